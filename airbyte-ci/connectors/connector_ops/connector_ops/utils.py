@@ -2,16 +2,23 @@
 # Copyright (c) 2023 Airbyte, Inc., all rights reserved.
 #
 
+import atexit
+import copy
+import datetime
 import functools
+import hashlib
 import json
 import logging
 import os
 import re
+import stat
+import tempfile
+import threading
 from dataclasses import dataclass
 from enum import Enum
 from glob import glob
 from pathlib import Path
-from typing import List, Optional, Set, Tuple, Union
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
 
 import git
 import requests
@@ -23,6 +30,12 @@ from rich.console import Console
 from simpleeval import simple_eval
 
 
+try:
+    from yaml import CSafeLoader as SafeYamlLoader
+except ImportError:  # pragma: no cover
+    from yaml import SafeLoader as SafeYamlLoader  # type: ignore
+
+
 console = Console()
 
 DIFFED_BRANCH = os.environ.get("DIFFED_BRANCH", "origin/master")
@@ -81,6 +94,156 @@ class ConnectorInvalidNameError(Exception):
     pass
 
 
+class ReadOnlyDict(dict):
+    """A dict which can't be modified, copying it gives a regular dict."""
+
+    def _read_only(self, *args: Any, **kwargs: Any) -> None:
+        raise TypeError("The connector metadata is read-only, copy it to modify it.")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only  # type: ignore
+    clear = pop = popitem = setdefault = update = _read_only  # type: ignore
+
+    def __copy__(self) -> dict:
+        return dict(self)
+
+    def __deepcopy__(self, memo: dict) -> dict:
+        return {key: copy.deepcopy(value, memo) for key, value in self.items()}
+
+    def __reduce__(self) -> Tuple:
+        return (ReadOnlyDict, (dict(self),))
+
+
+class ReadOnlyList(list):
+    """A list which can't be modified, copying it gives a regular list."""
+
+    def _read_only(self, *args: Any, **kwargs: Any) -> None:
+        raise TypeError("The connector metadata is read-only, copy it to modify it.")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only  # type: ignore
+    append = clear = extend = insert = pop = remove = reverse = sort = _read_only  # type: ignore
+
+    def __copy__(self) -> list:
+        return list(self)
+
+    def __deepcopy__(self, memo: dict) -> list:
+        return [copy.deepcopy(value, memo) for value in self]
+
+    def __reduce__(self) -> Tuple:
+        return (ReadOnlyList, (list(self),))
+
+
+# The read-only containers are dumped to YAML as the plain containers they wrap
+for _representer in (yaml.representer.SafeRepresenter, yaml.representer.Representer):
+    _representer.add_representer(ReadOnlyDict, _representer.represent_dict)
+    _representer.add_representer(ReadOnlyList, _representer.represent_list)
+
+
+def _to_read_only(value: Any) -> Any:
+    if isinstance(value, dict):
+        return ReadOnlyDict((key, _to_read_only(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return ReadOnlyList(_to_read_only(item) for item in value)
+    return value
+
+
+def _encode_yaml_timestamp(value: Any) -> dict:
+    # YAML parses unquoted dates and timestamps, which JSON can't represent
+    if isinstance(value, datetime.datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {"__date__": value.isoformat()}
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _decode_yaml_timestamp(value: dict) -> Any:
+    if value.keys() == {"__datetime__"}:
+        return datetime.datetime.fromisoformat(value["__datetime__"])
+    if value.keys() == {"__date__"}:
+        return datetime.date.fromisoformat(value["__date__"])
+    return value
+
+
+class ConnectorMetadataIndex:
+    """Index of the parsed metadata files of the connectors.
+
+    A parsed metadata file is reused until the file modification time or size changes. The metadata is shared by all the callers,
+    so it is returned read-only.
+    When a cache path is set, the index is persisted on disk as JSON when the process exits.
+    On disk entries are validated with a hash of the file content,
+    so files touched by a git checkout without being changed are not parsed again.
+    """
+
+    def __init__(self, cache_path: Optional[Path] = None):
+        self.cache_path = cache_path
+        # Maps a metadata file path to its (mtime, size), content hash and read-only metadata
+        self._entries: Dict[str, Tuple[Tuple[int, int], str, ReadOnlyDict]] = {}
+        # Maps a metadata file path to its content hash and metadata, as persisted on disk
+        self._disk_entries: Optional[Dict[str, Tuple[str, dict]]] = None
+        self._disk_entries_changed = False
+        self._lock = threading.Lock()
+
+    def _get_disk_entries(self) -> Dict[str, Tuple[str, dict]]:
+        if self._disk_entries is None:
+            self._disk_entries = {}
+            if self.cache_path and self.cache_path.is_file():
+                try:
+                    disk_entries = json.loads(self.cache_path.read_text(), object_hook=_decode_yaml_timestamp)
+                    self._disk_entries = {file_key: (content_hash, metadata) for file_key, (content_hash, metadata) in disk_entries.items()}
+                except (OSError, ValueError, TypeError, AttributeError) as e:
+                    logging.warning(f"Could not read the connector metadata cache at {self.cache_path}, ignoring it: {e}")
+        return self._disk_entries
+
+    def get(self, metadata_file_path: Path) -> Optional[ReadOnlyDict]:
+        """Get the data section of a connector metadata file.
+
+        Args:
+            metadata_file_path (Path): Path to the metadata file.
+
+        Returns:
+            Optional[ReadOnlyDict]: The read-only connector metadata, None if the metadata file does not exist.
+        """
+        try:
+            stat_result = metadata_file_path.stat()
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        if not stat.S_ISREG(stat_result.st_mode):
+            return None
+        file_key = os.path.abspath(metadata_file_path)
+        stat_key = (stat_result.st_mtime_ns, stat_result.st_size)
+
+        with self._lock:
+            entry = self._entries.get(file_key)
+            if entry is None or entry[0] != stat_key:
+                content = metadata_file_path.read_bytes()
+                content_hash = hashlib.sha256(content).hexdigest()
+                disk_entry = self._get_disk_entries().get(file_key)
+                if disk_entry is not None and disk_entry[0] == content_hash:
+                    metadata = disk_entry[1]
+                else:
+                    metadata = yaml.load(content, Loader=SafeYamlLoader)["data"]
+                    self._get_disk_entries()[file_key] = (content_hash, metadata)
+                    self._disk_entries_changed = True
+                entry = self._entries[file_key] = (stat_key, content_hash, _to_read_only(metadata))
+        return entry[2]
+
+    def save(self) -> None:
+        """Atomically persist the index to the cache path, if any entry changed."""
+        if not self.cache_path or not self._disk_entries_changed:
+            return
+        with self._lock:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            file_descriptor, temporary_path = tempfile.mkstemp(dir=self.cache_path.parent, suffix=".tmp")
+            with os.fdopen(file_descriptor, "w") as temporary_file:
+                json.dump(self._disk_entries, temporary_file, default=_encode_yaml_timestamp)
+            os.replace(temporary_path, self.cache_path)
+            self._disk_entries_changed = False
+
+
+CONNECTOR_METADATA_CACHE_PATH = os.environ.get("CONNECTOR_METADATA_CACHE_PATH")
+CONNECTOR_METADATA_INDEX = ConnectorMetadataIndex(Path(CONNECTOR_METADATA_CACHE_PATH) if CONNECTOR_METADATA_CACHE_PATH else None)
+atexit.register(CONNECTOR_METADATA_INDEX.save)
+
+
 class ConnectorVersionNotFound(Exception):
     pass
 
@@ -378,10 +541,7 @@ class Connector:
 
     @property
     def metadata(self) -> Optional[dict]:
-        file_path = self.metadata_file_path
-        if not file_path.is_file():
-            return None
-        return yaml.safe_load((self.code_directory / METADATA_FILE_NAME).read_text())["data"]
+        return CONNECTOR_METADATA_INDEX.get(self.metadata_file_path)
 
     @property
     def connector_spec_file_content(self) -> Optional[dict]:
@@ -2,6 +2,8 @@
 # Copyright (c) 2023 Airbyte, Inc., all rights reserved.
 #
 
+import copy
+import datetime
 from contextlib import nullcontext as does_not_raise
 from pathlib import Path
 
@@ -93,6 +95,86 @@ class TestConnector:
         assert connector_with_dockerfile.has_dockerfile
 
 
+class TestConnectorMetadataIndex:
+    @pytest.fixture
+    def metadata_file_path(self, tmp_path):
+        metadata_file_path = tmp_path / utils.METADATA_FILE_NAME
+        metadata_file_path.write_text("data:\n  dockerImageTag: 1.0.0\n")
+        return metadata_file_path
+
+    def test_get_reuses_parsed_metadata_until_file_changes(self, mocker, metadata_file_path):
+        index = utils.ConnectorMetadataIndex()
+        yaml_load = mocker.spy(utils.yaml, "load")
+
+        metadata = index.get(metadata_file_path)
+        assert metadata == {"dockerImageTag": "1.0.0"}
+        assert index.get(metadata_file_path) is metadata
+        assert yaml_load.call_count == 1
+
+        metadata_file_path.write_text("data:\n  dockerImageTag: 1.0.10\n")
+        assert index.get(metadata_file_path) == {"dockerImageTag": "1.0.10"}
+        assert yaml_load.call_count == 2
+
+    def test_get_returns_read_only_metadata(self, tmp_path):
+        metadata_file_path = tmp_path / utils.METADATA_FILE_NAME
+        metadata_file_path.write_text("data:\n  tags:\n    - language:python\n  connectorBuildOptions:\n    baseImage: image\n")
+        metadata = utils.ConnectorMetadataIndex().get(metadata_file_path)
+
+        with pytest.raises(TypeError):
+            metadata["dockerImageTag"] = "1.0.0"
+        with pytest.raises(TypeError):
+            metadata["tags"].append("language:java")
+        with pytest.raises(TypeError):
+            metadata["connectorBuildOptions"].pop("baseImage")
+
+        metadata_copy = copy.deepcopy(metadata)
+        metadata_copy["tags"].append("language:java")
+        assert metadata["tags"] == ["language:python"]
+
+    def test_read_only_metadata_can_be_dumped_to_yaml(self, tmp_path):
+        metadata_file_path = tmp_path / utils.METADATA_FILE_NAME
+        metadata_file_path.write_text("data:\n  tags:\n    - language:python\n  connectorBuildOptions:\n    baseImage: image\n")
+        metadata = utils.ConnectorMetadataIndex().get(metadata_file_path)
+
+        expected_metadata = {"tags": ["language:python"], "connectorBuildOptions": {"baseImage": "image"}}
+        assert utils.yaml.safe_load(utils.yaml.safe_dump(metadata)) == expected_metadata
+        assert utils.yaml.safe_load(utils.yaml.dump({"data": metadata})) == {"data": expected_metadata}
+
+    def test_get_missing_metadata_file(self, tmp_path):
+        assert utils.ConnectorMetadataIndex().get(tmp_path / utils.METADATA_FILE_NAME) is None
+        assert utils.ConnectorMetadataIndex().get(tmp_path) is None
+
+    def test_disk_cache_is_validated_with_content_hash(self, mocker, tmp_path, metadata_file_path):
+        cache_path = tmp_path / "cache" / "metadata_index.json"
+        index = utils.ConnectorMetadataIndex(cache_path)
+        index.get(metadata_file_path)
+        index.save()
+        assert cache_path.is_file()
+
+        # Touching the file changes its modification time but not its content
+        metadata_file_path.write_text(metadata_file_path.read_text())
+        yaml_load = mocker.spy(utils.yaml, "load")
+        assert utils.ConnectorMetadataIndex(cache_path).get(metadata_file_path) == {"dockerImageTag": "1.0.0"}
+        assert yaml_load.call_count == 0
+
+        metadata_file_path.write_text("data:\n  dockerImageTag: 2.0.0\n")
+        assert utils.ConnectorMetadataIndex(cache_path).get(metadata_file_path) == {"dockerImageTag": "2.0.0"}
+        assert yaml_load.call_count == 1
+
+    def test_disk_cache_keeps_yaml_dates(self, tmp_path):
+        metadata_file_path = tmp_path / utils.METADATA_FILE_NAME
+        metadata_file_path.write_text("data:\n  releases:\n    breakingChanges:\n      1.0.0:\n        upgradeDeadline: 2024-01-10\n")
+        cache_path = tmp_path / "metadata_index.json"
+        index = utils.ConnectorMetadataIndex(cache_path)
+        metadata = index.get(metadata_file_path)
+        index.save()
+
+        # Touching the file makes the index read the metadata back from the disk cache
+        metadata_file_path.write_text(metadata_file_path.read_text())
+        assert utils.ConnectorMetadataIndex(cache_path).get(metadata_file_path) == metadata
+        assert metadata["releases"]["breakingChanges"]["1.0.0"]["upgradeDeadline"] == datetime.date(2024, 1, 10)
+
+
 @pytest.fixture()
 def gradle_file_with_dependencies(tmpdir) -> tuple[Path, list[Path], list[Path]]:
     test_gradle_file = Path(tmpdir) / "build.gradle"
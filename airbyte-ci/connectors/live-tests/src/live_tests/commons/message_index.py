@@ -0,0 +1,98 @@
+# Copyright (c) 2024 Airbyte, Inc., all rights reserved.
+from __future__ import annotations
+
+import json
+import logging
+from array import array
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any, Optional
+
+from airbyte_protocol.models import AirbyteMessage  # type: ignore
+from airbyte_protocol.models import Type as AirbyteMessageType
+from pydantic import ValidationError
+
+
+class AirbyteMessageIndex:
+    """Byte offset index of the Airbyte messages found in a connector output file.
+
+    The output file is scanned once: each line is only decoded to find its message type and stream name.
+    Messages are parsed into AirbyteMessage models lazily, when they are read back through the index.
+    """
+
+    def __init__(self, command_output_path: Path, logger: Optional[logging.Logger] = None):
+        self.command_output_path = command_output_path
+        self.logger = logger or logging.getLogger(__name__)
+        self._offsets_per_type: dict[AirbyteMessageType, array] = defaultdict(lambda: array("q"))
+        self._offsets_per_type_and_stream: dict[tuple[AirbyteMessageType, str], array] = defaultdict(lambda: array("q"))
+        self._build()
+
+    @staticmethod
+    def _get_stream_name(message_type: AirbyteMessageType, raw_message: dict[str, Any]) -> Optional[str]:
+        try:
+            if message_type is AirbyteMessageType.RECORD:
+                return raw_message["record"]["stream"]
+            if message_type is AirbyteMessageType.STATE:
+                return raw_message["state"]["stream"]["stream_descriptor"]["name"]
+            if message_type is AirbyteMessageType.TRACE and raw_message["trace"]["type"] == "STREAM_STATUS":
+                return raw_message["trace"]["stream_status"]["stream_descriptor"]["name"]
+        except (KeyError, TypeError):
+            return None
+        return None
+
+    def _build(self) -> None:
+        offset = 0
+        with open(self.command_output_path, "rb") as command_output:
+            for line in command_output:
+                line_offset, offset = offset, offset + len(line)
+                try:
+                    raw_message = json.loads(line)
+                    message_type = AirbyteMessageType(raw_message["type"])
+                except (ValueError, KeyError, TypeError):
+                    continue
+                self._offsets_per_type[message_type].append(line_offset)
+                stream_name = self._get_stream_name(message_type, raw_message)
+                if stream_name is not None:
+                    self._offsets_per_type_and_stream[(message_type, stream_name)].append(line_offset)
+
+    @property
+    def message_count_per_type(self) -> dict[AirbyteMessageType, int]:
+        return {message_type: len(offsets) for message_type, offsets in self._offsets_per_type.items()}
+
+    def _get_offsets(self, message_type: AirbyteMessageType, stream_name: Optional[str] = None) -> array:
+        if stream_name is None:
+            return self._offsets_per_type.get(message_type, array("q"))
+        return self._offsets_per_type_and_stream.get((message_type, stream_name), array("q"))
+
+    def count_messages(self, message_type: AirbyteMessageType, stream_name: Optional[str] = None) -> int:
+        return len(self._get_offsets(message_type, stream_name))
+
+    def _read_messages_at(self, offsets: Iterable[int]) -> Iterator[AirbyteMessage]:
+        with open(self.command_output_path, "rb") as command_output:
+            for offset in offsets:
+                command_output.seek(offset)
+                try:
+                    yield AirbyteMessage.parse_obj(json.loads(command_output.readline()))
+                except ValidationError as e:
+                    self.logger.warning(f"Error parsing AirbyteMessage: {e}")
+
+    def get_raw_messages(self, message_type: AirbyteMessageType, stream_name: Optional[str] = None) -> Iterator[dict[str, Any]]:
+        """Yield the decoded JSON of the messages of the given type, without validating them as AirbyteMessage models."""
+        with open(self.command_output_path, "rb") as command_output:
+            for offset in self._get_offsets(message_type, stream_name):
+                command_output.seek(offset)
+                yield json.loads(command_output.readline())
+
+    def get_messages(self, message_type: AirbyteMessageType, stream_name: Optional[str] = None) -> Iterator[AirbyteMessage]:
+        """Yield the messages of the given type, optionally restricted to a single stream, in the order they were emitted."""
+        yield from self._read_messages_at(self._get_offsets(message_type, stream_name))
+
+    def get_all_messages(self) -> Iterator[AirbyteMessage]:
+        """Yield all the indexed messages in the order they were emitted."""
+        with open(self.command_output_path, "rb") as command_output:
+            for line in command_output:
+                try:
+                    yield AirbyteMessage.parse_obj(json.loads(line))
+                except (ValueError, ValidationError):
+                    continue
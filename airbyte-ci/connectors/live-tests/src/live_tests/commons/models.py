@@ -11,7 +11,7 @@ from collections import defaultdict
 from collections.abc import Iterable, Iterator, MutableMapping
 from dataclasses import dataclass, field
 from enum import Enum
-from functools import cache
+from functools import cached_property
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
@@ -28,9 +28,9 @@ from airbyte_protocol.models import (
 from airbyte_protocol.models import Type as AirbyteMessageType
 from genson import SchemaBuilder  # type: ignore
 from mitmproxy import http
-from pydantic import ValidationError
 
 from live_tests.commons.backends import DuckDbBackend, FileBackend
+from live_tests.commons.message_index import AirbyteMessageIndex
 from live_tests.commons.secret_access import get_airbyte_api_key
 from live_tests.commons.utils import (
     get_connector_container,
@@ -279,9 +279,15 @@ class ExecutionResult:
     def logger(self) -> logging.Logger:
         return logging.getLogger(f"{self.connector_under_test.target_or_control.value}-{self.command.value}")
 
+    @cached_property
+    def message_index(self) -> AirbyteMessageIndex:
+        """Index of the messages in the command output, built on first access with a single pass over the stdout file."""
+        self.logger.info(f"Indexing Airbyte messages from {self.stdout_file_path}")
+        return AirbyteMessageIndex(self.stdout_file_path, self.logger)
+
     @property
     def airbyte_messages(self) -> Iterable[AirbyteMessage]:
-        return self.parse_airbyte_messages_from_command_output(self.stdout_file_path)
+        return self.message_index.get_all_messages()
 
     @property
     def duckdb_schema(self) -> Iterable[str]:
@@ -333,24 +339,11 @@ class ExecutionResult:
             await self.http_dump.export(temp_file.name)
             self.http_flows = get_http_flows_from_mitm_dump(Path(temp_file.name))
 
-    def parse_airbyte_messages_from_command_output(
-        self, command_output_path: Path, log_validation_errors: bool = False
-    ) -> Iterable[AirbyteMessage]:
-        with open(command_output_path) as command_output:
-            for line in command_output:
-                try:
-                    yield AirbyteMessage.parse_raw(line)
-                except ValidationError as e:
-                    if log_validation_errors:
-                        self.logger.warn(f"Error parsing AirbyteMessage: {e}")
-
     def get_records(self) -> Iterable[AirbyteMessage]:
         self.logger.info(
             f"Reading records all records for command {self.command.value} on {self.connector_under_test.target_or_control.value} version."
         )
-        for message in self.airbyte_messages:
-            if message.type is AirbyteMessageType.RECORD:
-                yield message
+        yield from self.message_index.get_messages(AirbyteMessageType.RECORD)
 
     def generate_stream_schemas(self) -> dict[str, Any]:
         self.logger.info("Generating stream schemas")
@@ -392,40 +385,37 @@ class ExecutionResult:
         return types
 
     def get_records_per_stream(self, stream: str) -> Iterator[AirbyteMessage]:
-        assert self.backend is not None, "Backend must be set to get records per stream"
         self.logger.info(f"Reading records for stream {stream}")
-        if stream not in self.backend.record_per_stream_paths:
+        if not self.message_index.count_messages(AirbyteMessageType.RECORD, stream):
             self.logger.warning(f"No records found for stream {stream}")
-            yield from []
-        else:
-            for message in self.parse_airbyte_messages_from_command_output(
-                self.backend.record_per_stream_paths[stream], log_validation_errors=True
-            ):
-                if message.type is AirbyteMessageType.RECORD:
-                    yield message
+        yield from self.message_index.get_messages(AirbyteMessageType.RECORD, stream)
 
-    def get_states_per_stream(self, stream: str) -> Dict[str, List[AirbyteStateMessage]]:
-        self.logger.info(f"Reading state messages for stream {stream}")
+    @cached_property
+    def _states_per_stream(self) -> Dict[str, List[AirbyteStateMessage]]:
         states = defaultdict(list)
-        for message in self.airbyte_messages:
-            if message.type is AirbyteMessageType.STATE:
+        for message in self.message_index.get_messages(AirbyteMessageType.STATE):
+            if message.state.stream:
                 states[message.state.stream.stream_descriptor.name].append(message.state)
         return states
 
-    def get_status_messages_per_stream(self, stream: str) -> Dict[str, List[AirbyteStreamStatusTraceMessage]]:
-        self.logger.info(f"Reading state messages for stream {stream}")
+    @cached_property
+    def _status_messages_per_stream(self) -> Dict[str, List[AirbyteStreamStatusTraceMessage]]:
         statuses = defaultdict(list)
-        for message in self.airbyte_messages:
-            if message.type is AirbyteMessageType.TRACE and message.trace.type == TraceType.STREAM_STATUS:
+        for message in self.message_index.get_messages(AirbyteMessageType.TRACE):
+            if message.trace.type == TraceType.STREAM_STATUS:
                 statuses[message.trace.stream_status.stream_descriptor.name].append(message.trace.stream_status)
         return statuses
 
-    @cache
+    def get_states_per_stream(self, stream: str) -> Dict[str, List[AirbyteStateMessage]]:
+        self.logger.info(f"Reading state messages for stream {stream}")
+        return defaultdict(list, self._states_per_stream)
+
+    def get_status_messages_per_stream(self, stream: str) -> Dict[str, List[AirbyteStreamStatusTraceMessage]]:
+        self.logger.info(f"Reading state messages for stream {stream}")
+        return defaultdict(list, self._status_messages_per_stream)
+
     def get_message_count_per_type(self) -> dict[AirbyteMessageType, int]:
-        message_count: dict[AirbyteMessageType, int] = defaultdict(int)
-        for message in self.airbyte_messages:
-            message_count[message.type] += 1
-        return message_count
+        return self.message_index.message_count_per_type
 
     async def save_http_dump(self, output_dir: Path) -> None:
         if self.http_dump:
@@ -0,0 +1,172 @@
+# Copyright (c) 2024 Airbyte, Inc., all rights reserved.
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import tempfile
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+import duckdb
+
+
+class ExcludedPaths:
+    """Record fields excluded from the comparison, as dot separated paths from the root of the record (e.g. `emitted_at`).
+
+    The same paths remove the fields from the hashed records and exclude them from the DeepDiff of the records, so both comparisons agree.
+    """
+
+    def __init__(self, paths: Iterable[str] = ()):
+        self.paths = [tuple(path.split(".")) for path in paths]
+
+    def remove(self, record: dict[str, Any]) -> dict[str, Any]:
+        return self._remove(record, self.paths)
+
+    def _remove(self, value: dict[str, Any], paths: list[tuple[str, ...]]) -> dict[str, Any]:
+        excluded_keys = {path[0] for path in paths if len(path) == 1}
+        nested_paths: dict[str, list[tuple[str, ...]]] = {}
+        for path in paths:
+            if len(path) > 1:
+                nested_paths.setdefault(path[0], []).append(path[1:])
+        cleaned = {}
+        for key, item in value.items():
+            if key in excluded_keys:
+                continue
+            if key in nested_paths and isinstance(item, dict):
+                item = self._remove(item, nested_paths[key])
+            cleaned[key] = item
+        return cleaned
+
+    @property
+    def deepdiff_exclude_regex_paths(self) -> list[str]:
+        """Regexes matching the excluded paths in a DeepDiff of lists of records."""
+        return [r"^root\[\d+\]" + "".join(rf"\[{re.escape(repr(key))}\]" for key in path) + "$" for path in self.paths]
+
+
+@dataclass
+class RecordsDiff:
+    """Records which differ between the control and target versions of a stream.
+
+    The record lists are capped to the engine's max_records_in_diff, the counts are not.
+    """
+
+    mismatching_control_records: list[dict] = field(default_factory=list)
+    mismatching_target_records: list[dict] = field(default_factory=list)
+    control_only_records: list[dict] = field(default_factory=list)
+    target_only_records: list[dict] = field(default_factory=list)
+    mismatching_count: int = 0
+    control_only_count: int = 0
+    target_only_count: int = 0
+
+    @property
+    def has_diff(self) -> bool:
+        return bool(self.mismatching_count or self.control_only_count or self.target_only_count)
+
+
+class RecordDiffEngine:
+    """Out-of-core comparison of the records produced by the control and target versions of a stream.
+
+    Records are canonicalized (sorted keys, excluded fields removed) and hashed while being streamed to disk.
+    Control and target records are then joined in DuckDB on their primary key, or on their content hash when the stream has no primary key.
+    Only the records whose hash differs, or which are missing on one side, are loaded back in memory for a field level diff.
+    Records sharing the same key are matched by their rank in the key group, so duplicates are compared as multisets.
+    """
+
+    TABLE_COLUMNS = "{'key': 'VARCHAR', 'hash': 'VARCHAR', 'record': 'VARCHAR'}"
+    # DuckDB rejects CSV lines longer than 2MB by default, a line holds a whole record
+    MAX_LINE_SIZE = 1024**3
+
+    def __init__(self, excluded_paths: Optional[ExcludedPaths] = None, max_records_in_diff: int = 1000):
+        self.excluded_paths = excluded_paths or ExcludedPaths()
+        self.max_records_in_diff = max_records_in_diff
+
+    def _canonicalize(self, record: dict[str, Any]) -> str:
+        return json.dumps(self.excluded_paths.remove(record), sort_keys=True)
+
+    def _write_records(self, records: Iterable[dict[str, Any]], primary_key: Optional[list[str]], path: Path) -> None:
+        # json.dumps escapes tabs and new lines so they can't collide with the TSV delimiters
+        with open(path, "w") as records_file:
+            for record in records:
+                canonical_record = self._canonicalize(record)
+                record_hash = hashlib.blake2b(canonical_record.encode("utf-8"), digest_size=16).hexdigest()
+                if primary_key:
+                    key = json.dumps(record.get("data", {}).get(primary_key[0]), sort_keys=True)
+                else:
+                    key = record_hash
+                records_file.write(f"{key}\t{record_hash}\t{canonical_record}\n")
+
+    def _load_table(self, connection: duckdb.DuckDBPyConnection, table_name: str, path: Path) -> None:
+        connection.execute(
+            f"""
+            CREATE TABLE {table_name} AS
+            SELECT *, row_number() OVER (PARTITION BY key ORDER BY hash) AS occurrence
+            FROM read_csv('{path}', delim = '\t', quote = '', escape = '', header = false, auto_detect = false,
+                          columns = {self.TABLE_COLUMNS}, max_line_size = {self.MAX_LINE_SIZE})
+            """
+        )
+
+    def _count_and_fetch(self, connection: duckdb.DuckDBPyConnection, query: str) -> tuple[int, list[tuple]]:
+        count = connection.execute(f"SELECT count(*) FROM ({query})").fetchone()[0]  # type: ignore
+        rows = connection.execute(f"{query} LIMIT {self.max_records_in_diff}").fetchall()
+        return count, rows
+
+    def diff(
+        self,
+        control_records: Iterable[dict[str, Any]],
+        target_records: Iterable[dict[str, Any]],
+        primary_key: Optional[list[str]] = None,
+    ) -> RecordsDiff:
+        """Compare control and target records (as dicts of the AirbyteRecordMessage fields) with a bounded memory footprint."""
+        with tempfile.TemporaryDirectory() as working_directory:
+            working_path = Path(working_directory)
+            self._write_records(control_records, primary_key, working_path / "control.tsv")
+            self._write_records(target_records, primary_key, working_path / "target.tsv")
+
+            connection = duckdb.connect(str(working_path / "diff.duckdb"))
+            try:
+                connection.execute("SET enable_progress_bar = false")
+                self._load_table(connection, "control", working_path / "control.tsv")
+                self._load_table(connection, "target", working_path / "target.tsv")
+
+                mismatching_count, mismatching_rows = self._count_and_fetch(
+                    connection,
+                    """
+                    SELECT control.record, target.record FROM control
+                    JOIN target ON control.key = target.key AND control.occurrence = target.occurrence
+                    WHERE control.hash <> target.hash
+                    ORDER BY control.key, control.occurrence
+                    """,
+                )
+                control_only_count, control_only_rows = self._count_and_fetch(
+                    connection,
+                    """
+                    SELECT control.record FROM control
+                    LEFT JOIN target ON control.key = target.key AND control.occurrence = target.occurrence
+                    WHERE target.key IS NULL
+                    ORDER BY control.key, control.occurrence
+                    """,
+                )
+                target_only_count, target_only_rows = self._count_and_fetch(
+                    connection,
+                    """
+                    SELECT target.record FROM target
+                    LEFT JOIN control ON target.key = control.key AND target.occurrence = control.occurrence
+                    WHERE control.key IS NULL
+                    ORDER BY target.key, target.occurrence
+                    """,
+                )
+            finally:
+                connection.close()
+
+        return RecordsDiff(
+            mismatching_control_records=[json.loads(control) for control, _ in mismatching_rows],
+            mismatching_target_records=[json.loads(target) for _, target in mismatching_rows],
+            control_only_records=[json.loads(row[0]) for row in control_only_rows],
+            target_only_records=[json.loads(row[0]) for row in target_only_rows],
+            mismatching_count=mismatching_count,
+            control_only_count=control_only_count,
+            target_only_count=target_only_count,
+        )
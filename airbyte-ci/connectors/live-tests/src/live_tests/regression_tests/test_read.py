@@ -2,14 +2,15 @@
 from __future__ import annotations
 
 import json
-from collections.abc import Callable, Generator, Iterable
-from typing import TYPE_CHECKING, Any, Optional
+from collections.abc import Callable, Iterable
+from typing import TYPE_CHECKING, Optional
 
 import pytest
-from airbyte_protocol.models import AirbyteMessage  # type: ignore
+from airbyte_protocol.models import Type as AirbyteMessageType  # type: ignore
 from deepdiff import DeepDiff  # type: ignore
 
 from live_tests.commons.models import ExecutionResult
+from live_tests.commons.record_diff import ExcludedPaths, RecordDiffEngine, RecordsDiff
 from live_tests.utils import fail_test_on_failing_execution_results, get_and_write_diff, get_test_logger, write_string_to_test_artifact
 
 if TYPE_CHECKING:
@@ -20,7 +21,7 @@ pytestmark = [
 ]
 
 
-EXCLUDE_PATHS = ["emitted_at"]
+EXCLUDED_PATHS = ExcludedPaths(["emitted_at"])
 
 
 class TestDataIntegrity:
@@ -147,29 +148,35 @@ class TestDataIntegrity:
             read_target_execution_result (ExecutionResult): The target version execution result.
         """
         streams_with_diff = set()
+        diff_engine = RecordDiffEngine(excluded_paths=EXCLUDED_PATHS)
         for stream in read_control_execution_result.configured_streams:
-            control_records = list(read_control_execution_result.get_records_per_stream(stream))
-            target_records = list(read_target_execution_result.get_records_per_stream(stream))
+            control_index = read_control_execution_result.message_index
+            target_index = read_target_execution_result.message_index
 
-            if control_records and not target_records:
+            if control_index.count_messages(AirbyteMessageType.RECORD, stream) and not target_index.count_messages(
+                AirbyteMessageType.RECORD, stream
+            ):
                 pytest.fail(f"Stream {stream} is missing in the target version.")
 
-            if primary_key := read_control_execution_result.primary_keys_per_stream.get(stream):
+            primary_key = read_control_execution_result.primary_keys_per_stream.get(stream)
+            records_diff = diff_engine.diff(
+                (message["record"] for message in control_index.get_raw_messages(AirbyteMessageType.RECORD, stream)),
+                (message["record"] for message in target_index.get_raw_messages(AirbyteMessageType.RECORD, stream)),
+                primary_key,
+            )
+            if primary_key:
                 diffs = self._get_diff_on_stream_with_pk(
                     request,
                     record_property,
                     stream,
-                    control_records,
-                    target_records,
-                    primary_key,
+                    records_diff,
                 )
             else:
                 diffs = self._get_diff_on_stream_without_pk(
                     request,
                     record_property,
                     stream,
-                    control_records,
-                    target_records,
+                    records_diff,
                 )
 
             if diffs:
@@ -444,108 +451,77 @@ class TestDataIntegrity:
         request: SubRequest,
         record_property: Callable,
         stream: str,
-        control_records: list[AirbyteMessage],
-        target_records: list[AirbyteMessage],
-        primary_key: list[str],
+        records_diff: RecordsDiff,
     ) -> Optional[Iterable[str]]:
-        control_pks = {r.record.data[primary_key[0]] for r in control_records}
-        target_pks = {r.record.data[primary_key[0]] for r in target_records}
+        if not records_diff.has_diff:
+            return None
 
-        # Compare the diff for all records whose primary key is in
+        # Compare the diff for all records whose primary key is in both versions but whose content differs
         record_diff_path_prefix = f"{stream}_record_diff"
         record_diff = get_and_write_diff(
             request,
-            _get_filtered_sorted_records(control_records, target_pks, True, primary_key),
-            _get_filtered_sorted_records(target_records, control_pks, True, primary_key),
+            records_diff.mismatching_control_records,
+            records_diff.mismatching_target_records,
             record_diff_path_prefix,
             ignore_order=False,
-            exclude_paths=EXCLUDE_PATHS,
+            exclude_paths=EXCLUDED_PATHS.deepdiff_exclude_regex_paths,
         )
 
         control_records_diff_path_prefix = f"{stream}_control_records_diff"
         control_records_diff = get_and_write_diff(
             request,
-            _get_filtered_sorted_records(control_records, target_pks, False, primary_key),
+            records_diff.control_only_records,
             [],
             control_records_diff_path_prefix,
             ignore_order=False,
-            exclude_paths=EXCLUDE_PATHS,
+            exclude_paths=EXCLUDED_PATHS.deepdiff_exclude_regex_paths,
         )
 
         target_records_diff_path_prefix = f"{stream}_target_records_diff"
         target_records_diff = get_and_write_diff(
             request,
             [],
-            _get_filtered_sorted_records(target_records, control_pks, False, primary_key),
+            records_diff.target_only_records,
             target_records_diff_path_prefix,
             ignore_order=False,
-            exclude_paths=EXCLUDE_PATHS,
+            exclude_paths=EXCLUDED_PATHS.deepdiff_exclude_regex_paths,
         )
 
-        has_diff = record_diff or control_records_diff or target_records_diff
-
-        if has_diff:
-            record_property(
-                f"{stream} stream: records with primary key in target & control whose values differ",
-                record_diff,
-            )
-            record_property(
-                f"{stream} stream: records in control but not target",
-                control_records_diff,
-            )
-            record_property(
-                f"{stream} stream: records in target but not control",
-                target_records_diff,
-            )
+        record_property(
+            f"{stream} stream: records with primary key in target & control whose values differ ({records_diff.mismatching_count} records)",
+            record_diff,
+        )
+        record_property(
+            f"{stream} stream: records in control but not target ({records_diff.control_only_count} records)",
+            control_records_diff,
+        )
+        record_property(
+            f"{stream} stream: records in target but not control ({records_diff.target_only_count} records)",
+            target_records_diff,
+        )
 
-            return (record_diff, control_records_diff, target_records_diff)
-        return None
+        return (record_diff, control_records_diff, target_records_diff)
 
     def _get_diff_on_stream_without_pk(
         self,
         request: SubRequest,
         record_property: Callable,
         stream: str,
-        control_records: list[AirbyteMessage],
-        target_records: list[AirbyteMessage],
+        records_diff: RecordsDiff,
     ) -> Optional[Iterable[str]]:
+        if not records_diff.has_diff:
+            return None
+        # Without primary key, records are matched on their content: only the unmatched ones are left to diff
         diff = get_and_write_diff(
             request,
-            [json.loads(r.record.json(sort_keys=True)) for r in control_records],
-            [json.loads(r.record.json(sort_keys=True)) for r in target_records],
+            records_diff.control_only_records,
+            records_diff.target_only_records,
             f"{stream}_diff",
             ignore_order=True,
-            exclude_paths=EXCLUDE_PATHS,
+            exclude_paths=EXCLUDED_PATHS.deepdiff_exclude_regex_paths,
         )
-        if diff:
-            record_property(f"Diff for stream {stream}", diff)
-            return (diff,)
-        return None
-
-
-def _get_filtered_sorted_records(
-    records: list[AirbyteMessage],
-    primary_key_set: set[Generator[Any, Any, None]],
-    include_target: bool,
-    primary_key: list[str],
-) -> list[dict]:
-    """
-    Get a list of records sorted by primary key, and filtered as specified.
-
-    For example, if `include_target` is true, we filter the records such that
-    only those whose primary key is in `primary_key_set` are returned.
-    If `include_target` is false, we only return records whose primary key
-    is not in `primary_key_set`.
-    """
-    if include_target:
-        _filter = lambda x: x["data"].get(primary_key[0]) in primary_key_set
-    else:
-        _filter = lambda x: x["data"].get(primary_key[0]) not in primary_key_set
-
-    return sorted(
-        filter(
-            _filter,
-            [json.loads(s.record.json(sort_keys=True)) for s in records],
-        ),
-        key=lambda x: x["data"][primary_key[0]],
-    )
+        record_property(
+            f"Diff for stream {stream} ({records_diff.control_only_count} records in control only, {records_diff.target_only_count} records in target only)",
+            diff,
+        )
+        return (diff,)
@@ -0,0 +1,104 @@
+# Copyright (c) 2024 Airbyte, Inc., all rights reserved.
+
+import pytest
+from airbyte_protocol.models import (
+    AirbyteMessage,
+    AirbyteRecordMessage,
+    AirbyteStateMessage,
+    AirbyteStateType,
+    AirbyteStreamState,
+    AirbyteStreamStatus,
+    AirbyteStreamStatusTraceMessage,
+    AirbyteTraceMessage,
+    StreamDescriptor,
+    TraceType,
+)
+from airbyte_protocol.models import Type as AirbyteMessageType
+
+from live_tests.commons.message_index import AirbyteMessageIndex
+
+
+def _record(stream: str, data: dict) -> AirbyteMessage:
+    return AirbyteMessage(type=AirbyteMessageType.RECORD, record=AirbyteRecordMessage(stream=stream, data=data, emitted_at=1))
+
+
+def _state(stream: str) -> AirbyteMessage:
+    return AirbyteMessage(
+        type=AirbyteMessageType.STATE,
+        state=AirbyteStateMessage(
+            type=AirbyteStateType.STREAM,
+            stream=AirbyteStreamState(stream_descriptor=StreamDescriptor(name=stream), stream_state={"cursor": 1}),
+        ),
+    )
+
+
+def _status(stream: str, status: AirbyteStreamStatus) -> AirbyteMessage:
+    return AirbyteMessage(
+        type=AirbyteMessageType.TRACE,
+        trace=AirbyteTraceMessage(
+            type=TraceType.STREAM_STATUS,
+            emitted_at=1,
+            stream_status=AirbyteStreamStatusTraceMessage(stream_descriptor=StreamDescriptor(name=stream), status=status),
+        ),
+    )
+
+
+@pytest.fixture
+def command_output_path(tmp_path):
+    messages = [
+        _status("users", AirbyteStreamStatus.STARTED),
+        _record("users", {"id": 1}),
+        _record("orders", {"id": "a"}),
+        _record("users", {"id": 2}),
+        _state("users"),
+        _state("orders"),
+        _status("users", AirbyteStreamStatus.COMPLETE),
+    ]
+    path = tmp_path / "stdout.log"
+    lines = [m.json(exclude_unset=True) for m in messages]
+    # Connector output can contain non-protocol lines which must be ignored
+    lines.insert(2, "this is not an airbyte message")
+    lines.insert(4, '{"type": "UNKNOWN"}')
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+def test_message_count_per_type(command_output_path):
+    index = AirbyteMessageIndex(command_output_path)
+    assert index.message_count_per_type == {
+        AirbyteMessageType.TRACE: 2,
+        AirbyteMessageType.RECORD: 3,
+        AirbyteMessageType.STATE: 2,
+    }
+    assert index.count_messages(AirbyteMessageType.RECORD, "users") == 2
+    assert index.count_messages(AirbyteMessageType.RECORD, "unknown_stream") == 0
+
+
+def test_get_messages_per_stream(command_output_path):
+    index = AirbyteMessageIndex(command_output_path)
+    assert [m.record.data for m in index.get_messages(AirbyteMessageType.RECORD, "users")] == [{"id": 1}, {"id": 2}]
+    assert [m.record.data for m in index.get_messages(AirbyteMessageType.RECORD, "orders")] == [{"id": "a"}]
+    assert [m.state.stream.stream_descriptor.name for m in index.get_messages(AirbyteMessageType.STATE, "orders")] == ["orders"]
+    assert [m.trace.stream_status.status for m in index.get_messages(AirbyteMessageType.TRACE, "users")] == [
+        AirbyteStreamStatus.STARTED,
+        AirbyteStreamStatus.COMPLETE,
+    ]
+    assert list(index.get_messages(AirbyteMessageType.SPEC)) == []
+
+
+def test_get_all_messages(command_output_path):
+    index = AirbyteMessageIndex(command_output_path)
+    assert [m.type for m in index.get_all_messages()] == [
+        AirbyteMessageType.TRACE,
+        AirbyteMessageType.RECORD,
+        AirbyteMessageType.RECORD,
+        AirbyteMessageType.RECORD,
+        AirbyteMessageType.STATE,
+        AirbyteMessageType.STATE,
+        AirbyteMessageType.TRACE,
+    ]
+
+
+def test_get_raw_messages(command_output_path):
+    index = AirbyteMessageIndex(command_output_path)
+    assert [m["record"]["data"] for m in index.get_raw_messages(AirbyteMessageType.RECORD, "users")] == [{"id": 1}, {"id": 2}]
@@ -0,0 +1,77 @@
+# Copyright (c) 2024 Airbyte, Inc., all rights reserved.
+
+from deepdiff import DeepDiff  # type: ignore
+
+from live_tests.commons.record_diff import ExcludedPaths, RecordDiffEngine
+
+
+def _record(data: dict, emitted_at: int = 1) -> dict:
+    return {"stream": "users", "data": data, "emitted_at": emitted_at}
+
+
+def test_diff_with_primary_key():
+    control_records = [
+        _record({"id": 1, "name": "alice"}),
+        _record({"id": 2, "name": "bob"}),
+        _record({"id": 3, "name": "carol"}),
+    ]
+    target_records = [
+        _record({"id": 4, "name": "dave"}),
+        _record({"name": "bobby", "id": 2}),
+        _record({"id": 1, "name": "alice"}, emitted_at=2),
+    ]
+    records_diff = RecordDiffEngine(excluded_paths=ExcludedPaths(["emitted_at"])).diff(control_records, target_records, ["id"])
+
+    assert records_diff.has_diff
+    assert records_diff.mismatching_count == 1
+    assert records_diff.mismatching_control_records == [{"stream": "users", "data": {"id": 2, "name": "bob"}}]
+    assert records_diff.mismatching_target_records == [{"stream": "users", "data": {"id": 2, "name": "bobby"}}]
+    assert records_diff.control_only_count == 1
+    assert records_diff.control_only_records == [{"stream": "users", "data": {"id": 3, "name": "carol"}}]
+    assert records_diff.target_only_count == 1
+    assert records_diff.target_only_records == [{"stream": "users", "data": {"id": 4, "name": "dave"}}]
+
+
+def test_diff_without_primary_key_compares_multisets():
+    control_records = [_record({"a": 1}), _record({"a": 1}), _record({"a": "tab\there"})]
+    target_records = [_record({"a": "tab\there"}), _record({"a": 1}), _record({"a": 2})]
+    records_diff = RecordDiffEngine(excluded_paths=ExcludedPaths(["emitted_at"])).diff(control_records, target_records)
+
+    assert records_diff.mismatching_count == 0
+    assert records_diff.control_only_records == [{"stream": "users", "data": {"a": 1}}]
+    assert records_diff.target_only_records == [{"stream": "users", "data": {"a": 2}}]
+
+
+def test_no_diff_on_identical_records():
+    records = [_record({"id": i}) for i in range(10)]
+    assert not RecordDiffEngine().diff(records, list(reversed(records)), ["id"]).has_diff
+    assert not RecordDiffEngine().diff([], []).has_diff
+
+
+def test_diff_records_are_capped():
+    control_records = [_record({"id": i}) for i in range(10)]
+    records_diff = RecordDiffEngine(max_records_in_diff=3).diff(control_records, [], ["id"])
+    assert records_diff.control_only_count == 10
+    assert len(records_diff.control_only_records) == 3
+
+
+def test_excluded_paths_agree_with_deepdiff():
+    excluded_paths = ExcludedPaths(["emitted_at", "data.updated_at"])
+    control_records = [_record({"id": 1, "emitted_at": "a", "updated_at": "a"})]
+    target_records = [_record({"id": 1, "emitted_at": "b", "updated_at": "b"}, emitted_at=2)]
+
+    records_diff = RecordDiffEngine(excluded_paths=excluded_paths).diff(control_records, target_records, ["id"])
+    deep_diff = DeepDiff(control_records, target_records, exclude_regex_paths=excluded_paths.deepdiff_exclude_regex_paths)
+
+    # only the top level emitted_at is excluded, a data field with the same name is still compared
+    assert records_diff.mismatching_count == 1
+    assert records_diff.mismatching_control_records == [{"stream": "users", "data": {"id": 1, "emitted_at": "a"}}]
+    assert list(deep_diff["values_changed"]) == ["root[0]['data']['emitted_at']"]
+
+
+def test_diff_large_records():
+    large_value = "x" * 5 * 1024 * 1024
+    records_diff = RecordDiffEngine().diff(
+        [_record({"id": 1, "value": large_value})], [_record({"id": 1, "value": large_value[1:]})], ["id"]
+    )
+    assert records_diff.mismatching_count == 1
@@ -3,26 +3,43 @@
 #
 
 import copy
+import hashlib
+import inspect
 import json
-from typing import List, Union
+import os
+import sys
+import tempfile
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple, Type, Union
 
 import semver
 import sentry_sdk
 from dagster import MetadataValue, OpExecutionContext, Output, asset
 from dagster_gcp.gcs.file_manager import GCSFileHandle, GCSFileManager
+from metadata_service.models import transform
 from metadata_service.models.generated.ConnectorRegistryDestinationDefinition import ConnectorRegistryDestinationDefinition
 from metadata_service.models.generated.ConnectorRegistrySourceDefinition import ConnectorRegistrySourceDefinition
 from metadata_service.models.generated.ConnectorRegistryV0 import ConnectorRegistryV0
-from metadata_service.models.transform import to_json_sanitized_dict
+from metadata_service.models.transform import to_json, to_json_sanitized_dict
 from orchestrator.assets.registry_entry import ConnectorTypePrimaryKey, ConnectorTypes
+from orchestrator.config import REGISTRY_STATE_DIR
 from orchestrator.logging import sentry
 from orchestrator.logging.publish_connector_lifecycle import PublishConnectorLifecycle, PublishConnectorLifecycleStage, StageStatus
+from orchestrator.utils.blob_helpers import download_blob_with_cache
 from orchestrator.utils.object_helpers import default_none_to_dict
 from pydash.objects import set_with
 
 
 PolymorphicRegistryEntry = Union[ConnectorRegistrySourceDefinition, ConnectorRegistryDestinationDefinition]
 
+# Maps a registry entry key to the hash of the entry inputs and the JSON serialization of the validated entry
+RegistryState = Dict[str, Tuple[str, str]]
+
+REGISTRY_ENTRY_MODELS: Dict[ConnectorTypes, Type[PolymorphicRegistryEntry]] = {
+    ConnectorTypes.SOURCE: ConnectorRegistrySourceDefinition,
+    ConnectorTypes.DESTINATION: ConnectorRegistryDestinationDefinition,
+}
+
 GROUP_NAME = "registry"
 
 
@@ -66,7 +83,10 @@ def apply_metrics_to_registry_entry(registry_entry_dict: dict, connector_type: C
 
 @sentry_sdk.trace
 def persist_registry_to_json(
-    registry: ConnectorRegistryV0, registry_name: str, registry_directory_manager: GCSFileManager
+    registry: ConnectorRegistryV0,
+    registry_name: str,
+    registry_directory_manager: GCSFileManager,
+    registry_json: Optional[str] = None,
 ) -> GCSFileHandle:
     """Persist the registry to a json file on GCS bucket
 
@@ -74,12 +94,13 @@ def persist_registry_to_json(
         registry (ConnectorRegistryV0): The registry.
         registry_name (str): The name of the registry. One of "cloud" or "oss".
         registry_directory_manager (OutputDataFrame): The registry directory manager.
+        registry_json (Optional[str]): The already serialized registry, if available.
 
     Returns:
         OutputDataFrame: The registry directory manager.
     """
     registry_file_name = f"{registry_name}_registry"
-    registry_json = registry.json(exclude_none=True)
+    registry_json = registry_json or registry.json(exclude_none=True)
 
     file_handle = registry_directory_manager.write_data(registry_json.encode("utf-8"), ext="json", key=registry_file_name)
     return file_handle
@@ -138,6 +159,106 @@ def get_connector_type_from_registry_entry(registry_entry: PolymorphicRegistryEn
         raise ValueError("Registry entry is not a source or destination")
 
 
+@lru_cache(maxsize=None)
+def get_registry_code_version() -> str:
+    """Get a hash of the code and models the registry entries are generated with.
+
+    Returns:
+        str: The registry code version.
+    """
+    code_version = hashlib.sha256()
+    for module in (sys.modules[__name__], transform):
+        code_version.update(inspect.getsource(module).encode("utf-8"))
+    code_version.update(ConnectorRegistryV0.schema_json().encode("utf-8"))
+    return code_version.hexdigest()
+
+
+def get_registry_entry_hash(
+    registry_entry_json: str, metrics: dict, release_candidate_registry_entry: Optional[PolymorphicRegistryEntry]
+) -> str:
+    """Get a hash of everything the registry entry is generated from, including the code generating it.
+
+    Args:
+        registry_entry_json (str): The sanitized JSON of the latest registry entry.
+        metrics (dict): The metrics of the connector.
+        release_candidate_registry_entry (Optional[PolymorphicRegistryEntry]): The release candidate registry entry of the connector, if any.
+
+    Returns:
+        str: The registry entry hash.
+    """
+    registry_entry_hash = hashlib.sha256(get_registry_code_version().encode("utf-8"))
+    registry_entry_hash.update(registry_entry_json.encode("utf-8"))
+    registry_entry_hash.update(json.dumps(metrics, sort_keys=True).encode("utf-8"))
+    if release_candidate_registry_entry is not None:
+        registry_entry_hash.update(to_json(release_candidate_registry_entry).encode("utf-8"))
+    return registry_entry_hash.hexdigest()
+
+
+def get_registry_json(registry_entry_jsons: Dict[str, List[str]]) -> str:
+    """Assemble the registry JSON from the JSON serialization of its entries.
+
+    The output is identical to ConnectorRegistryV0.json(exclude_none=True), without serializing the unchanged entries again.
+
+    Args:
+        registry_entry_jsons (Dict[str, List[str]]): The serialized entries of the "sources" and "destinations" fields.
+
+    Returns:
+        str: The registry JSON.
+    """
+    return "{" + ", ".join(f'"{field}": [{", ".join(registry_entry_jsons[field])}]' for field in ConnectorRegistryV0.__fields__) + "}"
+
+
+def _get_registry_state_path(context: OpExecutionContext, registry_name: str) -> str:
+    registry_state_dir = REGISTRY_STATE_DIR or os.path.join(context.instance.storage_directory(), "registry_state")
+    return os.path.join(registry_state_dir, f"{registry_name}_registry_state.json")
+
+
+def load_registry_state(context: OpExecutionContext, registry_name: str) -> RegistryState:
+    """Load the registry entries generated during the last generation of the registry.
+
+    Args:
+        context (OpExecutionContext): The execution context.
+        registry_name (str): The name of the registry. One of "cloud" or "oss".
+
+    Returns:
+        RegistryState: The registry state, empty if it does not exist or is invalid.
+    """
+    registry_state_path = _get_registry_state_path(context, registry_name)
+    try:
+        with open(registry_state_path) as state_file:
+            registry_state = json.load(state_file)
+        if not isinstance(registry_state, dict) or not all(
+            isinstance(entry_state, list) and len(entry_state) == 2 and all(isinstance(value, str) for value in entry_state)
+            for entry_state in registry_state.values()
+        ):
+            raise ValueError("unexpected registry state format")
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        context.log.warning(
+            f"Ignoring the invalid {registry_name} registry state at {registry_state_path}, the registry is fully generated: {e}"
+        )
+        return {}
+    return {registry_entry_key: (entry_hash, entry_json) for registry_entry_key, (entry_hash, entry_json) in registry_state.items()}
+
+
+def save_registry_state(context: OpExecutionContext, registry_name: str, registry_state: RegistryState) -> None:
+    """Atomically replace the registry state with the entries of the registry that was just persisted.
+
+    Args:
+        context (OpExecutionContext): The execution context.
+        registry_name (str): The name of the registry. One of "cloud" or "oss".
+        registry_state (RegistryState): The registry state.
+    """
+    registry_state_path = _get_registry_state_path(context, registry_name)
+    registry_state_dir = os.path.dirname(registry_state_path)
+    os.makedirs(registry_state_dir, exist_ok=True)
+    file_descriptor, temporary_path = tempfile.mkstemp(dir=registry_state_dir, suffix=".tmp")
+    with os.fdopen(file_descriptor, "w") as temporary_file:
+        json.dump(registry_state, temporary_file)
+    os.replace(temporary_path, registry_state_path)
+
+
 @sentry_sdk.trace
 def generate_and_persist_registry(
     context: OpExecutionContext,
@@ -149,6 +270,9 @@ def generate_and_persist_registry(
 ) -> Output[ConnectorRegistryV0]:
     """Generate the selected registry from the metadata files, and persist it to GCS.
 
+    The registry is generated incrementally: entries generated from the same inputs as in the last generated registry
+    are read back from their JSON, only the new or changed entries are enriched.
+
     Args:
         context (OpExecutionContext): The execution context.
         registry_entry_file_blobs (storage.Blob): The registry entries.
@@ -163,7 +287,11 @@ def generate_and_persist_registry(
         f"Generating {registry_name} registry...",
     )
 
-    registry_dict = {"sources": [], "destinations": []}
+    registry_entries = {"sources": [], "destinations": []}
+    registry_entry_jsons = {"sources": [], "destinations": []}
+    previous_registry_state = load_registry_state(context, registry_name)
+    registry_state: RegistryState = {}
+    changed_entries_count = 0
 
     docker_repository_to_rc_registry_entry = {
         release_candidate_registry_entries.dockerRepository: release_candidate_registry_entries
@@ -174,20 +302,50 @@ def generate_and_persist_registry(
         connector_type = get_connector_type_from_registry_entry(latest_registry_entry)
         plural_connector_type = f"{connector_type.value}s"
 
+        registry_entry_id = str(getattr(latest_registry_entry, ConnectorTypePrimaryKey[connector_type.value].value))
+        registry_entry_key = f"{connector_type.value}/{registry_entry_id}"
+
         # We sanitize the registry entry to ensure its in a format
         # that can be parsed by pydantic.
-        registry_entry_dict = to_json_sanitized_dict(latest_registry_entry)
-        enriched_registry_entry_dict = apply_metrics_to_registry_entry(registry_entry_dict, connector_type, latest_connector_metrics)
-        enriched_registry_entry_dict = apply_release_candidate_entries(enriched_registry_entry_dict, docker_repository_to_rc_registry_entry)
-
-        registry_dict[plural_connector_type].append(enriched_registry_entry_dict)
-
-    registry_model = ConnectorRegistryV0.parse_obj(registry_dict)
-
-    file_handle = persist_registry_to_json(registry_model, registry_name, registry_directory_manager)
+        sanitized_registry_entry_json = to_json(latest_registry_entry)
+        registry_entry_hash = get_registry_entry_hash(
+            sanitized_registry_entry_json,
+            latest_connector_metrics.get(registry_entry_id, {}),
+            docker_repository_to_rc_registry_entry.get(latest_registry_entry.dockerRepository),
+        )
+
+        previous_entry_state = previous_registry_state.get(registry_entry_key)
+        if previous_entry_state and previous_entry_state[0] == registry_entry_hash:
+            registry_entry_json = previous_entry_state[1]
+            registry_entry = REGISTRY_ENTRY_MODELS[connector_type].parse_raw(registry_entry_json)
+        else:
+            registry_entry_dict = json.loads(sanitized_registry_entry_json)
+            enriched_registry_entry_dict = apply_metrics_to_registry_entry(registry_entry_dict, connector_type, latest_connector_metrics)
+            enriched_registry_entry_dict = apply_release_candidate_entries(
+                enriched_registry_entry_dict, docker_repository_to_rc_registry_entry
+            )
+            registry_entry = REGISTRY_ENTRY_MODELS[connector_type].parse_obj(enriched_registry_entry_dict)
+            registry_entry_json = registry_entry.json(exclude_none=True)
+            changed_entries_count += 1
+
+        registry_state[registry_entry_key] = (registry_entry_hash, registry_entry_json)
+        registry_entries[plural_connector_type].append(registry_entry)
+        registry_entry_jsons[plural_connector_type].append(registry_entry_json)
+
+    # The entries are already validated, building the registry model from them only copies them
+    registry_model = ConnectorRegistryV0(**registry_entries)
+
+    file_handle = persist_registry_to_json(
+        registry_model, registry_name, registry_directory_manager, registry_json=get_registry_json(registry_entry_jsons)
+    )
+    removed_entries_count = len(previous_registry_state.keys() - registry_state.keys())
+    if changed_entries_count or removed_entries_count:
+        save_registry_state(context, registry_name, registry_state)
 
     metadata = {
         "gcs_path": MetadataValue.url(file_handle.public_url),
+        "changed_entries_count": changed_entries_count,
+        "removed_entries_count": removed_entries_count,
     }
 
     PublishConnectorLifecycle.log(
@@ -285,16 +443,14 @@ def latest_oss_registry(_context: OpExecutionContext, latest_oss_registry_dict:
 @asset(required_resource_keys={"latest_cloud_registry_gcs_blob"}, group_name=GROUP_NAME)
 @sentry.instrument_asset_op
 def latest_cloud_registry_dict(context: OpExecutionContext) -> dict:
-    oss_registry_file = context.resources.latest_cloud_registry_gcs_blob
-    json_string = oss_registry_file.download_as_string().decode("utf-8")
-    oss_registry_dict = json.loads(json_string)
-    return oss_registry_dict
+    cloud_registry_file = context.resources.latest_cloud_registry_gcs_blob
+    cloud_registry_dict = json.loads(download_blob_with_cache(cloud_registry_file))
+    return cloud_registry_dict
 
 
 @asset(required_resource_keys={"latest_oss_registry_gcs_blob"}, group_name=GROUP_NAME)
 @sentry.instrument_asset_op
 def latest_oss_registry_dict(context: OpExecutionContext) -> dict:
     oss_registry_file = context.resources.latest_oss_registry_gcs_blob
-    json_string = oss_registry_file.download_as_string().decode("utf-8")
-    oss_registry_dict = json.loads(json_string)
+    oss_registry_dict = json.loads(download_blob_with_cache(oss_registry_file))
     return oss_registry_dict
@@ -26,7 +26,7 @@ from orchestrator.fetcher.connector_cdk_version import get_cdk_version
 from orchestrator.logging import sentry
 from orchestrator.logging.publish_connector_lifecycle import PublishConnectorLifecycle, PublishConnectorLifecycleStage, StageStatus
 from orchestrator.models.metadata import LatestMetadataEntry, MetadataDefinition
-from orchestrator.utils.blob_helpers import yaml_blob_to_dict
+from orchestrator.utils.blob_helpers import download_blobs_concurrently, yaml_blob_to_dict
 from orchestrator.utils.object_helpers import CaseInsensitveKeys, deep_copy_params, default_none_to_dict
 from pydantic import BaseModel, ValidationError
 from pydash.objects import get, set_with
@@ -308,8 +308,11 @@ def apply_entry_schema_migrations(registry_entry: dict) -> dict:
 
 @sentry_sdk.trace
 def read_registry_entry_blob(registry_entry_blob: storage.Blob) -> TaggedRegistryEntry:
-    json_string = registry_entry_blob.download_as_string().decode("utf-8")
-    registry_entry_dict = json.loads(json_string)
+    return parse_registry_entry_json(registry_entry_blob.download_as_string())
+
+
+def parse_registry_entry_json(registry_entry_json: Union[str, bytes]) -> TaggedRegistryEntry:
+    registry_entry_dict = json.loads(registry_entry_json)
 
     connector_type, ConnectorModel = get_connector_type_from_registry_entry(registry_entry_dict)
     registry_entry_dict = apply_entry_schema_migrations(registry_entry_dict)
@@ -718,8 +721,8 @@ def registry_entry(
 
 def get_registry_entries(blob_resource) -> Output[List]:
     registry_entries = []
-    for blob in blob_resource:
-        _, registry_entry = read_registry_entry_blob(blob)
+    for registry_entry_json in download_blobs_concurrently(blob_resource):
+        _, registry_entry = parse_registry_entry_json(registry_entry_json)
         registry_entries.append(registry_entry)
 
     return Output(registry_entries)
@@ -3,6 +3,7 @@
 #
 
 import os
+import tempfile
 from typing import Optional
 
 
@@ -30,6 +31,11 @@ CONNECTOR_DEPENDENCY_FILE_NAME = "dependencies.json"
 
 MAX_METADATA_PARTITION_RUN_REQUEST = 50
 
+MAX_BLOB_DOWNLOAD_WORKERS = 32
+BLOB_CACHE_DIR = os.getenv("METADATA_BLOB_CACHE_DIR", os.path.join(tempfile.gettempdir(), "metadata_blob_cache"))
+# Defaults to a directory of the dagster instance storage
+REGISTRY_STATE_DIR = os.getenv("METADATA_REGISTRY_STATE_DIR")
+
 HIGH_QUEUE_PRIORITY = "3"
 MED_QUEUE_PRIORITY = "2"
 LOW_QUEUE_PRIORITY = "1"
@@ -1,7 +1,14 @@
 # Copyright (c) 2023 Airbyte, Inc., all rights reserved.
 
+import hashlib
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Optional
+
 import yaml
 from google.cloud import storage
+from orchestrator.config import BLOB_CACHE_DIR, MAX_BLOB_DOWNLOAD_WORKERS
 
 
 def yaml_blob_to_dict(yaml_blob: storage.Blob) -> dict:
@@ -10,3 +17,86 @@ def yaml_blob_to_dict(yaml_blob: storage.Blob) -> dict:
     """
     yaml_string = yaml_blob.download_as_string().decode("utf-8")
     return yaml.safe_load(yaml_string)
+
+
+class BlobContentCache:
+    """
+    Local disk cache of GCS blob contents.
+
+    Contents are keyed on the blob name and its generation (or ETag when the generation is unknown),
+    so a blob is only downloaded again when it was overwritten in the bucket.
+    Only the latest known version of each blob is kept on disk.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = cache_dir or BLOB_CACHE_DIR
+
+    @staticmethod
+    def _get_version(blob: storage.Blob) -> Optional[str]:
+        version = blob.generation or blob.etag
+        return str(version) if version else None
+
+    def _get_blob_dir(self, blob: storage.Blob) -> str:
+        bucket_name = blob.bucket.name if blob.bucket else ""
+        return os.path.join(self.cache_dir, hashlib.sha256(f"{bucket_name}/{blob.name}".encode("utf-8")).hexdigest())
+
+    def _get_path(self, blob: storage.Blob, version: str) -> str:
+        return os.path.join(self._get_blob_dir(blob), hashlib.sha256(version.encode("utf-8")).hexdigest())
+
+    def get(self, blob: storage.Blob) -> Optional[bytes]:
+        version = self._get_version(blob)
+        if version is None:
+            return None
+        try:
+            with open(self._get_path(blob, version), "rb") as cached_file:
+                return cached_file.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, blob: storage.Blob, content: bytes) -> None:
+        version = self._get_version(blob)
+        if version is None:
+            return
+        blob_dir = self._get_blob_dir(blob)
+        os.makedirs(blob_dir, exist_ok=True)
+        path = self._get_path(blob, version)
+
+        # Write to a temporary file first so concurrent readers never see a partial file
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=blob_dir, suffix=".tmp")
+        with os.fdopen(file_descriptor, "wb") as temporary_file:
+            temporary_file.write(content)
+        os.replace(temporary_path, path)
+
+        # Evict the previous versions of the blob
+        for file_name in os.listdir(blob_dir):
+            file_path = os.path.join(blob_dir, file_name)
+            if file_path != path and not file_name.endswith(".tmp"):
+                try:
+                    os.remove(file_path)
+                except FileNotFoundError:
+                    pass
+
+
+def download_blob_with_cache(blob: storage.Blob, cache: Optional[BlobContentCache] = None) -> bytes:
+    """
+    Download the content of the given blob, reusing the locally cached content if the blob did not change.
+    """
+    cache = cache or BlobContentCache()
+    content = cache.get(blob)
+    if content is None:
+        # The download refreshes the blob generation and ETag from the response headers,
+        # so the content is cached under the version that was actually downloaded
+        content = blob.download_as_bytes()
+        cache.put(blob, content)
+    return content
+
+
+def download_blobs_concurrently(
+    blobs: Iterable[storage.Blob], cache: Optional[BlobContentCache] = None, max_workers: int = MAX_BLOB_DOWNLOAD_WORKERS
+) -> List[bytes]:
+    """
+    Download the content of the given blobs with a pool of threads, preserving the order of the blobs.
+    """
+    cache = cache or BlobContentCache()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda blob: download_blob_with_cache(blob, cache), blobs))
@@ -0,0 +1,81 @@
+#
+# Copyright (c) 2024 Airbyte, Inc., all rights reserved.
+#
+
+import json
+import threading
+from types import SimpleNamespace
+
+import pytest
+from orchestrator.assets.registry_entry import get_registry_entries
+from orchestrator.utils.blob_helpers import BlobContentCache, download_blob_with_cache, download_blobs_concurrently
+
+
+class FakeBlob:
+    """Minimal stand-in for a storage.Blob listed from a local fake bucket."""
+
+    def __init__(self, name: str, content: bytes, generation: int = 1):
+        self.bucket = SimpleNamespace(name="fake-bucket")
+        self.name = name
+        self.etag = None
+        self.generation = generation
+        self.content = content
+        self.download_count = 0
+        self._lock = threading.Lock()
+
+    def download_as_bytes(self) -> bytes:
+        with self._lock:
+            self.download_count += 1
+        return self.content
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return BlobContentCache(str(tmp_path / "blob_cache"))
+
+
+def test_download_blob_with_cache_only_downloads_new_generations(cache):
+    blob = FakeBlob("metadata/airbyte/source-faker/latest/oss.json", b"v1")
+
+    assert download_blob_with_cache(blob, cache) == b"v1"
+    assert download_blob_with_cache(blob, cache) == b"v1"
+    assert blob.download_count == 1
+
+    blob.content, blob.generation = b"v2", 2
+    assert download_blob_with_cache(blob, cache) == b"v2"
+    assert blob.download_count == 2
+
+
+def test_download_blob_without_version_is_not_cached(cache):
+    blob = FakeBlob("no_version.json", b"content", generation=None)
+
+    download_blob_with_cache(blob, cache)
+    download_blob_with_cache(blob, cache)
+    assert blob.download_count == 2
+
+
+def test_download_blobs_concurrently_preserves_order_and_reuses_cache(cache):
+    blobs = [FakeBlob(f"metadata/connector-{i}/latest/cloud.json", f"{i}".encode()) for i in range(100)]
+
+    assert download_blobs_concurrently(blobs, cache, max_workers=8) == [f"{i}".encode() for i in range(100)]
+    assert download_blobs_concurrently(blobs, cache, max_workers=8) == [f"{i}".encode() for i in range(100)]
+    assert all(blob.download_count == 1 for blob in blobs)
+
+
+def test_get_registry_entries_from_blobs(monkeypatch, tmp_path):
+    monkeypatch.setattr("orchestrator.utils.blob_helpers.BLOB_CACHE_DIR", str(tmp_path))
+    registry_entry = {
+        "sourceDefinitionId": "dfd88b22-b603-4c3d-aad7-3701784586b1",
+        "name": "Faker",
+        "dockerRepository": "airbyte/source-faker",
+        "dockerImageTag": "6.0.0",
+        "documentationUrl": "https://docs.airbyte.com/integrations/sources/faker",
+        "spec": {"connectionSpecification": {}},
+        "releases": {"isReleaseCandidate": False},
+    }
+    blobs = [FakeBlob("metadata/airbyte/source-faker/latest/oss.json", json.dumps(registry_entry).encode())]
+
+    registry_entries = get_registry_entries(blobs).value
+
+    assert [entry.dockerRepository for entry in registry_entries] == ["airbyte/source-faker"]
+    assert registry_entries[0].releases is None
@@ -3,6 +3,7 @@
 #
 
 import copy
+import json
 from unittest import mock
 from uuid import UUID
 
@@ -540,3 +541,70 @@ def test_apply_release_candidates_newer_version(mocker):
     )
     result = registry.apply_release_candidates(latest_registry_entry, rc_registry_entry)
     assert "1.1.0-rc.1" in result["releases"]["releaseCandidates"]
+
+
+def test_generate_and_persist_registry_incrementally(mocker, tmp_path, oss_registry_dict):
+    mocker.patch.object(registry, "REGISTRY_STATE_DIR", str(tmp_path))
+    mocker.patch.object(registry.PublishConnectorLifecycle, "log")
+    registry_directory_manager = mock.Mock()
+    registry_directory_manager.write_data.return_value.public_url = "https://test_registry_url.com"
+    latest_registry_entries = ConnectorRegistryV0.parse_obj(oss_registry_dict).sources
+    context = mock.Mock()
+
+    def generate_registry(latest_connector_metrics):
+        return registry.generate_and_persist_registry(
+            context=context,
+            latest_registry_entries=latest_registry_entries,
+            release_candidate_registry_entries=[],
+            registry_directory_manager=registry_directory_manager,
+            registry_name="oss",
+            latest_connector_metrics=latest_connector_metrics,
+        )
+
+    full_rebuild = generate_registry({})
+    assert full_rebuild.metadata["changed_entries_count"].value == len(latest_registry_entries)
+    full_rebuild_json = registry_directory_manager.write_data.call_args.args[0]
+    with open(tmp_path / "oss_registry_state.json") as f:
+        assert json.load(f)
+
+    changed_entry_id = str(latest_registry_entries[0].sourceDefinitionId)
+    incremental_update = generate_registry({changed_entry_id: {"all": {"usage": "high"}}})
+    assert incremental_update.metadata["changed_entries_count"].value == 1
+    assert incremental_update.value.sources[0].generated.metrics.all == {"usage": "high"}
+    assert incremental_update.value.sources[1:] == full_rebuild.value.sources[1:]
+
+    generate_registry({})
+    assert registry_directory_manager.write_data.call_args.args[0] == full_rebuild_json
+
+    latest_registry_entries = latest_registry_entries[1:]
+    assert generate_registry({}).metadata["removed_entries_count"].value == 1
+    context.log.warning.assert_not_called()
+
+
+def test_generate_and_persist_registry_ignores_invalid_state(mocker, tmp_path, oss_registry_dict):
+    mocker.patch.object(registry, "REGISTRY_STATE_DIR", str(tmp_path))
+    mocker.patch.object(registry.PublishConnectorLifecycle, "log")
+    (tmp_path / "oss_registry_state.json").write_text("not json")
+    context = mock.Mock()
+    registry_directory_manager = mock.Mock()
+    registry_directory_manager.write_data.return_value.public_url = "https://test_registry_url.com"
+    latest_registry_entries = ConnectorRegistryV0.parse_obj(oss_registry_dict).sources
+
+    output = registry.generate_and_persist_registry(
+        context=context,
+        latest_registry_entries=latest_registry_entries,
+        release_candidate_registry_entries=[],
+        registry_directory_manager=registry_directory_manager,
+        registry_name="oss",
+        latest_connector_metrics={},
+    )
+
+    assert output.metadata["changed_entries_count"].value == len(latest_registry_entries)
+    context.log.warning.assert_called_once()
+    assert len(registry.load_registry_state(context, "oss")) == len(latest_registry_entries)
+
+
+def test_registry_entry_hash_depends_on_the_code_version(mocker):
+    registry_entry_hash = registry.get_registry_entry_hash("{}", {}, None)
+    mocker.patch.object(registry, "get_registry_code_version", return_value="new code version")
+    assert registry.get_registry_entry_hash("{}", {}, None) != registry_entry_hash
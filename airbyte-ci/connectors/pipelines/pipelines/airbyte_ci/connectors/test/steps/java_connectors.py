@@ -82,12 +82,17 @@ def _get_acceptance_test_steps(context: ConnectorTestContext) -> List[StepToRun]
     Generate the steps to run the acceptance tests for a Java connector.
     """
 
+    # The tests run against the connector image loaded to the docker host, and the normalization image when supported
+    dependencies = [CONNECTOR_TEST_STEP_ID.BUILD, CONNECTOR_TEST_STEP_ID.LOAD_IMAGE_TO_LOCAL_DOCKER_HOST]
+    if context.connector.supports_normalization:
+        dependencies.append(CONNECTOR_TEST_STEP_ID.BUILD_NORMALIZATION)
+
     # Run tests in parallel
     return [
         StepToRun(
             id=CONNECTOR_TEST_STEP_ID.INTEGRATION,
             step=IntegrationTests(context, secrets=context.get_secrets_for_step_id(CONNECTOR_TEST_STEP_ID.INTEGRATION)),
-            depends_on=[CONNECTOR_TEST_STEP_ID.BUILD],
+            depends_on=dependencies,
         ),
         StepToRun(
             id=CONNECTOR_TEST_STEP_ID.ACCEPTANCE,
@@ -95,7 +100,7 @@ def _get_acceptance_test_steps(context: ConnectorTestContext) -> List[StepToRun]
                 context, secrets=context.get_secrets_for_step_id(CONNECTOR_TEST_STEP_ID.ACCEPTANCE), concurrent_test_run=False
             ),
             args=lambda results: {"connector_under_test_container": results[CONNECTOR_TEST_STEP_ID.BUILD].output[LOCAL_BUILD_PLATFORM]},
-            depends_on=[CONNECTOR_TEST_STEP_ID.BUILD],
+            depends_on=dependencies,
         ),
     ]
 
@@ -6,12 +6,14 @@
 
 from __future__ import annotations
 
+import heapq
 import inspect
+import json
+import time
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple, Union
 
 import anyio
-import asyncer
 import dpath
 
 from pipelines import main_logger
@@ -84,6 +86,8 @@ class RunStepOptions:
     log_step_tree: bool = True
     concurrency: int = 10
     step_params: Dict[CONNECTOR_TEST_STEP_ID, STEP_PARAMS] = field(default_factory=dict)
+    # Path of a Chrome trace event file to write the step execution timeline to
+    trace_path: Optional[str] = None
 
     def __post_init__(self) -> None:
         if self.skip_steps and self.keep_steps:
@@ -146,23 +150,6 @@ async def evaluate_run_args(args: ARGS_TYPE, results: RESULTS_DICT) -> Dict:
     raise TypeError(f"Unexpected args type: {type(args)}")
 
 
-def _skip_remaining_steps(remaining_steps: STEP_TREE) -> RESULTS_DICT:
-    """
-    Skip all remaining steps.
-    """
-    skipped_results: Dict[str, StepResult] = {}
-    for runnable_step in remaining_steps:
-        if isinstance(runnable_step, StepToRun):
-            skipped_results[runnable_step.id] = runnable_step.step.skip()
-        elif isinstance(runnable_step, list):
-            nested_skipped_results = _skip_remaining_steps(list(runnable_step))
-            skipped_results = {**skipped_results, **nested_skipped_results}
-        else:
-            raise Exception(f"Unexpected step type: {type(runnable_step)}")
-
-    return skipped_results
-
-
 def _step_dependencies_succeeded(step_to_eval: StepToRun, results: RESULTS_DICT) -> bool:
     """
     Check if all dependencies of a step have succeeded.
@@ -184,37 +171,6 @@ def _step_dependencies_succeeded(step_to_eval: StepToRun, results: RESULTS_DICT)
     )
 
 
-def _filter_skipped_steps(steps_to_evaluate: STEP_TREE, skip_steps: List[str], results: RESULTS_DICT) -> Tuple[STEP_TREE, RESULTS_DICT]:
-    """
-    Filter out steps that should be skipped.
-
-    Either because they are in the skip list or because one of their dependencies failed.
-    """
-    steps_to_run: STEP_TREE = []
-    for step_to_eval in steps_to_evaluate:
-        # ignore nested steps
-        if isinstance(step_to_eval, list):
-            steps_to_run.append(step_to_eval)
-            continue
-
-        # skip step if its id is in the skip list
-        if step_to_eval.id in skip_steps:
-            main_logger.info(f"Skipping step {step_to_eval.id}")
-            results[step_to_eval.id] = step_to_eval.step.skip("Skipped by user")
-
-        # skip step if a dependency failed
-        elif not _step_dependencies_succeeded(step_to_eval, results):
-            main_logger.info(
-                f"Skipping step {step_to_eval.id} because one of the dependencies have not been met: {step_to_eval.depends_on}"
-            )
-            results[step_to_eval.id] = step_to_eval.step.skip("Skipped because a dependency was not met")
-
-        else:
-            steps_to_run.append(step_to_eval)
-
-    return steps_to_run, results
-
-
 def _get_next_step_group(steps: STEP_TREE) -> Tuple[STEP_TREE, STEP_TREE]:
     """
     Get the next group of steps to run concurrently.
@@ -253,6 +209,138 @@ def _log_step_tree(step_tree: STEP_TREE, options: RunStepOptions, depth: int = 0
                 main_logger.info(f"{indent * depth}- {steps.id}")
 
 
+@dataclass
+class _ScheduledStep:
+    """A step of the step tree, as a node of the dependency graph used by the scheduler."""
+
+    index: int
+    step_to_run: StepToRun
+    # Steps which run before this one according to the step tree ordering
+    predecessors: Set[int]
+    # Steps which must be resolved before this one can start
+    waits_for: Set[int] = field(default_factory=set)
+    dependents: Set[int] = field(default_factory=set)
+    # Length of the longest chain of steps waiting on this one
+    critical_path_length: int = 1
+    ready_at: Optional[float] = None
+    started_at: Optional[float] = None
+    stopped_at: Optional[float] = None
+
+
+def _compile_step_graph(steps: STEP_TREE, predecessors: Set[int], graph: List[_ScheduledStep]) -> Set[int]:
+    """
+    Flatten a step tree into graph nodes, following the same grouping rules as the step tree execution order.
+
+    Returns:
+        Set[int]: The indexes of the nodes added for this step tree.
+    """
+    step_group, remaining_steps = _get_next_step_group(steps)
+    group_indexes: Set[int] = set()
+    for step in step_group:
+        if isinstance(step, list):
+            group_indexes |= _compile_step_graph(list(step), predecessors, graph)
+        elif isinstance(step, StepToRun):
+            graph.append(_ScheduledStep(index=len(graph), step_to_run=step, predecessors=set(predecessors)))
+            group_indexes.add(len(graph) - 1)
+        else:
+            raise Exception(f"Unexpected step type: {type(step)}")
+
+    if remaining_steps:
+        group_indexes |= _compile_step_graph(remaining_steps, predecessors | group_indexes, graph)
+    return group_indexes
+
+
+def _get_step_graph(runnables: STEP_TREE, results: RESULTS_DICT, fail_fast: bool = False) -> List[_ScheduledStep]:
+    """
+    Build the dependency graph of a step tree.
+
+    A step declaring depends_on only waits for these dependencies, a step without depends_on waits for all the steps preceding it in the step tree.
+    With fail_fast, every step waits for all the steps preceding it in the step tree, so that it is skipped when one of them fails.
+    """
+    graph: List[_ScheduledStep] = []
+    _compile_step_graph(runnables, set(), graph)
+
+    for node in graph:
+        if not node.step_to_run.depends_on:
+            node.waits_for = set(node.predecessors)
+            continue
+        for step_id in node.step_to_run.depends_on:
+            dependency_indexes = {index for index in node.predecessors if graph[index].step_to_run.id == step_id}
+            if not dependency_indexes and step_id not in results:
+                raise InvalidStepConfiguration(
+                    f"Step {node.step_to_run.id} depends on {step_id} which has not been run yet. This implies that the order of the steps is not correct. Please check that the steps are in the correct order."
+                )
+            node.waits_for |= dependency_indexes
+
+    # The critical paths follow the declared dependencies, fail fast only delays steps until the previous ones are resolved
+    declared_dependents: Dict[int, Set[int]] = {node.index: set() for node in graph}
+    for node in graph:
+        for index in node.waits_for:
+            declared_dependents[index].add(node.index)
+    # Nodes only wait for nodes with a lower index, so a reverse pass sees the dependents of a node before the node itself
+    for node in reversed(graph):
+        node.critical_path_length = 1 + max((graph[index].critical_path_length for index in declared_dependents[node.index]), default=0)
+
+    for node in graph:
+        if fail_fast:
+            node.waits_for |= node.predecessors
+        for index in node.waits_for:
+            graph[index].dependents.add(node.index)
+    return graph
+
+
+def _log_step_timeline(graph: List[_ScheduledStep], width: int = 50) -> None:
+    """
+    Log a Gantt chart of the step executions to the console.
+
+    e.g.
+    STEP TIMELINE (total 120.00s)
+    build          |██████████                                        | waited   0.00s, ran  24.10s
+    unit           |          ██████████████████                      | waited   0.00s, ran  43.50s
+    integration    |          ████████████████████████████████████████| waited   0.00s, ran  96.20s
+    """
+    executed_nodes = [node for node in graph if node.started_at is not None and node.stopped_at is not None]
+    if not executed_nodes:
+        return
+    total_duration = max(node.stopped_at for node in executed_nodes) or 1.0  # type: ignore
+    id_width = max(len(str(node.step_to_run.id)) for node in executed_nodes)
+    main_logger.info(f"STEP TIMELINE (total {total_duration:.2f}s)")
+    for node in executed_nodes:
+        assert node.started_at is not None and node.stopped_at is not None and node.ready_at is not None
+        bar_start = int(node.started_at / total_duration * width)
+        bar_end = max(int(node.stopped_at / total_duration * width), bar_start + 1)
+        bar = (" " * bar_start + "█" * (bar_end - bar_start)).ljust(width)[:width]
+        main_logger.info(
+            f"{str(node.step_to_run.id):<{id_width}} |{bar}| waited {node.started_at - node.ready_at:>7.2f}s, ran {node.stopped_at - node.started_at:>7.2f}s"
+        )
+
+
+def _write_step_trace(graph: List[_ScheduledStep], trace_path: str) -> None:
+    """
+    Write the step executions to a file in the Chrome trace event format, which can be loaded in chrome://tracing or Perfetto.
+    """
+    trace_events = []
+    for node in graph:
+        if node.started_at is None or node.stopped_at is None or node.ready_at is None:
+            continue
+        step_id = str(node.step_to_run.id)
+        trace_events.append(
+            {
+                "name": step_id,
+                "ph": "X",
+                "ts": int(node.started_at * 1_000_000),
+                "dur": int((node.stopped_at - node.started_at) * 1_000_000),
+                "pid": 0,
+                "tid": node.index,
+                "args": {"waited_for_slot_seconds": round(node.started_at - node.ready_at, 3)},
+            }
+        )
+        trace_events.append({"name": "thread_name", "ph": "M", "pid": 0, "tid": node.index, "args": {"name": step_id}})
+
+    with open(trace_path, "w") as trace_file:
+        json.dump({"traceEvents": trace_events, "displayTimeUnit": "ms"}, trace_file)
+
+
 async def run_steps(
     runnables: STEP_TREE,
     results: RESULTS_DICT = {},
@@ -260,6 +348,14 @@ async def run_steps(
 ) -> RESULTS_DICT:
     """Run multiple steps sequentially, or in parallel if steps are wrapped into a sublist.
 
+    The step tree is compiled into a dependency graph and each step starts as soon as the steps it waits for are resolved:
+    - a step declaring depends_on only waits for these dependencies, which must precede it in the step tree.
+    - a step without depends_on waits for all the steps preceding it in the step tree.
+    - if fail_fast is enabled, every step waits for all the steps preceding it in the step tree.
+    At most options.concurrency steps run at the same time. When more steps are ready than available slots,
+    steps with the longest chain of dependents start first.
+    If fail_fast is enabled, a step is skipped when one of the steps preceding it in the step tree has failed.
+
     Examples
     --------
     >>> from pipelines.models.steps import Step, StepResult, StepStatus
@@ -287,7 +383,7 @@ async def run_steps(
 
     Args:
         runnables (List[StepToRun]): List of steps to run.
-        results (RESULTS_DICT, optional): Dictionary of step results, used for recursion.
+        results (RESULTS_DICT, optional): Dictionary of results of steps which already ran.
 
     Returns:
         RESULTS_DICT: Dictionary of step results.
@@ -303,43 +399,86 @@ async def run_steps(
         _log_step_tree(runnables, options)
         options.log_step_tree = False
 
-    # If any of the previous steps failed, skip the remaining steps
-    if options.fail_fast and any(result.status is StepStatus.FAILURE and result.consider_in_overall_status for result in results.values()):
-        skipped_results = _skip_remaining_steps(runnables)
-        return {**results, **skipped_results}
-
-    # Pop the next step to run
-    steps_to_evaluate, remaining_steps = _get_next_step_group(runnables)
-
-    # Remove any skipped steps
-    steps_to_run, results = _filter_skipped_steps(steps_to_evaluate, step_ids_to_skip, results)
-
-    # Run all steps in list concurrently
-    semaphore = anyio.Semaphore(options.concurrency)
-    async with semaphore:
-        async with asyncer.create_task_group() as task_group:
-            tasks = []
-            for step_to_run in steps_to_run:
-                # if the step to run is a list, run it in parallel
-                if isinstance(step_to_run, list):
-                    tasks.append(task_group.soonify(run_steps)(list(step_to_run), results, options))
-                else:
-                    step_args = await evaluate_run_args(step_to_run.args, results)
-                    step_to_run.step.extra_params = options.step_params.get(step_to_run.id, {})
-                    main_logger.info(f"QUEUING STEP {step_to_run.id}")
-                    tasks.append(task_group.soonify(step_to_run.step.run)(**step_args))
-
-    # Apply new results
-    new_results: Dict[str, Any] = {}
-    for i, task in enumerate(tasks):
-        step_to_run = steps_to_run[i]
-        if isinstance(step_to_run, list):
-            new_results = {**new_results, **task.value}
+    initial_results = results
+    results = dict(results)
+    graph = _get_step_graph(runnables, results, fail_fast=options.fail_fast)
+    previous_results_failed = any(result.status is StepStatus.FAILURE and result.consider_in_overall_status for result in results.values())
+    remaining_dependencies = {node.index: len(node.waits_for) for node in graph}
+    ready_queue: List[Tuple[int, int]] = []
+    failed_indexes: Set[int] = set()
+    resolved_count = 0
+    running_count = 0
+    start_time = time.monotonic()
+    send_stream, receive_stream = anyio.create_memory_object_stream(len(graph))
+
+    def get_skip_result(node: _ScheduledStep) -> Optional[StepResult]:
+        step_to_run = node.step_to_run
+        # If any of the previous steps failed, skip the step
+        if options.fail_fast and (previous_results_failed or node.predecessors & failed_indexes):
+            return step_to_run.step.skip()
+        if step_to_run.id in step_ids_to_skip:
+            main_logger.info(f"Skipping step {step_to_run.id}")
+            return step_to_run.step.skip("Skipped by user")
+        if not _step_dependencies_succeeded(step_to_run, results):
+            main_logger.info(f"Skipping step {step_to_run.id} because one of the dependencies have not been met: {step_to_run.depends_on}")
+            return step_to_run.step.skip("Skipped because a dependency was not met")
+        return None
+
+    def resolve(node: _ScheduledStep, result: StepResult) -> None:
+        nonlocal resolved_count
+        results[node.step_to_run.id] = result
+        resolved_count += 1
+        if result.status is StepStatus.FAILURE and result.consider_in_overall_status:
+            failed_indexes.add(node.index)
+        for index in sorted(node.dependents):
+            remaining_dependencies[index] -= 1
+            if remaining_dependencies[index] == 0:
+                enqueue(graph[index])
+
+    def enqueue(node: _ScheduledStep) -> None:
+        # Skipped steps are resolved right away, they don't take an execution slot
+        skip_result = get_skip_result(node)
+        if skip_result is not None:
+            resolve(node, skip_result)
         else:
-            new_results[step_to_run.id] = task.value
-
-    return await run_steps(
-        runnables=remaining_steps,
-        results={**results, **new_results},
-        options=options,
-    )
+            node.ready_at = time.monotonic() - start_time
+            heapq.heappush(ready_queue, (-node.critical_path_length, node.index))
+
+    async def run_step(node: _ScheduledStep) -> None:
+        step_to_run = node.step_to_run
+        step_args = await evaluate_run_args(step_to_run.args, results)
+        step_to_run.step.extra_params = options.step_params.get(step_to_run.id, {})
+        main_logger.info(f"STARTING STEP {step_to_run.id}")
+        node.started_at = time.monotonic() - start_time
+        results[step_to_run.id] = await step_to_run.step.run(**step_args)
+        node.stopped_at = time.monotonic() - start_time
+        await send_stream.send(node.index)
+
+    for node in graph:
+        if not node.waits_for:
+            enqueue(node)
+
+    async with send_stream, receive_stream:
+        async with anyio.create_task_group() as task_group:
+            while resolved_count < len(graph):
+                while ready_queue and running_count < options.concurrency:
+                    node = graph[heapq.heappop(ready_queue)[1]]
+                    # A failure may have happened while the step was waiting for an execution slot
+                    if options.fail_fast and node.predecessors & failed_indexes:
+                        resolve(node, node.step_to_run.step.skip())
+                        continue
+                    main_logger.info(f"QUEUING STEP {node.step_to_run.id}")
+                    running_count += 1
+                    task_group.start_soon(run_step, node)
+                if resolved_count == len(graph):
+                    break
+                finished_node = graph[await receive_stream.receive()]
+                running_count -= 1
+                resolve(finished_node, results[finished_node.step_to_run.id])
+
+    _log_step_timeline(graph)
+    if options.trace_path:
+        _write_step_trace(graph, options.trace_path)
+
+    # Preserve the step tree order in the returned results
+    return {**initial_results, **{node.step_to_run.id: results[node.step_to_run.id] for node in graph}}
@@ -1,5 +1,6 @@
 # Copyright (c) 2023 Airbyte, Inc., all rights reserved.
 
+import json
 import time
 
 import anyio
@@ -338,6 +339,135 @@ async def test_run_steps_passes_results():
     assert results["step3"].output == "1:2:3:4"
 
 
+@pytest.mark.anyio
+async def test_run_steps_starts_steps_when_dependencies_are_resolved():
+    ran_at = {}
+
+    class SleepStep(Step):
+        title = "Sleep Step"
+
+        async def _run(self, name, sleep) -> StepResult:
+            await anyio.sleep(sleep)
+            ran_at[name] = time.time()
+            return StepResult(step=self, status=StepStatus.SUCCESS)
+
+    steps = [
+        [StepToRun(id="build", step=SleepStep(test_context), args={"name": "build", "sleep": 0})],
+        [
+            StepToRun(id="unit", step=SleepStep(test_context), args={"name": "unit", "sleep": 3}, depends_on=["build"]),
+            StepToRun(id="load", step=SleepStep(test_context), args={"name": "load", "sleep": 0}, depends_on=["build"]),
+        ],
+        [StepToRun(id="acceptance", step=SleepStep(test_context), args={"name": "acceptance", "sleep": 0}, depends_on=["load"])],
+        [StepToRun(id="report", step=SleepStep(test_context), args={"name": "report", "sleep": 0})],
+    ]
+
+    results = await run_steps(steps, options=RunStepOptions(fail_fast=False))
+
+    # acceptance only waits for its dependency, report waits for all the previous steps
+    assert ran_at["acceptance"] < ran_at["unit"]
+    assert ran_at["unit"] < ran_at["report"]
+    assert list(results.keys()) == ["build", "unit", "load", "acceptance", "report"]
+
+
+@pytest.mark.anyio
+async def test_run_steps_fail_fast_skips_dependents_of_a_sibling_step_failure():
+    class SleepStep(Step):
+        title = "Sleep Step"
+
+        async def _run(self, sleep, result_status=StepStatus.SUCCESS) -> StepResult:
+            await anyio.sleep(sleep)
+            return StepResult(step=self, status=result_status)
+
+    steps = [
+        [StepToRun(id="build", step=SleepStep(test_context), args={"sleep": 0})],
+        [
+            StepToRun(
+                id="unit",
+                step=SleepStep(test_context),
+                args={"sleep": 0.5, "result_status": StepStatus.FAILURE},
+                depends_on=["build"],
+            ),
+            StepToRun(id="load", step=SleepStep(test_context), args={"sleep": 0}, depends_on=["build"]),
+        ],
+        [StepToRun(id="acceptance", step=SleepStep(test_context), args={"sleep": 0}, depends_on=["load"])],
+    ]
+
+    results = await run_steps(steps, options=RunStepOptions(fail_fast=True))
+
+    # acceptance only depends on load, but waits for the unit step failure to be skipped
+    assert results["unit"].status is StepStatus.FAILURE
+    assert results["load"].status is StepStatus.SUCCESS
+    assert results["acceptance"].status is StepStatus.SKIPPED
+
+
+@pytest.mark.anyio
+async def test_run_steps_limits_concurrency_per_step():
+    running = 0
+    max_running = 0
+
+    class CountingStep(Step):
+        title = "Counting Step"
+
+        async def _run(self) -> StepResult:
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await anyio.sleep(0.1)
+            running -= 1
+            return StepResult(step=self, status=StepStatus.SUCCESS)
+
+    steps = [
+        [StepToRun(id=f"step{i}", step=CountingStep(test_context)) for i in range(4)],
+        [[StepToRun(id=f"nested_step{i}", step=CountingStep(test_context)) for i in range(4)]],
+    ]
+
+    results = await run_steps(steps, options=RunStepOptions(concurrency=2))
+
+    assert max_running == 2
+    assert all(result.status is StepStatus.SUCCESS for result in results.values())
+
+
+@pytest.mark.anyio
+async def test_run_steps_prioritizes_critical_path():
+    started = []
+
+    class RecordingStep(Step):
+        title = "Recording Step"
+
+        async def _run(self, name) -> StepResult:
+            started.append(name)
+            await anyio.sleep(0)
+            return StepResult(step=self, status=StepStatus.SUCCESS)
+
+    steps = [
+        [
+            StepToRun(id="leaf", step=RecordingStep(test_context), args={"name": "leaf"}),
+            StepToRun(id="root", step=RecordingStep(test_context), args={"name": "root"}),
+        ],
+        [StepToRun(id="child", step=RecordingStep(test_context), args={"name": "child"}, depends_on=["root"])],
+    ]
+
+    await run_steps(steps, options=RunStepOptions(concurrency=1))
+
+    # root starts first as child is waiting on it
+    assert started[0] == "root"
+
+
+@pytest.mark.anyio
+async def test_run_steps_writes_trace(tmp_path):
+    trace_path = tmp_path / "trace.json"
+    steps = [
+        [StepToRun(id="step1", step=TestStep(test_context))],
+        [StepToRun(id="step2", step=TestStep(test_context), args={"result_status": StepStatus.FAILURE})],
+        [StepToRun(id="step3", step=TestStep(test_context))],
+    ]
+
+    await run_steps(steps, options=RunStepOptions(trace_path=str(trace_path)))
+
+    trace = json.loads(trace_path.read_text())
+    assert [event["name"] for event in trace["traceEvents"] if event["ph"] == "X"] == ["step1", "step2"]
+
+
 @pytest.mark.anyio
 @pytest.mark.parametrize(
     "invalid_args",
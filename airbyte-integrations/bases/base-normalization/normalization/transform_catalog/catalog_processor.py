@@ -3,10 +3,14 @@
 #
 
 
+import glob
+import hashlib
 import json
 import os
 import re
-from typing import Any, Dict, List, Set
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Any, Dict, List, Set, Tuple
 
 import yaml
 from airbyte_cdk.models.airbyte_protocol import DestinationSyncMode, SyncMode  # type: ignore
@@ -16,6 +20,11 @@ from normalization.transform_catalog.destination_name_transformer import Destina
 from normalization.transform_catalog.stream_processor import StreamProcessor
 from normalization.transform_catalog.table_name_registry import TableNameRegistry
 
+# File recording the hash of the inputs used to generate the models of each stream during the previous run
+MANIFEST_FILE_NAME = ".normalization_manifest.json"
+# Below this number of streams to generate, the cost of starting worker processes outweighs the parallel processing
+MIN_STREAMS_FOR_PARALLEL_PROCESSING = 50
+
 
 class CatalogProcessor:
     """
@@ -28,20 +37,25 @@ class CatalogProcessor:
     This is relying on a StreamProcessor to handle the conversion of a stream to a table one at a time.
     """
 
-    def __init__(self, output_directory: str, destination_type: DestinationType):
+    def __init__(self, output_directory: str, destination_type: DestinationType, max_workers: int = os.cpu_count() or 1):
         """
         @param output_directory is the path to the directory where this processor should write the resulting SQL files (DBT models)
         @param destination_type is the destination type of warehouse
+        @param max_workers is the maximum number of processes used to generate the models of the streams in parallel
         """
         self.output_directory: str = output_directory
         self.destination_type: DestinationType = destination_type
         self.name_transformer: DestinationNameTransformer = DestinationNameTransformer(destination_type)
         self.models_to_source: Dict[str, str] = {}
+        self.max_workers: int = max_workers
 
     def process(self, catalog_file: str, json_column_name: str, default_schema: str):
         """
         This method first parse and build models to handle top-level streams.
-        In a second loop will go over the substreams that were nested in a breadth-first traversal manner.
+        Each top-level stream then goes over its substreams that were nested in a breadth-first traversal manner.
+
+        The models of a top-level stream (and of its substreams) are only generated again when the stream, its resolved table names
+        or the normalization code changed since the previous run recorded in the manifest of the output directory.
 
         @param catalog_file input AirbyteCatalog file in JSON Schema describing the structure of the raw data
         @param json_column_name is the column name containing the JSON Blob with the raw data
@@ -51,7 +65,6 @@ class CatalogProcessor:
         schema_to_source_tables: Dict[str, Set[str]] = {}
         catalog = read_json(catalog_file)
         # print(json.dumps(catalog, separators=(",", ":")))
-        substreams = []
         stream_processors = self.build_stream_processor(
             catalog=catalog,
             json_column_name=json_column_name,
@@ -67,6 +80,10 @@ class CatalogProcessor:
                 f"WARN: Resolving conflict: {conflict.schema}.{conflict.table_name_conflict} "
                 f"from '{'.'.join(conflict.json_path)}' into {conflict.table_name_resolved}"
             )
+        resolved_names = get_resolved_names_by_stream(tables_registry)
+        previous_manifest = self.read_manifest()
+        manifest: Dict[str, Dict] = {}
+        streams_to_process: List[Tuple[str, str, StreamProcessor]] = []
         for stream_processor in stream_processors:
             # MySQL table names need to be manually truncated, because it does not do it automatically
             truncate = (
@@ -77,15 +94,52 @@ class CatalogProcessor:
             raw_table_name = self.name_transformer.normalize_table_name(f"_airbyte_raw_{stream_processor.stream_name}", truncate=truncate)
             add_table_to_sources(schema_to_source_tables, stream_processor.schema, raw_table_name)
 
-            nested_processors = stream_processor.process()
-            self.models_to_source.update(stream_processor.models_to_source)
-
-            if nested_processors and len(nested_processors) > 0:
-                substreams += nested_processors
-            for file in stream_processor.sql_outputs:
-                output_sql_file(os.path.join(self.output_directory, file), stream_processor.sql_outputs[file])
+            stream_key = f"{stream_processor.schema}.{stream_processor.stream_name}"
+            stream_hash = get_stream_hash(stream_processor, resolved_names.get(stream_processor.stream_name, []))
+            previous_entry = previous_manifest.get(stream_key)
+            if (
+                previous_entry
+                and previous_entry["hash"] == stream_hash
+                and all(os.path.exists(os.path.join(self.output_directory, file)) for file in previous_entry["files"])
+            ):
+                print(f"  Reusing models of stream '{stream_processor.stream_name}' generated by a previous run")
+                self.models_to_source.update(previous_entry["models_to_source"])
+                manifest[stream_key] = previous_entry
+            else:
+                streams_to_process.append((stream_key, stream_hash, stream_processor))
+
+        stream_outputs = self.process_streams([stream_processor for _, _, stream_processor in streams_to_process])
+        for (stream_key, stream_hash, _), (sql_outputs, models_to_source) in zip(streams_to_process, stream_outputs):
+            self.models_to_source.update(models_to_source)
+            for file in sql_outputs:
+                output_sql_file(os.path.join(self.output_directory, file), sql_outputs[file])
+            manifest[stream_key] = {"hash": stream_hash, "files": sorted(sql_outputs), "models_to_source": models_to_source}
+
+        # Remove the models of streams which are not part of the catalog anymore
+        generated_files = {file for entry in manifest.values() for file in entry["files"]}
+        for previous_entry in previous_manifest.values():
+            for file in previous_entry["files"]:
+                if file not in generated_files and os.path.exists(os.path.join(self.output_directory, file)):
+                    os.remove(os.path.join(self.output_directory, file))
         self.write_yaml_sources_file(schema_to_source_tables)
-        self.process_substreams(substreams, tables_registry)
+        self.write_manifest(manifest)
+
+    def process_streams(self, stream_processors: List[StreamProcessor]) -> List[Tuple[Dict[str, str], Dict[str, str]]]:
+        """
+        Generate the models of the top-level streams and of their substreams, using multiple processes for large catalogs.
+
+        @return the generated SQL files and models_to_source mapping of each stream, in the same order as the stream processors
+        """
+        if self.max_workers <= 1 or len(stream_processors) < MIN_STREAMS_FOR_PARALLEL_PROCESSING:
+            return process_stream_trees(stream_processors)
+        # Streams are dispatched in a few large batches, so the tables registry shared by the stream processors is only pickled once per batch
+        batches = [stream_processors[i :: self.max_workers] for i in range(self.max_workers)]
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            batch_outputs = list(executor.map(process_stream_trees, batches))
+        result: List[Tuple[Dict[str, str], Dict[str, str]]] = [({}, {})] * len(stream_processors)
+        for i, outputs in enumerate(batch_outputs):
+            result[i :: self.max_workers] = outputs
+        return result
 
     @staticmethod
     def build_stream_processor(
@@ -165,21 +219,27 @@ class CatalogProcessor:
             result.append(stream_processor)
         return result
 
-    def process_substreams(self, substreams: List[StreamProcessor], tables_registry: TableNameRegistry):
+    def read_manifest(self) -> Dict[str, Dict]:
         """
-        Handle nested stream/substream/children
+        Read the manifest of the models generated by the previous run, if any
         """
-        while substreams:
-            children = substreams
-            substreams = []
-            for substream in children:
-                substream.tables_registry = tables_registry
-                nested_processors = substream.process()
-                self.models_to_source.update(substream.models_to_source)
-                if nested_processors:
-                    substreams += nested_processors
-                for file in substream.sql_outputs:
-                    output_sql_file(os.path.join(self.output_directory, file), substream.sql_outputs[file])
+        manifest_path = os.path.join(self.output_directory, MANIFEST_FILE_NAME)
+        if not os.path.exists(manifest_path):
+            return {}
+        try:
+            return read_json(manifest_path)
+        except ValueError as e:
+            print(f"WARN: Ignoring invalid manifest {manifest_path}: {e}")
+            return {}
+
+    def write_manifest(self, manifest: Dict[str, Dict]):
+        """
+        Record the hash of the inputs and the generated files of each stream, to skip unchanged streams in the next run
+        """
+        if not os.path.exists(self.output_directory):
+            os.makedirs(self.output_directory)
+        with open(os.path.join(self.output_directory, MANIFEST_FILE_NAME), "w") as fh:
+            json.dump(manifest, fh, indent=2, sort_keys=True)
 
     def write_yaml_sources_file(self, schema_to_source_tables: Dict[str, Set[str]]):
         """
@@ -284,6 +344,80 @@ def add_table_to_sources(schema_to_source_tables: Dict[str, Set[str]], schema_na
         raise KeyError(f"Duplicate table {table_name} in {schema_name}")
 
 
+def process_stream_trees(stream_processors: List[StreamProcessor]) -> List[Tuple[Dict[str, str], Dict[str, str]]]:
+    """
+    Generate the models of top-level streams and of their substreams (nested in a breadth-first traversal manner).
+    This is run in worker processes so it only returns picklable outputs.
+
+    @return the generated SQL files and models_to_source mapping of each stream
+    """
+    result = []
+    for stream_processor in stream_processors:
+        sql_outputs: Dict[str, str] = {}
+        models_to_source: Dict[str, str] = {}
+        children = [stream_processor]
+        while children:
+            substreams = []
+            for substream in children:
+                nested_processors = substream.process()
+                sql_outputs.update(substream.sql_outputs)
+                models_to_source.update(substream.models_to_source)
+                if nested_processors:
+                    substreams += nested_processors
+            children = substreams
+        result.append((sql_outputs, models_to_source))
+    return result
+
+
+def get_resolved_names_by_stream(tables_registry: TableNameRegistry) -> Dict[str, List[List[str]]]:
+    """
+    Group the resolved schema, table and file names of all (nested) streams by the name of their top-level stream
+    """
+    result: Dict[str, List[List[str]]] = {}
+    for values in tables_registry.simple_file_registry.values():
+        for value in values:
+            for schema in [value.intermediate_schema, value.schema]:
+                key = tables_registry.get_registry_key(schema, value.json_path, value.stream_name)
+                resolved = tables_registry.registry[key]
+                result.setdefault(value.json_path[0], []).append([key, resolved.schema, resolved.table_name, resolved.file_name])
+    return result
+
+
+@lru_cache(maxsize=None)
+def get_normalization_code_hash() -> str:
+    """
+    Hash of the normalization code generating the models, so that models are generated again when it changes
+    """
+    code_hash = hashlib.sha256()
+    for path in sorted(glob.glob(os.path.join(os.path.dirname(__file__), "*.py"))):
+        with open(path, "rb") as file:
+            code_hash.update(file.read())
+    return code_hash.hexdigest()
+
+
+def get_stream_hash(stream_processor: StreamProcessor, resolved_names: List[List[str]]) -> str:
+    """
+    Hash of all the inputs used to generate the models of a top-level stream and of its substreams
+    """
+    stream_inputs = {
+        "code": get_normalization_code_hash(),
+        "stream_name": stream_processor.stream_name,
+        "destination_type": stream_processor.destination_type.value,
+        "raw_schema": stream_processor.raw_schema,
+        "default_schema": stream_processor.default_schema,
+        "schema": stream_processor.schema,
+        "source_sync_mode": stream_processor.source_sync_mode.value,
+        "destination_sync_mode": stream_processor.destination_sync_mode.value,
+        "cursor_field": stream_processor.cursor_field,
+        "primary_key": stream_processor.primary_key,
+        "json_column_name": stream_processor.json_column_name,
+        "properties": stream_processor.properties,
+        "from_table": str(stream_processor.from_table),
+        "resolved_names": sorted(resolved_names),
+    }
+    return hashlib.sha256(json.dumps(stream_inputs, sort_keys=True).encode("utf-8")).hexdigest()
+
+
 def output_sql_file(file: str, sql: str):
     """
     @param file is the path to filename to be written
@@ -292,8 +426,11 @@ def output_sql_file(file: str, sql: str):
     output_dir = os.path.dirname(file)
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
+    content = "".join(line + "\n" for line in sql.splitlines() if line.strip()) + "\n"
+    if os.path.exists(file):
+        with open(file, "r") as f:
+            if f.read() == content:
+                # Leave unchanged files untouched to keep dbt partial parsing
+                return
     with open(file, "w") as f:
-        for line in sql.splitlines():
-            if line.strip():
-                f.write(line + "\n")
-        f.write("\n")
+        f.write(content)
@@ -6,10 +6,11 @@
 import os
 import re
 from enum import Enum
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Tuple, Union
 
 from airbyte_cdk.models.airbyte_protocol import DestinationSyncMode, SyncMode  # type: ignore
-from jinja2 import Template
+from jinja2 import Environment, Template
 from normalization.destination_type import DestinationType
 from normalization.transform_catalog import dbt_macro
 from normalization.transform_catalog.destination_name_transformer import DestinationNameTransformer, transform_json_naming
@@ -39,6 +40,18 @@ from normalization.transform_catalog.utils import (
 # let's use a lower value to be safely away from the limit...
 MAXIMUM_COLUMNS_TO_USE_EPHEMERAL = 450
 
+# All the stream processors share the same jinja environment
+# so that each model template is only parsed and compiled once per catalog
+jinja_environment = Environment()
+
+
+@lru_cache(maxsize=None)
+def compile_template(source: str) -> Template:
+    """
+    Compile a jinja template, or return the already compiled template for this source
+    """
+    return jinja_environment.from_string(source)
+
 
 class PartitionScheme(Enum):
     """
@@ -388,7 +401,7 @@ class StreamProcessor(object):
             table_alias = ""
         else:
             table_alias = "as table_alias"
-        template = Template(
+        template = compile_template(
             """
 -- SQL model to parse JSON blob stored in a single column and extract into separated field columns as described by the JSON Schema
 -- depends_on: {{ from_table }}
@@ -469,7 +482,7 @@ where 1 = 1
         return f"{json_extract} as {column_name}"
 
     def generate_column_typing_model(self, from_table: str, column_names: Dict[str, Tuple[str, str]]) -> Any:
-        template = Template(
+        template = compile_template(
             """
 -- SQL model to cast each column to its adequate SQL type converted from the JSON schema type
 -- depends_on: {{ from_table }}
@@ -602,7 +615,7 @@ where 1 = 1
 
     @staticmethod
     def generate_mysql_date_format_statement(column_name: str) -> Any:
-        template = Template(
+        template = compile_template(
             """
         case when {{column_name}} = '' then NULL
         else cast({{column_name}} as date)
@@ -614,7 +627,7 @@ where 1 = 1
     @staticmethod
     def generate_mysql_datetime_format_statement(column_name: str) -> Any:
         regexp = r"\\d{4}-\\d{2}-\\d{2}T\\d{2}:\\d{2}:\\d{2}.*"
-        template = Template(
+        template = compile_template(
             """
         case when {{column_name}} regexp '{{regexp}}' THEN STR_TO_DATE(SUBSTR({{column_name}}, 1, 19), '%Y-%m-%dT%H:%i:%S')
         else cast(if({{column_name}} = '', NULL, {{column_name}}) as datetime)
@@ -637,7 +650,7 @@ where 1 = 1
             },
             {"regex": r"\\d{4}-\\d{2}-\\d{2}T(\\d{2}:){2}\\d{2}\\.\\d{1,7}(\\+|-)\\d{2}", "format": "YYYY-MM-DDTHH24:MI:SS.FFTZH"},
         ]
-        template = Template(
+        template = compile_template(
             """
     case
 {% for format_item in formats %}
@@ -659,7 +672,7 @@ where 1 = 1
             {"regex": r"\\d{4}-\\d{2}-\\d{2}T(\\d{2}:){2}\\d{2}", "format": "YYYY-MM-DDTHH24:MI:SS"},
             {"regex": r"\\d{4}-\\d{2}-\\d{2}T(\\d{2}:){2}\\d{2}\\.\\d{1,7}", "format": "YYYY-MM-DDTHH24:MI:SS.FF"},
         ]
-        template = Template(
+        template = compile_template(
             """
     case
 {% for format_item in formats %}
@@ -674,7 +687,7 @@ where 1 = 1
 
     def generate_id_hashing_model(self, from_table: str, column_names: Dict[str, Tuple[str, str]]) -> Any:
 
-        template = Template(
+        template = compile_template(
             """
 -- SQL model to build a hash column based on the values of this record
 -- depends_on: {{ from_table }}
@@ -862,7 +875,7 @@ where 1 = 1
             "unique_key": self.get_unique_key(),
         }
         if self.destination_type == DestinationType.CLICKHOUSE:
-            clickhouse_active_row_sql = Template(
+            clickhouse_active_row_sql = compile_template(
                 """
 input_data_with_active_row_num as (
     select *,
@@ -876,7 +889,7 @@ input_data_with_active_row_num as (
 ),"""
             ).render(jinja_variables)
             jinja_variables["clickhouse_active_row_sql"] = clickhouse_active_row_sql
-            scd_columns_sql = Template(
+            scd_columns_sql = compile_template(
                 """
       case when _airbyte_active_row_num = 1{{ cdc_active_row }} then 1 else 0 end as {{ active_row }},
       {{ lag_begin }}({{ cursor_field }}) over (
@@ -888,7 +901,7 @@ input_data_with_active_row_num as (
             ).render(jinja_variables)
             jinja_variables["scd_columns_sql"] = scd_columns_sql
         else:
-            scd_columns_sql = Template(
+            scd_columns_sql = compile_template(
                 """
       lag({{ cursor_field }}) over (
         partition by {{ primary_key_partition | join(", ") }}
@@ -904,7 +917,7 @@ input_data_with_active_row_num as (
       ) = 1{{ cdc_active_row }} then 1 else 0 end as {{ active_row }}"""
             ).render(jinja_variables)
             jinja_variables["scd_columns_sql"] = scd_columns_sql
-        sql = Template(
+        sql = compile_template(
             """
 -- depends_on: {{ from_table }}
 with
@@ -1087,7 +1100,7 @@ from dedup_data where {{ airbyte_row_num }} = 1
         This is the table that the user actually wants. In addition to the columns that the source outputs, it has some additional metadata columns;
         see the basic normalization docs for an explanation: https://docs.airbyte.com/understanding-airbyte/basic-normalization#normalization-metadata-columns
         """
-        template = Template(
+        template = compile_template(
             """
 -- Final base SQL model
 -- depends_on: {{ from_table }}
@@ -1128,7 +1141,7 @@ where 1 = 1
         return destination_sync_mode.value in [DestinationSyncMode.append.value, DestinationSyncMode.append_dedup.value]
 
     def add_incremental_clause(self, sql_query: str) -> Any:
-        template = Template(
+        template = compile_template(
             """
 {{ sql_query }}
 {{ incremental_clause }}
@@ -1210,7 +1223,7 @@ where 1 = 1
                     delete_statement = "delete from {{ final_table_relation }}"
                     unique_key_reference = "{{ final_table_relation }}." + self.get_unique_key(in_jinja=False)
                     noop_delete_statement = "delete from {{ this }} where 1=0"
-                deletion_hook = Template(
+                deletion_hook = compile_template(
                     """
                     {{ '{%' }}
                     set final_table_relation = adapter.get_relation(
@@ -1296,7 +1309,7 @@ where 1 = 1
                 scd_table_name = self.tables_registry.get_table_name(schema, self.json_path, self.stream_name, "scd", truncate_name)
                 print(f"  Adding drop table hook for {scd_table_name} to {file_name}")
                 hooks = [
-                    Template(
+                    compile_template(
                         """
                     {{ '{%' }}
                         set scd_table_relation = adapter.get_relation(
@@ -1316,7 +1329,7 @@ where 1 = 1
                     ).render(scd_table_name=scd_table_name)
                 ]
                 config["post_hook"] = "[" + ",".join(map(wrap_in_quotes, hooks)) + "]"
-        template = Template(
+        template = compile_template(
             """
 {{ '{{' }} config(
 {%- for key in config %}
@@ -0,0 +1,105 @@
+#
+# Copyright (c) 2023 Airbyte, Inc., all rights reserved.
+#
+
+
+import copy
+import json
+import os
+from typing import Dict
+
+import pytest
+from normalization.destination_type import DestinationType
+from normalization.transform_catalog import catalog_processor
+from normalization.transform_catalog.catalog_processor import CatalogProcessor
+from normalization.transform_catalog.stream_processor import StreamProcessor
+
+
+@pytest.fixture(scope="function", autouse=True)
+def before_tests(request):
+    # This makes the test run whether it is executed from the tests folder (with pytest/gradle)
+    # or from the base-normalization folder (through pycharm)
+    unit_tests_dir = os.path.join(request.fspath.dirname, "unit_tests")
+    if os.path.exists(unit_tests_dir):
+        os.chdir(unit_tests_dir)
+    else:
+        os.chdir(request.fspath.dirname)
+    yield
+    os.chdir(request.config.invocation_dir)
+
+
+@pytest.fixture
+def catalog() -> Dict:
+    with open("resources/nested_catalog.json", "r") as file:
+        nested_catalog = json.load(file)
+    stream_copy = copy.deepcopy(nested_catalog["streams"][0])
+    stream_copy["stream"]["name"] = "adcreatives_copy"
+    nested_catalog["streams"].append(stream_copy)
+    return nested_catalog
+
+
+def write_catalog(tmp_path, catalog: Dict) -> str:
+    catalog_file = str(tmp_path / "catalog.json")
+    with open(catalog_file, "w") as file:
+        json.dump(catalog, file)
+    return catalog_file
+
+
+def read_models(output_directory: str) -> Dict[str, str]:
+    models = {}
+    for root, _, files in os.walk(output_directory):
+        for file in files:
+            if file.endswith(".sql"):
+                with open(os.path.join(root, file), "r") as f:
+                    models[os.path.relpath(os.path.join(root, file), output_directory)] = f.read()
+    return models
+
+
+def run_catalog_processor(catalog_file: str, output_directory: str, max_workers: int = 1) -> CatalogProcessor:
+    processor = CatalogProcessor(output_directory=output_directory, destination_type=DestinationType.POSTGRES, max_workers=max_workers)
+    processor.process(catalog_file=catalog_file, json_column_name="_airbyte_data", default_schema="schema_test")
+    return processor
+
+
+def test_unchanged_streams_are_not_generated_again(tmp_path, catalog, monkeypatch):
+    catalog_file = write_catalog(tmp_path, catalog)
+    output_directory = str(tmp_path / "models")
+    first_processor = run_catalog_processor(catalog_file, output_directory)
+    first_models = read_models(output_directory)
+    assert any("adcreatives_copy" in model for model in first_models)
+
+    processed_streams = []
+    original_process = StreamProcessor.process
+
+    def process(self):
+        processed_streams.append(self.json_path)
+        return original_process(self)
+
+    monkeypatch.setattr(StreamProcessor, "process", process)
+    second_processor = run_catalog_processor(catalog_file, output_directory)
+    assert processed_streams == []
+    assert second_processor.models_to_source == first_processor.models_to_source
+    assert read_models(output_directory) == first_models
+
+    # Only the changed stream and its substreams are generated again
+    catalog["streams"][1]["stream"]["json_schema"]["properties"]["new_column"] = {"type": ["null", "string"]}
+    run_catalog_processor(write_catalog(tmp_path, catalog), output_directory)
+    assert processed_streams
+    assert all(json_path[0] == "adcreatives_copy" for json_path in processed_streams)
+
+    # The models of removed streams are deleted
+    catalog["streams"] = catalog["streams"][:1]
+    run_catalog_processor(write_catalog(tmp_path, catalog), output_directory)
+    assert not any("adcreatives_copy" in model for model in read_models(output_directory))
+    assert read_models(output_directory) == {model: sql for model, sql in first_models.items() if "adcreatives_copy" not in model}
+
+
+def test_parallel_processing_generates_the_same_models(tmp_path, catalog, monkeypatch):
+    catalog_file = write_catalog(tmp_path, catalog)
+    sequential_processor = run_catalog_processor(catalog_file, str(tmp_path / "sequential"))
+
+    monkeypatch.setattr(catalog_processor, "MIN_STREAMS_FOR_PARALLEL_PROCESSING", 0)
+    parallel_processor = run_catalog_processor(catalog_file, str(tmp_path / "parallel"), max_workers=2)
+
+    assert parallel_processor.models_to_source == sequential_processor.models_to_source
+    assert read_models(str(tmp_path / "parallel")) == read_models(str(tmp_path / "sequential"))
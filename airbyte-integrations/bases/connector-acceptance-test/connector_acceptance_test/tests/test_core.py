@@ -5,7 +5,8 @@
 import json
 import logging
 import re
-from collections import Counter, defaultdict
+from abc import ABC, abstractmethod
+from collections import defaultdict
 from functools import reduce
 from logging import Logger
 from os.path import splitext
@@ -51,7 +52,8 @@ from connector_acceptance_test.config import (
     SpecTestConfig,
     UnsupportedFileTypeConfig,
 )
-from connector_acceptance_test.utils import ConnectorRunner, SecretDict, filter_output, make_hashable, verify_records_schema
+from connector_acceptance_test.utils import ConnectorRunner, SecretDict, filter_output, make_hashable
+from connector_acceptance_test.utils.asserts import RecordsSchemaVerifier
 from connector_acceptance_test.utils.backward_compatibility import CatalogDiffChecker, SpecDiffChecker, validate_previous_configs
 from connector_acceptance_test.utils.common import (
     build_configured_catalog_from_custom_catalog,
@@ -873,15 +875,6 @@ class TestDiscovery(BaseTest):
         assert not errors, "\n".join(errors)
 
 
-def primary_keys_for_records(streams, records):
-    streams_with_primary_key = [stream for stream in streams if stream.stream.source_defined_primary_key]
-    for stream in streams_with_primary_key:
-        stream_records = [r for r in records if r.stream == stream.stream.name]
-        for stream_record in stream_records:
-            pk_values = _extract_primary_key_value(stream_record.data, stream.stream.source_defined_primary_key)
-            yield pk_values, stream_record
-
-
 def _extract_pk_values(records: Iterable[Mapping[str, Any]], primary_key: List[List[str]]) -> Iterable[dict[Tuple[str], Any]]:
     for record in records:
         yield _extract_primary_key_value(record, primary_key)
@@ -895,46 +888,52 @@ def _extract_primary_key_value(record: Mapping[str, Any], primary_key: List[List
     return pk_values
 
 
-@pytest.mark.default_timeout(TEN_MINUTES)
-@pytest.mark.usefixtures("final_teardown")
-class TestBasicRead(BaseTest):
-    @staticmethod
-    def _validate_records_structure(records: List[AirbyteRecordMessage], configured_catalog: ConfiguredAirbyteCatalog):
-        """
-        Check object structure similar to one expected by schema. Sometimes
-        just running schema validation is not enough case schema could have
-        additionalProperties parameter set to true and no required fields
-        therefore any arbitrary object would pass schema validation.
-        This method is here to catch those cases by extracting all the paths
-        from the object and compare it to paths expected from jsonschema. If
-        there no common paths then raise an alert.
-
-        :param records: List of airbyte record messages gathered from connector instances.
-        :param configured_catalog: Testcase parameters parsed from yaml file
-        """
-        schemas: Dict[str, Set] = {}
-        for stream in configured_catalog.streams:
-            schemas[stream.stream.name] = set(get_expected_schema_structure(stream.stream.json_schema))
+class RecordsValidator(ABC):
+    """Validation of the records emitted by a read.
+    Records are consumed one at a time, while the connector output is read, so they never have to be all kept in memory.
+    """
 
+    @abstractmethod
+    def consume(self, record: AirbyteRecordMessage) -> None:
+        """Inspect a record of the read."""
+
+    @abstractmethod
+    def validate(self) -> None:
+        """Assert that the records consumed so far are valid."""
+
+    def consume_all_and_validate(self, records: Iterable[AirbyteRecordMessage]) -> None:
         for record in records:
-            schema_paths = schemas.get(record.stream)
-            if not schema_paths:
-                continue
-            record_fields = set(get_object_structure(record.data))
-            common_fields = set.intersection(record_fields, schema_paths)
+            self.consume(record)
+        self.validate()
 
-            assert (
-                common_fields
-            ), f" Record {record} from {record.stream} stream with fields {record_fields} should have some fields mentioned by json schema: {schema_paths}"
 
-    @staticmethod
-    def _validate_schema(records: List[AirbyteRecordMessage], configured_catalog: ConfiguredAirbyteCatalog):
-        """
-        Check if data type and structure in records matches the one in json_schema of the stream in catalog
-        """
-        TestBasicRead._validate_records_structure(records, configured_catalog)
+class RecordsSchemaValidator(RecordsValidator):
+    """Check if data type and structure in records matches the one in json_schema of the stream in catalog.
+
+    Schema validation alone is not enough when the schema sets additionalProperties to true and has no required fields,
+    as any arbitrary object would pass it. This is why we also extract all the paths from each record and compare them to the paths
+    expected from the json schema: if a record has no path in common with its schema we raise an alert.
+    """
+
+    def __init__(self, configured_catalog: ConfiguredAirbyteCatalog):
+        self._expected_paths: Dict[str, Set] = {
+            stream.stream.name: set(get_expected_schema_structure(stream.stream.json_schema)) for stream in configured_catalog.streams
+        }
+        self._structure_error: Optional[str] = None
+        self._schema_verifier = RecordsSchemaVerifier(configured_catalog)
+
+    def consume(self, record: AirbyteRecordMessage) -> None:
+        schema_paths = self._expected_paths.get(record.stream)
+        if self._structure_error is None and schema_paths:
+            record_fields = set(get_object_structure(record.data))
+            if not set.intersection(record_fields, schema_paths):
+                self._structure_error = f" Record {record} from {record.stream} stream with fields {record_fields} should have some fields mentioned by json schema: {schema_paths}"
+        self._schema_verifier.add(record)
+
+    def validate(self) -> None:
+        assert self._structure_error is None, self._structure_error
         bar = "-" * 80
-        streams_errors = verify_records_schema(records, configured_catalog)
+        streams_errors = self._schema_verifier.stream_errors
         for stream_name, errors in streams_errors.items():
             errors = map(str, errors.values())
             str_errors = f"\n{bar}\n".join(errors)
@@ -943,62 +942,107 @@ class TestBasicRead(BaseTest):
         if streams_errors:
             pytest.fail(f"Please check your json_schema in selected streams {tuple(streams_errors.keys())}.")
 
-    def _validate_empty_streams(self, records, configured_catalog, allowed_empty_streams):
-        """
-        Only certain streams allowed to be empty
-        """
-        allowed_empty_stream_names = set([allowed_empty_stream.name for allowed_empty_stream in allowed_empty_streams])
-        counter = Counter(record.stream for record in records)
 
-        all_streams = set(stream.stream.name for stream in configured_catalog.streams)
-        streams_with_records = set(counter.keys())
-        streams_without_records = all_streams - streams_with_records
+class EmptyStreamsValidator(RecordsValidator):
+    """Only certain streams allowed to be empty"""
 
-        streams_without_records = streams_without_records - allowed_empty_stream_names
-        assert not streams_without_records, f"All streams should return some records, streams without records: {streams_without_records}"
+    def __init__(self, configured_catalog: ConfiguredAirbyteCatalog, allowed_empty_streams: Set[EmptyStreamConfiguration]):
+        self._allowed_empty_stream_names = set([allowed_empty_stream.name for allowed_empty_stream in allowed_empty_streams])
+        self._all_streams = set(stream.stream.name for stream in configured_catalog.streams)
+        self._streams_with_records: Set[str] = set()
 
-    def _validate_field_appears_at_least_once_in_stream(self, records: List, schema: Dict):
-        """
-        Get all possible schema paths, then diff with existing record paths.
-        In case of `oneOf` or `anyOf` schema props, compare only choice which is present in records.
-        """
-        expected_paths = get_expected_schema_structure(schema, annotate_one_of=True)
-        expected_paths = set(flatten_tuples(tuple(expected_paths)))
+    def consume(self, record: AirbyteRecordMessage) -> None:
+        self._streams_with_records.add(record.stream)
 
-        for record in records:
-            record_paths = set(get_object_structure(record))
-            paths_to_remove = {path for path in expected_paths if re.sub(r"\([0-9]*\)", "", path) in record_paths}
-            for path in paths_to_remove:
-                path_parts = re.split(r"\([0-9]*\)", path)
-                if len(path_parts) > 1:
-                    expected_paths -= {path for path in expected_paths if path_parts[0] in path}
-            expected_paths -= paths_to_remove
+    def validate(self) -> None:
+        streams_without_records = self._all_streams - self._streams_with_records - self._allowed_empty_stream_names
+        assert not streams_without_records, f"All streams should return some records, streams without records: {streams_without_records}"
 
-        return sorted(list(expected_paths))
 
-    def _validate_field_appears_at_least_once(self, records: List[AirbyteRecordMessage], configured_catalog: ConfiguredAirbyteCatalog):
-        """
-        Validate if each field in a stream has appeared at least once in some record.
-        """
+class FieldsAppearAtLeastOnceValidator(RecordsValidator):
+    """Validate if each field in a stream has appeared at least once in some record.
 
-        stream_name_to_empty_fields_mapping = {}
-        for stream in configured_catalog.streams:
-            stream_records = [record.data for record in records if record.stream == stream.stream.name]
+    Get all possible schema paths, then diff with existing record paths.
+    In case of `oneOf` or `anyOf` schema props, compare only choice which is present in records.
+    Once all the paths of a stream have been found, the following records of the stream are not inspected anymore.
+    """
 
-            empty_field_paths = self._validate_field_appears_at_least_once_in_stream(
-                records=stream_records, schema=stream.stream.json_schema
-            )
-            if empty_field_paths:
-                stream_name_to_empty_fields_mapping[stream.stream.name] = empty_field_paths
+    def __init__(self, configured_catalog: ConfiguredAirbyteCatalog):
+        self._missing_paths_per_stream: Dict[str, Set[str]] = {}
+        for stream in configured_catalog.streams:
+            expected_paths = get_expected_schema_structure(stream.stream.json_schema, annotate_one_of=True)
+            self._missing_paths_per_stream[stream.stream.name] = set(flatten_tuples(tuple(expected_paths)))
 
+    def consume(self, record: AirbyteRecordMessage) -> None:
+        expected_paths = self._missing_paths_per_stream.get(record.stream)
+        if not expected_paths:
+            return
+        record_paths = set(get_object_structure(record.data))
+        paths_to_remove = {path for path in expected_paths if re.sub(r"\([0-9]*\)", "", path) in record_paths}
+        for path in paths_to_remove:
+            path_parts = re.split(r"\([0-9]*\)", path)
+            if len(path_parts) > 1:
+                expected_paths -= {path for path in expected_paths if path_parts[0] in path}
+        expected_paths -= paths_to_remove
+
+    def validate(self) -> None:
+        stream_name_to_empty_fields_mapping = {
+            stream_name: sorted(list(missing_paths))
+            for stream_name, missing_paths in self._missing_paths_per_stream.items()
+            if missing_paths
+        }
         msg = "Following streams has records with fields, that are either null or not present in each output record:\n"
         for stream_name, fields in stream_name_to_empty_fields_mapping.items():
             msg += f"`{stream_name}` stream has `{fields}` empty fields\n"
         assert not stream_name_to_empty_fields_mapping, msg
 
+
+class PrimaryKeysDataTypeValidator(RecordsValidator):
+    """Validate that primary keys are not arrays or objects and are not null in all their parts."""
+
+    DATA_TYPES_MAPPING = {"dict": "object", "list": "array"}
+
+    def __init__(self, streams: List[ConfiguredAirbyteStream]):
+        self._primary_keys_per_stream = {
+            stream.stream.name: stream.stream.source_defined_primary_key for stream in streams if stream.stream.source_defined_primary_key
+        }
+        self._error: Optional[str] = None
+
+    def _get_error(self, record: AirbyteRecordMessage, primary_key: List[List[str]]) -> Optional[str]:
+        non_nullable_key_part_found = False
+        for primary_key_value in _extract_primary_key_value(record.data, primary_key).values():
+            if primary_key_value is not None:
+                non_nullable_key_part_found = True
+            if isinstance(primary_key_value, (list, dict)):
+                return (
+                    f"Stream {record.stream} contains primary key with forbidden type "
+                    f"of '{self.DATA_TYPES_MAPPING.get(primary_key_value.__class__.__name__)}'"
+                )
+        if not non_nullable_key_part_found:
+            return f"Stream {record.stream} contains primary key with null values in all its parts"
+        return None
+
+    def consume(self, record: AirbyteRecordMessage) -> None:
+        primary_key = self._primary_keys_per_stream.get(record.stream)
+        if self._error is None and primary_key:
+            self._error = self._get_error(record, primary_key)
+
+    def validate(self) -> None:
+        assert self._error is None, self._error
+
+
+@pytest.mark.default_timeout(TEN_MINUTES)
+@pytest.mark.usefixtures("final_teardown")
+class TestBasicRead(BaseTest):
+    def _validate_field_appears_at_least_once(self, records: Iterable[AirbyteRecordMessage], configured_catalog: ConfiguredAirbyteCatalog):
+        """
+        Validate if each field in a stream has appeared at least once in some record.
+        """
+        FieldsAppearAtLeastOnceValidator(configured_catalog).consume_all_and_validate(records)
+
     def _validate_expected_records(
         self,
-        records: List[AirbyteRecordMessage],
+        actual_records_by_stream: MutableMapping[str, List[MutableMapping]],
         expected_records_by_stream: MutableMapping[str, List[MutableMapping]],
         flags,
         ignored_fields: Optional[Mapping[str, List[IgnoredFieldsConfiguration]]],
@@ -1008,9 +1052,8 @@ class TestBasicRead(BaseTest):
         """
         We expect some records from stream to match expected_records, partially or fully, in exact or any order.
         """
-        actual_by_stream = self.group_by_stream(records)
         for stream_name, expected in expected_records_by_stream.items():
-            actual = actual_by_stream.get(stream_name, [])
+            actual = actual_records_by_stream.get(stream_name, [])
             detailed_logger.info(f"Actual records for stream {stream_name}:")
             detailed_logger.info(actual)
             ignored_field_names = [field.name for field in ignored_fields.get(stream_name, [])]
@@ -1108,31 +1151,46 @@ class TestBasicRead(BaseTest):
         detailed_logger: Logger,
         certified_file_based_connector: bool,
     ):
-        output = await docker_runner.call_read(connector_config, configured_catalog)
-
-        records = [message.record for message in filter_output(output, Type.RECORD)]
-        state_messages = [message for message in filter_output(output, Type.STATE)]
-
-        if certified_file_based_connector:
-            self._file_types.update(self._get_actual_file_types(records))
-
-        assert records, "At least one record should be read using provided catalog"
+        output = await docker_runner.call_read_iter(connector_config, configured_catalog)
 
+        records_validators: List[RecordsValidator] = []
         if should_validate_schema:
-            self._validate_schema(records=records, configured_catalog=configured_catalog)
-
-        self._validate_empty_streams(records=records, configured_catalog=configured_catalog, allowed_empty_streams=empty_streams)
-
+            records_validators.append(RecordsSchemaValidator(configured_catalog))
+        records_validators.append(EmptyStreamsValidator(configured_catalog, empty_streams))
         if should_validate_primary_keys_data_type:
-            self._validate_primary_keys_data_type(streams=configured_catalog.streams, records=records)
-
+            records_validators.append(PrimaryKeysDataTypeValidator(configured_catalog.streams))
         # TODO: remove this condition after https://github.com/airbytehq/airbyte/issues/8312 is done
         if should_validate_data_points:
-            self._validate_field_appears_at_least_once(records=records, configured_catalog=configured_catalog)
+            records_validators.append(FieldsAppearAtLeastOnceValidator(configured_catalog))
+
+        # The connector output is consumed in a single pass: records are handed over to the validators and only
+        # the records of the streams with expected records are kept in memory.
+        has_records = False
+        actual_records_by_stream: MutableMapping[str, List[MutableMapping]] = defaultdict(list)
+        state_messages = []
+        all_statuses = []
+        for message in output:
+            if message.type == Type.RECORD:
+                has_records = True
+                for records_validator in records_validators:
+                    records_validator.consume(message.record)
+                if message.record.stream in expected_records_by_stream:
+                    actual_records_by_stream[message.record.stream].append(message.record.data)
+                if certified_file_based_connector:
+                    self._file_types.update(self._get_actual_file_types([message.record]))
+            elif message.type == Type.STATE:
+                state_messages.append(message)
+            elif message.type == Type.TRACE and message.trace.type == TraceType.STREAM_STATUS:
+                all_statuses.append(message.trace.stream_status)
+
+        assert has_records, "At least one record should be read using provided catalog"
+
+        for records_validator in records_validators:
+            records_validator.validate()
 
         if expected_records_by_stream:
             self._validate_expected_records(
-                records=records,
+                actual_records_by_stream=actual_records_by_stream,
                 expected_records_by_stream=expected_records_by_stream,
                 flags=expect_records_config,
                 ignored_fields=ignored_fields,
@@ -1141,11 +1199,6 @@ class TestBasicRead(BaseTest):
             )
 
         if should_validate_stream_statuses:
-            all_statuses = [
-                message.trace.stream_status
-                for message in filter_output(output, Type.TRACE)
-                if message.trace.type == TraceType.STREAM_STATUS
-            ]
             self._validate_stream_statuses(configured_catalog=configured_catalog, statuses=all_statuses)
 
         if should_validate_state_messages:
@@ -1328,23 +1381,6 @@ class TestBasicRead(BaseTest):
             # Check if stats are of the correct type and present in state message
             assert isinstance(state.sourceStats, AirbyteStateStats), "Source stats should be in state message."
 
-    @staticmethod
-    def _validate_primary_keys_data_type(streams: List[ConfiguredAirbyteStream], records: List[AirbyteRecordMessage]):
-        data_types_mapping = {"dict": "object", "list": "array"}
-        for primary_keys, record in primary_keys_for_records(streams=streams, records=records):
-            stream_name = record.stream
-            non_nullable_key_part_found = False
-            for primary_key_path, primary_key_value in primary_keys.items():
-                if primary_key_value is not None:
-                    non_nullable_key_part_found = True
-
-                assert not isinstance(primary_key_value, (list, dict)), (
-                    f"Stream {stream_name} contains primary key with forbidden type "
-                    f"of '{data_types_mapping.get(primary_key_value.__class__.__name__)}'"
-                )
-
-            assert non_nullable_key_part_found, f"Stream {stream_name} contains primary key with null values in all its parts"
-
 
 @pytest.mark.default_timeout(TEN_MINUTES)
 class TestConnectorAttributes(BaseTest):
@@ -3,10 +3,11 @@
 #
 
 import copy
+import json
 import logging
 import re
 from collections import defaultdict
-from typing import Any, Dict, List, Mapping
+from typing import Any, Dict, Hashable, Iterable, Mapping, Optional, Set, Tuple
 
 import pendulum
 from jsonschema import Draft7Validator, FormatChecker, FormatError, ValidationError, validators
@@ -81,29 +82,160 @@ class CustomFormatChecker(FormatChecker):
             return super().check(instance, format)
 
 
+# Schema keywords whose validation outcome depends on the value of an instance, and not only on its structure and types.
+VALUE_DEPENDENT_KEYWORDS = {
+    "additionalItems",
+    "const",
+    "contains",
+    "dependencies",
+    "else",
+    "enum",
+    "exclusiveMaximum",
+    "exclusiveMinimum",
+    "format",
+    "if",
+    "maxItems",
+    "maxLength",
+    "maxProperties",
+    "maximum",
+    "minItems",
+    "minLength",
+    "minProperties",
+    "minimum",
+    "multipleOf",
+    "pattern",
+    "patternProperties",
+    "propertyNames",
+    "then",
+    "uniqueItems",
+}
+# Path component used for the items of an array, it can't collide with a property name
+ARRAY_ITEMS = None
+
+ValueDependentPaths = Dict[Tuple, Optional[Set[str]]]
+
+
+def get_value_dependent_paths(schema: Any, path: Tuple = (), paths: Optional[ValueDependentPaths] = None) -> Optional[ValueDependentPaths]:
+    """Get the paths of the instances whose validation against the schema depends on their values.
+    Each path is mapped to the formats the instance is checked against, or to None if other value dependent keywords apply to it.
+    Returns None if the schema can't be analyzed, e.g. when it uses references.
+    """
+    paths = {} if paths is None else paths
+    if not isinstance(schema, dict):
+        return paths
+    if "$ref" in schema:
+        return None
+    value_dependent_keywords = VALUE_DEPENDENT_KEYWORDS.intersection(schema)
+    if (
+        value_dependent_keywords - {"format"}
+        or isinstance(schema.get("additionalProperties"), dict)
+        or isinstance(schema.get("items"), list)
+    ):
+        # The whole value at this path, including all its children, is part of the record shape
+        paths[path] = None
+        return paths
+    if value_dependent_keywords and (path not in paths or paths[path] is not None):
+        paths.setdefault(path, set()).add(schema["format"])
+
+    sub_schemas = [(path + (name,), sub_schema) for name, sub_schema in schema.get("properties", {}).items()]
+    if isinstance(schema.get("items"), dict):
+        sub_schemas.append((path + (ARRAY_ITEMS,), schema["items"]))
+    for keyword in ("allOf", "anyOf", "oneOf"):
+        sub_schemas.extend((path, sub_schema) for sub_schema in schema.get(keyword, []))
+    if "not" in schema:
+        sub_schemas.append((path, schema["not"]))
+    for sub_path, sub_schema in sub_schemas:
+        if get_value_dependent_paths(sub_schema, sub_path, paths) is None:
+            return None
+    return paths
+
+
+def get_record_shape(value: Any, value_dependent_paths: ValueDependentPaths, format_checker: FormatChecker, path: Tuple = ()) -> Hashable:
+    """Get a hashable signature of a record made of its keys and value types, of the values found at value dependent paths
+    and of the conformity of values to the formats they are checked against.
+    Records with the same shape get the same validation outcome against the schema the value dependent paths were computed from.
+    """
+    formats = value_dependent_paths.get(path, set())
+    if formats is None:
+        return ("value", json.dumps(value, sort_keys=True, default=str))
+    if isinstance(value, dict):
+        shape = (
+            "object",
+            tuple(
+                sorted((key, get_record_shape(item, value_dependent_paths, format_checker, path + (key,))) for key, item in value.items())
+            ),
+        )
+    elif isinstance(value, list):
+        shape = ("array", frozenset(get_record_shape(item, value_dependent_paths, format_checker, path + (ARRAY_ITEMS,)) for item in value))
+    else:
+        shape = type(value).__name__
+    if formats:
+        return ("formats", tuple(format_checker.conforms(value, format) for format in sorted(formats)), shape)
+    return shape
+
+
+class RecordsSchemaVerifier:
+    """Check records against their schemas from the catalog, one record at a time.
+    A single error is kept for each schema path of each stream, so memory usage does not grow with the number of records.
+
+    When memoize_valid_shapes is enabled, the shapes (see get_record_shape) of the records which passed validation are cached
+    per stream: records with an already validated shape are not validated again. Records with errors are always fully validated,
+    so the reported errors are the same as without memoization.
+    """
+
+    MAX_MEMOIZED_SHAPES_PER_STREAM = 10_000
+
+    def __init__(self, catalog: ConfiguredAirbyteCatalog, memoize_valid_shapes: bool = True):
+        self.format_checker = CustomFormatChecker()
+        self.stream_validators = {}
+        self.stream_value_dependent_paths: Dict[str, Optional[ValueDependentPaths]] = {}
+        self.stream_valid_shapes: Dict[str, Set[Hashable]] = defaultdict(set)
+        for stream in catalog.streams:
+            schema_to_validate_against = stream.stream.json_schema
+            # We will be disabling strict `NoAdditionalPropertiesValidator` until we have a better plan for schema validation. The consequence
+            # is that we will lack visibility on new fields that are not added on the root level (root level is validated by Datadog)
+            #   validator = NoAdditionalPropertiesValidator if fail_on_extra_columns else Draft7ValidatorWithStrictInteger
+            validator = Draft7ValidatorWithStrictInteger
+            self.stream_validators[stream.stream.name] = validator(schema_to_validate_against, format_checker=self.format_checker)
+            self.stream_value_dependent_paths[stream.stream.name] = (
+                get_value_dependent_paths(schema_to_validate_against) if memoize_valid_shapes else None
+            )
+        self.stream_errors: Dict[str, Dict[str, ValidationError]] = defaultdict(dict)
+
+    def add(self, record: AirbyteRecordMessage) -> None:
+        validator = self.stream_validators.get(record.stream)
+        if not validator:
+            logging.error(f"Received record from the `{record.stream}` stream, which is not in the catalog.")
+            return
+
+        value_dependent_paths = self.stream_value_dependent_paths[record.stream]
+        if value_dependent_paths is None:
+            self._validate(validator, record)
+            return
+
+        shape = get_record_shape(record.data, value_dependent_paths, self.format_checker)
+        valid_shapes = self.stream_valid_shapes[record.stream]
+        if shape in valid_shapes:
+            return
+        if not self._validate(validator, record) and len(valid_shapes) < self.MAX_MEMOIZED_SHAPES_PER_STREAM:
+            valid_shapes.add(shape)
+
+    def _validate(self, validator: Draft7Validator, record: AirbyteRecordMessage) -> bool:
+        """Validate the record data and store its errors, return whether errors were found."""
+        has_errors = False
+        for error in validator.iter_errors(record.data):
+            self.stream_errors[record.stream][str(error.schema_path)] = error
+            has_errors = True
+        return has_errors
+
+
 def verify_records_schema(
-    records: List[AirbyteRecordMessage], catalog: ConfiguredAirbyteCatalog
+    records: Iterable[AirbyteRecordMessage], catalog: ConfiguredAirbyteCatalog, memoize_valid_shapes: bool = True
 ) -> Mapping[str, Mapping[str, ValidationError]]:
     """Check records against their schemas from the catalog, yield error messages.
     Only first record with error will be yielded for each stream.
     """
-    stream_validators = {}
-    for stream in catalog.streams:
-        schema_to_validate_against = stream.stream.json_schema
-        # We will be disabling strict `NoAdditionalPropertiesValidator` until we have a better plan for schema validation. The consequence
-        # is that we will lack visibility on new fields that are not added on the root level (root level is validated by Datadog)
-        #   validator = NoAdditionalPropertiesValidator if fail_on_extra_columns else Draft7ValidatorWithStrictInteger
-        validator = Draft7ValidatorWithStrictInteger
-        stream_validators[stream.stream.name] = validator(schema_to_validate_against, format_checker=CustomFormatChecker())
-    stream_errors = defaultdict(dict)
+    verifier = RecordsSchemaVerifier(catalog, memoize_valid_shapes)
     for record in records:
-        validator = stream_validators.get(record.stream)
-        if not validator:
-            logging.error(f"Received record from the `{record.stream}` stream, which is not in the catalog.")
-            continue
-
-        errors = list(validator.iter_errors(record.data))
-        for error in errors:
-            stream_errors[record.stream][str(error.schema_path)] = error
-
-    return stream_errors
+        verifier.add(record)
+    return verifier.stream_errors
@@ -9,12 +9,11 @@ import logging
 import os
 import uuid
 from pathlib import Path
-from typing import Any, List, Mapping, Optional, Union
+from typing import Any, Iterable, Iterator, List, Mapping, Optional, Union
 
 import dagger
 import docker
 import pytest
-from anyio import Path as AnyioPath
 from pydantic import ValidationError
 
 from airbyte_protocol.models import AirbyteMessage, ConfiguredAirbyteCatalog, OrchestratorType
@@ -192,6 +191,20 @@ class ConnectorRunner:
             enable_caching=enable_caching,
         )
 
+    async def call_read_iter(
+        self, config: SecretDict, catalog: ConfiguredAirbyteCatalog, raise_container_error: bool = False, enable_caching: bool = True
+    ) -> Iterator[AirbyteMessage]:
+        """Same as call_read but messages are parsed and yielded one by one while the connector output is read,
+        so that the whole output never has to be held in memory. The returned iterator can only be consumed once.
+        """
+        return await self._run_iter(
+            ["read", "--config", self.IN_CONTAINER_CONFIG_PATH, "--catalog", self.IN_CONTAINER_CATALOG_PATH],
+            raise_container_error,
+            config=config,
+            catalog=catalog,
+            enable_caching=enable_caching,
+        )
+
     async def call_read_with_state(
         self,
         config: SecretDict,
@@ -249,6 +262,20 @@ class ConnectorRunner:
         Returns:
             List[AirbyteMessage]: The list of AirbyteMessages emitted by the connector.
         """
+        return list(await self._run_iter(airbyte_command, raise_container_error, config, catalog, state, enable_caching))
+
+    async def _run_iter(
+        self,
+        airbyte_command: List[str],
+        raise_container_error: bool,
+        config: SecretDict = None,
+        catalog: dict = None,
+        state: Union[dict, list] = None,
+        enable_caching=True,
+    ) -> Iterator[AirbyteMessage]:
+        """Run a command in the connector container and return an iterator over the AirbyteMessages emitted by the connector.
+        The messages are parsed lazily from the exported command output file.
+        """
         container = self._connector_under_test_container
         current_user = (await container.with_exec(["whoami"]).stdout()).strip()
         container = container.with_user(current_user)
@@ -262,47 +289,58 @@ class ConnectorRunner:
         if catalog:
             container = container.with_new_file(self.IN_CONTAINER_CATALOG_PATH, contents=catalog.json(), owner=current_user)
         try:
-            output = await self._read_output_from_file(airbyte_command, container)
+            output_lines = await self._read_output_from_file(airbyte_command, container)
         except dagger.QueryError as e:
             output_too_big = bool([error for error in e.errors if error.message.startswith("file size")])
             if output_too_big:
-                output = await self._read_output_from_file(airbyte_command, container)
+                output_lines = await self._read_output_from_file(airbyte_command, container)
             elif raise_container_error:
                 raise e
             else:
                 if isinstance(e, dagger.ExecError):
-                    output = e.stdout + e.stderr
+                    output_lines = splitlines_generator(e.stdout + e.stderr)
                 else:
                     pytest.fail(f"Failed to run command {airbyte_command} in container {self.image_tag} with error: {e}")
-        return self.parse_airbyte_messages_from_command_output(output)
+        return self.iter_airbyte_messages_from_command_output(output_lines)
 
     async def _read_output_from_stdout(self, airbyte_command: list, container: dagger.Container) -> str:
         return await container.with_exec(airbyte_command, use_entrypoint=True).stdout()
 
-    async def _read_output_from_file(self, airbyte_command: list, container: dagger.Container) -> str:
-        local_output_file_path = f"/tmp/{str(uuid.uuid4())}"
+    async def _read_output_from_file(self, airbyte_command: list, container: dagger.Container) -> Iterator[str]:
+        """Run the command, export its output file to the host and return an iterator over the output lines.
+        The local copy of the output file is removed once the iterator is exhausted.
+        """
+        local_output_file_path = Path(f"/tmp/{str(uuid.uuid4())}")
         entrypoint = await container.entrypoint()
         airbyte_command = entrypoint + airbyte_command
 
         container = container.with_exec(
             ["sh", "-c", " ".join(airbyte_command) + f" > {self.IN_CONTAINER_OUTPUT_PATH} 2>&1 | tee -a {self.IN_CONTAINER_OUTPUT_PATH}"]
         )
-        await container.file(self.IN_CONTAINER_OUTPUT_PATH).export(local_output_file_path)
-        output = await AnyioPath(local_output_file_path).read_text()
-        await AnyioPath(local_output_file_path).unlink()
-        return output
+        await container.file(self.IN_CONTAINER_OUTPUT_PATH).export(str(local_output_file_path))
+        return self._read_lines_and_remove_file(local_output_file_path)
+
+    @staticmethod
+    def _read_lines_and_remove_file(file_path: Path) -> Iterator[str]:
+        try:
+            with open(file_path) as output_file:
+                for line in output_file:
+                    yield line.rstrip("\n")
+        finally:
+            file_path.unlink(missing_ok=True)
 
     def parse_airbyte_messages_from_command_output(self, command_output: str) -> List[AirbyteMessage]:
-        airbyte_messages = []
-        for line in splitlines_generator(command_output):
+        return list(self.iter_airbyte_messages_from_command_output(splitlines_generator(command_output)))
+
+    def iter_airbyte_messages_from_command_output(self, command_output_lines: Iterable[str]) -> Iterator[AirbyteMessage]:
+        for line in command_output_lines:
             try:
                 airbyte_message = AirbyteMessage.parse_raw(line)
                 if airbyte_message.type is AirbyteMessageType.CONTROL and airbyte_message.control.type is OrchestratorType.CONNECTOR_CONFIG:
                     self._persist_new_configuration(airbyte_message.control.connectorConfig.config, int(airbyte_message.control.emitted_at))
-                airbyte_messages.append(airbyte_message)
+                yield airbyte_message
             except ValidationError as exc:
                 logging.warning("Unable to parse connector's output %s, error: %s", line, exc)
-        return airbyte_messages
 
     def _persist_new_configuration(self, new_configuration: dict, configuration_emitted_at: int) -> Optional[Path]:
         """Store new configuration values to an updated_configurations subdir under the original configuration path.
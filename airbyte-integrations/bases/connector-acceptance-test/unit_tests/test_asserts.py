@@ -3,7 +3,13 @@
 #
 
 import pytest
-from connector_acceptance_test.utils.asserts import verify_records_schema
+from connector_acceptance_test.utils.asserts import (
+    CustomFormatChecker,
+    Draft7ValidatorWithStrictInteger,
+    get_record_shape,
+    get_value_dependent_paths,
+    verify_records_schema,
+)
 
 from airbyte_protocol.models import (
     AirbyteRecordMessage,
@@ -76,6 +82,8 @@ def test_verify_records_schema(configured_catalog: ConfiguredAirbyteCatalog):
 
     streams_with_errors = verify_records_schema(records, configured_catalog)
     errors = [error.message for error in streams_with_errors["my_stream"].values()]
+    streams_with_errors_without_memoization = verify_records_schema(records, configured_catalog, memoize_valid_shapes=False)
+    assert errors == [error.message for error in streams_with_errors_without_memoization["my_stream"].values()]
 
     assert "my_stream" in streams_with_errors
     assert len(streams_with_errors) == 1, "only one stream"
@@ -120,3 +128,67 @@ def test_validate_records_format(record, configured_catalog, valid):
         assert not streams_with_errors
     else:
         assert streams_with_errors, f"Record {record} should produce errors against {configured_catalog.streams[0].stream.json_schema}"
+
+
+@pytest.mark.parametrize(
+    "schema, expected_paths",
+    [
+        ({"type": "object", "properties": {"a": {"type": "string"}}}, {}),
+        (
+            {"type": "object", "properties": {"a": {"type": "string", "format": "date"}, "b": {"type": "string", "enum": ["x"]}}},
+            {("a",): {"date"}, ("b",): None},
+        ),
+        (
+            {"type": "object", "properties": {"a": {"type": "array", "items": {"anyOf": [{"format": "date"}, {"format": "time"}]}}}},
+            {("a", None): {"date", "time"}},
+        ),
+        ({"type": "object", "properties": {"a": {"type": "object", "additionalProperties": {"type": "string"}}}}, {("a",): None}),
+        ({"type": "object", "properties": {"a": {"$ref": "#/definitions/a"}}}, None),
+    ],
+)
+def test_get_value_dependent_paths(schema, expected_paths):
+    assert get_value_dependent_paths(schema) == expected_paths
+
+
+def test_get_record_shape():
+    value_dependent_paths = {("date",): {"date"}, ("status",): None}
+    checker = CustomFormatChecker()
+
+    def shape(record):
+        return get_record_shape(record, value_dependent_paths, checker)
+
+    assert shape({"id": 1, "date": "2020-12-20", "status": "ok"}) == shape({"status": "ok", "date": "2021-01-01", "id": 2})
+    assert shape({"id": 1}) != shape({"id": 1.0})
+    assert shape({"id": 1}) != shape({"id": True})
+    assert shape({"date": "2020-12-20"}) != shape({"date": "2020-20-20"})
+    assert shape({"status": "ok"}) != shape({"status": "ko"})
+    assert shape({"tags": ["a", "b"]}) == shape({"tags": ["c"]})
+    assert shape({"tags": ["a", 1]}) != shape({"tags": ["a"]})
+
+
+def test_verify_records_schema_skips_valid_shapes(mocker, configured_catalog: ConfiguredAirbyteCatalog):
+    records = [AirbyteRecordMessage(stream="my_stream", data={"text": f"text_{i}", "number": i}, emitted_at=0) for i in range(10)] + [
+        AirbyteRecordMessage(stream="my_stream", data={"text": None, "number": i}, emitted_at=0) for i in range(2)
+    ]
+    iter_errors_spy = mocker.spy(Draft7ValidatorWithStrictInteger, "iter_errors")
+
+    streams_with_errors = verify_records_schema(records, configured_catalog)
+
+    assert list(streams_with_errors["my_stream"]) == ["deque(['properties', 'text', 'type'])"]
+    # One validation for the valid shape, invalid records are always validated
+    assert iter_errors_spy.call_count == 3
+
+
+@pytest.mark.parametrize(
+    "configured_catalog",
+    [{"type": "object", "properties": {"a": {"type": "string", "format": "date"}}}],
+    indirect=["configured_catalog"],
+)
+def test_verify_records_schema_validates_shapes_with_different_format_conformity(configured_catalog: ConfiguredAirbyteCatalog):
+    records = [
+        AirbyteRecordMessage(stream="my_stream", data={"a": "2020-12-20"}, emitted_at=0),
+        AirbyteRecordMessage(stream="my_stream", data={"a": "2020-12-21"}, emitted_at=0),
+        AirbyteRecordMessage(stream="my_stream", data={"a": "2020-20-20"}, emitted_at=0),
+    ]
+    streams_with_errors = verify_records_schema(records, configured_catalog)
+    assert [error.message for error in streams_with_errors["my_stream"].values()] == ["'2020-20-20' is not a 'date'"]
@@ -73,6 +73,26 @@ class TestContainerRunner:
         runner._persist_new_configuration.assert_called_once_with(new_configuration, 1)
         mock_logging.warning.assert_called_once()
 
+    def test_iter_airbyte_messages_from_output_file(self, mocker, tmp_path):
+        output_file_path = tmp_path / "output.txt"
+        output_file_path.write_text(
+            "\n".join(
+                [
+                    AirbyteMessage(
+                        type=AirbyteMessageType.RECORD, record=AirbyteRecordMessage(stream="test_stream", data={"foo": i}, emitted_at=1.0)
+                    ).json(exclude_unset=False)
+                    for i in range(3)
+                ]
+                + ["invalid message"]
+            )
+        )
+        runner = connector_runner.ConnectorRunner(mocker.Mock())
+        messages = runner.iter_airbyte_messages_from_command_output(runner._read_lines_and_remove_file(output_file_path))
+
+        assert next(messages).record.data == {"foo": 0}
+        assert [message.record.data for message in messages] == [{"foo": 1}, {"foo": 2}]
+        assert not output_file_path.exists()
+
     @pytest.mark.parametrize(
         "pass_configuration_path, old_configuration, new_configuration, new_configuration_emitted_at, expect_new_configuration",
         [
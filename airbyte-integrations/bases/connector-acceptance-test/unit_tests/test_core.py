@@ -966,7 +966,7 @@ async def test_read(mocker, schema, ignored_fields, expect_records_config, recor
         ]
     )
     docker_runner_mock = mocker.MagicMock(
-        call_read=mocker.AsyncMock(
+        call_read_iter=mocker.AsyncMock(
             return_value=[
                 AirbyteMessage(type=Type.RECORD, record=AirbyteRecordMessage(stream="test_stream", data=record, emitted_at=111))
                 for record in records
@@ -1673,7 +1673,7 @@ async def test_read_validate_async_output_stream_statuses(mocker):
             ),
         ),
     ]
-    docker_runner_mock = mocker.MagicMock(call_read=mocker.AsyncMock(return_value=async_stream_output))
+    docker_runner_mock = mocker.MagicMock(call_read_iter=mocker.AsyncMock(return_value=async_stream_output))
 
     t = test_core.TestBasicRead()
     await t.test_read(
@@ -1774,7 +1774,7 @@ async def test_read_validate_stream_statuses_exceptions(mocker, output):
             )
         ]
     )
-    docker_runner_mock = mocker.MagicMock(call_read=mocker.AsyncMock(return_value=output))
+    docker_runner_mock = mocker.MagicMock(call_read_iter=mocker.AsyncMock(return_value=output))
 
     t = test_core.TestBasicRead()
     with pytest.raises(AssertionError):
@@ -1967,7 +1967,7 @@ async def test_read_validate_async_output_state_messages(mocker, state_message_p
     if not state_message_params:
         async_stream_output.pop()
         print(async_stream_output)
-    docker_runner_mock = mocker.MagicMock(call_read=mocker.AsyncMock(return_value=async_stream_output))
+    docker_runner_mock = mocker.MagicMock(call_read_iter=mocker.AsyncMock(return_value=async_stream_output))
 
     t = test_core.TestBasicRead()
 
@@ -2100,7 +2100,7 @@ async def test_read_validate_primary_keys_data_type(mocker, primary_key, record,
     stream_output = [
         AirbyteMessage(type=Type.RECORD, record=AirbyteRecordMessage(stream=stream_name, data=record, emitted_at=1)),
     ]
-    docker_runner_mock = mocker.MagicMock(call_read=mocker.AsyncMock(return_value=stream_output))
+    docker_runner_mock = mocker.MagicMock(call_read_iter=mocker.AsyncMock(return_value=stream_output))
 
     t = test_core.TestBasicRead()
     with expectation:
@@ -1,10 +1,25 @@
 # Copyright (c) 2023 Airbyte, Inc., all rights reserved.
 
 import json
+import logging
+import time
 from typing import Dict, List, Optional
 
 import requests
 import urllib3
+from requests.adapters import HTTPAdapter
+
+
+LOGGER = logging.getLogger("airbyte")
+
+# connections kept alive for the requests sent in parallel
+DEFAULT_MAX_CONNECTIONS = 20
+# (connect, read) timeouts of a request, in seconds
+REQUEST_TIMEOUT = (10, 120)
+MAX_RETRIES = 5
+RETRY_BACKOFF_SECONDS = 1
+RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+DOCUMENT_ALREADY_EXISTS = "DOCUMENT_ALREADY_EXISTS"
 
 
 class AstraClient:
@@ -15,6 +30,7 @@ class AstraClient:
         keyspace_name: str,
         embedding_dim: int,
         similarity_function: str,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
     ):
         self.astra_endpoint = astra_endpoint
         self.astra_application_token = astra_application_token
@@ -29,19 +45,39 @@ class AstraClient:
             "User-Agent": "airbyte",
         }
 
+        # the session is shared by the threads sending requests, so the pool keeps a connection alive for each of them
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_connections)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _send_query(self, request_url: str, query: Dict) -> Dict:
+        """
+        Sends the query and returns the response, retrying with an exponential backoff when the connection fails,
+        the request times out or Astra DB is throttling or unavailable.
+        """
+        data = json.dumps(query)
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                response = self.session.post(request_url, headers=self.request_header, data=data, timeout=REQUEST_TIMEOUT)
+                if response.status_code == 200:
+                    return json.loads(response.text)
+                if response.status_code not in RETRYABLE_STATUS_CODES or attempt == MAX_RETRIES:
+                    raise urllib3.exceptions.HTTPError(f"Astra DB not available. Status code: {response.status_code}, {response.text}")
+                reason = f"status code {response.status_code}"
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if attempt == MAX_RETRIES:
+                    raise
+                reason = str(e)
+            backoff = RETRY_BACKOFF_SECONDS * 2**attempt
+            LOGGER.warning(f"Astra DB request failed with {reason}, retrying in {backoff} seconds.")
+            time.sleep(backoff)
+
     def _run_query(self, request_url: str, query: Dict):
-        try:
-            response = requests.request("POST", request_url, headers=self.request_header, data=json.dumps(query))
-            if response.status_code == 200:
-                response_dict = json.loads(response.text)
-                if "errors" in response_dict:
-                    raise Exception(f"Astra DB request error - {response_dict['errors']}")
-                else:
-                    return response_dict
-            else:
-                raise urllib3.exceptions.HTTPError(f"Astra DB not available. Status code: {response.status_code}, {response.text}")
-        except Exception:
-            raise
+        response_dict = self._send_query(request_url, query)
+        if "errors" in response_dict:
+            raise Exception(f"Astra DB request error - {response_dict['errors']}")
+        return response_dict
 
     def find_collections(self, include_detail: bool = True):
         query = {"findCollections": {"options": {"explain": include_detail}}}
@@ -120,8 +156,17 @@ class AstraClient:
         return result["status"]["insertedIds"][0]
 
     def insert_documents(self, collection_name: str, documents: List[Dict]) -> List[str]:
-        query = {"insertMany": {"documents": documents}}
-        result = self._run_query(self._build_collection_query(collection_name), query)
+        """
+        Inserts the documents, which must have an _id, with an unordered insertMany.
+
+        A retried request may insert documents already inserted by the failed attempt. They are rejected as already existing,
+        which is ignored, so the retries are idempotent.
+        """
+        query = {"insertMany": {"documents": documents, "options": {"ordered": False}}}
+        result = self._send_query(self._build_collection_query(collection_name), query)
+        errors = [error for error in result.get("errors", []) if error.get("errorCode") != DOCUMENT_ALREADY_EXISTS]
+        if errors:
+            raise Exception(f"Astra DB request error - {errors}")
 
         return result["status"]["insertedIds"]
 
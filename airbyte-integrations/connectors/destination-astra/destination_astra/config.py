@@ -31,6 +31,13 @@ class AstraIndexingModel(BaseModel):
         title="Astra DB collection",
         description="Collections hold data. They are analagous to tables in traditional Cassandra terminology. This tool will create the collection with the provided name automatically if it does not already exist. Alternatively, you can create one thorugh the Data Explorer tab in the Astra UI.",
     )
+    max_concurrent_requests: int = Field(
+        default=10,
+        title="Max Concurrent Requests",
+        description="The maximum number of insert requests sent to Astra DB in parallel. Lower it if Astra DB is throttling the requests.",
+        ge=1,
+        le=50,
+    )
 
     class Config:
         title = "Indexing"
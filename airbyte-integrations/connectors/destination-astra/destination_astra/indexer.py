@@ -3,6 +3,7 @@
 #
 
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 import urllib3
@@ -15,8 +16,8 @@ from destination_astra.astra_client import AstraClient
 from destination_astra.config import AstraIndexingModel
 
 
-# do not flood the server with too many connections in parallel
-PARALLELISM_LIMIT = 20
+# maximum number of documents of an insertMany request accepted by the Data API
+INSERT_BATCH_SIZE = 20
 
 MAX_METADATA_SIZE = 40_960 - 10_000
 
@@ -30,7 +31,12 @@ class AstraIndexer(Indexer):
         super().__init__(config)
 
         self.client = AstraClient(
-            config.astra_db_endpoint, config.astra_db_app_token, config.astra_db_keyspace, embedding_dimensions, "cosine"
+            config.astra_db_endpoint,
+            config.astra_db_app_token,
+            config.astra_db_keyspace,
+            embedding_dimensions,
+            "cosine",
+            max_connections=config.max_concurrent_requests,
         )
 
         self.embedding_dimensions = embedding_dimensions
@@ -60,11 +66,14 @@ class AstraIndexer(Indexer):
                 **metadata,
             }
             docs.append(doc)
-        serial_batches = create_chunks(docs, batch_size=PARALLELISM_LIMIT)
-
-        for batch in serial_batches:
-            results = [chunk for chunk in batch]
-            self.client.insert_documents(collection_name=self.config.collection, documents=results)
+        batches = [list(batch) for batch in create_chunks(docs, batch_size=INSERT_BATCH_SIZE)]
+        if not batches:
+            return
+
+        # do not flood the server with too many requests in parallel
+        with ThreadPoolExecutor(max_workers=min(self.config.max_concurrent_requests, len(batches))) as executor:
+            # consuming the results raises the first error of the requests
+            list(executor.map(lambda batch: self.client.insert_documents(collection_name=self.config.collection, documents=batch), batches))
 
     def delete(self, delete_ids, namespace, stream):
         if len(delete_ids) > 0:
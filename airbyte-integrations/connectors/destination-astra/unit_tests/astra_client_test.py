@@ -0,0 +1,189 @@
+#
+# Copyright (c) 2023 Airbyte, Inc., all rights reserved.
+#
+
+import json
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock, patch
+
+import pytest
+import urllib3
+from destination_astra.astra_client import AstraClient
+from destination_astra.config import AstraIndexingModel
+from destination_astra.indexer import AstraIndexer
+
+
+logger = logging.getLogger("airbyte")
+
+KEYSPACE = "mykeyspace"
+COLLECTION = "mycollection"
+
+
+class AstraStub:
+    """
+    Data API stub serving insertMany and countDocuments over HTTP/1.1, with a latency added to every request.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.documents = {}
+        self.requests = 0
+        self.connections = set()
+        self.max_concurrent_requests = 0
+        # status codes returned once the documents of the next requests are inserted
+        self.failures = []
+        self._concurrent_requests = 0
+        self._lock = threading.Lock()
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                query = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with stub._lock:
+                    stub.requests += 1
+                    stub.connections.add(self.client_address)
+                    stub._concurrent_requests += 1
+                    stub.max_concurrent_requests = max(stub.max_concurrent_requests, stub._concurrent_requests)
+                try:
+                    time.sleep(stub.latency)
+                    status, body = stub.handle(query)
+                finally:
+                    with stub._lock:
+                        stub._concurrent_requests -= 1
+                body = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def handle(self, query):
+        if "countDocuments" in query:
+            return 200, {"status": {"count": len(self.documents)}}
+        inserted_ids, errors = [], []
+        with self._lock:
+            for document in query["insertMany"]["documents"]:
+                if document["_id"] in self.documents:
+                    errors.append({"message": "Document already exists with the given _id", "errorCode": "DOCUMENT_ALREADY_EXISTS"})
+                else:
+                    self.documents[document["_id"]] = document
+                    inserted_ids.append(document["_id"])
+            if self.failures:
+                return self.failures.pop(0), {}
+        body = {"status": {"insertedIds": inserted_ids}}
+        if errors:
+            body["errors"] = errors
+        return 200, body
+
+
+@pytest.fixture(name="stub")
+def stub_fixture():
+    stub = AstraStub()
+    with patch("destination_astra.astra_client.RETRY_BACKOFF_SECONDS", 0):
+        yield stub
+    stub.close()
+
+
+def create_client(stub, max_connections=20):
+    return AstraClient(stub.url, "mytoken", KEYSPACE, 3, "cosine", max_connections=max_connections)
+
+
+def create_indexer(stub, max_concurrent_requests):
+    config = AstraIndexingModel(
+        astra_db_app_token="mytoken",
+        astra_db_endpoint="https://8292d414-dd1b-4c33-8431-e838bedc04f7-us-east1.apps.astra.datastax.com",
+        astra_db_keyspace=KEYSPACE,
+        collection=COLLECTION,
+        max_concurrent_requests=max_concurrent_requests,
+    )
+    indexer = AstraIndexer(config, 3)
+    indexer.client = create_client(stub, max_concurrent_requests)
+    return indexer
+
+
+def create_chunks(count):
+    return [Mock(page_content=f"test {i}", metadata={"_ab_stream": "abc"}, embedding=[i, i, i]) for i in range(count)]
+
+
+def test_requests_reuse_connections(stub):
+    client = create_client(stub)
+    for i in range(5):
+        client.insert_documents(COLLECTION, [{"_id": str(i)}])
+
+    assert client.count_documents(COLLECTION) == 5
+    assert len(stub.connections) == 1
+
+
+def test_retried_insert_is_idempotent(stub):
+    stub.failures = [503, 504]
+    client = create_client(stub)
+
+    client.insert_documents(COLLECTION, [{"_id": str(i)} for i in range(3)])
+
+    assert sorted(stub.documents) == ["0", "1", "2"]
+    assert stub.requests == 3
+
+
+def test_insert_raises_other_errors(stub):
+    client = create_client(stub)
+    stub.handle = lambda query: (200, {"errors": [{"message": "Document size limit exceeded", "errorCode": "SHRED_DOC_LIMIT_VIOLATION"}]})
+
+    with pytest.raises(Exception, match="SHRED_DOC_LIMIT_VIOLATION"):
+        client.insert_documents(COLLECTION, [{"_id": "0"}])
+
+
+def test_insert_raises_after_max_retries(stub):
+    with patch("destination_astra.astra_client.MAX_RETRIES", 2):
+        stub.failures = [503] * 3
+        client = create_client(stub)
+
+        with pytest.raises(urllib3.exceptions.HTTPError, match="Status code: 503"):
+            client.insert_documents(COLLECTION, [{"_id": "0"}])
+        assert stub.requests == 3
+
+
+def test_index_sends_batches_concurrently(stub):
+    stub.latency = 0.05
+    indexer = create_indexer(stub, max_concurrent_requests=4)
+
+    indexer.index(create_chunks(200), "ns1", "some_stream")
+
+    assert len(stub.documents) == 200
+    assert stub.requests == 10
+    assert 1 < stub.max_concurrent_requests <= 4
+
+
+def test_index_throughput_with_latency(stub):
+    stub.latency = 0.05
+    chunk_count = 1000
+
+    durations = {}
+    for max_concurrent_requests in (1, 10):
+        indexer = create_indexer(stub, max_concurrent_requests)
+        start = time.perf_counter()
+        indexer.index(create_chunks(chunk_count), "ns1", "some_stream")
+        durations[max_concurrent_requests] = time.perf_counter() - start
+
+    logger.info(
+        f"Indexing {chunk_count} documents with {stub.latency * 1000:.0f}ms of latency per request: "
+        + ", ".join(f"{count} concurrent requests {chunk_count / duration:.0f} documents/s" for count, duration in durations.items())
+    )
+    assert len(stub.documents) == 2 * chunk_count
+    assert durations[10] * 4 < durations[1]
@@ -4,12 +4,13 @@
 
 import logging
 from decimal import Decimal
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Union
 
 import awswrangler as wr
 import boto3
 import botocore
 import pandas as pd
+import pyarrow as pa
 from awswrangler import _data_types
 from botocore.credentials import AssumeRoleCredentialFetcher, CredentialResolver, DeferredRefreshableCredentials, JSONFileCache
 from botocore.exceptions import ClientError
@@ -68,6 +69,43 @@ def _cast_pandas_column(df: pd.DataFrame, col: str, current_type: str, desired_t
 _data_types._cast_pandas_column = _cast_pandas_column
 
 
+def _arrow_types_mapper(typ: pa.DataType) -> Optional[pd.api.extensions.ExtensionDtype]:
+    # Same dtypes as the ones awswrangler casts the glue types to, so that it does not cast the columns again
+    if pa.types.is_int64(typ):
+        return pd.Int64Dtype()
+    if pa.types.is_boolean(typ):
+        return pd.BooleanDtype()
+    if pa.types.is_string(typ):
+        return pd.StringDtype("pyarrow")
+    return None
+
+
+def _has_timestamps(typ: pa.DataType) -> bool:
+    if pa.types.is_timestamp(typ):
+        return True
+    if pa.types.is_list(typ):
+        return _has_timestamps(typ.value_type)
+    if pa.types.is_struct(typ):
+        return any(_has_timestamps(field.type) for field in typ)
+    return False
+
+
+def _to_pandas(data: Union[pd.DataFrame, pa.Table]) -> pd.DataFrame:
+    # awswrangler only writes pandas DataFrames
+    if not isinstance(data, pa.Table):
+        return data
+
+    columns = {}
+    for field, column in zip(data.schema, data.columns):
+        if pa.types.is_nested(field.type) and _has_timestamps(field.type):
+            # to_pandas would convert the nested timestamps to integers
+            columns[field.name] = pd.Series(column.to_pylist(), dtype=object)
+        else:
+            columns[field.name] = column.to_pandas(types_mapper=_arrow_types_mapper)
+
+    return pd.DataFrame(columns)
+
+
 # This class created to support refreshing sts role assumption credentials for long running syncs
 class AssumeRoleProvider(object):
     METHOD = "assume-role"
@@ -198,9 +236,17 @@ class AwsHandler:
         )
 
     def _write(
-        self, df: pd.DataFrame, path: str, database: str, table: str, mode: str, dtype: Dict[str, str], partition_cols: list = None
+        self,
+        data: Union[pd.DataFrame, pa.Table],
+        path: str,
+        database: str,
+        table: str,
+        mode: str,
+        dtype: Dict[str, str],
+        partition_cols: list = None,
     ) -> Any:
         self._create_database_if_not_exists(database)
+        df = _to_pandas(data)
 
         if self._config.format_type == OutputFormat.JSONL:
             return self._write_json(df, path, database, table, mode, dtype, partition_cols)
@@ -251,10 +297,10 @@ class AwsHandler:
             self.delete_table(database, table)
             self.delete_table_objects(database, table)
 
-    def write(self, df: pd.DataFrame, database: str, table: str, dtype: Dict[str, str], partition_cols: list):
+    def write(self, data: Union[pd.DataFrame, pa.Table], database: str, table: str, dtype: Dict[str, str], partition_cols: list):
         path = self._get_s3_path(database, table)
         return self._write(
-            df,
+            data,
             path,
             database,
             table,
@@ -263,10 +309,10 @@ class AwsHandler:
             partition_cols,
         )
 
-    def append(self, df: pd.DataFrame, database: str, table: str, dtype: Dict[str, str], partition_cols: list):
+    def append(self, data: Union[pd.DataFrame, pa.Table], database: str, table: str, dtype: Dict[str, str], partition_cols: list):
         path = self._get_s3_path(database, table)
         return self._write(
-            df,
+            data,
             path,
             database,
             table,
@@ -275,10 +321,10 @@ class AwsHandler:
             partition_cols,
         )
 
-    def upsert(self, df: pd.DataFrame, database: str, table: str, dtype: Dict[str, str], partition_cols: list):
+    def upsert(self, data: Union[pd.DataFrame, pa.Table], database: str, table: str, dtype: Dict[str, str], partition_cols: list):
         path = self._get_s3_path(database, table)
         return self._write(
-            df,
+            data,
             path,
             database,
             table,
@@ -94,7 +94,7 @@ class DestinationAwsDatalake(Destination):
 
                 # Flush records every RECORD_FLUSH_INTERVAL records to limit memory consumption
                 # Records will either get flushed when a state message is received or when hitting the RECORD_FLUSH_INTERVAL
-                if len(streams[stream]._messages) > RECORD_FLUSH_INTERVAL:
+                if streams[stream].buffered_record_count > RECORD_FLUSH_INTERVAL:
                     logger.debug(f"Reached size limit: flushing records for {stream}")
                     streams[stream].flush(partial=True)
 
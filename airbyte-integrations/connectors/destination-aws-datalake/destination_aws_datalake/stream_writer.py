@@ -6,15 +6,18 @@ import json
 import logging
 from datetime import date, datetime
 from decimal import Decimal, getcontext
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from awswrangler import _data_types
 
 from airbyte_cdk.models import ConfiguredAirbyteStream, DestinationSyncMode
 
 from .aws import AwsHandler
 from .config_reader import ConnectorConfig, PartitionOptions
-from .constants import EMPTY_VALUES, GLUE_TYPE_MAPPING_DECIMAL, GLUE_TYPE_MAPPING_DOUBLE, PANDAS_TYPE_MAPPING
+from .constants import EMPTY_VALUES, GLUE_TYPE_MAPPING_DECIMAL, GLUE_TYPE_MAPPING_DOUBLE
 
 
 # By default we set glue decimal type to decimal(28,25)
@@ -22,6 +25,12 @@ from .constants import EMPTY_VALUES, GLUE_TYPE_MAPPING_DECIMAL, GLUE_TYPE_MAPPIN
 getcontext().prec = 25
 logger = logging.getLogger("airbyte")
 
+# The buffered values are converted to Arrow arrays every ARROW_CHUNK_ROWS records,
+# so that only the last records are kept as Python objects
+ARROW_CHUNK_ROWS = 1000
+
+TIMESTAMP_TYPE = pa.timestamp("ns", tz="UTC")
+
 
 class DictEncoder(json.JSONEncoder):
     def default(self, obj):
@@ -38,6 +47,53 @@ class DictEncoder(json.JSONEncoder):
         return super(DictEncoder, self).default(obj)
 
 
+def _cast_string(value: Any) -> Optional[str]:
+    return str(value) if value and value != "" else None
+
+
+def _cast_number(value: Any) -> Any:
+    if type(value) in (int, float):
+        return value
+
+    return pd.to_numeric(value, errors="coerce")
+
+
+def _cast_timestamp(value: Any) -> Any:
+    if isinstance(value, str):
+        try:
+            timestamp = pd.Timestamp(datetime.fromisoformat(value))
+        except ValueError:
+            pass
+        else:
+            return timestamp.tz_convert("UTC") if timestamp.tzinfo else timestamp.tz_localize("UTC")
+
+    return pd.to_datetime(value, errors="coerce", utc=True)
+
+
+def _cast_integer(value: Any) -> Optional[int]:
+    if type(value) is int or value is None:
+        return value
+
+    number = pd.to_numeric(value, errors="coerce")
+    if pd.isna(number):
+        return None
+
+    # Arrow would silently truncate the value
+    if number != int(number):
+        raise ValueError(f"Value {value!r} can't be stored in an integer column")
+
+    return int(number)
+
+
+def _to_timestamp_array(values: List[Any]) -> pa.Array:
+    try:
+        return pc.cast(pa.array(values, pa.string()), TIMESTAMP_TYPE)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Arrow only parses ISO 8601 strings with a zone offset, pandas parses
+        # everything else the same way it did record by record
+        return pa.Array.from_pandas(pd.to_datetime(pd.Series(values, dtype=object), format="mixed", errors="coerce", utc=True))
+
+
 class StreamWriter:
     def __init__(self, aws_handler: AwsHandler, config: ConnectorConfig, configured_stream: ConfiguredAirbyteStream) -> None:
         self._aws_handler: AwsHandler = aws_handler
@@ -50,11 +106,24 @@ class StreamWriter:
         self._table: str = configured_stream.stream.name
         self._database: str = self._configured_stream.stream.namespace or self._config.lakeformation_database_name
 
-        self._messages = []
+        # The type plan of the stream, from which the records are cast to Arrow arrays
+        self._glue_dtypes, self._json_casts = self._get_glue_dtypes_from_json_schema(self._schema)
+        self._columns: List[Tuple[str, Callable[[Any], Any], Callable[[List[Any]], pa.Array]]] = [
+            (col, self._get_value_cast(col), self._get_array_conversion(col)) for col in self._schema
+        ]
+        self._values: Dict[str, List[Any]]
+        self._chunks: Dict[str, List[pa.Array]]
+        self._record_count: int
+        self._clear_buffer()
+
         self._partial_flush_count = 0
 
         logger.info(f"Creating StreamWriter for {self._database}:{self._table}")
 
+    @property
+    def buffered_record_count(self) -> int:
+        return self._record_count
+
     def _get_date_columns(self) -> List[str]:
         date_columns = []
         for key, val in self._schema.items():
@@ -66,7 +135,7 @@ class StreamWriter:
 
         return date_columns
 
-    def _add_partition_column(self, col: str, df: pd.DataFrame) -> Dict[str, str]:
+    def _add_partition_column(self, col: str, columns: Dict[str, pa.ChunkedArray]) -> Dict[str, str]:
         partitioning = self._config.partitioning
 
         if partitioning == PartitionOptions.NONE:
@@ -86,36 +155,28 @@ class StreamWriter:
             # aside from the above, awswrangler will remove data from a table if the partition value is null
             # see: https://github.com/aws/aws-sdk-pandas/issues/921
             if partition == "YEAR":
-                df[date_col] = df[col].dt.strftime("%Y").fillna("0").astype("Int64")
+                columns[date_col] = pc.year(columns[col]).fill_null(0)
 
             elif partition == "MONTH":
-                df[date_col] = df[col].dt.strftime("%m").fillna("0").astype("Int64")
+                columns[date_col] = pc.month(columns[col]).fill_null(0)
 
             elif partition == "DAY":
-                df[date_col] = df[col].dt.strftime("%d").fillna("0").astype("Int64")
+                columns[date_col] = pc.day(columns[col]).fill_null(0)
 
             elif partition == "DATE":
                 fields[date_col] = "date"
-                df[date_col] = df[col].dt.strftime("%Y-%m-%d")
+                columns[date_col] = columns[col].cast(pa.date32())
 
         return fields
 
-    def _drop_additional_top_level_properties(self, record: Dict[str, Any]) -> Dict[str, Any]:
+    def _compile_json_schema_cast(self, schema_entry: Dict[str, Any]) -> Callable[[Any], Any]:
         """
-        Helper that removes any unexpected top-level properties from the record.
-        Since the json schema is used to build the table and cast types correctly,
-        we need to remove any unexpected properties that can't be casted accurately.
+        Helper that returns the function casting a value to the type of a json schema entry,
+        so that the schema is only walked once per stream.
         """
-        schema_keys = self._schema.keys()
-        records_keys = record.keys()
-        difference = list(set(records_keys).difference(set(schema_keys)))
-
-        for key in difference:
-            del record[key]
+        if not isinstance(schema_entry, dict):
+            return lambda value: value
 
-        return record
-
-    def _json_schema_cast_value(self, value, schema_entry) -> Any:
         typ = schema_entry.get("type")
         typ = self._get_json_schema_type(typ)
         props = schema_entry.get("properties")
@@ -124,42 +185,56 @@ class StreamWriter:
         if typ == "string":
             format = schema_entry.get("format")
             if format == "date-time":
-                return pd.to_datetime(value, errors="coerce", utc=True)
+                return _cast_timestamp
 
-            return str(value) if value and value != "" else None
+            return _cast_string
 
         elif typ == "integer":
-            return pd.to_numeric(value, errors="coerce")
+            return _cast_number
 
         elif typ == "number":
             if self._config.glue_catalog_float_as_decimal:
-                return Decimal(str(value)) if value else Decimal("0")
-            return pd.to_numeric(value, errors="coerce")
+                return lambda value: Decimal(str(value)) if value else Decimal("0")
+            return _cast_number
 
         elif typ == "boolean":
-            return bool(value)
+            return bool
 
         elif typ == "null":
-            return None
+            return lambda value: None
 
         elif typ == "object":
-            if value in EMPTY_VALUES:
-                return None
+            prop_casts = {key: self._compile_json_schema_cast(val) for key, val in props.items()} if props else None
 
-            if isinstance(value, dict) and props:
-                for key, val in value.items():
-                    if key in props:
-                        value[key] = self._json_schema_cast_value(val, props[key])
+            def cast_object(value):
+                if value in EMPTY_VALUES:
+                    return None
+
+                if isinstance(value, dict) and prop_casts:
+                    for key, val in value.items():
+                        if key in prop_casts:
+                            value[key] = prop_casts[key](val)
                 return value
 
+            return cast_object
+
         elif typ == "array" and items:
-            if value in EMPTY_VALUES:
-                return None
+            item_cast = self._compile_json_schema_cast(items)
 
-            if isinstance(value, list):
-                return [self._json_schema_cast_value(item, items) for item in value]
+            def cast_array(value):
+                if value in EMPTY_VALUES:
+                    return None
 
-        return value
+                if isinstance(value, list):
+                    return [item_cast(item) for item in value]
+                return value
+
+            return cast_array
+
+        return lambda value: value
+
+    def _json_schema_cast_value(self, value, schema_entry) -> Any:
+        return self._compile_json_schema_cast(schema_entry)(value)
 
     def _json_schema_cast(self, record: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -203,24 +278,45 @@ class StreamWriter:
 
         return types[0]
 
-    def _get_pandas_dtypes_from_json_schema(self, df: pd.DataFrame) -> Dict[str, str]:
-        column_types = {}
+    def _get_value_cast(self, col: str) -> Callable[[Any], Any]:
+        """
+        Helper that returns the function casting the values of a top level column before they are converted to Arrow.
+        """
+        schema_entry = self._schema[col]
+        glue_type = self._glue_dtypes[col]
+        typ = self._get_json_schema_type(schema_entry.get("type"))
+        cast = self._compile_json_schema_cast(schema_entry)
+
+        # Make sure complex types that can't be converted
+        # to a struct or array are converted to a json string
+        # so they can be queried with json_extract
+        if col in self._json_casts:
+            return lambda value: json.dumps(cast(value), cls=DictEncoder)
 
-        typ = "string"
-        for col in df.columns:
-            if col in self._schema:
-                typ = self._schema[col].get("type", "string")
-                airbyte_type = self._schema[col].get("airbyte_type")
+        if glue_type in ["timestamp", "date"]:
+            # parsed a chunk at a time
+            return lambda value: value
 
-                # special case where the json schema type contradicts the airbyte type
-                if airbyte_type and typ == "number" and airbyte_type == "integer":
-                    typ = "integer"
+        if glue_type == "bigint":
+            return _cast_integer
+
+        # other types stored as strings, like unknown types
+        if glue_type == "string" and typ not in ["string", "null"]:
+            return lambda value: None if value is None else str(value)
 
-                typ = self._get_json_schema_type(typ)
+        return cast
 
-            column_types[col] = PANDAS_TYPE_MAPPING.get(typ, "string")
+    def _get_array_conversion(self, col: str) -> Callable[[List[Any]], pa.Array]:
+        glue_type = self._glue_dtypes[col]
 
-        return column_types
+        if glue_type == "timestamp":
+            return _to_timestamp_array
+
+        if glue_type == "date":
+            return lambda values: _to_timestamp_array(values).cast(pa.date32())
+
+        arrow_type = _data_types.athena2pyarrow(glue_type)
+        return lambda values: pa.array(values, arrow_type, from_pandas=True)
 
     def _get_json_schema_types(self) -> Dict[str, str]:
         types = {}
@@ -370,9 +466,29 @@ class StreamWriter:
         return self._configured_stream.cursor_field
 
     def append_message(self, message: Dict[str, Any]):
-        clean_message = self._drop_additional_top_level_properties(message)
-        clean_message = self._json_schema_cast(clean_message)
-        self._messages.append(clean_message)
+        # properties missing from the json schema are dropped, they can't be casted accurately
+        for col, cast_value, _ in self._columns:
+            self._values[col].append(cast_value(message.get(col)))
+
+        self._record_count += 1
+        if self._record_count % ARROW_CHUNK_ROWS == 0:
+            self._convert_values_to_arrow()
+
+    def _convert_values_to_arrow(self) -> None:
+        for col, _, to_array in self._columns:
+            values = self._values[col]
+            if values:
+                self._chunks[col].append(to_array(values))
+                self._values[col] = []
+
+    def _clear_buffer(self) -> None:
+        self._values = {col: [] for col in self._schema}
+        self._chunks = {col: [] for col in self._schema}
+        self._record_count = 0
+
+    def _get_arrow_columns(self) -> Dict[str, pa.ChunkedArray]:
+        self._convert_values_to_arrow()
+        return {col: pa.chunked_array(chunks) for col, chunks in self._chunks.items()}
 
     def reset(self):
         logger.info(f"Deleting table {self._database}:{self._table}")
@@ -382,42 +498,29 @@ class StreamWriter:
             logger.warning(f"Failed to reset table {self._database}:{self._table}")
 
     def flush(self, partial: bool = False):
-        logger.debug(f"Flushing {len(self._messages)} messages to table {self._database}:{self._table}")
-
-        df = pd.DataFrame(self._messages)
-        # best effort to convert pandas types
-        df = df.astype(self._get_pandas_dtypes_from_json_schema(df), errors="ignore")
+        logger.debug(f"Flushing {self._record_count} messages to table {self._database}:{self._table}")
 
-        if len(df) < 1:
+        if self._record_count < 1:
             logger.info(f"No messages to write to {self._database}:{self._table}")
             return
 
+        columns = self._get_arrow_columns()
+
         partition_fields = {}
-        date_columns = self._get_date_columns()
-        for col in date_columns:
-            if col in df.columns:
-                df[col] = pd.to_datetime(df[col], format="mixed", utc=True)
-
-                # Create date column for partitioning
-                if self._cursor_fields and col in self._cursor_fields:
-                    fields = self._add_partition_column(col, df)
-                    partition_fields.update(fields)
-
-        dtype, json_casts = self._get_glue_dtypes_from_json_schema(self._schema)
-        dtype = {**dtype, **partition_fields}
-        partition_fields = list(partition_fields.keys())
+        for col in self._get_date_columns():
+            # Create date column for partitioning
+            if self._cursor_fields and col in self._cursor_fields:
+                fields = self._add_partition_column(col, columns)
+                partition_fields.update(fields)
 
-        # Make sure complex types that can't be converted
-        # to a struct or array are converted to a json string
-        # so they can be queried with json_extract
-        for col in json_casts:
-            if col in df.columns:
-                df[col] = df[col].apply(lambda x: json.dumps(x, cls=DictEncoder))
+        dtype = {**self._glue_dtypes, **partition_fields}
+        partition_fields = list(partition_fields.keys())
+        table = pa.table(columns)
 
         if self._sync_mode == DestinationSyncMode.overwrite and self._partial_flush_count < 1:
-            logger.debug(f"Overwriting {len(df)} records to {self._database}:{self._table}")
+            logger.debug(f"Overwriting {table.num_rows} records to {self._database}:{self._table}")
             self._aws_handler.write(
-                df,
+                table,
                 self._database,
                 self._table,
                 dtype,
@@ -425,9 +528,9 @@ class StreamWriter:
             )
 
         elif self._sync_mode == DestinationSyncMode.append or self._partial_flush_count > 0:
-            logger.debug(f"Appending {len(df)} records to {self._database}:{self._table}")
+            logger.debug(f"Appending {table.num_rows} records to {self._database}:{self._table}")
             self._aws_handler.append(
-                df,
+                table,
                 self._database,
                 self._table,
                 dtype,
@@ -435,11 +538,11 @@ class StreamWriter:
             )
 
         else:
-            self._messages = []
+            self._clear_buffer()
             raise Exception(f"Unsupported sync mode: {self._sync_mode}")
 
         if partial:
             self._partial_flush_count += 1
 
-        del df
-        self._messages.clear()
+        del table, columns
+        self._clear_buffer()
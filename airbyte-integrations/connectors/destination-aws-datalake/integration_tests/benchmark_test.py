@@ -0,0 +1,175 @@
+#
+# Copyright (c) 2023 Airbyte, Inc., all rights reserved.
+#
+
+import json
+import logging
+import subprocess
+import sys
+
+import pytest
+from destination_aws_datalake.destination import RECORD_FLUSH_INTERVAL
+
+
+logger = logging.getLogger("airbyte")
+
+TOTAL_RECORDS = 2 * RECORD_FLUSH_INTERVAL
+
+# Writes the records of a stream to S3 and Glue mocked by moto, in a fresh process so its peak RSS is its own. The "previous" mode
+# flushes the records like the previous implementation did: each record cast in Python and kept in a list until the flush, which
+# converts the list to a DataFrame whose types are fixed column by column. The number of rows of each Parquet write is recorded.
+BENCHMARK_SCRIPT = """
+import json, os, resource, sys, time
+
+import awswrangler as wr
+import boto3
+import pandas as pd
+from destination_aws_datalake import DestinationAwsDatalake
+from destination_aws_datalake.aws import AwsHandler
+from destination_aws_datalake.config_reader import ConnectorConfig
+from destination_aws_datalake.stream_writer import DictEncoder, StreamWriter
+from moto import mock_aws
+
+from airbyte_cdk.models import AirbyteStream, ConfiguredAirbyteStream, DestinationSyncMode, SyncMode
+
+mode, total_records, flush_interval = sys.argv[1], int(sys.argv[2]), int(sys.argv[3])
+with open("unit_tests/fixtures/config.json", "r") as f:
+    config = ConnectorConfig(**json.loads(f.read()))
+
+PANDAS_TYPE_MAPPING = {"string": "string", "integer": "Int64", "number": "float64", "boolean": "bool", "object": "object", "array": "object"}
+STREAM_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "id": {"type": "integer"},
+        "name": {"type": ["null", "string"]},
+        "price": {"type": ["null", "number"]},
+        "active": {"type": "boolean"},
+        "updated_at": {"type": "string", "format": "date-time"},
+        "created_on": {"type": ["null", "string"], "format": "date"},
+        "address": {"type": "object", "properties": {"city": {"type": "string"}, "zip": {"type": "integer"}}},
+        "tags": {"type": "array", "items": {"type": "string"}},
+        "attributes": {"type": "object"},
+        "description": {"type": "string"},
+    },
+}
+
+
+written_rows = []
+to_parquet = wr.s3.to_parquet
+
+
+def counting_to_parquet(df, *args, **kwargs):
+    written_rows.append(len(df))
+    return to_parquet(df, *args, **kwargs)
+
+
+wr.s3.to_parquet = counting_to_parquet
+
+
+def record(i):
+    return {
+        "id": i,
+        "name": f"name {i}",
+        "price": i / 100,
+        "active": i % 2 == 0,
+        "updated_at": f"2023-{i % 12 + 1:02d}-{i % 28 + 1:02d}T10:36:39Z",
+        "created_on": f"2023-{i % 12 + 1:02d}-01",
+        "address": {"city": f"city {i % 100}", "zip": i % 99999},
+        "tags": ["a", str(i)],
+        "attributes": {"key": i, "values": [1, 2]},
+        "description": "x" * 200,
+    }
+
+
+def previous_cast_value(writer, value, schema_entry):
+    typ = writer._get_json_schema_type(schema_entry.get("type"))
+    if typ == "string":
+        if schema_entry.get("format") == "date-time":
+            return pd.to_datetime(value, errors="coerce", utc=True)
+        return str(value) if value and value != "" else None
+    elif typ in ("integer", "number"):
+        return pd.to_numeric(value, errors="coerce")
+    elif typ == "boolean":
+        return bool(value)
+    elif typ == "object" and isinstance(value, dict) and schema_entry.get("properties"):
+        props = schema_entry["properties"]
+        return {key: previous_cast_value(writer, val, props[key]) if key in props else val for key, val in value.items()}
+    elif typ == "array" and isinstance(value, list) and schema_entry.get("items"):
+        return [previous_cast_value(writer, item, schema_entry["items"]) for item in value]
+    return value
+
+
+def previous_flush(writer, messages):
+    df = pd.DataFrame(messages)
+    df = df.astype(
+        {col: PANDAS_TYPE_MAPPING.get(writer._get_json_schema_type(writer._schema[col].get("type")), "string") for col in df.columns},
+        errors="ignore",
+    )
+    for col in writer._get_date_columns():
+        df[col] = pd.to_datetime(df[col], format="mixed", utc=True)
+    dtype, json_casts = writer._get_glue_dtypes_from_json_schema(writer._schema)
+    for col in json_casts:
+        df[col] = df[col].apply(lambda x: json.dumps(x, cls=DictEncoder))
+    writer._aws_handler.append(df, writer._database, writer._table, dtype, [])
+
+
+def previous_write(writer):
+    messages = []
+    for i in range(total_records):
+        data = record(i)
+        messages.append({key: previous_cast_value(writer, data.get(key), entry) for key, entry in writer._schema.items()})
+        if len(messages) == flush_interval:
+            previous_flush(writer, messages)
+            messages = []
+
+
+def arrow_write(writer):
+    for i in range(total_records):
+        writer.append_message(record(i))
+        if writer.buffered_record_count == flush_interval:
+            writer.flush(partial=True)
+
+
+os.environ.update({"AWS_ACCESS_KEY_ID": "testing", "AWS_SECRET_ACCESS_KEY": "testing"})
+with mock_aws():
+    boto3.Session(region_name=config.region).client("s3").create_bucket(Bucket=config.bucket_name)
+    stream = ConfiguredAirbyteStream(
+        stream=AirbyteStream(name="benchmark", json_schema=STREAM_SCHEMA, supported_sync_modes=[SyncMode.incremental]),
+        sync_mode=SyncMode.incremental,
+        destination_sync_mode=DestinationSyncMode.append,
+    )
+    writer = StreamWriter(AwsHandler(config, DestinationAwsDatalake()), config, stream)
+    initial_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    start = time.perf_counter()
+    previous_write(writer) if mode == "previous" else arrow_write(writer)
+    duration = time.perf_counter() - start
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+print(json.dumps({"duration": duration, "rss_growth_mb": peak_rss_mb - initial_rss_mb, "written_rows": written_rows}))
+"""
+
+
+def run_benchmark(mode: str) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", BENCHMARK_SCRIPT, mode, str(TOTAL_RECORDS), str(RECORD_FLUSH_INTERVAL)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+@pytest.mark.slow
+def test_flush_throughput_and_memory():
+    previous = run_benchmark("previous")
+    arrow = run_benchmark("arrow")
+
+    logger.info(
+        f"Writing {TOTAL_RECORDS} records flushed every {RECORD_FLUSH_INTERVAL} records: "
+        f"previous {TOTAL_RECORDS / previous['duration']:.0f} records/s and {previous['rss_growth_mb']:.0f}MB peak RSS growth, "
+        f"arrow {TOTAL_RECORDS / arrow['duration']:.0f} records/s and {arrow['rss_growth_mb']:.0f}MB peak RSS growth"
+    )
+    # The durations and the RSS depend on the load of the machine, so they are only logged.
+    # Both writes must flush every record once, in one Parquet write per flush interval.
+    expected_written_rows = [RECORD_FLUSH_INTERVAL] * (TOTAL_RECORDS // RECORD_FLUSH_INTERVAL)
+    assert previous["written_rows"] == expected_written_rows
+    assert arrow["written_rows"] == expected_written_rows
@@ -0,0 +1,168 @@
+#
+# Copyright (c) 2023 Airbyte, Inc., all rights reserved.
+#
+
+import json
+from datetime import date
+from typing import Any, Dict, List, Mapping
+
+import awswrangler as wr
+import boto3
+import pandas as pd
+import pytest
+from destination_aws_datalake import DestinationAwsDatalake
+from moto import mock_aws
+
+from airbyte_cdk.models import (
+    AirbyteMessage,
+    AirbyteRecordMessage,
+    AirbyteStateMessage,
+    AirbyteStateType,
+    AirbyteStream,
+    AirbyteStreamState,
+    ConfiguredAirbyteCatalog,
+    ConfiguredAirbyteStream,
+    DestinationSyncMode,
+    StreamDescriptor,
+    SyncMode,
+    Type,
+)
+
+
+STREAM_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "id": {"type": "integer"},
+        "name": {"type": ["null", "string"]},
+        "price": {"type": ["null", "number"]},
+        "active": {"type": "boolean"},
+        "updated_at": {"type": "string", "format": "date-time"},
+        "created_on": {"type": ["null", "string"], "format": "date"},
+        "address": {"type": ["null", "object"], "properties": {"city": {"type": "string"}, "zip": {"type": "integer"}}},
+        "tags": {"type": ["null", "array"], "items": {"type": "string"}},
+        "attributes": {"type": ["null", "object"]},
+    },
+}
+
+
+@pytest.fixture(name="config")
+def config_fixture() -> Mapping[str, Any]:
+    with open("unit_tests/fixtures/config.json", "r") as f:
+        return json.loads(f.read())
+
+
+@pytest.fixture(name="session")
+def session_fixture(config: Mapping[str, Any], monkeypatch) -> boto3.Session:
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    with mock_aws():
+        session = boto3.Session(region_name=config["region"])
+        session.client("s3").create_bucket(Bucket=config["bucket_name"])
+        yield session
+
+
+def create_catalog(destination_sync_mode: DestinationSyncMode) -> ConfiguredAirbyteCatalog:
+    stream = AirbyteStream(name="products", json_schema=STREAM_SCHEMA, supported_sync_modes=[SyncMode.full_refresh, SyncMode.incremental])
+    return ConfiguredAirbyteCatalog(
+        streams=[
+            ConfiguredAirbyteStream(
+                stream=stream,
+                sync_mode=SyncMode.incremental,
+                destination_sync_mode=destination_sync_mode,
+                cursor_field=["updated_at"],
+            )
+        ]
+    )
+
+
+def create_record(i: int) -> Dict[str, Any]:
+    return {
+        "id": i,
+        "name": f"product {i}" if i % 3 else "",
+        "price": str(i / 4),
+        "active": i % 2 == 0,
+        "updated_at": f"2023-0{i % 3 + 1}-15T10:00:00-02:00",
+        "created_on": "2023-01-01",
+        "address": {"city": f"city {i}", "zip": str(i), "country": "dropped"},
+        "tags": ["a", str(i)] if i % 2 else None,
+        "attributes": {"size": i},
+        "unknown": "dropped",
+    }
+
+
+def create_messages(ids: List[int]) -> List[AirbyteMessage]:
+    messages = [
+        AirbyteMessage(type=Type.RECORD, record=AirbyteRecordMessage(stream="products", data=create_record(i), emitted_at=0)) for i in ids
+    ]
+    state = AirbyteStateMessage(
+        type=AirbyteStateType.STREAM,
+        stream=AirbyteStreamState(stream_descriptor=StreamDescriptor(name="products"), stream_state={"updated_at": "2023"}),
+    )
+    return messages + [AirbyteMessage(type=Type.STATE, state=state)]
+
+
+def read_table(session: boto3.Session, config: Mapping[str, Any]) -> pd.DataFrame:
+    path = f"s3://{config['bucket_name']}/{config['lakeformation_database_name']}/products/"
+    if config["format"]["format_type"] == "JSONL":
+        df = wr.s3.read_json(path, dataset=True, lines=True, boto3_session=session)
+    else:
+        df = wr.s3.read_parquet(path, dataset=True, boto3_session=session)
+    return df.sort_values("id").reset_index(drop=True)
+
+
+@pytest.mark.parametrize("partitioning", ["NO PARTITIONING", "YEAR/MONTH/DAY", "DATE"])
+def test_write_parquet(session: boto3.Session, config: Mapping[str, Any], partitioning: str):
+    config["partitioning"] = partitioning
+    destination = DestinationAwsDatalake()
+
+    list(destination.write(config, create_catalog(DestinationSyncMode.overwrite), create_messages(list(range(10)))))
+    # the second sync overwrites the first one with two flushes
+    list(
+        destination.write(config, create_catalog(DestinationSyncMode.overwrite), create_messages(list(range(5))) + create_messages([5, 6]))
+    )
+
+    types = wr.catalog.get_table_types(database=config["lakeformation_database_name"], table="products", boto3_session=session)
+    assert {col: types[col] for col in STREAM_SCHEMA["properties"]} == {
+        "id": "bigint",
+        "name": "string",
+        "price": "double",
+        "active": "boolean",
+        "updated_at": "timestamp",
+        "created_on": "date",
+        "address": "struct<city:string,zip:bigint>",
+        "tags": "array<string>",
+        "attributes": "string",
+    }
+
+    df = read_table(session, config)
+    assert df["id"].tolist() == list(range(7))
+    assert pd.isna(df["name"][0])
+    assert df["name"][1] == "product 1"
+    assert df["price"].tolist()[:2] == [0.0, 0.25]
+    assert df["active"].tolist()[:2] == [True, False]
+    assert df["updated_at"].tolist()[:2] == [pd.Timestamp("2023-01-15T12:00:00"), pd.Timestamp("2023-02-15T12:00:00")]
+    assert df["created_on"].tolist()[0] == date(2023, 1, 1)
+    assert df["address"].tolist()[0] == {"city": "city 0", "zip": 0}
+    assert df["tags"].tolist()[0] is None
+    assert df["tags"].tolist()[1].tolist() == ["a", "1"]
+    assert df["attributes"].tolist()[0] == '{"size": 0}'
+    if partitioning == "YEAR/MONTH/DAY":
+        assert df["updated_at_month"].astype(int).tolist()[:3] == [1, 2, 3]
+    if partitioning == "DATE":
+        assert df["updated_at_date"].astype(str).tolist()[:2] == ["2023-01-15", "2023-02-15"]
+
+
+def test_write_jsonl(session: boto3.Session, config: Mapping[str, Any]):
+    config["format"] = {"format_type": "JSONL", "compression_codec": "GZIP"}
+    destination = DestinationAwsDatalake()
+
+    list(destination.write(config, create_catalog(DestinationSyncMode.append), create_messages(list(range(3)))))
+    list(destination.write(config, create_catalog(DestinationSyncMode.append), create_messages(list(range(3, 5)))))
+
+    df = read_table(session, config)
+    assert df["id"].tolist() == list(range(5))
+    assert pd.isna(df["name"][0])
+    assert df["name"][1] == "product 1"
+    assert df["price"].tolist()[:2] == [0.0, 0.25]
+    assert df["address"].tolist()[0] == {"city": "city 0", "zip": 0}
+    assert df["attributes"].tolist()[0] == '{"size": 0}'
@@ -3,16 +3,20 @@
 #
 
 import json
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
 from typing import Any, Dict, Mapping
+from unittest.mock import patch
 
 import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pytest
+from awswrangler import _data_types
 from destination_aws_datalake import DestinationAwsDatalake
 from destination_aws_datalake.aws import AwsHandler
 from destination_aws_datalake.config_reader import ConnectorConfig
-from destination_aws_datalake.stream_writer import DictEncoder, StreamWriter
+from destination_aws_datalake.stream_writer import ARROW_CHUNK_ROWS, TIMESTAMP_TYPE, DictEncoder, StreamWriter
 
 from airbyte_cdk.models import AirbyteStream, ConfiguredAirbyteStream, DestinationSyncMode, SyncMode
 
@@ -317,8 +321,109 @@ def test_append_messsage():
     writer = get_writer(get_config())
     message = {"string_col": "test", "int_col": 1, "datetime_col": "2021-01-01T00:00:00Z", "date_col": "2021-01-01"}
     writer.append_message(message)
-    assert len(writer._messages) == 1
-    assert writer._messages[0] == message
+    assert writer.buffered_record_count == 1
+    assert pa.table(writer._get_arrow_columns()).to_pylist() == [
+        {
+            "string_col": "test",
+            "int_col": 1,
+            "datetime_col": pd.Timestamp("2021-01-01T00:00:00Z"),
+            "date_col": date(2021, 1, 1),
+        }
+    ]
+
+
+def test_append_message_converts_values_by_chunk():
+    writer = get_writer(get_config())
+    for i in range(ARROW_CHUNK_ROWS + 1):
+        writer.append_message({"string_col": i, "int_col": str(i), "datetime_col": "2021-01-01T00:00:00Z", "date_col": "2021-01-01"})
+
+    assert writer.buffered_record_count == ARROW_CHUNK_ROWS + 1
+    assert len(writer._chunks["int_col"]) == 1
+    assert writer._values["int_col"] == [ARROW_CHUNK_ROWS]
+
+    columns = writer._get_arrow_columns()
+    assert columns["int_col"].num_chunks == 2
+    assert columns["int_col"].to_pylist() == list(range(ARROW_CHUNK_ROWS + 1))
+    assert columns["string_col"].to_pylist()[:2] == ["0", "1"]
+
+
+def test_arrow_columns_match_glue_types():
+    writer = get_big_schema_writer(get_config())
+    writer.append_message(
+        {
+            "appId": "1",
+            "appName": "app",
+            "bounced": True,
+            "browser": {"family": "Firefox", "version": ["1", "2"]},
+            "causedBy": {"created": "2", "id": "id"},
+            "percentage": "0.5",
+            "location": "",
+            "nestedJson": {"city": {"name": "Paris"}},
+            "nested_mixed_types": {"city": 1},
+            "sentAt": "2023-02-09T10:36:39-08:00",
+            "receivedAt": "2023-02-09",
+            "questions": [{"id": 1, "question": "q", "answer": "a", "other": "dropped"}],
+            "mixed_type_simple": 1.5,
+            "unknown": "dropped",
+        }
+    )
+    table = pa.table(writer._get_arrow_columns())
+
+    for col, glue_type in writer._glue_dtypes.items():
+        expected_type = {"timestamp": TIMESTAMP_TYPE, "date": pa.date32()}.get(glue_type) or _data_types.athena2pyarrow(glue_type)
+        assert table.schema.field(col).type == expected_type
+
+    record = table.to_pylist()[0]
+    assert "unknown" not in record
+    assert record["appId"] == 1
+    assert record["browser"] == {
+        "family": "Firefox",
+        "name": None,
+        "producer": None,
+        "producerUrl": None,
+        "type": None,
+        "url": None,
+        "version": ["1", "2"],
+    }
+    assert record["causedBy"] == {"created": 2, "id": "id"}
+    assert record["percentage"] == 0.5
+    assert record["location"] is None
+    assert record["nested_mixed_types"] == '{"city": "1"}'
+    assert record["sentAt"] == pd.Timestamp("2023-02-09T18:36:39Z")
+    assert record["receivedAt"] == date(2023, 2, 9)
+    assert record["questions"] == [{"id": 1, "question": "q", "answer": "a"}]
+    assert record["mixed_type_simple"] == "1.5"
+    assert record["status"] is None
+    assert record["read"] is False
+
+
+def test_timestamp_columns_are_parsed_like_pandas():
+    values = ["2023-02-09T10:36:39-08:00", "2023-06-15T16:08:39.123Z", "2023-06-15", "2023-06-15 16:08:39", "", "hello", None]
+    writer = get_writer(get_config())
+    for value in values:
+        writer.append_message({"datetime_col": value, "date_col": value})
+
+    columns = writer._get_arrow_columns()
+    expected = [pd.to_datetime(value, errors="coerce", utc=True) for value in values]
+    assert columns["datetime_col"].to_pylist() == [None if pd.isna(value) else value for value in expected]
+    assert columns["date_col"].to_pylist() == [None if pd.isna(value) else value.date() for value in expected]
+
+
+def test_timestamp_columns_in_iso_format_are_parsed_by_arrow():
+    writer = get_writer(get_config())
+    writer.append_message({"datetime_col": "2023-02-09T10:36:39-08:00"})
+
+    with patch("destination_aws_datalake.stream_writer.pd.to_datetime") as to_datetime:
+        columns = writer._get_arrow_columns()
+
+    to_datetime.assert_not_called()
+    assert columns["datetime_col"].to_pylist() == [pd.Timestamp("2023-02-09T18:36:39Z")]
+
+
+def test_integer_column_rejects_fractional_values():
+    writer = get_writer(get_config())
+    with pytest.raises(ValueError, match="can't be stored in an integer column"):
+        writer.append_message({"int_col": "1.5"})
 
 
 def test_get_cursor_field():
@@ -341,13 +446,11 @@ def test_add_partition_column():
         config["partitioning"] = partitioning
 
         writer = get_writer(config)
-        df = pd.DataFrame(
-            {
-                "datetime_col": [datetime.now()],
-            }
-        )
-        assert writer._add_partition_column("datetime_col", df) == expected_columns
-        assert all([col in df.columns for col in expected_columns])
+        columns = {
+            "datetime_col": pa.chunked_array([pa.array([datetime.now()], TIMESTAMP_TYPE)]),
+        }
+        assert writer._add_partition_column("datetime_col", columns) == expected_columns
+        assert all([col in columns for col in expected_columns])
 
 
 def test_get_glue_dtypes_from_json_schema():
@@ -1,12 +1,13 @@
 # Copyright (c) 2024 Airbyte, Inc., all rights reserved.
 
+import csv
 import datetime
 import json
 import logging
 import os
 import re
+import tempfile
 import uuid
-from collections import defaultdict
 from logging import getLogger
 from typing import Any, Dict, Iterable, List, Mapping
 
@@ -22,6 +23,21 @@ logger = getLogger("airbyte")
 CONFIG_MOTHERDUCK_API_KEY = "motherduck_api_key"
 CONFIG_DEFAULT_SCHEMA = "main"
 
+# records converted from Python lists to an Arrow record batch at once
+RECORD_BATCH_ROWS = 10_000
+# size of the buffered records written to DuckDB without waiting for a state message, so memory stays bounded
+MAX_BUFFER_BYTES = 64 * 1024 * 1024
+# size of the id and the timestamp of a record
+ROW_OVERHEAD_BYTES = 44
+
+RAW_TABLE_SCHEMA = pa.schema(
+    [
+        ("_airbyte_ab_id", pa.string()),
+        ("_airbyte_emitted_at", pa.timestamp("us")),
+        ("_airbyte_data", pa.string()),
+    ]
+)
+
 
 def validated_sql_name(sql_name: Any) -> str:
     """Return the input if it is a valid SQL name, otherwise raise an exception."""
@@ -33,6 +49,76 @@ def validated_sql_name(sql_name: Any) -> str:
     raise ValueError(f"Invalid SQL name: {sql_name}")
 
 
+class RawTableWriter:
+    """
+    Buffers the records of a stream as Arrow record batches of the raw table schema and inserts them into the raw table.
+    """
+
+    def __init__(self, con: duckdb.DuckDBPyConnection, schema_name: str, stream_name: str):
+        self._con = con
+        self._table_name = f"{schema_name}._airbyte_raw_{stream_name}"
+        self._batches: List[pa.RecordBatch] = []
+        self._rows = self._empty_rows()
+
+    @staticmethod
+    def _empty_rows() -> Dict[str, List[Any]]:
+        return {name: [] for name in RAW_TABLE_SCHEMA.names}
+
+    def append(self, data: Mapping[str, Any]) -> int:
+        """
+        Buffers the record and returns its size in bytes.
+        """
+        json_data = json.dumps(data)
+        self._rows["_airbyte_ab_id"].append(str(uuid.uuid4()))
+        self._rows["_airbyte_emitted_at"].append(datetime.datetime.now())
+        self._rows["_airbyte_data"].append(json_data)
+        if len(self._rows["_airbyte_data"]) >= RECORD_BATCH_ROWS:
+            self._convert_rows()
+        return len(json_data) + ROW_OVERHEAD_BYTES
+
+    def flush(self) -> None:
+        self._convert_rows()
+        self._insert_batches()
+
+    def _insert_batches(self) -> None:
+        if self._batches:
+            pa_table = pa.Table.from_batches(self._batches, schema=RAW_TABLE_SCHEMA)
+            # DuckDB will automatically find and SELECT from the `pa_table`
+            # local variable defined above.
+            self._con.sql(f"INSERT INTO {self._table_name} SELECT * FROM pa_table")
+            self._batches = []
+
+    def _convert_rows(self) -> None:
+        if not self._rows["_airbyte_data"]:
+            return
+        try:
+            self._batches.append(pa.RecordBatch.from_pydict(self._rows, schema=RAW_TABLE_SCHEMA))
+        except Exception:
+            logger.exception("Converting records to Arrow failed, falling back to copying them from a local file.")
+            # the batches buffered before the rows are inserted first, in the same transaction, so the records are written
+            # in order and a failure doesn't leave part of them in the table
+            self._con.begin()
+            try:
+                self._insert_batches()
+                self._copy_rows()
+                self._con.commit()
+            except Exception:
+                self._con.rollback()
+                raise
+        self._rows = self._empty_rows()
+
+    def _copy_rows(self) -> None:
+        """
+        Writes the rows to a local CSV file and copies it into the raw table, which DuckDB reads in a streaming fashion.
+        """
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", newline="", encoding="utf-8", delete=False) as file:
+            csv.writer(file).writerows(zip(*(self._rows[name] for name in RAW_TABLE_SCHEMA.names)))
+        try:
+            self._con.execute(f"COPY {self._table_name} FROM '{file.name}' (FORMAT csv, HEADER false, DELIMITER ',', QUOTE '\"')")
+        finally:
+            os.remove(file.name)
+
+
 class DestinationDuckdb(Destination):
     @staticmethod
     def _get_destination_path(destination_path: str) -> str:
@@ -110,16 +196,14 @@ class DestinationDuckdb(Destination):
 
             con.execute(query)
 
-        buffer = defaultdict(lambda: defaultdict(list))
+        writers = {stream_name: RawTableWriter(con, schema_name, stream_name) for stream_name in streams}
+        buffer_size = 0
 
         for message in input_messages:
             if message.type == Type.STATE:
-                # flush the buffer
-                for stream_name in buffer.keys():
-                    logger.info(f"flushing buffer for state: {message}")
-                    DestinationDuckdb._safe_write(con=con, buffer=buffer, schema_name=schema_name, stream_name=stream_name)
-
-                buffer = defaultdict(lambda: defaultdict(list))
+                logger.info(f"flushing buffer for state: {message}")
+                DestinationDuckdb._flush(writers)
+                buffer_size = 0
 
                 yield message
             elif message.type == Type.RECORD:
@@ -129,39 +213,22 @@ class DestinationDuckdb(Destination):
                     logger.debug(f"Stream {stream_name} was not present in configured streams, skipping")
                     continue
                 # add to buffer
-                buffer[stream_name]["_airbyte_ab_id"].append(str(uuid.uuid4()))
-                buffer[stream_name]["_airbyte_emitted_at"].append(datetime.datetime.now().isoformat())
-                buffer[stream_name]["_airbyte_data"].append(json.dumps(data))
+                buffer_size += writers[stream_name].append(data)
+                if buffer_size >= MAX_BUFFER_BYTES:
+                    logger.info(f"flushing buffer of {buffer_size} bytes")
+                    DestinationDuckdb._flush(writers)
+                    buffer_size = 0
 
             else:
                 logger.info(f"Message type {message.type} not supported, skipping")
 
         # flush any remaining messages
-        for stream_name in buffer.keys():
-            DestinationDuckdb._safe_write(con=con, buffer=buffer, schema_name=schema_name, stream_name=stream_name)
+        DestinationDuckdb._flush(writers)
 
     @staticmethod
-    def _safe_write(*, con: duckdb.DuckDBPyConnection, buffer: Dict[str, Dict[str, List[Any]]], schema_name: str, stream_name: str):
-        table_name = f"_airbyte_raw_{stream_name}"
-        try:
-            pa_table = pa.Table.from_pydict(buffer[stream_name])
-        except:
-            logger.exception(
-                f"Writing with pyarrow view failed, falling back to writing with executemany. Expect some performance degradation."
-            )
-            query = f"""
-            INSERT INTO {schema_name}.{table_name}
-                (_airbyte_ab_id, _airbyte_emitted_at, _airbyte_data)
-            VALUES (?,?,?)
-            """
-            entries_to_write = buffer[stream_name]
-            con.executemany(
-                query, zip(entries_to_write["_airbyte_ab_id"], entries_to_write["_airbyte_emitted_at"], entries_to_write["_airbyte_data"])
-            )
-        else:
-            # DuckDB will automatically find and SELECT from the `pa_table`
-            # local variable defined above.
-            con.sql(f"INSERT INTO {schema_name}.{table_name} SELECT * FROM pa_table")
+    def _flush(writers: Mapping[str, RawTableWriter]) -> None:
+        for writer in writers.values():
+            writer.flush()
 
     def check(self, logger: logging.Logger, config: Mapping[str, Any]) -> AirbyteConnectionStatus:
         """
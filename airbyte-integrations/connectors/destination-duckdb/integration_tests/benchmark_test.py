@@ -0,0 +1,113 @@
+# Copyright (c) 2024 Airbyte, Inc., all rights reserved.
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+
+import pytest
+
+
+logger = logging.getLogger("airbyte")
+
+TOTAL_RECORDS = 200_000
+RECORD_PAYLOAD_BYTES = 500
+FREQUENT_STATE_INTERVAL = 1_000
+
+# Writes the records of a single stream with a state message every state_interval records, in a fresh process so its peak RSS is
+# its own. The "previous" mode buffers the records like the previous implementation did: Python lists of all the records since the
+# last state message, converted to an Arrow table at the next one.
+BENCHMARK_SCRIPT = """
+import datetime, json, resource, sys, time, uuid
+from collections import defaultdict
+
+import duckdb
+import pyarrow as pa
+from destination_duckdb import DestinationDuckdb
+
+from airbyte_cdk.models import AirbyteMessage, AirbyteRecordMessage, AirbyteStateMessage, AirbyteStream, ConfiguredAirbyteCatalog
+from airbyte_cdk.models import ConfiguredAirbyteStream, DestinationSyncMode, SyncMode, Type
+
+mode, path, total_records, payload_bytes, state_interval = sys.argv[1], sys.argv[2], *map(int, sys.argv[3:6])
+
+
+def messages():
+    for i in range(total_records):
+        data = {"id": i, "payload": str(i).rjust(payload_bytes, "x")}
+        yield AirbyteMessage(type=Type.RECORD, record=AirbyteRecordMessage(stream="benchmark", data=data, emitted_at=0))
+        if (i + 1) % state_interval == 0:
+            yield AirbyteMessage(type=Type.STATE, state=AirbyteStateMessage(data={"state": str(i)}))
+
+
+def previous_write():
+    con = duckdb.connect(database=path)
+    con.execute("CREATE TABLE _airbyte_raw_benchmark (_airbyte_ab_id TEXT PRIMARY KEY, _airbyte_emitted_at DATETIME, _airbyte_data JSON)")
+    buffer = defaultdict(list)
+    for message in messages():
+        if message.type == Type.STATE:
+            pa_table = pa.Table.from_pydict(buffer)
+            con.sql("INSERT INTO _airbyte_raw_benchmark SELECT * FROM pa_table")
+            buffer = defaultdict(list)
+        else:
+            buffer["_airbyte_ab_id"].append(str(uuid.uuid4()))
+            buffer["_airbyte_emitted_at"].append(datetime.datetime.now().isoformat())
+            buffer["_airbyte_data"].append(json.dumps(message.record.data))
+    return con
+
+
+def bounded_write():
+    stream = AirbyteStream(name="benchmark", json_schema={}, supported_sync_modes=[SyncMode.full_refresh])
+    catalog = ConfiguredAirbyteCatalog(
+        streams=[ConfiguredAirbyteStream(stream=stream, sync_mode=SyncMode.full_refresh, destination_sync_mode=DestinationSyncMode.append)]
+    )
+    DestinationDuckdb._get_destination_path = staticmethod(lambda destination_path: destination_path)
+    list(DestinationDuckdb().write({"destination_path": path, "schema": "main"}, catalog, messages()))
+    return duckdb.connect(database=path)
+
+
+start = time.perf_counter()
+con = previous_write() if mode == "previous" else bounded_write()
+duration = time.perf_counter() - start
+count = con.execute("SELECT count(1) FROM main._airbyte_raw_benchmark").fetchall()[0][0]
+peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+print(json.dumps({"duration": duration, "count": count, "peak_rss_mb": peak_rss_mb}))
+"""
+
+
+def run_benchmark(mode: str, state_interval: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "benchmark.duckdb")
+        output = subprocess.run(
+            [sys.executable, "-c", BENCHMARK_SCRIPT, mode, path, str(TOTAL_RECORDS), str(RECORD_PAYLOAD_BYTES), str(state_interval)],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+@pytest.mark.slow
+def test_memory_and_throughput_by_state_cadence():
+    results = {
+        (mode, state_interval): run_benchmark(mode, state_interval)
+        for mode in ("previous", "bounded")
+        for state_interval in (FREQUENT_STATE_INTERVAL, TOTAL_RECORDS)
+    }
+
+    logger.info(
+        f"Writing {TOTAL_RECORDS} records of {RECORD_PAYLOAD_BYTES} bytes: "
+        + ", ".join(
+            f"{mode} with a state every {state_interval} records {TOTAL_RECORDS / result['duration']:.0f} records/s "
+            f"and {result['peak_rss_mb']:.0f}MB peak RSS"
+            for (mode, state_interval), result in results.items()
+        )
+    )
+    assert all(result["count"] == TOTAL_RECORDS for result in results.values())
+    # DuckDB caches the written data the same way whatever the cadence, so the growth of the peak RSS is due to the buffered records
+    previous_growth = results[("previous", TOTAL_RECORDS)]["peak_rss_mb"] - results[("previous", FREQUENT_STATE_INTERVAL)]["peak_rss_mb"]
+    bounded_growth = results[("bounded", TOTAL_RECORDS)]["peak_rss_mb"] - results[("bounded", FREQUENT_STATE_INTERVAL)]["peak_rss_mb"]
+    assert bounded_growth * 2 < previous_growth
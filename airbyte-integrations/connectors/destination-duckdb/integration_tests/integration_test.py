@@ -10,12 +10,15 @@ import tempfile
 import time
 from datetime import datetime
 from pathlib import Path
+from types import SimpleNamespace
 from typing import Any, Callable, Dict, Generator, Iterable
 from unittest.mock import MagicMock
 
 import duckdb
+import pyarrow as pa
 import pytest
 from destination_duckdb import DestinationDuckdb
+from destination_duckdb import destination as destination_module
 from destination_duckdb.destination import CONFIG_MOTHERDUCK_API_KEY
 from faker import Faker
 
@@ -220,6 +223,122 @@ def test_write(
     assert result[1][2] == json.dumps(airbyte_message2.record.data)
 
 
+def _connect(config: Dict[str, str]) -> duckdb.DuckDBPyConnection:
+    motherduck_api_key = str(config.get(CONFIG_MOTHERDUCK_API_KEY, ""))
+    duckdb_config = {}
+    if motherduck_api_key:
+        duckdb_config["motherduck_token"] = motherduck_api_key
+        duckdb_config["custom_user_agent"] = "airbyte"
+    return duckdb.connect(database=config.get("destination_path"), read_only=False, config=duckdb_config)
+
+
+def _count_records(config: Dict[str, str], schema_name: str, table_name: str) -> int:
+    with _connect(config) as con:
+        return con.execute(f"SELECT count(1) FROM {schema_name}._airbyte_raw_{table_name}").fetchall()[0][0]
+
+
+def test_write_flushes_full_buffer_without_state(
+    config: Dict[str, str],
+    configured_catalogue: ConfiguredAirbyteCatalog,
+    test_table_name: str,
+    test_schema_name: str,
+    monkeypatch,
+):
+    monkeypatch.setattr(destination_module, "RECORD_BATCH_ROWS", 100)
+    monkeypatch.setattr(destination_module, "MAX_BUFFER_BYTES", 10_000)
+    counts_before_end = []
+
+    def messages():
+        for i in range(1000):
+            yield AirbyteMessage(
+                type=Type.RECORD, record=AirbyteRecordMessage(stream=test_table_name, data={"key1": f"value{i}"}, emitted_at=0)
+            )
+        counts_before_end.append(_count_records(config, test_schema_name, test_table_name))
+
+    result = list(DestinationDuckdb().write(config, configured_catalogue, messages()))
+
+    assert result == []
+    assert 0 < counts_before_end[0] < 1000
+    assert _count_records(config, test_schema_name, test_table_name) == 1000
+
+
+def test_write_copies_records_arrow_cannot_convert(
+    config: Dict[str, str],
+    configured_catalogue: ConfiguredAirbyteCatalog,
+    test_table_name: str,
+    test_schema_name: str,
+    monkeypatch,
+):
+    # the timestamps of the records can't be converted to integers
+    monkeypatch.setattr(
+        destination_module,
+        "RAW_TABLE_SCHEMA",
+        pa.schema([("_airbyte_ab_id", pa.string()), ("_airbyte_emitted_at", pa.int64()), ("_airbyte_data", pa.string())]),
+    )
+    data = [{"key1": f'quoted "value", {i}', "key2": "line\nbreak"} for i in range(150)]
+    messages = [
+        AirbyteMessage(type=Type.RECORD, record=AirbyteRecordMessage(stream=test_table_name, data=record_data, emitted_at=0))
+        for record_data in data
+    ]
+
+    list(DestinationDuckdb().write(config, configured_catalogue, messages))
+
+    with _connect(config) as con:
+        result = con.execute(f"SELECT _airbyte_data FROM {test_schema_name}._airbyte_raw_{test_table_name}").fetchall()
+    assert sorted(row[0] for row in result) == sorted(json.dumps(record_data) for record_data in data)
+
+
+def _fail_second_conversion(monkeypatch) -> None:
+    conversions = []
+
+    def from_pydict(rows, schema):
+        conversions.append(rows)
+        if len(conversions) == 2:
+            raise pa.ArrowInvalid("conversion failed")
+        return pa.RecordBatch.from_pydict(rows, schema=schema)
+
+    monkeypatch.setattr(destination_module, "pa", SimpleNamespace(RecordBatch=SimpleNamespace(from_pydict=from_pydict), Table=pa.Table))
+    monkeypatch.setattr(destination_module, "RECORD_BATCH_ROWS", 100)
+
+
+def _record_messages(table_name: str, n: int) -> list[AirbyteMessage]:
+    return [
+        AirbyteMessage(type=Type.RECORD, record=AirbyteRecordMessage(stream=table_name, data={"key1": i}, emitted_at=0)) for i in range(n)
+    ]
+
+
+def test_write_inserts_buffered_batches_before_copied_records(
+    config: Dict[str, str],
+    configured_catalogue: ConfiguredAirbyteCatalog,
+    test_table_name: str,
+    test_schema_name: str,
+    monkeypatch,
+):
+    _fail_second_conversion(monkeypatch)
+
+    list(DestinationDuckdb().write(config, configured_catalogue, _record_messages(test_table_name, 250)))
+
+    with _connect(config) as con:
+        result = con.execute(f"SELECT _airbyte_data FROM {test_schema_name}._airbyte_raw_{test_table_name} ORDER BY rowid").fetchall()
+    assert [json.loads(row[0])["key1"] for row in result] == list(range(250))
+
+
+def test_write_rolls_back_failed_copy(
+    config: Dict[str, str],
+    configured_catalogue: ConfiguredAirbyteCatalog,
+    test_table_name: str,
+    test_schema_name: str,
+    monkeypatch,
+):
+    _fail_second_conversion(monkeypatch)
+    monkeypatch.setattr(destination_module.RawTableWriter, "_copy_rows", MagicMock(side_effect=duckdb.IOException("copy failed")))
+
+    with pytest.raises(duckdb.IOException):
+        list(DestinationDuckdb().write(config, configured_catalogue, _record_messages(test_table_name, 250)))
+
+    assert _count_records(config, test_schema_name, test_table_name) == 0
+
+
 def _airbyte_messages(n: int, batch_size: int, table_name: str) -> Generator[AirbyteMessage, None, None]:
     fake = Faker()
     Faker.seed(0)
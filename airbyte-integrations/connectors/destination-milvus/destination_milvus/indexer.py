@@ -4,14 +4,15 @@
 
 
 import os
+from concurrent.futures import ThreadPoolExecutor
 from multiprocessing import Process
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 from pymilvus import Collection, CollectionSchema, DataType, FieldSchema, connections, utility
 
 from airbyte_cdk.destinations.vector_db_based.document_processor import METADATA_RECORD_ID_FIELD, METADATA_STREAM_FIELD
 from airbyte_cdk.destinations.vector_db_based.indexer import Indexer
-from airbyte_cdk.destinations.vector_db_based.utils import create_stream_identifier, format_exception
+from airbyte_cdk.destinations.vector_db_based.utils import create_chunks, create_stream_identifier, format_exception
 from airbyte_cdk.models import ConfiguredAirbyteCatalog
 from airbyte_cdk.models.airbyte_protocol import DestinationSyncMode
 from destination_milvus.config import MilvusIndexingConfigModel
@@ -19,6 +20,14 @@ from destination_milvus.config import MilvusIndexingConfigModel
 
 CLOUD_DEPLOYMENT_MODE = "cloud"
 
+# bounds of an insert request, well below the 64MB limit of the gRPC messages accepted by Milvus
+MAX_INSERT_BATCH_ROWS = 32
+MAX_INSERT_BATCH_BYTES = 16 * 1024 * 1024
+# number of insert requests in flight
+MAX_PENDING_INSERTS = 4
+# number of ids of the `in [...]` expression of a query or delete request
+MAX_IDS_PER_EXPR = 1000
+
 
 class MilvusIndexer(Indexer):
     config: MilvusIndexingConfigModel
@@ -104,13 +113,12 @@ class MilvusIndexer(Indexer):
                 self._delete_for_filter(f'{METADATA_STREAM_FIELD} == "{create_stream_identifier(stream.stream)}"')
 
     def _delete_for_filter(self, expr: str) -> None:
-        iterator = self._collection.query_iterator(expr=expr)
+        # only the primary keys of the matching entities are fetched, a page at a time
+        iterator = self._collection.query_iterator(expr=expr, output_fields=[self._primary_key], batch_size=MAX_IDS_PER_EXPR)
         page = iterator.next()
         while len(page) > 0:
-            id_field = next(iter(page[0].keys()))
-            ids = [next(iter(entity.values())) for entity in page]
-            id_list_expr = ", ".join([str(id) for id in ids])
-            self._collection.delete(expr=f"{id_field} in [{id_list_expr}]")
+            id_list_expr = ", ".join([str(entity[self._primary_key]) for entity in page])
+            self._collection.delete(expr=f"{self._primary_key} in [{id_list_expr}]")
             page = iterator.next()
 
     def _normalize(self, metadata: dict) -> dict:
@@ -125,22 +133,52 @@ class MilvusIndexer(Indexer):
 
         return result
 
-    def index(self, document_chunks, namespace, stream):
-        entities = []
-        for i in range(len(document_chunks)):
-            chunk = document_chunks[i]
+    def _create_insert_batches(self, document_chunks) -> List[List[Dict[str, Any]]]:
+        """
+        Splits the chunks into batches of entities, bounded in number of rows and estimated size.
+        """
+        batches: List[List[Dict[str, Any]]] = [[]]
+        batch_size = 0
+        for chunk in document_chunks:
             entity = {
                 **self._normalize(chunk.metadata),
                 self.config.vector_field: chunk.embedding,
                 self.config.text_field: chunk.page_content,
             }
-            if chunk.page_content is not None:
-                entity[self.config.text_field] = chunk.page_content
-            entities.append(entity)
-        self._collection.insert(entities)
+            entity_size = 4 * len(chunk.embedding) + len(chunk.page_content or "") + len(str(chunk.metadata))
+            if batches[-1] and (len(batches[-1]) == MAX_INSERT_BATCH_ROWS or batch_size + entity_size > MAX_INSERT_BATCH_BYTES):
+                batches.append([])
+                batch_size = 0
+            batches[-1].append(entity)
+            batch_size += entity_size
+        return batches if batches[-1] else []
+
+    def _insert_columns(self, entities: List[Dict[str, Any]]) -> None:
+        """
+        Inserts the entities as one list of values per field of the collection, which skips the conversion of each row.
+
+        Collections without dynamic field only hold the fields of their schema. Entities with other fields are inserted as rows
+        instead, so that they are rejected by Milvus rather than silently losing these fields.
+        """
+        field_names = [field.name for field in self._collection.schema.fields if not field.auto_id]
+        if any(not set(entity).issubset(field_names) for entity in entities):
+            self._collection.insert(entities)
+            return
+        self._collection.insert([[entity.get(field_name) for entity in entities] for field_name in field_names])
+
+    def index(self, document_chunks, namespace, stream):
+        batches = self._create_insert_batches(document_chunks)
+        if not batches:
+            return
+
+        # with dynamic fields, the entities must be inserted as rows, which hold the fields missing from the schema
+        insert = self._collection.insert if self._collection.schema.enable_dynamic_field else self._insert_columns
+        # the requests are pipelined: the next batches are sent while the previous ones are written
+        with ThreadPoolExecutor(max_workers=min(MAX_PENDING_INSERTS, len(batches))) as executor:
+            # consuming the results raises the first error of the inserts
+            list(executor.map(insert, batches))
 
     def delete(self, delete_ids, namespace, stream):
-        if len(delete_ids) > 0:
-            id_list_expr = ", ".join([f'"{id}"' for id in delete_ids])
-            id_expr = f"{METADATA_RECORD_ID_FIELD} in [{id_list_expr}]"
-            self._delete_for_filter(id_expr)
+        for batch in create_chunks(delete_ids, batch_size=MAX_IDS_PER_EXPR):
+            id_list_expr = ", ".join([f'"{id}"' for id in batch])
+            self._delete_for_filter(f"{METADATA_RECORD_ID_FIELD} in [{id_list_expr}]")
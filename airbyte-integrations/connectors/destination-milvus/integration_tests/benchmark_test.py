@@ -0,0 +1,113 @@
+#
+# Copyright (c) 2023 Airbyte, Inc., all rights reserved.
+#
+
+import logging
+import os
+import time
+import uuid
+from unittest.mock import Mock, patch
+
+import pytest
+from destination_milvus.config import MilvusIndexingConfigModel
+from destination_milvus.indexer import MilvusIndexer
+from pymilvus import utility
+from pymilvus.client.grpc_handler import GrpcHandler
+from pymilvus.exceptions import MilvusException
+
+
+logger = logging.getLogger("airbyte")
+
+MILVUS_URI_ENV = "MILVUS_BENCHMARK_URI"
+DIMENSIONS = 1536
+# number of chunks of a batch written by the Writer of the destination
+CHUNKS_PER_INDEX_CALL = 128
+INDEX_CALLS = 20
+DELETE_ID_COUNT = 2000
+
+
+@pytest.fixture(name="milvus_uri", scope="module")
+def milvus_uri_fixture():
+    """
+    Milvus instance to benchmark against, like Milvus Lite started locally with:
+    milvus-lite server --data-dir /tmp/milvus --host 127.0.0.1 --port 19530
+    """
+    uri = os.environ.get(MILVUS_URI_ENV)
+    if not uri:
+        pytest.skip(f"{MILVUS_URI_ENV} is not set")
+
+    # Milvus Lite answers has_collection for a missing collection with an error status, which pymilvus 2.3 raises
+    has_collection = GrpcHandler.has_collection
+
+    def has_collection_or_false(self, *args, **kwargs):
+        try:
+            return has_collection(self, *args, **kwargs)
+        except MilvusException as e:
+            if "does not exist" in str(e):
+                return False
+            raise
+
+    with patch.object(GrpcHandler, "has_collection", has_collection_or_false):
+        yield uri
+
+
+def create_indexer(uri: str, collection: str) -> MilvusIndexer:
+    config = MilvusIndexingConfigModel(host=uri, collection=collection, auth={"mode": "no_auth"})
+    indexer = MilvusIndexer(config, DIMENSIONS)
+    indexer._connect_with_timeout = Mock()
+    indexer.pre_sync(Mock(streams=[]))
+    return indexer
+
+
+def create_chunks(record_ids):
+    return [
+        Mock(metadata={"_ab_record_id": record_id, "_ab_stream": "benchmark"}, page_content="x" * 500, embedding=[0.1] * DIMENSIONS)
+        for record_id in record_ids
+    ]
+
+
+def test_insert_and_delete_throughput(milvus_uri):
+    record_ids = [str(uuid.uuid4()) for _ in range(CHUNKS_PER_INDEX_CALL * INDEX_CALLS)]
+    batches = [record_ids[i : i + CHUNKS_PER_INDEX_CALL] for i in range(0, len(record_ids), CHUNKS_PER_INDEX_CALL)]
+    deleted_ids = record_ids[:DELETE_ID_COUNT]
+
+    # Previous implementation: one insert of all the rows of each batch, one expression with all the deleted ids,
+    # whose matching entities are queried with all their fields
+    indexer = create_indexer(milvus_uri, f"benchmark_{uuid.uuid4().hex}")
+    start = time.perf_counter()
+    for batch in batches:
+        indexer._collection.insert(
+            [{**chunk.metadata, "vector": chunk.embedding, "text": chunk.page_content} for chunk in create_chunks(batch)]
+        )
+    previous_insert_duration = time.perf_counter() - start
+    start = time.perf_counter()
+    id_list_expr = ", ".join([f'"{id}"' for id in deleted_ids])
+    iterator = indexer._collection.query_iterator(expr=f"_ab_record_id in [{id_list_expr}]")
+    page = iterator.next()
+    while len(page) > 0:
+        indexer._collection.delete(expr=f"pk in [{', '.join(str(entity['pk']) for entity in page)}]")
+        page = iterator.next()
+    previous_delete_duration = time.perf_counter() - start
+    utility.drop_collection(indexer.config.collection)
+
+    collection = f"benchmark_{uuid.uuid4().hex}"
+    indexer = create_indexer(milvus_uri, collection)
+    start = time.perf_counter()
+    for batch in batches:
+        indexer.index(create_chunks(batch), None, "benchmark")
+    insert_duration = time.perf_counter() - start
+    start = time.perf_counter()
+    indexer.delete(deleted_ids, None, "benchmark")
+    delete_duration = time.perf_counter() - start
+    remaining = indexer._collection.query(expr='_ab_stream == "benchmark"', output_fields=["count(*)"])[0]["count(*)"]
+    utility.drop_collection(collection)
+
+    entity_count = len(record_ids)
+    logger.info(
+        f"Inserting {entity_count} entities of {DIMENSIONS} dimensions: previous {entity_count / previous_insert_duration:.0f} entities/s, "
+        f"pipelined batches {entity_count / insert_duration:.0f} entities/s. "
+        f"Deleting {DELETE_ID_COUNT} record ids: previous {previous_delete_duration:.2f}s, chunked expressions {delete_duration:.2f}s."
+    )
+    assert remaining == entity_count - DELETE_ID_COUNT
+    # Milvus Lite writes the inserts one at a time, so the insert rates only compare the client side of the two paths
+    assert delete_duration < previous_delete_duration
@@ -8,7 +8,7 @@ from unittest.mock import Mock, call, patch
 
 from destination_milvus.config import MilvusIndexingConfigModel, NoAuth, TokenAuth
 from destination_milvus.indexer import MilvusIndexer
-from pymilvus import DataType
+from pymilvus import CollectionSchema, DataType, FieldSchema
 
 from airbyte_cdk.models.airbyte_protocol import AirbyteStream, DestinationSyncMode, SyncMode
 
@@ -127,6 +127,7 @@ class TestMilvusIndexer(unittest.TestCase):
         mock_iterator = Mock()
         mock_iterator.next.side_effect = [[{"id": 1}], []]
         mock_Collection.return_value.query_iterator.return_value = mock_iterator
+        mock_Collection.return_value.primary_field.name = "id"
 
         self.milvus_indexer.pre_sync(
             Mock(
@@ -139,7 +140,9 @@ class TestMilvusIndexer(unittest.TestCase):
             )
         )
 
-        mock_Collection.return_value.query_iterator.assert_called_with(expr='_ab_stream == "some_stream"')
+        mock_Collection.return_value.query_iterator.assert_called_with(
+            expr='_ab_stream == "some_stream"', output_fields=["id"], batch_size=1000
+        )
         mock_Collection.return_value.delete.assert_called_with(expr="id in [1]")
 
     def test_pre_sync_does_not_call_delete(self, mock_Collection, mock_utility, mock_connections):
@@ -157,12 +160,98 @@ class TestMilvusIndexer(unittest.TestCase):
 
         self.milvus_indexer._collection.insert.assert_called_with([{"key": "value", "vector": [1, 2, 3], "text": "some content", "_id": 5}])
 
+    def test_index_splits_batches(self, mock_Collection, mock_utility, mock_connections):
+        self.milvus_indexer._primary_key = "id"
+        self.milvus_indexer.index(
+            [Mock(metadata={"key": f"value{i}"}, page_content=f"content {i}", embedding=[i, i, i]) for i in range(70)], None, "some_stream"
+        )
+
+        batches = sorted(
+            (call.args[0] for call in self.milvus_indexer._collection.insert.call_args_list), key=lambda batch: batch[0]["vector"]
+        )
+        self.assertEqual([len(batch) for batch in batches], [32, 32, 6])
+        self.assertEqual([entity["text"] for batch in batches for entity in batch], [f"content {i}" for i in range(70)])
+
+    @patch("destination_milvus.indexer.MAX_INSERT_BATCH_BYTES", 1000)
+    def test_index_bounds_batch_size(self, mock_Collection, mock_utility, mock_connections):
+        self.milvus_indexer._primary_key = "id"
+        self.milvus_indexer.index(
+            [Mock(metadata={}, page_content="x" * 400, embedding=[1, 2, 3]) for _ in range(5)]
+            + [Mock(metadata={}, page_content="x" * 2000, embedding=[1, 2, 3])],
+            None,
+            "some_stream",
+        )
+
+        self.assertEqual(sorted(len(call.args[0]) for call in self.milvus_indexer._collection.insert.call_args_list), [1, 1, 2, 2])
+
+    def test_index_inserts_columns_without_dynamic_field(self, mock_Collection, mock_utility, mock_connections):
+        self.milvus_indexer._primary_key = "pk"
+        self.milvus_indexer._collection.schema = CollectionSchema(
+            fields=[
+                FieldSchema(name="pk", dtype=DataType.INT64, is_primary=True, auto_id=True),
+                FieldSchema(name="vector", dtype=DataType.FLOAT_VECTOR, dim=3),
+                FieldSchema(name="text", dtype=DataType.VARCHAR, max_length=100),
+                FieldSchema(name="key", dtype=DataType.VARCHAR, max_length=100),
+            ]
+        )
+        self.milvus_indexer.index(
+            [
+                Mock(metadata={"key": "value1"}, page_content="some content", embedding=[1, 2, 3]),
+                Mock(metadata={"key": "value2"}, page_content="other content", embedding=[4, 5, 6]),
+            ],
+            None,
+            "some_stream",
+        )
+
+        self.milvus_indexer._collection.insert.assert_called_once_with(
+            [[[1, 2, 3], [4, 5, 6]], ["some content", "other content"], ["value1", "value2"]]
+        )
+
+    def test_index_inserts_rows_with_fields_missing_from_schema(self, mock_Collection, mock_utility, mock_connections):
+        self.milvus_indexer._primary_key = "pk"
+        self.milvus_indexer._collection.schema = CollectionSchema(
+            fields=[
+                FieldSchema(name="pk", dtype=DataType.INT64, is_primary=True, auto_id=True),
+                FieldSchema(name="vector", dtype=DataType.FLOAT_VECTOR, dim=3),
+                FieldSchema(name="text", dtype=DataType.VARCHAR, max_length=100),
+                FieldSchema(name="key", dtype=DataType.VARCHAR, max_length=100),
+            ]
+        )
+        self.milvus_indexer.index(
+            [
+                Mock(metadata={"key": "value1"}, page_content="some content", embedding=[1, 2, 3]),
+                Mock(metadata={"key": "value2", "extra": "other"}, page_content="other content", embedding=[4, 5, 6]),
+            ],
+            None,
+            "some_stream",
+        )
+
+        self.milvus_indexer._collection.insert.assert_called_once_with(
+            [
+                {"key": "value1", "vector": [1, 2, 3], "text": "some content"},
+                {"key": "value2", "extra": "other", "vector": [4, 5, 6], "text": "other content"},
+            ]
+        )
+
     def test_index_calls_delete(self, mock_Collection, mock_utility, mock_connections):
         mock_iterator = Mock()
         mock_iterator.next.side_effect = [[{"id": "123"}, {"id": "456"}], [{"id": "789"}], []]
         self.milvus_indexer._collection.query_iterator.return_value = mock_iterator
+        self.milvus_indexer._primary_key = "id"
 
         self.milvus_indexer.delete(["some_id"], None, "some_stream")
 
-        self.milvus_indexer._collection.query_iterator.assert_called_with(expr='_ab_record_id in ["some_id"]')
+        self.milvus_indexer._collection.query_iterator.assert_called_with(
+            expr='_ab_record_id in ["some_id"]', output_fields=["id"], batch_size=1000
+        )
         self.milvus_indexer._collection.delete.assert_has_calls([call(expr="id in [123, 456]"), call(expr="id in [789]")], any_order=False)
+
+    def test_delete_chunks_expressions(self, mock_Collection, mock_utility, mock_connections):
+        self.milvus_indexer._collection.query_iterator.return_value.next.return_value = []
+        self.milvus_indexer._primary_key = "id"
+
+        self.milvus_indexer.delete([f"id_{i}" for i in range(2500)], None, "some_stream")
+
+        exprs = [call.kwargs["expr"] for call in self.milvus_indexer._collection.query_iterator.call_args_list]
+        self.assertEqual([expr.count('"') // 2 for expr in exprs], [1000, 1000, 500])
+        self.assertTrue(exprs[2].startswith('_ab_record_id in ["id_2000", '))
@@ -4,7 +4,8 @@
 
 import os
 import uuid
-from typing import Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Optional
 
 import urllib3
 from pinecone import PineconeException
@@ -16,6 +17,7 @@ from airbyte_cdk.destinations.vector_db_based.utils import create_chunks, create
 from airbyte_cdk.models import AirbyteConnectionStatus, Status
 from airbyte_cdk.models.airbyte_protocol import ConfiguredAirbyteCatalog, DestinationSyncMode
 from destination_pinecone.config import PineconeIndexingModel
+from destination_pinecone.vector_deleter import VectorDeleter
 
 
 # large enough to speed up processing, small enough to not hit pinecone request limits
@@ -26,7 +28,11 @@ PARALLELISM_LIMIT = 4
 
 MAX_METADATA_SIZE = 40_960 - 10_000
 
-MAX_IDS_PER_DELETE = 1000
+# vector ids are the stream name, "#" and a uuid, so listing them by the hex digit following "#" splits them in disjoint sets
+ID_SUFFIX_FIRST_CHARACTERS = "0123456789abcdef"
+
+# number of id listings running in parallel when deleting by prefix
+LIST_PARALLELISM_LIMIT = 4
 
 AIRBYTE_TAG = "airbyte"
 AIRBYTE_TEST_TAG = "airbyte_test"
@@ -44,6 +50,9 @@ class PineconeIndexer(Indexer):
 
         self.pinecone_index = self.pc.Index(config.index)
         self.embedding_dimensions = embedding_dimensions
+        # marks the ids of the vectors written by this sync, which the deletions running while indexing skip
+        self._sync_id = uuid.uuid4().hex[:16]
+        self._pending_deletions: List[Future] = []
 
     def determine_spec_type(self, index_name):
         description = self.pc.describe_index(index_name)
@@ -58,14 +67,34 @@ class PineconeIndexer(Indexer):
     def pre_sync(self, catalog: ConfiguredAirbyteCatalog):
         self._pod_type = self.determine_spec_type(self.config.index)
 
-        for stream in catalog.streams:
-            stream_identifier = create_stream_identifier(stream.stream)
-            if stream.destination_sync_mode == DestinationSyncMode.overwrite:
-                self.delete_vectors(
-                    filter={METADATA_STREAM_FIELD: stream_identifier}, namespace=stream.stream.namespace, prefix=stream_identifier
+        overwritten_streams = [stream for stream in catalog.streams if stream.destination_sync_mode == DestinationSyncMode.overwrite]
+        if self._pod_type == "serverless" and overwritten_streams:
+            # The vectors of the previous syncs are found by listing their ids, which excludes the ids written by this sync,
+            # so the deletion can run in the background while indexing starts. post_sync waits for it.
+            executor = ThreadPoolExecutor(max_workers=len(overwritten_streams))
+            for stream in overwritten_streams:
+                self._pending_deletions.append(
+                    executor.submit(
+                        self.delete_by_prefix,
+                        prefix=stream.stream.name,
+                        namespace=stream.stream.namespace,
+                        skip_prefix=self._get_id_prefix(stream.stream.name),
+                    )
                 )
+            executor.shutdown(wait=False)
+            return
+
+        for stream in overwritten_streams:
+            stream_identifier = create_stream_identifier(stream.stream)
+            self.delete_vectors(
+                filter={METADATA_STREAM_FIELD: stream_identifier}, namespace=stream.stream.namespace, prefix=stream.stream.name
+            )
 
     def post_sync(self):
+        # raises in case of error
+        for deletion in self._pending_deletions:
+            deletion.result()
+        self._pending_deletions = []
         return []
 
     def get_source_tag(self):
@@ -89,23 +118,31 @@ class PineconeIndexer(Indexer):
         """
         Applicable to Starter implementation only. Deletes all vectors that match the given metadata filter.
         """
+        deleter = VectorDeleter(self.pinecone_index, namespace, f"filter {filter}")
         zero_vector = [0.0] * self.embedding_dimensions
         query_result = self.pinecone_index.query(vector=zero_vector, filter=filter, top_k=top_k, namespace=namespace)
         while len(query_result.matches) > 0:
-            vector_ids = [doc.id for doc in query_result.matches]
-            if len(vector_ids) > 0:
-                # split into chunks of 1000 ids to avoid id limit
-                batches = create_chunks(vector_ids, batch_size=MAX_IDS_PER_DELETE)
-                for batch in batches:
-                    self.pinecone_index.delete(ids=list(batch), namespace=namespace)
+            deleter.delete([doc.id for doc in query_result.matches])
+            # the next query would return the same vectors again if they were not deleted yet
+            deleter.flush()
             query_result = self.pinecone_index.query(vector=zero_vector, filter=filter, top_k=top_k, namespace=namespace)
 
-    def delete_by_prefix(self, prefix, namespace=None):
+    def delete_by_prefix(self, prefix, namespace=None, skip_prefix=None):
         """
-        Applicable to Serverless implementation only. Deletes all vectors with the given prefix.
+        Applicable to Serverless implementation only. Deletes all vectors whose id starts with the given prefix and "#",
+        except the ones starting with skip_prefix.
         """
-        for ids in self.pinecone_index.list(prefix=prefix, namespace=namespace):
-            self.pinecone_index.delete(ids=ids, namespace=namespace)
+        deleter = VectorDeleter(self.pinecone_index, namespace, f"prefix {prefix}")
+
+        def delete_listed_ids(id_prefix: str):
+            for ids in self.pinecone_index.list(prefix=id_prefix, namespace=namespace):
+                deleter.delete([id for id in ids if skip_prefix is None or not id.startswith(skip_prefix)])
+
+        id_prefixes = [f"{prefix}#{character}" for character in ID_SUFFIX_FIRST_CHARACTERS]
+        with ThreadPoolExecutor(max_workers=LIST_PARALLELISM_LIMIT) as executor:
+            # raises in case of error
+            list(executor.map(delete_listed_ids, id_prefixes))
+        deleter.flush()
 
     def _truncate_metadata(self, metadata: dict) -> dict:
         """
@@ -133,8 +170,7 @@ class PineconeIndexer(Indexer):
             metadata = self._truncate_metadata(chunk.metadata)
             if chunk.page_content is not None:
                 metadata["text"] = chunk.page_content
-            prefix = streamName
-            pinecone_docs.append((prefix + "#" + str(uuid.uuid4()), chunk.embedding, metadata))
+            pinecone_docs.append((self._get_id_prefix(streamName) + str(uuid.uuid4()), chunk.embedding, metadata))
         serial_batches = create_chunks(pinecone_docs, batch_size=PINECONE_BATCH_SIZE * PARALLELISM_LIMIT)
         for batch in serial_batches:
             async_results = []
@@ -146,6 +182,9 @@ class PineconeIndexer(Indexer):
             # Wait for and retrieve responses (this raises in case of error)
             [async_result.result() for async_result in async_results]
 
+    def _get_id_prefix(self, stream_name: str) -> str:
+        return f"{stream_name}#{self._sync_id}-"
+
     def delete(self, delete_ids, namespace, stream):
         filter = {METADATA_RECORD_ID_FIELD: {"$in": delete_ids}}
         if len(delete_ids) > 0:
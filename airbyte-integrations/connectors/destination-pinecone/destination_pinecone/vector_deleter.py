@@ -0,0 +1,67 @@
+#
+# Copyright (c) 2023 Airbyte, Inc., all rights reserved.
+#
+
+import logging
+import threading
+from collections import deque
+from typing import Any, Deque, Iterable, List, Optional
+
+
+LOGGER = logging.getLogger("airbyte")
+
+# maximum number of ids of a delete request accepted by Pinecone
+MAX_IDS_PER_DELETE = 1000
+
+# do not flood the server with too many delete requests in parallel
+MAX_PENDING_DELETES = 8
+
+PROGRESS_LOG_INTERVAL = 100_000
+
+
+class VectorDeleter:
+    """
+    Deletes vectors by id with parallel delete requests of up to MAX_IDS_PER_DELETE ids, logging the progress.
+
+    The ids can be added from several threads. Once MAX_PENDING_DELETES requests are in flight, adding ids waits for the oldest one.
+    """
+
+    def __init__(self, pinecone_index: Any, namespace: Optional[str], description: str):
+        self._pinecone_index = pinecone_index
+        self._namespace = namespace
+        self._description = description
+        self._lock = threading.Lock()
+        self._ids: List[str] = []
+        self._pending: Deque[Any] = deque()
+        self._requested_count = 0
+        self._logged_count = 0
+
+    def delete(self, ids: Iterable[str]) -> None:
+        with self._lock:
+            self._ids.extend(ids)
+            while len(self._ids) >= MAX_IDS_PER_DELETE:
+                self._send(self._ids[:MAX_IDS_PER_DELETE])
+                self._ids = self._ids[MAX_IDS_PER_DELETE:]
+
+    def flush(self) -> int:
+        """
+        Sends the remaining ids and waits for all the delete requests, raising the first error. Returns the number of deleted ids.
+        """
+        with self._lock:
+            if self._ids:
+                self._send(self._ids)
+                self._ids = []
+            while self._pending:
+                self._pending.popleft().result()
+            LOGGER.info(f"Deleted {self._requested_count} vectors of {self._description}.")
+            return self._requested_count
+
+    def _send(self, ids: List[str]) -> None:
+        if len(self._pending) >= MAX_PENDING_DELETES:
+            # raises in case of error
+            self._pending.popleft().result()
+        self._pending.append(self._pinecone_index.delete(ids=ids, namespace=self._namespace, async_req=True))
+        self._requested_count += len(ids)
+        if self._requested_count - self._logged_count >= PROGRESS_LOG_INTERVAL:
+            self._logged_count = self._requested_count
+            LOGGER.info(f"Deleting vectors of {self._description}: {self._requested_count} deleted so far.")
@@ -3,6 +3,8 @@
 #
 
 import os
+import threading
+import uuid
 from unittest.mock import ANY, MagicMock, Mock, call, patch
 
 import pytest
@@ -136,7 +138,8 @@ def test_pinecone_index_upsert_and_delete_starter(mock_describe_index, mock_dete
         vector=[0, 0, 0], filter={"_ab_record_id": {"$in": ["delete_id1", "delete_id2"]}}, top_k=10_000, namespace="ns1"
     )
     indexer.pinecone_index.delete.assert_has_calls(
-        [call(ids=["doc_id1", "doc_id2"], namespace="ns1"), call(ids=["doc_id3"], namespace="ns1")]
+        [call(ids=["doc_id1", "doc_id2"], namespace="ns1", async_req=True), call(ids=["doc_id3"], namespace="ns1", async_req=True)],
+        any_order=True,
     )
     indexer.pinecone_index.upsert.assert_called_with(
         vectors=(
@@ -217,8 +220,8 @@ def test_pinecone_index_delete_1k_limit(mock_describe_index):
     indexer.delete(["delete_id1"], "ns1", "some_stream")
     indexer.pinecone_index.delete.assert_has_calls(
         [
-            call(ids=[f"doc_id_{str(i)}" for i in range(1000)], namespace="ns1"),
-            call(ids=[f"doc_id_{str(i+1000)}" for i in range(300)], namespace="ns1"),
+            call(ids=[f"doc_id_{str(i)}" for i in range(1000)], namespace="ns1", async_req=True),
+            call(ids=[f"doc_id_{str(i+1000)}" for i in range(300)], namespace="ns1", async_req=True),
         ]
     )
 
@@ -305,7 +308,111 @@ def test_pinecone_pre_sync_starter(mock_describe_index, mock_determine_spec_type
     indexer.pinecone_index.query.assert_called_with(
         vector=[0, 0, 0], filter={"_ab_stream": "ns2_example_stream2"}, top_k=10_000, namespace="ns2"
     )
-    indexer.pinecone_index.delete.assert_called_with(ids=["doc_id1", "doc_id2"], namespace="ns2")
+    indexer.pinecone_index.delete.assert_called_with(ids=["doc_id1", "doc_id2"], namespace="ns2", async_req=True)
+
+
+def list_ids(ids):
+    """
+    Mimics Index.list, returning the given ids starting with the prefix in pages of 100.
+    """
+
+    def list(prefix, namespace):
+        matching_ids = sorted(id for id in ids if id.startswith(prefix))
+        for i in range(0, len(matching_ids), 100):
+            yield matching_ids[i : i + 100]
+
+    return list
+
+
+def deleted_ids(indexer):
+    return sorted(id for delete_call in indexer.pinecone_index.delete.call_args_list for id in delete_call.kwargs["ids"])
+
+
+def test_pinecone_delete_by_prefix():
+    indexer = create_pinecone_indexer()
+    previous_ids = [f"example_stream#{uuid.uuid4()}" for _ in range(2500)]
+    indexer.pinecone_index.list.side_effect = list_ids(previous_ids + [f"example_stream2#{uuid.uuid4()}"])
+
+    indexer.delete_by_prefix(prefix="example_stream", namespace="ns1")
+
+    assert sorted(call.kwargs["prefix"] for call in indexer.pinecone_index.list.call_args_list) == [
+        f"example_stream#{character}" for character in "0123456789abcdef"
+    ]
+    assert deleted_ids(indexer) == sorted(previous_ids)
+    for delete_call in indexer.pinecone_index.delete.call_args_list:
+        assert len(delete_call.kwargs["ids"]) <= 1000
+        assert delete_call.kwargs["namespace"] == "ns1"
+        assert delete_call.kwargs["async_req"]
+    # the ids of all the listed pages are sent in full batches
+    assert indexer.pinecone_index.delete.call_count == 3
+    assert indexer.pinecone_index.delete.return_value.result.call_count == 3
+
+
+def test_pinecone_delete_by_prefix_raises_delete_errors():
+    indexer = create_pinecone_indexer()
+    indexer.pinecone_index.list.side_effect = list_ids([f"example_stream#{uuid.uuid4()}" for _ in range(10)])
+    indexer.pinecone_index.delete.return_value.result.side_effect = Exception("Delete failed")
+
+    with pytest.raises(Exception, match="Delete failed"):
+        indexer.delete_by_prefix(prefix="example_stream", namespace="ns1")
+
+
+def test_pinecone_delete_by_prefix_limits_pending_deletes():
+    indexer = create_pinecone_indexer()
+    indexer.pinecone_index.list.side_effect = list_ids([f"example_stream#{uuid.uuid4()}" for _ in range(20_000)])
+    pending_deletes = []
+
+    def delete(ids, namespace, async_req):
+        future = Mock()
+        future.result.side_effect = lambda: pending_deletes.remove(future)
+        pending_deletes.append(future)
+        assert len(pending_deletes) <= 8
+        return future
+
+    indexer.pinecone_index.delete.side_effect = delete
+
+    indexer.delete_by_prefix(prefix="example_stream", namespace="ns1")
+
+    assert indexer.pinecone_index.delete.call_count == 20
+    assert pending_deletes == []
+
+
+def test_pinecone_pre_sync_serverless(mock_determine_spec_type):
+    mock_determine_spec_type.return_value = "serverless"
+    indexer = create_pinecone_indexer()
+    previous_ids = [f"example_stream2#{uuid.uuid4()}" for _ in range(50)]
+    listed_ids = list(previous_ids)
+    indexing_started = threading.Event()
+
+    def list_after_indexing_started(prefix, namespace):
+        # the deletion runs in the background, so the ids are listed once the vectors of this sync are indexed
+        assert indexing_started.wait(5)
+        yield from list_ids(listed_ids)(prefix, namespace)
+
+    indexer.pinecone_index.list.side_effect = list_after_indexing_started
+
+    indexer.pre_sync(generate_catalog())
+    indexer.index([Mock(page_content="test", metadata={"_ab_stream": "abc"}, embedding=[1, 2, 3])], "ns2", "example_stream2")
+    new_id = indexer.pinecone_index.upsert.call_args.kwargs["vectors"][0][0]
+    listed_ids.append(new_id)
+    indexing_started.set()
+    indexer.post_sync()
+
+    assert new_id.startswith("example_stream2#")
+    assert deleted_ids(indexer) == sorted(previous_ids)
+    assert {call.kwargs["namespace"] for call in indexer.pinecone_index.delete.call_args_list} == {"ns2"}
+    mock_determine_spec_type.return_value = "pod"
+
+
+def test_pinecone_post_sync_raises_deletion_errors(mock_determine_spec_type):
+    mock_determine_spec_type.return_value = "serverless"
+    indexer = create_pinecone_indexer()
+    indexer.pinecone_index.list.side_effect = Exception("List failed")
+
+    indexer.pre_sync(generate_catalog())
+    with pytest.raises(Exception, match="List failed"):
+        indexer.post_sync()
+    mock_determine_spec_type.return_value = "pod"
 
 
 @pytest.mark.parametrize(
@@ -33,6 +33,13 @@ class QdrantIndexingConfigModel(BaseModel):
         title="Prefer gRPC", description="Whether to prefer gRPC over HTTP. Set to true for Qdrant cloud clusters", default=True
     )
     collection: str = Field(..., title="Collection Name", description="The collection to load data into", order=2)
+    upload_parallelism: int = Field(
+        default=4,
+        title="Upload Parallelism",
+        description="The number of batches of points uploaded in parallel over the connection to the Qdrant instance. Set to 1 to upload one batch at a time.",
+        ge=1,
+        le=16,
+    )
     distance_metric: str = Field(
         default="cos",
         title="Distance Metric",
@@ -3,7 +3,10 @@
 #
 
 
+import logging
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional
 
 from qdrant_client import QdrantClient, models
@@ -12,18 +15,28 @@ from qdrant_client.models import Distance, PayloadSchemaType, VectorParams
 
 from airbyte_cdk.destinations.vector_db_based.document_processor import METADATA_RECORD_ID_FIELD, METADATA_STREAM_FIELD
 from airbyte_cdk.destinations.vector_db_based.indexer import Indexer
-from airbyte_cdk.destinations.vector_db_based.utils import create_stream_identifier, format_exception
+from airbyte_cdk.destinations.vector_db_based.utils import create_chunks, create_stream_identifier, format_exception
 from airbyte_cdk.models import AirbyteLogMessage, AirbyteMessage, ConfiguredAirbyteCatalog, Level, Type
 from airbyte_cdk.models.airbyte_protocol import DestinationSyncMode
 from destination_qdrant.config import QdrantIndexingConfigModel
 
 
+LOGGER = logging.getLogger("airbyte")
+
 DISTANCE_METRIC_MAP = {
     "dot": Distance.DOT,
     "cos": Distance.COSINE,
     "euc": Distance.EUCLID,
 }
 
+# number of points of an upsert request, as in QdrantClient.upload_points
+UPLOAD_BATCH_SIZE = 64
+MAX_UPLOAD_RETRIES = 3
+RETRY_BACKOFF_SECONDS = 1
+
+# number of record ids matched by the filter of a delete request
+MAX_IDS_PER_DELETE = 1000
+
 
 class QdrantIndexer(Indexer):
     config: QdrantIndexingConfigModel
@@ -90,32 +103,35 @@ class QdrantIndexer(Indexer):
             )
 
     def delete(self, delete_ids, namespace, stream):
-        if len(delete_ids) > 0:
+        for batch in create_chunks(delete_ids, batch_size=MAX_IDS_PER_DELETE):
             self._delete_for_filter(
                 models.FilterSelector(
-                    filter=models.Filter(
-                        should=[
-                            models.FieldCondition(key=METADATA_RECORD_ID_FIELD, match=models.MatchValue(value=_id)) for _id in delete_ids
-                        ]
-                    )
+                    filter=models.Filter(must=[models.FieldCondition(key=METADATA_RECORD_ID_FIELD, match=models.MatchAny(any=list(batch)))])
                 )
             )
 
     def index(self, document_chunks, namespace, stream):
-        entities = []
+        points = []
         for i in range(len(document_chunks)):
             chunk = document_chunks[i]
             payload = chunk.metadata
             if chunk.page_content is not None:
                 payload[self.config.text_field] = chunk.page_content
-            entities.append(
-                models.Record(
+            points.append(
+                models.PointStruct(
                     id=str(uuid.uuid4()),
                     payload=payload,
                     vector=chunk.embedding,
                 )
             )
-        self._client.upload_records(collection_name=self.config.collection, records=entities)
+        batches = [list(batch) for batch in create_chunks(points, batch_size=UPLOAD_BATCH_SIZE)]
+        if not batches:
+            return
+
+        # the batches share the connection of the client, whose gRPC channel multiplexes the requests sent in parallel
+        with ThreadPoolExecutor(max_workers=min(self.config.upload_parallelism, len(batches))) as executor:
+            # consuming the results raises the first error of the uploads
+            list(executor.map(self._upload_batch, batches))
 
     def post_sync(self) -> List[AirbyteMessage]:
         try:
@@ -139,5 +155,20 @@ class QdrantIndexer(Indexer):
             api_key = auth_method.api_key
             self._client = QdrantClient(url=url, prefer_grpc=prefer_grpc, api_key=api_key)
 
+    def _upload_batch(self, points: List[models.PointStruct]) -> None:
+        """
+        Upserts the points, retrying on failures like QdrantClient.upload_points. The ids of the points are set by the connector,
+        so a retried upsert overwrites the points already written by the failed attempt.
+        """
+        for attempt in range(MAX_UPLOAD_RETRIES):
+            try:
+                self._client.upsert(collection_name=self.config.collection, points=points, wait=False)
+                return
+            except Exception as e:
+                if attempt == MAX_UPLOAD_RETRIES - 1:
+                    raise
+                LOGGER.warning(f"Upload of {len(points)} points failed, retrying: {format_exception(e)}")
+                time.sleep(RETRY_BACKOFF_SECONDS * 2**attempt)
+
     def _delete_for_filter(self, selector: PointsSelector) -> None:
         self._client.delete(collection_name=self.config.collection, points_selector=selector)
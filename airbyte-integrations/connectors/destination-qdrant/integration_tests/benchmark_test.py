@@ -0,0 +1,104 @@
+#
+# Copyright (c) 2023 Airbyte, Inc., all rights reserved.
+#
+
+import logging
+import os
+import time
+import uuid
+from unittest.mock import Mock
+
+import pytest
+from destination_qdrant.config import QdrantIndexingConfigModel
+from destination_qdrant.indexer import QdrantIndexer
+from qdrant_client import models
+
+
+logger = logging.getLogger("airbyte")
+
+QDRANT_URL_ENV = "QDRANT_BENCHMARK_URL"
+COLLECTION = "benchmark"
+DIMENSIONS = 384
+# number of chunks of a batch written by the Writer of the destination
+CHUNKS_PER_INDEX_CALL = 256
+INDEX_CALLS = 20
+DELETE_ID_COUNT = 5000
+
+
+@pytest.fixture(name="qdrant_url", scope="module")
+def qdrant_url_fixture():
+    """
+    Qdrant instance to benchmark against, like a local container started with:
+    docker run -p 6333:6333 -p 6334:6334 qdrant/qdrant:v1.13.4
+    """
+    url = os.environ.get(QDRANT_URL_ENV)
+    if not url:
+        pytest.skip(f"{QDRANT_URL_ENV} is not set")
+    return url
+
+
+def create_indexer(url: str, upload_parallelism: int) -> QdrantIndexer:
+    config = QdrantIndexingConfigModel(
+        url=url, auth_method={"mode": "no_auth"}, prefer_grpc=True, collection=COLLECTION, upload_parallelism=upload_parallelism
+    )
+    indexer = QdrantIndexer(config, DIMENSIONS)
+    indexer._create_client()
+    indexer._client.recreate_collection(
+        collection_name=COLLECTION, vectors_config=models.VectorParams(size=DIMENSIONS, distance=models.Distance.COSINE)
+    )
+    indexer.pre_sync(Mock(streams=[]))
+    return indexer
+
+
+def create_chunks(record_ids):
+    return [
+        Mock(metadata={"_ab_record_id": record_id, "_ab_stream": "benchmark"}, page_content="x" * 500, embedding=[0.1] * DIMENSIONS)
+        for record_id in record_ids
+    ]
+
+
+def test_upload_and_delete_throughput(qdrant_url):
+    record_ids = [str(uuid.uuid4()) for _ in range(CHUNKS_PER_INDEX_CALL * INDEX_CALLS)]
+    batches = [record_ids[i : i + CHUNKS_PER_INDEX_CALL] for i in range(0, len(record_ids), CHUNKS_PER_INDEX_CALL)]
+    deleted_ids = record_ids[:DELETE_ID_COUNT]
+
+    # Previous implementation: upload_records with the default settings for every batch, one condition per deleted id
+    indexer = create_indexer(qdrant_url, 1)
+    start = time.perf_counter()
+    for batch in batches:
+        records = [models.Record(id=str(uuid.uuid4()), payload=chunk.metadata, vector=chunk.embedding) for chunk in create_chunks(batch)]
+        indexer._client.upload_records(collection_name=COLLECTION, records=records)
+    previous_upload_duration = time.perf_counter() - start
+    start = time.perf_counter()
+    indexer._client.delete(
+        collection_name=COLLECTION,
+        points_selector=models.FilterSelector(
+            filter=models.Filter(
+                should=[models.FieldCondition(key="_ab_record_id", match=models.MatchValue(value=_id)) for _id in deleted_ids]
+            )
+        ),
+        wait=True,
+    )
+    previous_delete_duration = time.perf_counter() - start
+    indexer.post_sync()
+
+    indexer = create_indexer(qdrant_url, 4)
+    start = time.perf_counter()
+    for batch in batches:
+        indexer.index(create_chunks(batch), None, "benchmark")
+    upload_duration = time.perf_counter() - start
+    start = time.perf_counter()
+    indexer.delete(deleted_ids, None, "benchmark")
+    remaining = indexer._client.count(collection_name=COLLECTION, exact=True).count
+    delete_duration = time.perf_counter() - start
+    indexer.post_sync()
+
+    point_count = len(record_ids)
+    logger.info(
+        f"Uploading {point_count} points of {DIMENSIONS} dimensions: previous {point_count / previous_upload_duration:.0f} points/s, "
+        f"parallel gRPC {point_count / upload_duration:.0f} points/s. "
+        f"Deleting {DELETE_ID_COUNT} record ids: previous {previous_delete_duration:.2f}s, MatchAny batches {delete_duration:.2f}s."
+    )
+    assert remaining == point_count - DELETE_ID_COUNT
+    assert upload_duration < previous_upload_duration
+    assert delete_duration < previous_delete_duration
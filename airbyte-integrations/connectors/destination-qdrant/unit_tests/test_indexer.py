@@ -3,7 +3,7 @@
 #
 
 import unittest
-from unittest.mock import Mock, call
+from unittest.mock import Mock, call, patch
 
 from destination_qdrant.config import QdrantIndexingConfigModel
 from destination_qdrant.indexer import QdrantIndexer
@@ -155,7 +155,41 @@ class TestQdrantIndexer(unittest.TestCase):
             "some_stream",
         )
 
-        self.qdrant_indexer._client.upload_records.assert_called_once()
+        self.qdrant_indexer._client.upsert.assert_called_once()
+        points = self.qdrant_indexer._client.upsert.call_args.kwargs["points"]
+        self.assertEqual([point.vector for point in points], [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]])
+        self.assertEqual(points[0].payload, {"key": "value1", "text": "some content"})
+
+    def test_index_uploads_batches_in_parallel(self):
+        self.qdrant_indexer.index(
+            [Mock(metadata={"key": f"value{i}"}, page_content=f"content {i}", embedding=[float(i)] * 3) for i in range(150)],
+            None,
+            "some_stream",
+        )
+
+        batches = sorted(
+            (call.kwargs["points"] for call in self.qdrant_indexer._client.upsert.call_args_list), key=lambda points: points[0].vector
+        )
+        self.assertEqual([len(points) for points in batches], [64, 64, 22])
+        self.assertEqual([point.vector[0] for points in batches for point in points], [float(i) for i in range(150)])
+
+    @patch("destination_qdrant.indexer.RETRY_BACKOFF_SECONDS", 0)
+    def test_index_retries_failed_uploads(self):
+        self.qdrant_indexer._client.upsert.side_effect = [Exception("Unavailable"), None]
+
+        self.qdrant_indexer.index([Mock(metadata={}, page_content="some content", embedding=[1.0, 2.0, 3.0])], None, "some_stream")
+
+        self.assertEqual(self.qdrant_indexer._client.upsert.call_count, 2)
+        first_attempt, second_attempt = self.qdrant_indexer._client.upsert.call_args_list
+        self.assertEqual(first_attempt.kwargs["points"][0].id, second_attempt.kwargs["points"][0].id)
+
+    @patch("destination_qdrant.indexer.RETRY_BACKOFF_SECONDS", 0)
+    def test_index_raises_after_max_retries(self):
+        self.qdrant_indexer._client.upsert.side_effect = Exception("Unavailable")
+
+        with self.assertRaises(Exception):
+            self.qdrant_indexer.index([Mock(metadata={}, page_content="some content", embedding=[1.0, 2.0, 3.0])], None, "some_stream")
+        self.assertEqual(self.qdrant_indexer._client.upsert.call_count, 3)
 
     def test_index_calls_delete(self):
         self.qdrant_indexer.delete(["some_id", "another_id"], None, "some_stream")
@@ -164,14 +198,25 @@ class TestQdrantIndexer(unittest.TestCase):
             collection_name=self.mock_config.collection,
             points_selector=models.FilterSelector(
                 filter=models.Filter(
-                    should=[
-                        models.FieldCondition(key="_ab_record_id", match=models.MatchValue(value="some_id")),
-                        models.FieldCondition(key="_ab_record_id", match=models.MatchValue(value="another_id")),
-                    ]
+                    must=[models.FieldCondition(key="_ab_record_id", match=models.MatchAny(any=["some_id", "another_id"]))]
                 )
             ),
         )
 
+    def test_delete_batches_ids(self):
+        delete_ids = [f"id_{i}" for i in range(2500)]
+        self.qdrant_indexer.delete(delete_ids, None, "some_stream")
+
+        selectors = [call.kwargs["points_selector"] for call in self.qdrant_indexer._client.delete.call_args_list]
+        self.assertEqual(
+            [selector.filter.must[0].match.any for selector in selectors], [delete_ids[:1000], delete_ids[1000:2000], delete_ids[2000:]]
+        )
+
+    def test_delete_without_ids(self):
+        self.qdrant_indexer.delete([], None, "some_stream")
+
+        self.qdrant_indexer._client.delete.assert_not_called()
+
     def test_post_sync_calls_close(self):
         result = self.qdrant_indexer.post_sync()
         self.qdrant_indexer._client.close.assert_called_once()
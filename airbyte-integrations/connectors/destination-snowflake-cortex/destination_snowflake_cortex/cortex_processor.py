@@ -4,6 +4,9 @@
 from __future__ import annotations
 
 import uuid
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import cached_property
 from pathlib import Path
 from textwrap import dedent, indent
 from typing import TYPE_CHECKING, Any
@@ -12,8 +15,10 @@ import dpath
 import sqlalchemy
 from airbyte._processors.file.jsonl import JsonlWriter
 from airbyte.secrets import SecretString
+from airbyte.strategies import WriteStrategy
 from airbyte.types import SQLTypeConverter
 from airbyte_cdk.destinations.vector_db_based import embedder
+from airbyte_cdk.destinations.vector_db_based.document_processor import Chunk
 from airbyte_cdk.destinations.vector_db_based.document_processor import (
     DocumentProcessor as DocumentSplitter,
 )
@@ -41,6 +46,33 @@ from destination_snowflake_cortex.globals import (
 if TYPE_CHECKING:
     from pathlib import Path
 
+EMBEDDING_BATCH_SIZE = 150
+"""The number of chunks embedded per request, for providers without a known request limit."""
+
+COHERE_EMBEDDING_BATCH_SIZE = 96
+"""The maximum number of texts Cohere embeds per request."""
+
+MAX_CONCURRENT_EMBEDDING_REQUESTS = 4
+"""The maximum number of embedding requests in flight at once."""
+
+MAX_CONCURRENT_UPLOADS = 4
+"""The maximum number of files uploaded to a Snowflake stage at once."""
+
+CHUNK_STREAM_SCHEMA = {
+    "type": "object",
+    "properties": {
+        DOCUMENT_ID_COLUMN: {"type": "string"},
+        CHUNK_ID_COLUMN: {"type": "string"},
+        METADATA_COLUMN: {"type": "object"},
+        DOCUMENT_CONTENT_COLUMN: {"type": "string"},
+        EMBEDDING_COLUMN: {
+            "type": "array",
+            "items": {"type": "float"},
+        },
+    },
+}
+"""The schema of the records written to local files, one per chunk."""
+
 
 class SnowflakeCortexConfig(SqlConfig):
     """A Snowflake configuration for use with Cortex functions."""
@@ -157,6 +189,11 @@ class SnowflakeCortexSqlProcessor(SqlProcessorBase):
         """Initialize the Snowflake processor."""
         self.splitter_config = splitter_config
         self.embedder_config = embedder_config
+        self._pending_chunks: list[tuple[AirbyteRecordMessage, Chunk]] = []
+        self._embedding_requests: deque[
+            tuple[list[tuple[AirbyteRecordMessage, Chunk]], Future[list[list[float] | None]]]
+        ] = deque()
+        self._embedding_executor: ThreadPoolExecutor | None = None
         super().__init__(
             sql_config=sql_config,
             catalog_provider=catalog_provider,
@@ -203,9 +240,14 @@ class SnowflakeCortexSqlProcessor(SqlProcessorBase):
         def path_str(path: Path) -> str:
             return str(path.absolute()).replace("\\", "\\\\")
 
-        for file_path in files:
-            query = f"PUT 'file://{path_str(file_path)}' {internal_sf_stage_name};"
-            self._execute_sql(query)
+        # Each statement runs on its own connection, so the files are uploaded concurrently
+        put_queries = [
+            f"PUT 'file://{path_str(file_path)}' {internal_sf_stage_name};" for file_path in files
+        ]
+        with ThreadPoolExecutor(
+            max_workers=min(MAX_CONCURRENT_UPLOADS, len(put_queries))
+        ) as executor:
+            list(executor.map(self._execute_sql, put_queries))
 
         columns_list = [
             self._quote_identifier(c)
@@ -311,28 +353,81 @@ class SnowflakeCortexSqlProcessor(SqlProcessorBase):
         We override the SQLProcessor implementation in order to handle chunking, embedding, etc.
 
         This method is called for each record message, before the record is written to local file.
+        The chunks of the record are embedded together with the chunks of the records around it,
+        and written to local file once their embeddings are received.
         """
         document_chunks, id_to_delete = self.splitter.process(record_msg)
 
         # TODO: Decide if we need to incorporate this into the final implementation:
         _ = id_to_delete
 
-        if not self.sql_config.cortex_embedding_model:
-            embeddings = self.embedder.embed_documents(
-                # TODO: Check this: Expects a list of documents, not chunks (docs are inconsistent)
-                documents=document_chunks,
+        chunks = [(record_msg, chunk) for chunk in document_chunks]
+        if self.sql_config.cortex_embedding_model:
+            self._write_chunks(chunks, embeddings=None)
+            return
+
+        self._pending_chunks.extend(chunks)
+        while len(self._pending_chunks) >= self.embedding_batch_size:
+            self._submit_embedding_request(self._pending_chunks[: self.embedding_batch_size])
+            del self._pending_chunks[: self.embedding_batch_size]
+
+    @overrides
+    def write_all_stream_data(self, write_strategy: WriteStrategy) -> None:
+        """Finalize any pending writes, once all the pending chunks are embedded."""
+        self._flush_pending_chunks()
+        super().write_all_stream_data(write_strategy)
+
+    def _submit_embedding_request(self, chunks: list[tuple[AirbyteRecordMessage, Chunk]]) -> None:
+        """Embed the chunks in the background.
+
+        When the maximum number of requests are in flight, this first waits for the oldest request
+        and writes its chunks, so that chunks are written in the order of their records.
+        """
+        if len(self._embedding_requests) >= MAX_CONCURRENT_EMBEDDING_REQUESTS:
+            self._write_oldest_embedded_chunks()
+        if self._embedding_executor is None:
+            self._embedding_executor = ThreadPoolExecutor(
+                max_workers=MAX_CONCURRENT_EMBEDDING_REQUESTS
             )
-        for i, chunk in enumerate(document_chunks, start=0):
+        future = self._embedding_executor.submit(
+            self.embedder.embed_documents,
+            # TODO: Check this: Expects a list of documents, not chunks (docs are inconsistent)
+            [chunk for _, chunk in chunks],
+        )
+        self._embedding_requests.append((chunks, future))
+
+    def _write_oldest_embedded_chunks(self) -> None:
+        """Wait for the oldest embedding request and write its chunks."""
+        chunks, future = self._embedding_requests.popleft()
+        self._write_chunks(chunks, embeddings=future.result())
+
+    def _flush_pending_chunks(self) -> None:
+        """Embed and write all the pending chunks."""
+        if self._pending_chunks:
+            self._submit_embedding_request(self._pending_chunks)
+            self._pending_chunks = []
+        try:
+            while self._embedding_requests:
+                self._write_oldest_embedded_chunks()
+        finally:
+            if self._embedding_executor is not None:
+                self._embedding_executor.shutdown(cancel_futures=True)
+                self._embedding_executor = None
+
+    def _write_chunks(
+        self,
+        chunks: list[tuple[AirbyteRecordMessage, Chunk]],
+        embeddings: list[list[float] | None] | None,
+    ) -> None:
+        """Write chunks to local file, with their embeddings if any."""
+        for i, (record_msg, chunk) in enumerate(chunks):
             new_data: dict[str, Any] = {
                 DOCUMENT_ID_COLUMN: self._create_document_id(record_msg),
                 CHUNK_ID_COLUMN: str(uuid.uuid4().int),
                 METADATA_COLUMN: chunk.metadata,
                 DOCUMENT_CONTENT_COLUMN: chunk.page_content,
-                EMBEDDING_COLUMN: None,
+                EMBEDDING_COLUMN: embeddings[i] if embeddings is not None else None,
             }
-            if not self.sql_config.cortex_embedding_model:
-                new_data[EMBEDDING_COLUMN] = embeddings[i]
-
             self.file_writer.process_record_message(
                 record_msg=AirbyteRecordMessage(
                     namespace=record_msg.namespace,
@@ -340,19 +435,7 @@ class SnowflakeCortexSqlProcessor(SqlProcessorBase):
                     data=new_data,
                     emitted_at=record_msg.emitted_at,
                 ),
-                stream_schema={
-                    "type": "object",
-                    "properties": {
-                        DOCUMENT_ID_COLUMN: {"type": "string"},
-                        CHUNK_ID_COLUMN: {"type": "string"},
-                        METADATA_COLUMN: {"type": "object"},
-                        DOCUMENT_CONTENT_COLUMN: {"type": "string"},
-                        EMBEDDING_COLUMN: {
-                            "type": "array",
-                            "items": {"type": "float"},
-                        },
-                    },
-                },
+                stream_schema=CHUNK_STREAM_SCHEMA,
             )
 
     def _get_table_by_name(
@@ -395,19 +478,32 @@ class SnowflakeCortexSqlProcessor(SqlProcessorBase):
         """
         pass
 
-    @property
+    @cached_property
     def embedder(self) -> embedder.Embedder:
         return embedder.create_from_config(
             embedding_config=self.embedder_config,  # type: ignore [arg-type]  # No common base class
             processing_config=self.splitter_config,
         )
 
+    @cached_property
+    def embedding_batch_size(self) -> int:
+        """Return the number of chunks to embed per request.
+
+        The OpenAI embedders split the documents they are given into requests of this size, to stay
+        under the tokens-per-minute limit.
+        """
+        if isinstance(self.embedder, embedder.BaseOpenAIEmbedder):
+            return max(1, embedder.OPEN_AI_TOKEN_LIMIT // self.splitter_config.chunk_size)
+        if isinstance(self.embedder, embedder.CohereEmbedder):
+            return COHERE_EMBEDDING_BATCH_SIZE
+        return EMBEDDING_BATCH_SIZE
+
     @property
     def embedding_dimensions(self) -> int:
         """Return the number of dimensions for the embeddings."""
         return self.embedder.embedding_dimensions
 
-    @property
+    @cached_property
     def splitter(self) -> DocumentSplitter:
         return DocumentSplitter(
             config=self.splitter_config,
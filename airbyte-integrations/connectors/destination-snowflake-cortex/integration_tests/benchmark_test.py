@@ -0,0 +1,121 @@
+#
+# Copyright (c) 2024 Airbyte, Inc., all rights reserved.
+#
+
+import logging
+import math
+import time
+from contextlib import ExitStack
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from airbyte.strategies import WriteStrategy
+
+from destination_snowflake_cortex import cortex_processor
+from destination_snowflake_cortex.cortex_processor import SnowflakeCortexSqlProcessor
+
+from unit_tests.cortex_processor_test import CHUNKS_PER_RECORD, create_messages, create_processor
+
+logger = logging.getLogger("airbyte")
+
+TOTAL_RECORDS = 500
+RECORDS_PER_FILE = 100
+EMBEDDING_REQUEST_LATENCY = 0.05
+UPLOAD_LATENCY = 0.2
+
+
+class FakeEmbedder:
+    """Return constant embeddings after the latency of an embedding request."""
+
+    embedding_dimensions = 8
+
+    def __init__(self) -> None:
+        self.request_count = 0
+
+    def embed_documents(self, documents: list[Any]) -> list[list[float]]:
+        self.request_count += 1
+        time.sleep(EMBEDDING_REQUEST_LATENCY)
+        return [[0.0] * self.embedding_dimensions for _ in documents]
+
+
+class FakeSql:
+    """Stand in for Snowflake, taking the latency of an upload for each PUT statement."""
+
+    def __init__(self) -> None:
+        self.statements: list[str] = []
+
+    def execute(self, sql: str) -> None:
+        if sql.startswith("PUT"):
+            time.sleep(UPLOAD_LATENCY)
+        self.statements.append(sql)
+
+
+def previous_process_record_message(
+    processor: SnowflakeCortexSqlProcessor, record_msg, stream_schema: dict
+) -> None:
+    # The previous implementation embedded the chunks of each record on their own, before writing them
+    document_chunks, _ = processor.splitter.process(record_msg)
+    embeddings = processor.embedder.embed_documents(documents=document_chunks)
+    processor._write_chunks(
+        [(record_msg, chunk) for chunk in document_chunks], embeddings=embeddings
+    )
+
+
+def run_benchmark(mode: str) -> dict:
+    processor = create_processor()
+    processor.embedder = FakeEmbedder()
+    processor.file_writer.MAX_BATCH_SIZE = RECORDS_PER_FILE * CHUNKS_PER_RECORD
+    sql = FakeSql()
+    with ExitStack() as stack:
+        stack.enter_context(patch.object(processor, "_execute_sql", side_effect=sql.execute))
+        stack.enter_context(patch.object(processor, "_ensure_schema_exists"))
+        stack.enter_context(
+            patch.object(processor, "_ensure_final_table_exists", return_value="docs")
+        )
+        stack.enter_context(
+            patch.object(processor, "_create_table_for_loading", return_value="docs_temp")
+        )
+        stack.enter_context(patch.object(processor, "_write_temp_table_to_final_table"))
+        if mode == "previous":
+            # The previous implementation uploaded one file after the other
+            stack.enter_context(patch.object(cortex_processor, "MAX_CONCURRENT_UPLOADS", 1))
+            stack.enter_context(
+                patch.object(
+                    processor,
+                    "process_record_message",
+                    side_effect=lambda record_msg, stream_schema: previous_process_record_message(
+                        processor, record_msg, stream_schema
+                    ),
+                )
+            )
+        start = time.perf_counter()
+        processor.process_airbyte_messages(
+            create_messages(TOTAL_RECORDS), write_strategy=WriteStrategy.APPEND
+        )
+        duration = time.perf_counter() - start
+    return {
+        "duration": duration,
+        "embedding_requests": processor.embedder.request_count,
+        "uploads": sum(statement.startswith("PUT") for statement in sql.statements),
+    }
+
+
+@pytest.mark.slow
+def test_embedding_and_staging_throughput():
+    previous = run_benchmark("previous")
+    batched = run_benchmark("batched")
+
+    logger.info(
+        f"Writing {TOTAL_RECORDS} records of {CHUNKS_PER_RECORD} chunks, with {EMBEDDING_REQUEST_LATENCY}s per embedding request "
+        f"and {UPLOAD_LATENCY}s per upload: previous {TOTAL_RECORDS / previous['duration']:.0f} records/s with "
+        f"{previous['embedding_requests']} embedding requests, batched {TOTAL_RECORDS / batched['duration']:.0f} records/s with "
+        f"{batched['embedding_requests']} embedding requests"
+    )
+    # The durations depend on the load of the machine, so they are only logged.
+    # The chunks were embedded one request per record, they are now embedded in full batches.
+    chunks = TOTAL_RECORDS * CHUNKS_PER_RECORD
+    assert previous["embedding_requests"] == TOTAL_RECORDS
+    embedding_batch_size = create_processor().embedding_batch_size
+    assert batched["embedding_requests"] == math.ceil(chunks / embedding_batch_size)
+    assert previous["uploads"] == batched["uploads"] == TOTAL_RECORDS // RECORDS_PER_FILE
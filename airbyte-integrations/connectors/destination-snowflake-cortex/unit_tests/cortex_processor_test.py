@@ -0,0 +1,236 @@
+#
+# Copyright (c) 2024 Airbyte, Inc., all rights reserved.
+#
+
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, Mock, patch
+
+from airbyte.strategies import WriteStrategy
+from airbyte_cdk.destinations.vector_db_based.config import (
+    CohereEmbeddingConfigModel,
+    FakeEmbeddingConfigModel,
+    OpenAIEmbeddingConfigModel,
+    ProcessingConfigModel,
+)
+from airbyte_cdk.destinations.vector_db_based.document_processor import Chunk
+from airbyte_cdk.models import (
+    AirbyteMessage,
+    AirbyteRecordMessage,
+    AirbyteStream,
+    ConfiguredAirbyteCatalog,
+    ConfiguredAirbyteStream,
+    DestinationSyncMode,
+    SyncMode,
+    Type,
+)
+
+from destination_snowflake_cortex.common.catalog.catalog_providers import CatalogProvider
+from destination_snowflake_cortex.cortex_processor import (
+    MAX_CONCURRENT_EMBEDDING_REQUESTS,
+    MAX_CONCURRENT_UPLOADS,
+    SnowflakeCortexConfig,
+    SnowflakeCortexSqlProcessor,
+)
+from destination_snowflake_cortex.globals import (
+    DOCUMENT_CONTENT_COLUMN,
+    DOCUMENT_ID_COLUMN,
+    EMBEDDING_COLUMN,
+)
+
+CHUNKS_PER_RECORD = 3
+
+
+def create_processor(embedder_config=None, chunk_size: int = 1000) -> SnowflakeCortexSqlProcessor:
+    stream = AirbyteStream(
+        name="docs",
+        json_schema={
+            "type": "object",
+            "properties": {"id": {"type": "integer"}, "text": {"type": "string"}},
+        },
+        supported_sync_modes=[SyncMode.full_refresh],
+    )
+    catalog = ConfiguredAirbyteCatalog(
+        streams=[
+            ConfiguredAirbyteStream(
+                stream=stream,
+                sync_mode=SyncMode.full_refresh,
+                destination_sync_mode=DestinationSyncMode.append,
+                primary_key=[["id"]],
+            )
+        ]
+    )
+    with patch.object(SnowflakeCortexSqlProcessor, "_ensure_schema_exists"):
+        processor = SnowflakeCortexSqlProcessor(
+            sql_config=SnowflakeCortexConfig(
+                host="MYACCOUNT",
+                username="MYUSERNAME",
+                password="xxxxxxx",
+                warehouse="MYWAREHOUSE",
+                database="MYDATABASE",
+                role="MYROLE",
+            ),
+            splitter_config=ProcessingConfigModel(chunk_size=chunk_size, text_fields=["text"]),
+            embedder_config=embedder_config or FakeEmbeddingConfigModel(mode="fake"),
+            catalog_provider=CatalogProvider(catalog),
+            temp_dir=Path(tempfile.mkdtemp()),
+        )
+    # The document splitter needs tiktoken encodings downloaded from the internet
+    processor.splitter = Mock(
+        process=lambda record: (
+            [
+                Chunk(
+                    page_content=f"{record.data['id']}-{i}",
+                    metadata={"id": record.data["id"]},
+                    record=record,
+                )
+                for i in range(CHUNKS_PER_RECORD)
+            ],
+            None,
+        )
+    )
+    return processor
+
+
+def create_messages(count: int) -> list[AirbyteMessage]:
+    return [
+        AirbyteMessage(
+            type=Type.RECORD,
+            record=AirbyteRecordMessage(
+                stream="docs", data={"id": i, "text": f"text {i}"}, emitted_at=0
+            ),
+        )
+        for i in range(count)
+    ]
+
+
+def embed_documents(documents) -> list[list[float]]:
+    return [[float(document.page_content.replace("-", "."))] for document in documents]
+
+
+class TestSnowflakeCortexSqlProcessor(unittest.TestCase):
+    def test_embedder_is_created_once(self):
+        processor = create_processor()
+        with patch(
+            "destination_snowflake_cortex.cortex_processor.embedder.create_from_config"
+        ) as create_from_config:
+            create_from_config.return_value.embedding_dimensions = 1536
+
+            assert processor.embedding_dimensions == 1536
+            assert processor.embedder is processor.embedder
+
+        create_from_config.assert_called_once()
+
+    def test_embedding_batch_size(self):
+        openai_config = OpenAIEmbeddingConfigModel(mode="openai", openai_key="mykey")
+        cohere_config = CohereEmbeddingConfigModel(mode="cohere", cohere_key="mykey")
+
+        assert create_processor(openai_config).embedding_batch_size == 150
+        assert create_processor(openai_config, chunk_size=100).embedding_batch_size == 1500
+        assert create_processor(cohere_config).embedding_batch_size == 96
+        assert create_processor().embedding_batch_size == 150
+
+    def test_chunks_are_embedded_in_batches_across_records(self):
+        processor = create_processor()
+        processor.embedder = Mock(embed_documents=Mock(side_effect=embed_documents))
+        processor.file_writer = MagicMock()
+
+        with patch.object(SnowflakeCortexSqlProcessor, "write_stream_data") as write_stream_data:
+            processor.process_airbyte_messages(
+                create_messages(120), write_strategy=WriteStrategy.AUTO
+            )
+
+        assert [
+            len(call.args[0]) for call in processor.embedder.embed_documents.call_args_list
+        ] == [150, 150, 60]
+        written = [
+            call.kwargs["record_msg"].data
+            for call in processor.file_writer.process_record_message.call_args_list
+        ]
+        assert [data[DOCUMENT_CONTENT_COLUMN] for data in written] == [
+            f"{i}-{j}" for i in range(120) for j in range(CHUNKS_PER_RECORD)
+        ]
+        assert all(
+            data[EMBEDDING_COLUMN] == [float(data[DOCUMENT_CONTENT_COLUMN].replace("-", "."))]
+            for data in written
+        )
+        assert written[0][DOCUMENT_ID_COLUMN] == "Stream_docs_Key_0"
+        # all the chunks are written before the streams are
+        write_stream_data.assert_called_once_with("docs", write_strategy=WriteStrategy.AUTO)
+
+    def test_embedding_requests_run_concurrently(self):
+        processor = create_processor()
+        barrier = threading.Barrier(MAX_CONCURRENT_EMBEDDING_REQUESTS, timeout=10)
+
+        def wait_and_embed(documents):
+            barrier.wait()
+            return embed_documents(documents)
+
+        processor.embedder = Mock(embed_documents=Mock(side_effect=wait_and_embed))
+        processor.file_writer = MagicMock()
+
+        with patch.object(SnowflakeCortexSqlProcessor, "write_stream_data"):
+            processor.process_airbyte_messages(
+                create_messages(50 * MAX_CONCURRENT_EMBEDDING_REQUESTS * 2),
+                write_strategy=WriteStrategy.AUTO,
+            )
+
+        assert (
+            processor.embedder.embed_documents.call_count == MAX_CONCURRENT_EMBEDDING_REQUESTS * 2
+        )
+        assert (
+            processor.file_writer.process_record_message.call_count
+            == 50 * MAX_CONCURRENT_EMBEDDING_REQUESTS * 2 * CHUNKS_PER_RECORD
+        )
+
+    def test_embedding_errors_are_raised(self):
+        processor = create_processor()
+        processor.embedder = Mock(embed_documents=Mock(side_effect=ValueError("Embedding failed")))
+        processor.file_writer = MagicMock()
+
+        with patch.object(SnowflakeCortexSqlProcessor, "write_stream_data") as write_stream_data:
+            with self.assertRaises(ValueError):
+                processor.process_airbyte_messages(
+                    create_messages(10), write_strategy=WriteStrategy.AUTO
+                )
+
+        processor.file_writer.process_record_message.assert_not_called()
+        write_stream_data.assert_not_called()
+
+    def test_files_are_uploaded_concurrently(self):
+        processor = create_processor()
+        processor.embedder = Mock(embedding_dimensions=1536)
+        barrier = threading.Barrier(MAX_CONCURRENT_UPLOADS, timeout=10)
+        statements = []
+
+        def execute_sql(sql):
+            if sql.startswith("PUT"):
+                barrier.wait()
+            statements.append(sql)
+
+        files = [Path(f"/tmp/file_{i}.jsonl.gz") for i in range(MAX_CONCURRENT_UPLOADS * 2)]
+        with patch.object(processor, "_create_table_for_loading", return_value="docs_temp"):
+            with patch.object(processor, "_execute_sql", side_effect=execute_sql):
+                assert processor._write_files_to_new_table(files, "docs", "batch") == "docs_temp"
+
+        assert sorted(statements[:-1]) == sorted(
+            f"PUT 'file://{path}' @%docs_temp;" for path in files
+        )
+        assert "COPY INTO docs_temp" in statements[-1]
+
+    def test_cortex_embedding_model_skips_embedding(self):
+        processor = create_processor()
+        processor.embedder = Mock()
+        processor.file_writer = MagicMock()
+
+        with patch.object(SnowflakeCortexConfig, "cortex_embedding_model", "e5-base-v2"):
+            processor.process_record_message(create_messages(1)[0].record, stream_schema={})
+
+        processor.embedder.embed_documents.assert_not_called()
+        written = [
+            call.kwargs["record_msg"].data
+            for call in processor.file_writer.process_record_message.call_args_list
+        ]
+        assert [data[EMBEDDING_COLUMN] for data in written] == [None] * CHUNKS_PER_RECORD
@@ -10,12 +10,23 @@ import sqlite3
 import uuid
 from asyncio.log import logger
 from collections import defaultdict
-from typing import Any, Iterable, Mapping
+from typing import Any, Iterable, List, Mapping, Tuple
 
 from airbyte_cdk.destinations import Destination
 from airbyte_cdk.models import AirbyteConnectionStatus, AirbyteMessage, ConfiguredAirbyteCatalog, DestinationSyncMode, Status, Type
 
 
+# size of the buffered records written to the database without waiting for a state message, so memory stays bounded
+MAX_BUFFER_BYTES = 16 * 1024 * 1024
+# size of the id and the timestamp of a record
+ROW_OVERHEAD_BYTES = 62
+
+DEFAULT_JOURNAL_MODE = "DELETE"
+DEFAULT_SYNCHRONOUS = "FULL"
+JOURNAL_MODES = ("DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF")
+SYNCHRONOUS_LEVELS = ("OFF", "NORMAL", "FULL", "EXTRA")
+
+
 class DestinationSqlite(Destination):
     @staticmethod
     def _get_destination_path(destination_path: str) -> str:
@@ -57,6 +68,10 @@ class DestinationSqlite(Destination):
             path = ""
         path = self._get_destination_path(path)
         con = sqlite3.connect(path)
+        self._configure_durability(con, config)
+        bulk_load = config.get("bulk_load_full_refresh", False)
+        # tables created without their primary key index, which is built once all their records are loaded
+        bulk_loaded_tables = []
         with con:
             # create the tables if needed
             for configured_stream in configured_catalog.streams:
@@ -68,6 +83,18 @@ class DestinationSqlite(Destination):
                     DROP TABLE IF EXISTS {}
                     """.format(table_name)
                     con.execute(query)
+                    if bulk_load:
+                        bulk_loaded_tables.append(table_name)
+                        con.execute(
+                            """
+                            CREATE TABLE {table_name} (
+                                _airbyte_ab_id TEXT,
+                                _airbyte_emitted_at TEXT,
+                                _airbyte_data TEXT
+                            )
+                            """.format(table_name=table_name)
+                        )
+                        continue
                 # create the table if needed
                 query = """
                 CREATE TABLE IF NOT EXISTS {table_name} (
@@ -77,22 +104,26 @@ class DestinationSqlite(Destination):
                 )
                 """.format(table_name=table_name)
                 con.execute(query)
+                # the table of a bulk load that failed before its index was built
+                self._create_unique_index(con, table_name)
 
+            # the statements are prepared once and reused by every flush
+            insert_queries = {
+                stream_name: """
+                INSERT INTO {table_name}
+                VALUES (?,?,?)
+                """.format(table_name=f"_airbyte_raw_{stream_name}")
+                for stream_name in streams
+            }
             buffer = defaultdict(list)
+            buffer_size = 0
 
             for message in input_messages:
                 if message.type == Type.STATE:
                     # flush the buffer
-                    for stream_name in buffer.keys():
-                        query = """
-                        INSERT INTO {table_name}
-                        VALUES (?,?,?)
-                        """.format(table_name=f"_airbyte_raw_{stream_name}")
-
-                        con.executemany(query, buffer[stream_name])
-
-                    con.commit()
+                    self._flush(con, insert_queries, buffer)
                     buffer = defaultdict(list)
+                    buffer_size = 0
 
                     yield message
                 elif message.type == Type.RECORD:
@@ -103,19 +134,48 @@ class DestinationSqlite(Destination):
                         continue
 
                     # add to buffer
-                    buffer[stream].append((str(uuid.uuid4()), datetime.datetime.now().isoformat(), json.dumps(data)))
+                    json_data = json.dumps(data)
+                    buffer[stream].append((str(uuid.uuid4()), datetime.datetime.now().isoformat(), json_data))
+                    buffer_size += len(json_data) + ROW_OVERHEAD_BYTES
+                    if buffer_size >= MAX_BUFFER_BYTES:
+                        self._flush(con, insert_queries, buffer)
+                        buffer = defaultdict(list)
+                        buffer_size = 0
 
             # flush any remaining messages
-            for stream_name in buffer.keys():
-                query = """
-                INSERT INTO {table_name}
-                VALUES (?,?,?)
-                """.format(table_name=f"_airbyte_raw_{stream_name}")
-
-                con.executemany(query, buffer[stream_name])
+            self._flush(con, insert_queries, buffer)
 
+            for table_name in bulk_loaded_tables:
+                self._create_unique_index(con, table_name)
             con.commit()
 
+    @staticmethod
+    def _configure_durability(con: sqlite3.Connection, config: Mapping[str, Any]) -> None:
+        journal_mode = config.get("journal_mode") or DEFAULT_JOURNAL_MODE
+        synchronous = config.get("synchronous") or DEFAULT_SYNCHRONOUS
+        if journal_mode not in JOURNAL_MODES:
+            raise ValueError(f"Invalid journal mode: {journal_mode}")
+        if synchronous not in SYNCHRONOUS_LEVELS:
+            raise ValueError(f"Invalid synchronous level: {synchronous}")
+        con.execute(f"PRAGMA journal_mode = {journal_mode}")
+        con.execute(f"PRAGMA synchronous = {synchronous}")
+
+    @staticmethod
+    def _flush(con: sqlite3.Connection, insert_queries: Mapping[str, str], buffer: Mapping[str, List[Tuple[str, str, str]]]) -> None:
+        for stream_name, rows in buffer.items():
+            con.executemany(insert_queries[stream_name], rows)
+        con.commit()
+
+    @staticmethod
+    def _create_unique_index(con: sqlite3.Connection, table_name: str) -> None:
+        """
+        Creates the unique index on the record ids of a table created without its primary key.
+        """
+        columns = con.execute(f"PRAGMA table_info({table_name})").fetchall()
+        # the pk column of table_info is 0 for the columns which are not part of the primary key
+        if any(column[1] == "_airbyte_ab_id" and column[5] == 0 for column in columns):
+            con.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {table_name}_ab_id ON {table_name} (_airbyte_ab_id)")
+
     def check(self, logger: logging.Logger, config: Mapping[str, Any]) -> AirbyteConnectionStatus:
         """
         Tests if the input configuration can be used to successfully connect to the destination with the needed permissions
@@ -0,0 +1,132 @@
+#
+# Copyright (c) 2023 Airbyte, Inc., all rights reserved.
+#
+
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+
+import pytest
+
+
+logger = logging.getLogger("airbyte")
+
+TOTAL_RECORDS = 200_000
+RECORD_PAYLOAD_BYTES = 500
+FREQUENT_STATE_INTERVAL = 1_000
+
+# Writes the records of an overwritten stream with a state message every state_interval records, in a fresh process so its peak
+# RSS is its own. The "previous" mode writes like the previous implementation did: all the records since the last state message
+# buffered in a list, inserted with the default journal mode and synchronous level.
+BENCHMARK_SCRIPT = """
+import datetime, json, resource, sqlite3, sys, time, uuid
+
+from destination_sqlite import DestinationSqlite
+
+from airbyte_cdk.models import AirbyteMessage, AirbyteRecordMessage, AirbyteStateMessage, AirbyteStream, ConfiguredAirbyteCatalog
+from airbyte_cdk.models import ConfiguredAirbyteStream, DestinationSyncMode, SyncMode, Type
+
+mode, path, total_records, payload_bytes, state_interval = sys.argv[1], sys.argv[2], *map(int, sys.argv[3:6])
+config = json.loads(sys.argv[6])
+
+
+def messages():
+    for i in range(total_records):
+        data = {"id": i, "payload": str(i).rjust(payload_bytes, "x")}
+        yield AirbyteMessage(type=Type.RECORD, record=AirbyteRecordMessage(stream="benchmark", data=data, emitted_at=0))
+        if (i + 1) % state_interval == 0:
+            yield AirbyteMessage(type=Type.STATE, state=AirbyteStateMessage(data={"state": str(i)}))
+
+
+def previous_write():
+    con = sqlite3.connect(path)
+    con.execute("CREATE TABLE _airbyte_raw_benchmark (_airbyte_ab_id TEXT PRIMARY KEY, _airbyte_emitted_at TEXT, _airbyte_data TEXT)")
+    buffer = []
+    for message in messages():
+        if message.type == Type.STATE:
+            con.executemany("INSERT INTO _airbyte_raw_benchmark VALUES (?,?,?)", buffer)
+            con.commit()
+            buffer = []
+        else:
+            buffer.append((str(uuid.uuid4()), datetime.datetime.now().isoformat(), json.dumps(message.record.data)))
+
+
+def bounded_write():
+    stream = AirbyteStream(name="benchmark", json_schema={}, supported_sync_modes=[SyncMode.full_refresh])
+    catalog = ConfiguredAirbyteCatalog(
+        streams=[ConfiguredAirbyteStream(stream=stream, sync_mode=SyncMode.full_refresh, destination_sync_mode=DestinationSyncMode.overwrite)]
+    )
+    DestinationSqlite._get_destination_path = staticmethod(lambda destination_path: destination_path)
+    list(DestinationSqlite().write(config={"destination_path": path, **config}, configured_catalog=catalog, input_messages=messages()))
+
+
+start = time.perf_counter()
+previous_write() if mode == "previous" else bounded_write()
+duration = time.perf_counter() - start
+count = sqlite3.connect(path).execute("SELECT count(1) FROM _airbyte_raw_benchmark").fetchall()[0][0]
+peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+print(json.dumps({"duration": duration, "count": count, "peak_rss_mb": peak_rss_mb}))
+"""
+
+PROFILES = {
+    "previous": ("previous", {}),
+    "default durability": ("bounded", {}),
+    "WAL, synchronous NORMAL": ("bounded", {"journal_mode": "WAL", "synchronous": "NORMAL"}),
+    "WAL, synchronous NORMAL, bulk load": ("bounded", {"journal_mode": "WAL", "synchronous": "NORMAL", "bulk_load_full_refresh": True}),
+}
+
+
+def run_benchmark(mode: str, config: dict, state_interval: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "sqlite.db")
+        output = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                BENCHMARK_SCRIPT,
+                mode,
+                path,
+                str(TOTAL_RECORDS),
+                str(RECORD_PAYLOAD_BYTES),
+                str(state_interval),
+                json.dumps(config),
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+@pytest.mark.slow
+def test_memory_and_throughput_by_profile():
+    results = {
+        (profile, state_interval): run_benchmark(*PROFILES[profile], state_interval)
+        for profile in PROFILES
+        for state_interval in (FREQUENT_STATE_INTERVAL, TOTAL_RECORDS)
+    }
+
+    logger.info(
+        f"Writing {TOTAL_RECORDS} records of {RECORD_PAYLOAD_BYTES} bytes: "
+        + ", ".join(
+            f"{profile} with a state every {state_interval} records {TOTAL_RECORDS / result['duration']:.0f} records/s "
+            f"and {result['peak_rss_mb']:.0f}MB peak RSS"
+            for (profile, state_interval), result in results.items()
+        )
+    )
+    assert all(result["count"] == TOTAL_RECORDS for result in results.values())
+    # SQLite caches the same pages whatever the cadence, so the growth of the peak RSS is due to the buffered records
+    previous_growth = results[("previous", TOTAL_RECORDS)]["peak_rss_mb"] - results[("previous", FREQUENT_STATE_INTERVAL)]["peak_rss_mb"]
+    bounded_growth = (
+        results[("default durability", TOTAL_RECORDS)]["peak_rss_mb"]
+        - results[("default durability", FREQUENT_STATE_INTERVAL)]["peak_rss_mb"]
+    )
+    assert bounded_growth * 2 < previous_growth
+    # every commit updates the primary key index at random places, unless it is built at the end
+    assert (
+        results[("WAL, synchronous NORMAL, bulk load", FREQUENT_STATE_INTERVAL)]["duration"]
+        < results[("default durability", FREQUENT_STATE_INTERVAL)]["duration"]
+    )
@@ -3,6 +3,7 @@
 #
 
 import json
+import os
 import random
 import sqlite3
 import string
@@ -13,10 +14,12 @@ from unittest.mock import MagicMock
 
 import pytest
 from destination_sqlite import DestinationSqlite
+from destination_sqlite import destination as destination_module
 
 from airbyte_cdk.models import (
     AirbyteMessage,
     AirbyteRecordMessage,
+    AirbyteStateMessage,
     AirbyteStream,
     ConfiguredAirbyteCatalog,
     ConfiguredAirbyteStream,
@@ -136,3 +139,107 @@ def test_write(
     assert len(result) == 2
     assert result[0][2] == json.dumps(airbyte_message1.record.data)
     assert result[1][2] == json.dumps(airbyte_message2.record.data)
+
+
+def _records(table_name: str, count: int):
+    for i in range(count):
+        yield AirbyteMessage(type=Type.RECORD, record=AirbyteRecordMessage(stream=table_name, data={"key1": f"value{i}"}, emitted_at=0))
+
+
+def _count_records(path: str, table_name: str) -> int:
+    with sqlite3.connect(path) as con:
+        return con.execute(f"SELECT count(1) FROM _airbyte_raw_{table_name}").fetchall()[0][0]
+
+
+def test_write_flushes_full_buffer_without_state(configured_catalogue: ConfiguredAirbyteCatalog, test_table_name: str, monkeypatch):
+    monkeypatch.setattr(destination_module, "MAX_BUFFER_BYTES", 10_000)
+    path = os.path.join(tempfile.mkdtemp(), "sqlite.db")
+    counts_before_end = []
+
+    def messages():
+        yield from _records(test_table_name, 1000)
+        counts_before_end.append(_count_records(path, test_table_name))
+
+    result = list(
+        DestinationSqlite().write(config={"destination_path": path}, configured_catalog=configured_catalogue, input_messages=messages())
+    )
+
+    assert result == []
+    assert 0 < counts_before_end[0] < 1000
+    assert _count_records(path, test_table_name) == 1000
+
+
+def test_write_sets_durability(configured_catalogue: ConfiguredAirbyteCatalog, test_table_name: str):
+    path = os.path.join(tempfile.mkdtemp(), "sqlite.db")
+    config = {"destination_path": path, "journal_mode": "WAL", "synchronous": "NORMAL"}
+    state = AirbyteMessage(type=Type.STATE, state=AirbyteStateMessage(data={"state": "1"}))
+
+    result = list(
+        DestinationSqlite().write(
+            config=config, configured_catalog=configured_catalogue, input_messages=[*_records(test_table_name, 10), state]
+        )
+    )
+
+    assert result == [state]
+    with sqlite3.connect(path) as con:
+        # the journal mode is persisted in the database file, unlike the synchronous level
+        assert con.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert _count_records(path, test_table_name) == 10
+
+
+def test_write_rejects_invalid_durability(configured_catalogue: ConfiguredAirbyteCatalog):
+    path = os.path.join(tempfile.mkdtemp(), "sqlite.db")
+
+    with pytest.raises(ValueError, match="Invalid synchronous level"):
+        list(
+            DestinationSqlite().write(
+                config={"destination_path": path, "synchronous": "NORMAL; DROP TABLE x"},
+                configured_catalog=configured_catalogue,
+                input_messages=[],
+            )
+        )
+
+
+def test_bulk_load_builds_unique_index_after_loading(test_table_name: str, table_schema: str):
+    path = os.path.join(tempfile.mkdtemp(), "sqlite.db")
+    catalog = ConfiguredAirbyteCatalog(
+        streams=[
+            ConfiguredAirbyteStream(
+                stream=AirbyteStream(name=test_table_name, json_schema=table_schema, supported_sync_modes=[SyncMode.full_refresh]),
+                sync_mode=SyncMode.full_refresh,
+                destination_sync_mode=DestinationSyncMode.overwrite,
+            )
+        ]
+    )
+    config = {"destination_path": path, "bulk_load_full_refresh": True}
+    index_query = f"SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = '_airbyte_raw_{test_table_name}'"
+    indexes_while_loading = []
+
+    def messages():
+        yield from _records(test_table_name, 100)
+        with sqlite3.connect(path) as con:
+            indexes_while_loading.extend(con.execute(index_query).fetchall())
+
+    list(DestinationSqlite().write(config=config, configured_catalog=catalog, input_messages=messages()))
+
+    assert indexes_while_loading == []
+    with sqlite3.connect(path) as con:
+        assert con.execute(index_query).fetchall() == [(f"_airbyte_raw_{test_table_name}_ab_id",)]
+        with pytest.raises(sqlite3.IntegrityError):
+            con.execute(f"INSERT INTO _airbyte_raw_{test_table_name} SELECT * FROM _airbyte_raw_{test_table_name} LIMIT 1")
+    assert _count_records(path, test_table_name) == 100
+
+
+def test_append_after_failed_bulk_load_builds_unique_index(configured_catalogue: ConfiguredAirbyteCatalog, test_table_name: str):
+    path = os.path.join(tempfile.mkdtemp(), "sqlite.db")
+    with sqlite3.connect(path) as con:
+        con.execute(f"CREATE TABLE _airbyte_raw_{test_table_name} (_airbyte_ab_id TEXT, _airbyte_emitted_at TEXT, _airbyte_data TEXT)")
+
+    list(
+        DestinationSqlite().write(
+            config={"destination_path": path}, configured_catalog=configured_catalogue, input_messages=_records(test_table_name, 10)
+        )
+    )
+
+    with sqlite3.connect(path) as con:
+        assert con.execute(f"PRAGMA index_list(_airbyte_raw_{test_table_name})").fetchall()[0][1] == f"_airbyte_raw_{test_table_name}_ab_id"
@@ -10,12 +10,16 @@ from typing import Any, Mapping
 
 import backoff
 import requests
+from requests.adapters import HTTPAdapter
 
 from destination_vectara.config import VectaraConfig
 
 
 METADATA_STREAM_FIELD = "_ab_stream"
 
+# requests sent in parallel by the worker pool, each of them over a connection kept alive by the session
+MAX_PARALLEL_REQUESTS = 16
+
 
 def user_error(e: Exception) -> bool:
     """
@@ -37,8 +41,20 @@ class VectaraClient:
         self.client_id = config.oauth2.client_id
         self.client_secret = config.oauth2.client_secret
         self.parallelize = config.parallelize
+
+        # the session and the worker pool live as long as the client, so the connections are reused across flushes
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=MAX_PARALLEL_REQUESTS)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.executor = ThreadPoolExecutor(max_workers=MAX_PARALLEL_REQUESTS)
+
         self.check()
 
+    def close(self):
+        self.executor.shutdown(wait=True)
+        self.session.close()
+
     def check(self):
         """
         Check for an existing corpus in Vectara.
@@ -114,13 +130,12 @@ class VectaraClient:
             "X-source": "airbyte",
         }
 
-        response = requests.request(method=http_method, url=url, headers=headers, params=params, data=json.dumps(data))
+        response = self.session.request(method=http_method, url=url, headers=headers, params=params, data=json.dumps(data))
         response.raise_for_status()
         return response.json()
 
     def delete_doc_by_metadata(self, metadata_field_name, metadata_field_values):
-        document_ids = []
-        for value in metadata_field_values:
+        def query_document_ids(value):
             data = {
                 "query": [
                     {
@@ -137,14 +152,20 @@ class VectaraClient:
                 ]
             }
             query_documents_response = self._request(endpoint="query", data=data)
-            document_ids.extend([document.get("id") for document in query_documents_response.get("responseSet")[0].get("document")])
+            return [document.get("id") for document in query_documents_response.get("responseSet")[0].get("document")]
+
+        document_ids = [document_id for ids in self.executor.map(query_document_ids, metadata_field_values) for document_id in ids]
         self.delete_docs_by_id(document_ids=document_ids)
 
+    def delete_doc(self, document_id):
+        self._request(endpoint="delete-doc", data={"customerId": self.customer_id, "corpusId": self.corpus_id, "documentId": document_id})
+
     def delete_docs_by_id(self, document_ids):
-        for document_id in document_ids:
-            self._request(
-                endpoint="delete-doc", data={"customerId": self.customer_id, "corpusId": self.corpus_id, "documentId": document_id}
-            )
+        """
+        Deletes the documents in parallel, as Vectara deletes a single document per request. Raises the first error.
+        """
+        # an id is listed once per record of the same primary key
+        list(self.executor.map(self.delete_doc, dict.fromkeys(document_ids)))
 
     def index_document(self, document):
         document_section, document_metadata, document_title, document_id = document
@@ -170,20 +191,19 @@ class VectaraClient:
 
     def index_documents(self, documents):
         if self.parallelize:
-            with ThreadPoolExecutor() as executor:
-                futures = [executor.submit(self.index_document, doc) for doc in documents]
-                for future in futures:
-                    try:
-                        response = future.result()
-                        if response is None:
-                            continue
-                        assert (
-                            response.get("status").get("code") == "OK"
-                            or response.get("status").get("statusDetail") == "Document should have at least one part."
-                        )
-                    except AssertionError as e:
-                        # Handle the assertion error
-                        pass
+            futures = [self.executor.submit(self.index_document, doc) for doc in documents]
+            for future in futures:
+                try:
+                    response = future.result()
+                    if response is None:
+                        continue
+                    assert (
+                        response.get("status").get("code") == "OK"
+                        or response.get("status").get("statusDetail") == "Document should have at least one part."
+                    )
+                except AssertionError as e:
+                    # Handle the assertion error
+                    pass
         else:
             for doc in documents:
                 self.index_document(doc)
@@ -40,8 +40,9 @@ class DestinationVectara(Destination):
         """
 
         config_model = VectaraConfig.parse_obj(config)
+        client = VectaraClient(config_model)
         writer = VectaraWriter(
-            client=VectaraClient(config_model),
+            client=client,
             text_fields=config_model.text_fields,
             title_field=config_model.title_field,
             metadata_fields=config_model.metadata_fields,
@@ -65,6 +66,8 @@ class DestinationVectara(Destination):
 
         # Make sure to flush any records still in the queue
         writer.flush()
+        writer.close()
+        client.close()
 
     def check(self, logger: logging.Logger, config: VectaraConfig) -> AirbyteConnectionStatus:
         """
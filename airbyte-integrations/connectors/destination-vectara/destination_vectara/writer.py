@@ -3,7 +3,8 @@
 #
 
 import uuid
-from typing import Any, Dict, List, Mapping, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
 
 import dpath.util
 
@@ -15,9 +16,64 @@ from destination_vectara.client import VectaraClient
 
 METADATA_STREAM_FIELD = "_ab_stream"
 
+GLOB_CHARACTERS = ("*", "?", "[")
+
+_NOT_FOUND = object()
+
+FieldExtractor = Callable[[Mapping[str, Any]], List[Any]]
+
+
+def _get_path(data: Any, segments: List[str]) -> Any:
+    for segment in segments:
+        if isinstance(data, Mapping):
+            if segment not in data:
+                return _NOT_FOUND
+            data = data[segment]
+        elif isinstance(data, list) and segment.isdecimal() and int(segment) < len(data):
+            data = data[int(segment)]
+        else:
+            return _NOT_FOUND
+    return data
+
+
+def _is_literal_path(segments: List[str]) -> bool:
+    return all(segment and not any(character in segment for character in GLOB_CHARACTERS) for segment in segments)
+
+
+def compile_field_path(path: str) -> FieldExtractor:
+    """
+    Returns a function finding the values of the dot-separated field path in the data of a record, like dpath.util.values.
+    Paths without glob characters are resolved with dictionary lookups instead of searching the whole record.
+    """
+    segments = path.split(".")
+    if not _is_literal_path(segments):
+        return lambda data: dpath.util.values(data, path, separator=".")
+
+    def values(data: Mapping[str, Any]) -> List[Any]:
+        value = _get_path(data, segments)
+        return [] if value is _NOT_FOUND else [value]
+
+    return values
+
+
+def compile_key_path(path: List[str]) -> Callable[[Mapping[str, Any]], Any]:
+    """
+    Returns a function getting the value of the primary key path in the data of a record, raising a KeyError if it's missing
+    like dpath.util.get.
+    """
+    if not _is_literal_path(path):
+        return lambda data: dpath.util.get(data, path)
+
+    def get(data: Mapping[str, Any]) -> Any:
+        value = _get_path(data, path)
+        if value is _NOT_FOUND:
+            raise KeyError(path)
+        return value
+
+    return get
+
 
 class VectaraWriter:
-    write_buffer: List[Mapping[str, Any]] = []
     flush_interval = 1000
 
     def __init__(
@@ -33,8 +89,28 @@ class VectaraWriter:
         self.title_field = title_field
         self.metadata_fields = metadata_fields
         self.streams = {f"{stream.stream.namespace}_{stream.stream.name}": stream for stream in catalog.streams}
+        self.write_buffer: List[Tuple[Dict[str, Any], Dict[str, Any], str, str]] = []
         self.ids_to_delete: List[str] = []
 
+        # the field paths are compiled once instead of being parsed for every record
+        self._text_field_extractors = self._compile_field_paths(text_fields)
+        self._metadata_field_extractors = self._compile_field_paths(metadata_fields)
+        self._title_extractor = compile_field_path(title_field) if title_field else None
+        self._primary_key_getters = {
+            stream_identifier: [compile_key_path(key) for key in stream.primary_key or []]
+            for stream_identifier, stream in self.streams.items()
+        }
+
+        # a full batch is written to Vectara in the background while the records of the next one are queued
+        self._batch_executor = ThreadPoolExecutor(max_workers=1)
+        self._pending_batch: Optional[Future] = None
+
+    @staticmethod
+    def _compile_field_paths(fields: Optional[List[str]]) -> Optional[List[Tuple[str, FieldExtractor]]]:
+        if not fields:
+            return None
+        return [(field, compile_field_path(field)) for field in fields]
+
     def delete_streams_to_overwrite(self, catalog: ConfiguredAirbyteCatalog) -> None:
         streams_to_overwrite = [
             f"{stream.stream.namespace}_{stream.stream.name}"
@@ -44,10 +120,6 @@ class VectaraWriter:
         if len(streams_to_overwrite):
             self.client.delete_doc_by_metadata(metadata_field_name=METADATA_STREAM_FIELD, metadata_field_values=streams_to_overwrite)
 
-    def _delete_documents_to_dedupe(self):
-        if len(self.ids_to_delete) > 0:
-            self.client.delete_docs_by_id(document_ids=self.ids_to_delete)
-
     def queue_write_operation(self, record: AirbyteRecordMessage) -> None:
         """Adds messages to the write queue and flushes if the buffer is full"""
 
@@ -66,17 +138,37 @@ class VectaraWriter:
 
         self.write_buffer.append((document_section, document_metadata, document_title, document_id))
         if len(self.write_buffer) == self.flush_interval:
-            self.flush()
+            self._write_batch_in_background()
 
     def flush(self) -> None:
         """Flush all documents in Queue to Vectara"""
-        self._delete_documents_to_dedupe()
-        self.client.index_documents(self.write_buffer)
-        self.write_buffer.clear()
-        self.ids_to_delete.clear()
+        self._write_batch_in_background()
+        self._wait_for_pending_batch()
+
+    def close(self) -> None:
+        self._batch_executor.shutdown(wait=True)
+
+    def _write_batch_in_background(self) -> None:
+        # the documents of a batch can replace the ones of the previous batch, so the batches are written one after the other
+        self._wait_for_pending_batch()
+        if self.write_buffer or self.ids_to_delete:
+            self._pending_batch = self._batch_executor.submit(self._write_batch, self.write_buffer, self.ids_to_delete)
+            self.write_buffer = []
+            self.ids_to_delete = []
+
+    def _wait_for_pending_batch(self) -> None:
+        if self._pending_batch:
+            pending_batch, self._pending_batch = self._pending_batch, None
+            # raises in case of error
+            pending_batch.result()
+
+    def _write_batch(self, documents, ids_to_delete: List[str]) -> None:
+        if len(ids_to_delete) > 0:
+            self.client.delete_docs_by_id(document_ids=ids_to_delete)
+        self.client.index_documents(documents)
 
     def _get_document_section(self, record: AirbyteRecordMessage):
-        relevant_fields = self._extract_relevant_fields(record, self.text_fields)
+        relevant_fields = self._extract_relevant_fields(record, self._text_field_extractors)
         if len(relevant_fields) == 0:
             text_fields = ", ".join(self.text_fields) if self.text_fields else "all fields"
             raise AirbyteTracedException(
@@ -87,11 +179,13 @@ class VectaraWriter:
         document_section = relevant_fields
         return document_section
 
-    def _extract_relevant_fields(self, record: AirbyteRecordMessage, fields: Optional[List[str]]) -> Dict[str, Any]:
+    def _extract_relevant_fields(
+        self, record: AirbyteRecordMessage, extractors: Optional[List[Tuple[str, FieldExtractor]]]
+    ) -> Dict[str, Any]:
         relevant_fields = {}
-        if fields and len(fields) > 0:
-            for field in fields:
-                values = dpath.util.values(record.data, field, separator=".")
+        if extractors:
+            for field, extractor in extractors:
+                values = extractor(record.data)
                 if values and len(values) > 0:
                     relevant_fields[field] = values if len(values) > 1 else values[0]
         else:
@@ -99,14 +193,14 @@ class VectaraWriter:
         return relevant_fields
 
     def _get_document_metadata(self, record: AirbyteRecordMessage) -> Dict[str, Any]:
-        document_metadata = self._extract_relevant_fields(record, self.metadata_fields)
+        document_metadata = self._extract_relevant_fields(record, self._metadata_field_extractors)
         document_metadata[METADATA_STREAM_FIELD] = self._get_stream_id(record)
         return document_metadata
 
     def _get_document_title(self, record: AirbyteRecordMessage) -> str:
         title = "Untitled"
-        if self.title_field:
-            found_title = dpath.util.values(record.data, self.title_field, separator=".")
+        if self._title_extractor:
+            found_title = self._title_extractor(record.data)
             if found_title:
                 title = found_title[0]
         return title
@@ -122,9 +216,9 @@ class VectaraWriter:
             return None
 
         primary_key = []
-        for key in current_stream.primary_key:
+        for get_key in self._primary_key_getters[stream_identifier]:
             try:
-                primary_key.append(str(dpath.util.get(record.data, key)))
+                primary_key.append(str(get_key(record.data)))
             except KeyError:
                 primary_key.append("__not_found__")
         stringified_primary_key = "_".join(primary_key)
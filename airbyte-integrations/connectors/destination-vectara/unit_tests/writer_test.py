@@ -0,0 +1,285 @@
+#
+# Copyright (c) 2023 Airbyte, Inc., all rights reserved.
+#
+
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import dpath.util
+import pytest
+from destination_vectara.client import VectaraClient
+from destination_vectara.writer import VectaraWriter, compile_field_path, compile_key_path
+
+from airbyte_cdk.models import AirbyteRecordMessage, ConfiguredAirbyteCatalog
+
+
+logger = logging.getLogger("airbyte")
+
+CONFIG = {
+    "oauth2": {"client_id": "myclientid", "client_secret": "myclientsecret"},
+    "corpus_name": "mycorpus",
+    "customer_id": "123456",
+    "parallelize": True,
+}
+
+
+class VectaraStub:
+    """
+    Vectara API stub serving the endpoints used by the destination, with a latency added to every request.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.documents = {}
+        self.requests = []
+        self.max_concurrent_requests = 0
+        self._concurrent_requests = 0
+        self._lock = threading.Lock()
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # the headers and the body are sent separately, which would wait for the delayed acknowledgement of the client
+            disable_nagle_algorithm = True
+
+            def do_POST(self):
+                endpoint = self.path.rsplit("/", 1)[-1]
+                data = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with stub._lock:
+                    stub.requests.append(endpoint)
+                    stub._concurrent_requests += 1
+                    stub.max_concurrent_requests = max(stub.max_concurrent_requests, stub._concurrent_requests)
+                try:
+                    time.sleep(stub.latency)
+                    body = json.dumps(stub.handle(endpoint, data)).encode()
+                finally:
+                    with stub._lock:
+                        stub._concurrent_requests -= 1
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}/v1"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def handle(self, endpoint, data):
+        with self._lock:
+            if endpoint == "list-corpora":
+                return {"corpus": [{"id": 1, "name": CONFIG["corpus_name"]}]}
+            if endpoint == "query":
+                metadata_filter = data["query"][0]["corpusKey"][0]["metadataFilter"]
+                stream = metadata_filter.split("'")[1]
+                matches = [document_id for document_id, document in self.documents.items() if document["_ab_stream"] == stream]
+                return {"responseSet": [{"document": [{"id": document_id} for document_id in matches[:100]]}]}
+            if endpoint == "delete-doc":
+                self.documents.pop(data["documentId"], None)
+                return {}
+            if endpoint == "index":
+                document = data["document"]
+                if document["documentId"] in self.documents:
+                    return {"status": {"code": "ALREADY_EXISTS"}}
+                self.documents[document["documentId"]] = json.loads(document["metadataJson"])
+                return {"status": {"code": "OK"}}
+            raise ValueError(f"Unexpected endpoint {endpoint}")
+
+
+def fake_jwt_token(client):
+    client.jwt_token = "token"
+    client.jwt_token_expires_ts = time.time() + 3600
+    return client.jwt_token
+
+
+@pytest.fixture(name="stub")
+def stub_fixture():
+    stub = VectaraStub()
+    with patch.object(VectaraClient, "BASE_URL", stub.url), patch.object(VectaraClient, "_get_jwt_token", fake_jwt_token):
+        yield stub
+    stub.close()
+
+
+def create_catalog(destination_sync_mode="append_dedup"):
+    return ConfiguredAirbyteCatalog.parse_obj(
+        {
+            "streams": [
+                {
+                    "stream": {"name": "mystream", "json_schema": {}, "supported_sync_modes": ["full_refresh", "incremental"]},
+                    "primary_key": [["id"]],
+                    "sync_mode": "incremental",
+                    "destination_sync_mode": destination_sync_mode,
+                }
+            ]
+        }
+    )
+
+
+def create_writer(client, catalog):
+    return VectaraWriter(client=client, text_fields=["text"], title_field="title", metadata_fields=["meta.*"], catalog=catalog)
+
+
+def create_record(i):
+    return AirbyteRecordMessage(
+        stream="mystream",
+        data={"id": i, "text": f"text {i}", "title": f"title {i}", "meta": {"a": i, "b": [i]}, "other": "x" * 100},
+        emitted_at=0,
+    )
+
+
+@pytest.mark.parametrize(
+    "path",
+    ["id", "a.b", "a.b.c", "a.list.0", "a.list.1.c", "a.list.5", "a.none", "a.text.0", "missing", "a.missing.b", "a.*", "a.list.*.c"],
+)
+def test_compiled_field_path_matches_dpath(path):
+    data = {"id": 1, "a": {"b": {"c": "value"}, "list": ["first", {"c": 2}], "none": None, "text": "abc"}}
+
+    assert compile_field_path(path)(data) == dpath.util.values(data, path, separator=".")
+
+
+@pytest.mark.parametrize("path", [["id"], ["a", "b", "c"], ["a", "list", "1", "c"], ["a", "none"], ["missing"], ["a", "b", "missing"]])
+def test_compiled_key_path_matches_dpath(path):
+    data = {"id": 1, "a": {"b": {"c": "value"}, "list": ["first", {"c": 2}], "none": None}}
+
+    try:
+        expected = dpath.util.get(data, path)
+    except KeyError:
+        with pytest.raises(KeyError):
+            compile_key_path(path)(data)
+    else:
+        assert compile_key_path(path)(data) == expected
+
+
+def test_writer_replaces_deduped_documents(stub):
+    client = VectaraClient(CONFIG)
+    writer = create_writer(client, create_catalog())
+    with patch.object(VectaraWriter, "flush_interval", 10):
+        for i in range(25):
+            writer.queue_write_operation(create_record(i % 20))
+        writer.flush()
+    writer.close()
+    client.close()
+
+    assert sorted(stub.documents) == sorted(f"Stream_None_mystream_Key_None_mystream_{i}" for i in range(20))
+    assert stub.documents["Stream_None_mystream_Key_None_mystream_3"] == {"meta.*": "[3, [3]]", "_ab_stream": "None_mystream"}
+    # the ids of a batch are deleted once, before the documents of the batch are indexed
+    assert stub.requests.count("delete-doc") == 25
+    assert stub.requests.count("index") == 25
+
+
+def test_writer_raises_errors_of_background_batches(stub):
+    client = VectaraClient(CONFIG)
+    writer = create_writer(client, create_catalog())
+
+    with patch.object(VectaraWriter, "flush_interval", 10), patch.object(client, "delete_doc", side_effect=Exception("Delete failed")):
+        for i in range(15):
+            writer.queue_write_operation(create_record(i))
+        with pytest.raises(Exception, match="Delete failed"):
+            writer.flush()
+    assert "index" not in stub.requests
+
+
+def test_delete_doc_by_metadata_deletes_in_parallel(stub):
+    stub.latency = 0.02
+    stub.documents = {str(i): {"_ab_stream": "None_mystream"} for i in range(100)}
+    client = VectaraClient(CONFIG)
+    writer = create_writer(client, create_catalog("overwrite"))
+
+    writer.delete_streams_to_overwrite(create_catalog("overwrite"))
+    client.close()
+
+    assert stub.documents == {}
+    assert stub.max_concurrent_requests > 1
+
+
+def previous_write(client, records, flush_interval):
+    """
+    Writes the records like the previous implementation: glob searches for every field, a new thread pool for every flush
+    and one delete request after the other.
+    """
+    buffer, ids_to_delete = [], []
+
+    def flush():
+        for document_id in ids_to_delete:
+            client.delete_doc(document_id)
+        with ThreadPoolExecutor() as executor:
+            list(executor.map(client.index_document, buffer))
+        buffer.clear()
+        ids_to_delete.clear()
+
+    for record in records:
+        section = {"text": dpath.util.values(record.data, "text", separator=".")[0]}
+        metadata = {"meta.*": dpath.util.values(record.data, "meta.*", separator="."), "_ab_stream": "None_mystream"}
+        title = dpath.util.values(record.data, "title", separator=".")[0]
+        document_id = f"Stream_None_mystream_Key_None_mystream_{dpath.util.get(record.data, ['id'])}"
+        ids_to_delete.append(document_id)
+        buffer.append((section, metadata, title, document_id))
+        if len(buffer) == flush_interval:
+            flush()
+    flush()
+
+
+def test_write_throughput_with_latency(stub):
+    stub.latency = 0.01
+    record_count = 200
+    flush_interval = 50
+    records = [create_record(i) for i in range(record_count)]
+    client = VectaraClient(CONFIG)
+
+    start = time.perf_counter()
+    previous_write(client, records, flush_interval)
+    previous_duration = time.perf_counter() - start
+
+    stub.documents = {}
+    writer = create_writer(client, create_catalog())
+    start = time.perf_counter()
+    with patch.object(VectaraWriter, "flush_interval", flush_interval):
+        for record in records:
+            writer.queue_write_operation(record)
+        writer.flush()
+    duration = time.perf_counter() - start
+    writer.close()
+    client.close()
+
+    logger.info(
+        f"Writing {record_count} deduped records with {stub.latency * 1000:.0f}ms of latency per request: "
+        f"previous {record_count / previous_duration:.0f} records/s, pipelined {record_count / duration:.0f} records/s"
+    )
+    assert len(stub.documents) == record_count
+    assert duration * 3 < previous_duration
+
+
+def test_field_extraction_throughput():
+    records = [create_record(i) for i in range(2000)]
+    writer = create_writer(None, create_catalog())
+
+    start = time.perf_counter()
+    for record in records:
+        [dpath.util.values(record.data, field, separator=".") for field in ("text", "title")]
+        dpath.util.get(record.data, ["id"])
+    previous_duration = time.perf_counter() - start
+    start = time.perf_counter()
+    for record in records:
+        writer._get_document_section(record)
+        writer._get_document_title(record)
+        writer._get_record_primary_key(record)
+    duration = time.perf_counter() - start
+    writer.close()
+
+    logger.info(
+        f"Extracting the text, title and primary key of {len(records)} records: previous {previous_duration:.3f}s, compiled {duration:.3f}s"
+    )
+    assert duration < previous_duration
@@ -0,0 +1,81 @@
+# Copyright (c) 2024 Airbyte, Inc., all rights reserved.
+import io
+import logging
+import os
+import time
+import zipfile
+from datetime import datetime
+
+from google.auth.credentials import AnonymousCredentials
+from google.cloud import storage
+from source_gcs import SourceGCSStreamReader
+from source_gcs.helpers import GCSRemoteFile
+from source_gcs.zip_helper import ZipHelper
+
+from airbyte_cdk.sources.file_based.file_based_stream_reader import FileReadMode
+
+from .conftest import LOCAL_GCP_PORT
+from .utils import get_docker_ip
+
+
+logger = logging.getLogger("airbyte")
+
+BENCHMARK_BUCKET = "benchmark-bucket-zip"
+MEMBER_COUNT = 10
+MEMBER_SIZE = 5 * 1024 * 1024
+
+
+def _upload_archive(client: storage.Client) -> storage.Blob:
+    bucket = client.bucket(BENCHMARK_BUCKET)
+    if not bucket.exists():
+        bucket = client.create_bucket(BENCHMARK_BUCKET)
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w", compression=zipfile.ZIP_STORED) as zf:
+        for i in range(MEMBER_COUNT):
+            zf.writestr(f"file_{i}.csv", b"id,value\n" + os.urandom(MEMBER_SIZE // 2).hex().encode()[: MEMBER_SIZE - 9])
+    blob = bucket.blob("archive.zip")
+    blob.upload_from_string(archive.getvalue())
+    return bucket.get_blob("archive.zip")
+
+
+def _read_first_member_with_full_download(blob: storage.Blob) -> str:
+    # Previous implementation: download the whole archive with 1MB ranged requests, then extract every member
+    object_bytes = b""
+    start, end = 0, 1024 * 1024
+    while start < blob.size:
+        object_bytes += blob.download_as_bytes(start=start, end=end)
+        start = end + 1
+        end = min(start + 1024 * 1024, blob.size)
+    with zipfile.ZipFile(io.BytesIO(object_bytes)) as zf:
+        return zf.read("file_0.csv").decode("utf-8")
+
+
+def test_zip_member_streaming_benchmark():
+    client = storage.Client(
+        credentials=AnonymousCredentials(), project="test", client_options={"api_endpoint": f"http://{get_docker_ip()}:{LOCAL_GCP_PORT}"}
+    )
+    blob = _upload_archive(client)
+
+    start = time.perf_counter()
+    expected_content = _read_first_member_with_full_download(blob)
+    full_download_duration = time.perf_counter() - start
+
+    reader = SourceGCSStreamReader()
+    reader._gcs_client = client
+    reader._config = type("BenchmarkConfig", (), {"bucket": BENCHMARK_BUCKET})()
+    zip_file = GCSRemoteFile(uri=f"gs://{BENCHMARK_BUCKET}/archive.zip", last_modified=datetime.now(), mime_type="zip")
+
+    start = time.perf_counter()
+    files = list(ZipHelper(blob, zip_file).get_gcs_remote_files())
+    listing_duration = time.perf_counter() - start
+    with reader.open_file(files[0], FileReadMode.READ, "utf-8", logger) as f:
+        content = f.read()
+    streaming_duration = time.perf_counter() - start
+
+    logger.info(
+        f"Archive of {blob.size} bytes: full download and extraction {full_download_duration:.2f}s, "
+        f"listing members {listing_duration:.2f}s, listing and streaming a member {streaming_duration:.2f}s"
+    )
+    assert len(files) == MEMBER_COUNT
+    assert content == expected_content
+    assert listing_duration < full_download_duration
@@ -47,7 +47,10 @@ def get_stream_name(blob):
 class GCSRemoteFile(RemoteFile):
     """
     Extends RemoteFile instance with displayed_uri attribute.
-    displayed_uri is being used by Cursor to identify files with temporal local path in their uri attribute.
+    displayed_uri is being used by Cursor to identify files read from a zip archive with the uri of the archive.
+    zip_blob_name and zip_member_name locate the files read from a zip archive.
     """
 
     displayed_uri: str = None
+    zip_blob_name: str = None
+    zip_member_name: str = None
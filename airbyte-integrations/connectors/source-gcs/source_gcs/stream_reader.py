@@ -1,12 +1,16 @@
 #
 # Copyright (c) 2023 Airbyte, Inc., all rights reserved.
 #
+import bz2
+import gzip
 import itertools
 import json
 import logging
-import tempfile
+import threading
+import zipfile
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from io import IOBase, StringIO
+from io import IOBase, StringIO, TextIOWrapper
 from typing import Iterable, List, Optional
 
 import pytz
@@ -18,7 +22,7 @@ from airbyte_cdk.sources.file_based.exceptions import ErrorListingFiles, FileBas
 from airbyte_cdk.sources.file_based.file_based_stream_reader import AbstractFileBasedStreamReader, FileReadMode
 from source_gcs.config import Config
 from source_gcs.helpers import GCSRemoteFile
-from source_gcs.zip_helper import ZipHelper
+from source_gcs.zip_helper import GCSBlobFile, ZipHelper
 
 
 # google can raise warnings for end user credentials, wrapping it to Logger
@@ -35,11 +39,15 @@ class SourceGCSStreamReader(AbstractFileBasedStreamReader):
     Stream reader for Google Cloud Storage (GCS).
     """
 
+    # Number of zip archives whose central directory is kept in memory to open their members
+    MAX_OPEN_ZIP_ARCHIVES = 4
+
     def __init__(self):
         super().__init__()
         self._gcs_client = None
         self._config = None
-        self.tmp_dir = tempfile.TemporaryDirectory()
+        self._zip_archives: OrderedDict[str, zipfile.ZipFile] = OrderedDict()
+        self._zip_archives_lock = threading.Lock()
 
     @property
     def config(self) -> Config:
@@ -107,7 +115,7 @@ class SourceGCSStreamReader(AbstractFileBasedStreamReader):
                         remote_file = GCSRemoteFile(uri=uri, last_modified=last_modified, mime_type=file_extension)
 
                         if file_extension == "zip":
-                            yield from ZipHelper(blob, remote_file, self.tmp_dir).get_gcs_remote_files()
+                            yield from ZipHelper(blob, remote_file).get_gcs_remote_files()
                         else:
                             yield remote_file
         except Exception as exc:
@@ -128,6 +136,9 @@ class SourceGCSStreamReader(AbstractFileBasedStreamReader):
         """
         logger.debug(f"Trying to open {file.uri}")
 
+        if getattr(file, "zip_member_name", None):
+            return self._open_zip_member(file, mode, encoding)
+
         # choose correct compression mode
         file_extension = file.mime_type.split(".")[-1]
         if file_extension in ["gz", "bz2"]:
@@ -146,3 +157,40 @@ class SourceGCSStreamReader(AbstractFileBasedStreamReader):
             logger.exception(oe)
             raise oe
         return result
+
+    def _get_zip_archive(self, blob_name: str) -> zipfile.ZipFile:
+        """
+        Get the zip archive stored in the blob, reading its central directory with ranged downloads the first time it is used.
+        """
+        with self._zip_archives_lock:
+            if blob_name in self._zip_archives:
+                self._zip_archives.move_to_end(blob_name)
+                return self._zip_archives[blob_name]
+
+        blob = self.gcs_client.bucket(self.config.bucket).get_blob(blob_name)
+        if blob is None:
+            raise FileNotFoundError(f"The zip archive {blob_name} was deleted from the bucket {self.config.bucket} since it was listed.")
+        zip_archive = zipfile.ZipFile(GCSBlobFile(blob), "r")
+
+        with self._zip_archives_lock:
+            self._zip_archives[blob_name] = zip_archive
+            while len(self._zip_archives) > self.MAX_OPEN_ZIP_ARCHIVES:
+                # The members opened from an evicted archive remain readable, zipfile only closes the blob file once they are closed
+                self._zip_archives.popitem(last=False)[1].close()
+        return zip_archive
+
+    def _open_zip_member(self, file: GCSRemoteFile, mode: FileReadMode, encoding: Optional[str]) -> IOBase:
+        """
+        Open a file of a zip archive, its content is downloaded and decompressed as it is read.
+        """
+        result = self._get_zip_archive(file.zip_blob_name).open(file.zip_member_name)
+
+        file_extension = file.zip_member_name.split(".")[-1]
+        if file_extension == "gz":
+            result = gzip.GzipFile(fileobj=result)
+        elif file_extension == "bz2":
+            result = bz2.BZ2File(result)
+
+        if mode == FileReadMode.READ:
+            return TextIOWrapper(result, encoding=encoding)
+        return result
@@ -1,10 +1,10 @@
 # Copyright (c) 2024 Airbyte, Inc., all rights reserved.
 import io
 import logging
-import os
-import tempfile
+import threading
 import zipfile
-from typing import Iterable
+from collections import OrderedDict
+from typing import Iterable, Optional
 
 from google.cloud.storage.blob import Blob
 
@@ -14,44 +14,117 @@ from source_gcs.helpers import GCSRemoteFile
 logger = logging.getLogger("airbyte")
 
 
-class ZipHelper:
-    BUFFER_SIZE_DEFAULT = 1024 * 1024
+class GCSBlobFile(io.RawIOBase):
+    """
+    Read-only and seekable file object over a GCS blob, backed by ranged downloads.
+
+    Blocks of the blob are downloaded on demand and kept in an LRU cache,
+    so zipfile can read the central directory of an archive and stream its members without downloading the whole archive.
+    """
+
+    BLOCK_SIZE_DEFAULT = 4 * 1024 * 1024
+    MAX_CACHED_BLOCKS_DEFAULT = 8
 
-    def __init__(self, blob: Blob, zip_file: GCSRemoteFile, tmp_dir: tempfile.TemporaryDirectory):
+    def __init__(self, blob: Blob, block_size: int = BLOCK_SIZE_DEFAULT, max_cached_blocks: int = MAX_CACHED_BLOCKS_DEFAULT):
+        super().__init__()
         self._blob = blob
         self._size = blob.size
-        self._tmp_dir = tmp_dir
-        self._zip_file = zip_file
+        self._block_size = block_size
+        self._max_cached_blocks = max_cached_blocks
+        self._blocks: OrderedDict[int, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+        self._position = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._blocks.clear()
+        super().close()
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = self._size + offset
+        else:
+            raise ValueError(f"Invalid whence value: {whence}")
+        if position < 0:
+            raise ValueError(f"Negative seek position {position}")
+        self._position = position
+        return self._position
+
+    def _get_block(self, index: int) -> bytes:
+        with self._lock:
+            block = self._blocks.get(index)
+            if block is not None:
+                self._blocks.move_to_end(index)
+                return block
 
-    def _chunk_download(self) -> bytes:
-        start = 0
-        end = self.BUFFER_SIZE_DEFAULT
-        object_bytes = b""
-        while start < self._size:
-            object_bytes_chunk = self._blob.download_as_bytes(start=start, end=end)
-            object_bytes += object_bytes_chunk
-            start = end + 1
-            end = start + self.BUFFER_SIZE_DEFAULT
-            if end > self._size:
-                end = self._size
-
-        return object_bytes
-
-    def _extract_files_to_tmp_directory(self, object_bytes: bytes) -> None:
-        with io.BytesIO(object_bytes) as bytes_io:
-            with zipfile.ZipFile(bytes_io, "r") as zf:
-                zf.extractall(self._tmp_dir.name)
+        start = index * self._block_size
+        # the end of the range is inclusive
+        end = min(start + self._block_size, self._size) - 1
+        block = self._blob.download_as_bytes(start=start, end=end)
+
+        with self._lock:
+            self._blocks[index] = block
+            while len(self._blocks) > self._max_cached_blocks:
+                self._blocks.popitem(last=False)
+        return block
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        if size is None or size < 0:
+            size = self._size - self._position
+        chunks = []
+        while size > 0 and self._position < self._size:
+            index, offset = divmod(self._position, self._block_size)
+            chunk = self._get_block(index)[offset : offset + size]
+            if not chunk:
+                break
+            chunks.append(chunk)
+            self._position += len(chunk)
+            size -= len(chunk)
+        return b"".join(chunks)
+
+    def readall(self) -> bytes:
+        return self.read(-1)
+
+    def readinto(self, buffer) -> int:
+        data = self.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+
+class ZipHelper:
+    def __init__(self, blob: Blob, zip_file: GCSRemoteFile):
+        self._blob = blob
+        self._zip_file = zip_file
 
     def get_gcs_remote_files(self) -> Iterable[GCSRemoteFile]:
-        self._extract_files_to_tmp_directory(self._chunk_download())
+        """
+        List the members of the zip archive from its central directory, without downloading the archive.
+        """
+        with zipfile.ZipFile(GCSBlobFile(self._blob), "r") as zf:
+            members = [member for member in zf.infolist() if not member.is_dir()]
 
-        for unzipped_file in os.listdir(self._tmp_dir.name):
-            logger.info(f"Picking up file {unzipped_file.split('/')[-1]} from zip archive {self._blob.public_url}.")
-            file_extension = unzipped_file.split(".")[-1]
+        for member in members:
+            logger.info(f"Picking up file {member.filename.split('/')[-1]} from zip archive {self._blob.public_url}.")
+            file_extension = member.filename.split(".")[-1]
 
             yield GCSRemoteFile(
-                uri=os.path.join(self._tmp_dir.name, unzipped_file),  # uri to temporal local file
+                uri=f"{self._zip_file.uri.split('?')[0]}/{member.filename}",
                 last_modified=self._zip_file.last_modified,
                 mime_type=file_extension,
                 displayed_uri=self._zip_file.uri,  # uri to remote file .zip
+                zip_blob_name=self._blob.name,
+                zip_member_name=member.filename,
             )
@@ -71,8 +71,11 @@ def zip_file():
 @pytest.fixture
 def mocked_blob():
     blob = Mock()
+    blob.name = "test.csv.zip"
     with open(Path(__file__).parent / "resource/files/test.csv.zip", "rb") as f:
-        blob.download_as_bytes.return_value = f.read()
-        blob.size = f.tell()
+        content = f.read()
+    # ranged downloads include the end byte, as with the GCS client
+    blob.download_as_bytes.side_effect = lambda start=0, end=None: content[start : None if end is None else end + 1]
+    blob.size = len(content)
 
     return blob
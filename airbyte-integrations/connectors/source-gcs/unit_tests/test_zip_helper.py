@@ -1,11 +1,109 @@
 # Copyright (c) 2024 Airbyte, Inc., all rights reserved.
 
-import tempfile
+import io
+import zipfile
+from datetime import datetime
+from unittest.mock import Mock
 
-from source_gcs.zip_helper import ZipHelper
+import pytest
+from source_gcs.zip_helper import GCSBlobFile, ZipHelper
+
+from airbyte_cdk.sources.file_based.file_based_stream_reader import FileReadMode
+
+
+def _blob_with_content(content: bytes) -> Mock:
+    blob = Mock()
+    blob.name = "archive.zip"
+    blob.size = len(content)
+    blob.download_as_bytes.side_effect = lambda start=0, end=None: content[start : None if end is None else end + 1]
+    return blob
 
 
 def test_get_gcs_remote_files(mocked_blob, zip_file, caplog):
-    files = list(ZipHelper(mocked_blob, zip_file, tempfile.TemporaryDirectory()).get_gcs_remote_files())
+    files = list(ZipHelper(mocked_blob, zip_file).get_gcs_remote_files())
     assert len(files) == 1
     assert "Picking up file test.csv from zip archive" in caplog.text
+    assert files[0].zip_blob_name == "test.csv.zip"
+    assert files[0].zip_member_name == "test.csv"
+    assert files[0].displayed_uri == zip_file.uri
+
+
+def test_blob_file_reads_ranges_through_block_cache():
+    content = bytes(range(256)) * 40
+    blob = _blob_with_content(content)
+    blob_file = GCSBlobFile(blob, block_size=1024, max_cached_blocks=2)
+
+    assert blob_file.read(10) == content[:10]
+    blob_file.seek(-20, io.SEEK_END)
+    assert blob_file.read() == content[-20:]
+    blob_file.seek(1000)
+    assert blob_file.read(2000) == content[1000:3000]
+    assert blob_file.read(0) == b""
+    blob_file.seek(len(content) + 10)
+    assert blob_file.read(10) == b""
+
+    # every download is a block, the last block being truncated to the blob size
+    ranges = [(call.kwargs["start"], call.kwargs["end"]) for call in blob.download_as_bytes.call_args_list]
+    assert all(end - start < 1024 for start, end in ranges)
+    assert (9216, 10239) in ranges
+
+
+def test_members_are_streamed_without_downloading_the_archive():
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w", compression=zipfile.ZIP_STORED) as zf:
+        zf.writestr("large.bin", b"x" * 10 * 1024 * 1024)
+        zf.writestr("folder/", b"")
+        zf.writestr("folder/small.csv", b"a,b\n1,2\n")
+    blob = _blob_with_content(archive.getvalue())
+
+    zip_file = Mock(uri="gs://bucket/archive.zip", last_modified=datetime.now())
+    files = list(ZipHelper(blob, zip_file).get_gcs_remote_files())
+    assert [file.zip_member_name for file in files] == ["large.bin", "folder/small.csv"]
+    assert [file.uri for file in files] == ["gs://bucket/archive.zip/large.bin", "gs://bucket/archive.zip/folder/small.csv"]
+
+    downloaded_bytes = sum(call.kwargs["end"] - call.kwargs["start"] + 1 for call in blob.download_as_bytes.call_args_list)
+    assert downloaded_bytes < len(archive.getvalue()) / 2
+
+
+def test_open_zip_member(mocked_reader, mocked_blob, zip_file, logger):
+    mocked_reader._config = Mock(bucket="bucket")
+    mocked_reader._gcs_client.bucket.return_value.get_blob.return_value = mocked_blob
+    file = next(ZipHelper(mocked_blob, zip_file).get_gcs_remote_files())
+
+    with mocked_reader.open_file(file, FileReadMode.READ, "utf-8", logger) as f:
+        first_read = f.read()
+    with mocked_reader.open_file(file, FileReadMode.READ_BINARY, None, logger) as f:
+        assert f.read().decode("utf-8") == first_read
+
+    assert first_read.startswith("field1, field2, field3")
+    # the central directory of the archive is only read once
+    mocked_reader._gcs_client.bucket.return_value.get_blob.assert_called_once_with("test.csv.zip")
+
+
+def test_evicted_zip_archives_are_closed(mocked_reader, zip_file, logger):
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("test.csv", b"a,b\n1,2\n")
+    blobs = {f"archive_{i}.zip": _blob_with_content(archive.getvalue()) for i in range(mocked_reader.MAX_OPEN_ZIP_ARCHIVES + 1)}
+    mocked_reader._config = Mock(bucket="bucket")
+    mocked_reader._gcs_client.bucket.return_value.get_blob.side_effect = blobs.get
+
+    first_archive = mocked_reader._get_zip_archive("archive_0.zip")
+    first_member = mocked_reader.open_file(
+        Mock(zip_blob_name="archive_0.zip", zip_member_name="test.csv"), FileReadMode.READ_BINARY, None, logger
+    )
+    for blob_name in list(blobs)[1:]:
+        mocked_reader._get_zip_archive(blob_name)
+
+    assert first_archive.fp is None
+    # a member opened before the archive was evicted can still be read
+    assert first_member.read() == b"a,b\n1,2\n"
+    first_member.close()
+
+
+def test_open_member_of_deleted_zip_archive(mocked_reader, logger):
+    mocked_reader._config = Mock(bucket="bucket")
+    mocked_reader._gcs_client.bucket.return_value.get_blob.return_value = None
+
+    with pytest.raises(FileNotFoundError, match="archive.zip"):
+        mocked_reader.open_file(Mock(zip_blob_name="archive.zip", zip_member_name="test.csv"), FileReadMode.READ, "utf-8", logger)
@@ -0,0 +1,180 @@
+#
+# Copyright (c) 2024 Airbyte, Inc., all rights reserved.
+#
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+import requests
+
+from airbyte_cdk import StreamSlice
+from airbyte_cdk.sources.streams.checkpoint.substream_resumable_full_refresh_cursor import (
+    FULL_REFRESH_COMPLETE_STATE,
+    SubstreamResumableFullRefreshCursor,
+)
+
+
+if TYPE_CHECKING:
+    from .streams import GithubStream
+
+# Number of pages of a repository fetched ahead of the reading of its records
+MAX_BUFFERED_PAGES = 2
+# Interval at which a worker waiting for the reading of its pages checks if the repository was cancelled
+PUT_TIMEOUT = 0.5
+
+FetchPage = Callable[[Optional[Mapping[str, Any]], Optional[Mapping[str, Any]], Optional[Mapping[str, Any]]], Tuple[Any, Any]]
+
+
+class RepositoryPartition:
+    """The pages of a repository fetched by a worker, in the order of its pagination"""
+
+    # Put by the worker when it stops fetching, the next pages are then fetched by the reading thread
+    END = object()
+
+    def __init__(self, repository: str):
+        self.repository = repository
+        self.pages = queue.Queue(maxsize=MAX_BUFFERED_PAGES)
+        self.cancelled = threading.Event()
+        self.fetched_directly = False
+
+    def put(self, item: Any) -> bool:
+        while not self.cancelled.is_set():
+            try:
+                self.pages.put(item, timeout=PUT_TIMEOUT)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def cancel(self) -> None:
+        self.cancelled.set()
+        # Unblock the worker waiting for free space in the buffer
+        while not self.pages.empty():
+            self.pages.get_nowait()
+
+
+class RepositoryPartitionReader:
+    """
+    Fetches the pages of the repository partitions of a stream ahead of their reading, from `max_workers` threads.
+
+    The stream still reads its partitions one after the other, so the records, the state and the checkpoints stay the
+    same as with a sequential read. The workers fetch the pages of the repository being read and of the next ones into
+    bounded buffers, which overlaps the latency of the requests to GitHub with the reading of the records. A fetched page
+    is only used if the stream requests it with the same request, any other page is fetched by the reading thread.
+    """
+
+    def __init__(self, stream: "GithubStream", fetch_page: FetchPage, repositories: List[str], max_workers: int):
+        self._stream = stream
+        self._fetch_page = fetch_page
+        self._repositories = repositories
+        self._max_workers = max_workers
+        self._started = False
+        self._stream_state: Optional[Mapping[str, Any]] = None
+        self._first_page_only = False
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._scheduled: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._partitions: Dict[str, RepositoryPartition] = {}
+
+    def fetch_page(
+        self,
+        stream_slice: Optional[Mapping[str, Any]] = None,
+        stream_state: Optional[Mapping[str, Any]] = None,
+        next_page_token: Optional[Mapping[str, Any]] = None,
+    ) -> Tuple[requests.PreparedRequest, requests.Response]:
+        repository = stream_slice.get("repository") if stream_slice else None
+        if not self._started:
+            self._started = True
+            if self._can_prefetch(stream_slice):
+                self._start(repository, stream_state)
+
+        partition = self._schedule(repository) if repository in self._positions else None
+        if partition is None or partition.fetched_directly:
+            return self._fetch_page(stream_slice, stream_state, next_page_token)
+
+        item = partition.pages.get()
+        if item is not RepositoryPartition.END:
+            request_key, page, exception = item
+            if request_key == self._request_key(stream_slice, stream_state, next_page_token):
+                if exception:
+                    raise exception
+                return page
+
+        # The stream requests something else than the next prefetched page, so the rest of the repository is read directly
+        partition.fetched_directly = True
+        partition.cancel()
+        return self._fetch_page(stream_slice, stream_state, next_page_token)
+
+    def close(self) -> None:
+        for partition in self._partitions.values():
+            partition.cancel()
+        self._partitions.clear()
+        if self._executor:
+            # The workers stop after their request in flight, so that no request outlives the reading of the stream
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def _can_prefetch(self, stream_slice: Optional[Mapping[str, Any]]) -> bool:
+        # Only the repository partitions of the REST API are prefetched, the GraphQL streams keep their pagination in the stream
+        partition = {key: value for key, value in (stream_slice or {}).items() if key not in ("partition", "cursor_slice")}
+        return self._stream.http_method == "GET" and list(partition) == ["repository"] and partition["repository"] in self._repositories
+
+    def _start(self, repository: str, stream_state: Optional[Mapping[str, Any]]) -> None:
+        self._stream_state = stream_state or {}
+        self._first_page_only = not self._stream.reads_all_pages
+        cursor = self._stream.get_cursor()
+        remaining = self._repositories[self._repositories.index(repository) :]
+        self._scheduled = [
+            repo
+            for repo in remaining
+            if repo == repository
+            or not isinstance(cursor, SubstreamResumableFullRefreshCursor)
+            # Repositories completed by a previous attempt are skipped by the sync
+            or cursor.select_state(StreamSlice(partition={"repository": repo}, cursor_slice={})) != FULL_REFRESH_COMPLETE_STATE
+        ]
+        self._positions = {repo: position for position, repo in reversed(list(enumerate(self._scheduled)))}
+        self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix=f"{self._stream.name}_partitions")
+
+    def _schedule(self, repository: str) -> Optional[RepositoryPartition]:
+        """Cancel the partitions before the one being read and submit the next ones, keeping one pending partition per worker"""
+        position = self._positions[repository]
+        for repo in list(self._partitions):
+            if self._positions[repo] < position:
+                self._partitions.pop(repo).cancel()
+        for repo in self._scheduled[position : position + self._max_workers + 1]:
+            if repo not in self._partitions:
+                self._partitions[repo] = RepositoryPartition(repo)
+                self._executor.submit(self._prefetch, self._partitions[repo])
+        return self._partitions.get(repository)
+
+    def _request_key(
+        self, stream_slice: Mapping[str, Any], stream_state: Mapping[str, Any], next_page_token: Optional[Mapping[str, Any]]
+    ) -> Tuple[Any, ...]:
+        kwargs = {"stream_slice": stream_slice, "stream_state": stream_state, "next_page_token": next_page_token}
+        return (
+            self._stream.path(**kwargs),
+            self._stream.request_params(**kwargs),
+            self._stream.request_headers(**kwargs),
+            self._stream.request_body_json(**kwargs),
+            self._stream.request_body_data(**kwargs),
+        )
+
+    def _prefetch(self, partition: RepositoryPartition) -> None:
+        stream_slice = {"repository": partition.repository}
+        next_page_token = None
+        try:
+            while not partition.cancelled.is_set():
+                request_key = self._request_key(stream_slice, self._stream_state, next_page_token)
+                try:
+                    page = self._fetch_page(stream_slice, self._stream_state, next_page_token)
+                except Exception as exception:
+                    partition.put((request_key, None, exception))
+                    return
+                next_page_token = self._stream.next_page_token(page[1])
+                partition.put((request_key, page, None))
+                if not next_page_token or self._first_page_only:
+                    return
+        finally:
+            partition.put(RepositoryPartition.END)
@@ -267,7 +267,7 @@ class SourceGithub(AbstractSource):
         workflow_runs_stream = WorkflowRuns(**repository_args_with_start_date)
 
         return [
-            IssueTimelineEvents(**repository_args),
+            IssueTimelineEvents(**repository_args_with_start_date),
             Assignees(**repository_args),
             Branches(**repository_args),
             Collaborators(**repository_args),
@@ -4,7 +4,7 @@
 
 import re
 from abc import ABC, abstractmethod
-from typing import Any, Iterable, List, Mapping, MutableMapping, Optional, Union
+from typing import Any, Iterable, List, Mapping, MutableMapping, Optional, Tuple, Union
 from urllib import parse
 
 import pendulum
@@ -38,7 +38,8 @@ from .graphql import (
     get_query_pull_requests,
     get_query_reviews,
 )
-from .utils import GitHubAPILimitException, getter
+from .partition_reader import RepositoryPartitionReader
+from .utils import GitHubAPILimitException, MultipleTokenAuthenticatorWithRateLimiter, getter
 
 
 class GithubStreamABC(HttpStream, ABC):
@@ -190,18 +191,51 @@ class GithubStreamABC(HttpStream, ABC):
 
 class GithubStream(GithubStreamABC):
     def __init__(self, repositories: List[str], page_size_for_large_streams: int, **kwargs):
+        authenticator = kwargs.get("authenticator")
         super().__init__(**kwargs)
         self.repositories = repositories
         # GitHub pagination could be from 1 to 100.
         # This parameter is deprecated and in future will be used sane default, page_size: 10
         self.page_size = page_size_for_large_streams if self.large_stream else constants.DEFAULT_PAGE_SIZE
+        # GitHub recommends against concurrent requests with a single token, so the repositories are fetched by one thread per token
+        self.max_concurrent_partitions = (
+            authenticator.token_count if isinstance(authenticator, MultipleTokenAuthenticatorWithRateLimiter) else 1
+        )
+        self._partition_reader = None
 
     def path(self, stream_slice: Mapping[str, Any] = None, **kwargs) -> str:
         return f"repos/{stream_slice['repository']}/{self.name}"
 
+    @property
+    def reads_all_pages(self) -> bool:
+        """
+        Streams sorted in descending order stop reading a repository once they reach its state, so only the first page of
+        their repositories is fetched ahead of the reading.
+        """
+        return getattr(self, "is_sorted", False) != "desc"
+
     def stream_slices(self, **kwargs) -> Iterable[Optional[Mapping[str, Any]]]:
-        for repository in self.repositories:
-            yield {"repository": repository}
+        partition_reader = RepositoryPartitionReader(
+            stream=self, fetch_page=super()._fetch_next_page, repositories=self.repositories, max_workers=self.max_concurrent_partitions
+        )
+        self._partition_reader = partition_reader
+        try:
+            for repository in self.repositories:
+                yield {"repository": repository}
+        finally:
+            partition_reader.close()
+            if self._partition_reader is partition_reader:
+                self._partition_reader = None
+
+    def _fetch_next_page(
+        self,
+        stream_slice: Optional[Mapping[str, Any]] = None,
+        stream_state: Optional[Mapping[str, Any]] = None,
+        next_page_token: Optional[Mapping[str, Any]] = None,
+    ) -> Tuple[requests.PreparedRequest, requests.Response]:
+        if self._partition_reader is None:
+            return super()._fetch_next_page(stream_slice, stream_state, next_page_token)
+        return self._partition_reader.fetch_page(stream_slice, stream_state, next_page_token)
 
     def get_error_display_message(self, exception: BaseException) -> Optional[str]:
         if (
@@ -1432,6 +1466,8 @@ class WorkflowRuns(SemiIncrementalMixin, GithubStream):
 
     # https://docs.github.com/en/actions/managing-workflow-runs/re-running-workflows-and-jobs
     re_run_period = 32  # days
+    # the reading of a repository stops at the records created before the re-run period
+    reads_all_pages = False
 
     def path(self, stream_slice: Mapping[str, Any] = None, **kwargs) -> str:
         return f"repos/{stream_slice['repository']}/actions/runs"
@@ -1661,16 +1697,20 @@ class ContributorActivity(GithubStream):
                 raise e
 
 
-class IssueTimelineEvents(GithubStream):
+class IssueTimelineEvents(SemiIncrementalMixin, GithubStream):
     """
     API docs https://docs.github.com/en/rest/issues/timeline?apiVersion=2022-11-28#list-timeline-events-for-an-issue
+
+    The timelines are only read for the issues updated since the previous sync, the `updated_at` of the issue
+    is the cursor of the stream.
     """
 
     primary_key = ["repository", "issue_number"]
+    cursor_field = "issue_updated_at"
 
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        self.parent = Issues(**kwargs)
+    def __init__(self, start_date: str = "", **kwargs):
+        super().__init__(start_date=start_date, **kwargs)
+        self.parent = Issues(start_date=start_date, **kwargs)
 
     def path(self, stream_slice: Mapping[str, Any] = None, **kwargs) -> str:
         return f"repos/{stream_slice['repository']}/issues/{stream_slice['number']}/timeline"
@@ -1678,15 +1718,22 @@ class IssueTimelineEvents(GithubStream):
     def stream_slices(
         self, sync_mode: SyncMode, cursor_field: List[str] = None, stream_state: Mapping[str, Any] = None
     ) -> Iterable[Optional[Mapping[str, Any]]]:
+        self._starting_point_cache.clear()
+        # The state of a previous full refresh sync has no cursor, the issues are then all read again
+        parent_stream_state = {
+            repository: {self.parent.cursor_field: v[self.cursor_field]}
+            for repository, v in (stream_state or {}).items()
+            if isinstance(v, Mapping) and self.cursor_field in v
+        }
         parent_stream_slices = self.parent.stream_slices(
-            sync_mode=SyncMode.full_refresh, cursor_field=cursor_field, stream_state=stream_state
+            sync_mode=SyncMode.incremental, cursor_field=cursor_field, stream_state=parent_stream_state
         )
         for stream_slice in parent_stream_slices:
             parent_records = self.parent.read_records(
-                sync_mode=SyncMode.full_refresh, cursor_field=cursor_field, stream_slice=stream_slice, stream_state=stream_state
+                sync_mode=SyncMode.incremental, cursor_field=cursor_field, stream_slice=stream_slice, stream_state=parent_stream_state
             )
             for record in parent_records:
-                yield {"repository": record["repository"], "number": record["number"]}
+                yield {"repository": record["repository"], "number": record["number"], "updated_at": record["updated_at"]}
 
     def parse_response(
         self,
@@ -1696,7 +1743,11 @@ class IssueTimelineEvents(GithubStream):
         next_page_token: Mapping[str, Any] = None,
     ) -> Iterable[Mapping]:
         events_list = response.json()
-        record = {"repository": stream_slice["repository"], "issue_number": stream_slice["number"]}
+        record = {
+            "repository": stream_slice["repository"],
+            "issue_number": stream_slice["number"],
+            "issue_updated_at": stream_slice["updated_at"],
+        }
         for event in events_list:
             record[event["event"]] = event
         yield record
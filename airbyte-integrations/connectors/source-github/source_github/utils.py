@@ -2,9 +2,10 @@
 # Copyright (c) 2023 Airbyte, Inc., all rights reserved.
 #
 
+import threading
 import time
 from dataclasses import dataclass
-from itertools import cycle
+from functools import partial
 from typing import Any, List, Mapping
 
 import pendulum
@@ -49,27 +50,34 @@ class Token:
 
 class MultipleTokenAuthenticatorWithRateLimiter(AbstractHeaderAuthenticator):
     """
-    Each token in the cycle is checked against the rate limiter.
-    If a token exceeds the capacity limit, the system switches to another token.
-    If all tokens are exhausted, the system will enter a sleep state until
-    the first token becomes available again.
+    Schedules the requests of all the streams over the tokens, which can be sent from several threads at once.
+    Each request is assigned to the token with the most remaining budget for its API (REST or GraphQL), and the
+    budget of the token is updated from the rate limit headers of its responses.
+    If the budgets of all tokens are exhausted for an API, the requests to this API wait
+    until the first token becomes available again.
     """
 
     DURATION = pendulum.duration(seconds=3600)  # Duration at which the current rate limit window resets
+    RATE_LIMIT_RESOURCES = {"core": ("count_rest", "reset_at_rest"), "graphql": ("count_graphql", "reset_at_graphql")}
 
     def __init__(self, tokens: List[str], auth_method: str = "token", auth_header: str = "Authorization"):
         self._auth_method = auth_method
         self._auth_header = auth_header
         self._tokens = {t: Token() for t in tokens}
+        self._lock = threading.RLock()
+        # the token and the API of the last request of each thread
+        self._assignments = threading.local()
         self.check_all_tokens()
-        self._tokens_iter = cycle(self._tokens)
-        self._active_token = next(self._tokens_iter)
         self._max_time = 60 * 10  # 10 minutes as default
 
     @property
     def auth_header(self) -> str:
         return self._auth_header
 
+    @property
+    def token_count(self) -> int:
+        return len(self._tokens)
+
     def get_auth_header(self) -> Mapping[str, Any]:
         """The header to set on outgoing HTTP requests"""
         if self.auth_header:
@@ -78,25 +86,26 @@ class MultipleTokenAuthenticatorWithRateLimiter(AbstractHeaderAuthenticator):
 
     def __call__(self, request):
         """Attach the HTTP headers required to authenticate on the HTTP request"""
-        while True:
-            current_token = self._tokens[self.current_active_token]
-            if "graphql" in request.path_url:
-                if self.process_token(current_token, "count_graphql", "reset_at_graphql"):
-                    break
-            else:
-                if self.process_token(current_token, "count_rest", "reset_at_rest"):
-                    break
+        if "graphql" in request.path_url:
+            token = self.process_token("count_graphql", "reset_at_graphql")
+        else:
+            token = self.process_token("count_rest", "reset_at_rest")
 
         request.headers.update(self.get_auth_header())
+        request.register_hook("response", partial(self._update_token_from_response, token))
 
         return request
 
     @property
     def current_active_token(self) -> str:
-        return self._active_token
+        """The token of the last request sent by the current thread"""
+        return getattr(self._assignments, "token", next(iter(self._tokens)))
 
     def update_token(self) -> None:
-        self._active_token = next(self._tokens_iter)
+        """Stop assigning requests to the token of the last request of the current thread until its budget is refreshed"""
+        count_attr = getattr(self._assignments, "count_attr", "count_rest")
+        with self._lock:
+            setattr(self._tokens[self.current_active_token], count_attr, 0)
 
     @property
     def token(self) -> str:
@@ -135,20 +144,43 @@ class MultipleTokenAuthenticatorWithRateLimiter(AbstractHeaderAuthenticator):
         )
 
     def check_all_tokens(self):
-        for token in self._tokens:
-            self._check_token_limits(token)
-
-    def process_token(self, current_token, count_attr, reset_attr):
-        if getattr(current_token, count_attr) > 0:
-            setattr(current_token, count_attr, getattr(current_token, count_attr) - 1)
-            return True
-        elif all(getattr(x, count_attr) == 0 for x in self._tokens.values()):
-            min_time_to_wait = min((getattr(x, reset_attr) - pendulum.now()).in_seconds() for x in self._tokens.values())
-            if min_time_to_wait < self.max_time:
-                time.sleep(min_time_to_wait if min_time_to_wait > 0 else 0)
-                self.check_all_tokens()
-            else:
-                raise GitHubAPILimitException(f"Rate limits for all tokens ({count_attr}) were reached")
-        else:
-            self.update_token()
-        return False
+        with self._lock:
+            for token in self._tokens:
+                self._check_token_limits(token)
+
+    def process_token(self, count_attr: str, reset_attr: str) -> str:
+        """Take one request from the budget of the token with the most remaining requests, waiting for a reset if all are exhausted"""
+        while True:
+            with self._lock:
+                token, token_info = max(self._tokens.items(), key=lambda item: getattr(item[1], count_attr))
+                if getattr(token_info, count_attr) > 0:
+                    setattr(token_info, count_attr, getattr(token_info, count_attr) - 1)
+                    self._assignments.token, self._assignments.count_attr = token, count_attr
+                    return token
+                min_time_to_wait = min((getattr(x, reset_attr) - pendulum.now()).in_seconds() for x in self._tokens.values())
+                if min_time_to_wait >= self.max_time:
+                    raise GitHubAPILimitException(f"Rate limits for all tokens ({count_attr}) were reached")
+            # the lock is released while waiting, so that the requests to the other API are not held back
+            time.sleep(min_time_to_wait if min_time_to_wait > 0 else 0)
+            with self._lock:
+                # the budgets may have been refreshed by another thread in the meantime
+                if all(getattr(x, count_attr) == 0 for x in self._tokens.values()):
+                    self.check_all_tokens()
+
+    def _update_token_from_response(self, token: str, response: requests.Response, **kwargs) -> None:
+        """Align the budget of the token with the rate limit headers of its response"""
+        attrs = self.RATE_LIMIT_RESOURCES.get(response.headers.get("X-RateLimit-Resource"))
+        remaining, reset = response.headers.get("X-RateLimit-Remaining"), response.headers.get("X-RateLimit-Reset")
+        if not attrs or remaining is None or reset is None:
+            return
+        count_attr, reset_attr = attrs
+        reset_at = pendulum.from_timestamp(int(reset))
+        with self._lock:
+            token_info = self._tokens[token]
+            if reset_at > getattr(token_info, reset_attr):
+                # the response belongs to a new rate limit window
+                setattr(token_info, count_attr, int(remaining))
+                setattr(token_info, reset_attr, reset_at)
+            elif reset_at == getattr(token_info, reset_attr):
+                # the requests still in flight are already taken from the budget
+                setattr(token_info, count_attr, min(getattr(token_info, count_attr), int(remaining)))
@@ -0,0 +1,80 @@
+#
+# Copyright (c) 2024 Airbyte, Inc., all rights reserved.
+#
+
+import logging
+import time
+from collections import Counter
+from typing import Tuple
+from unittest.mock import patch
+
+import pytest
+import responses
+from source_github.partition_reader import RepositoryPartitionReader
+from source_github.streams import Tags
+from source_github.utils import MultipleTokenAuthenticatorWithRateLimiter, read_full_refresh
+
+from .test_partition_reader import tags_response
+
+
+logger = logging.getLogger("airbyte")
+
+REPOSITORIES = [f"org/repo{i}" for i in range(20)]
+PAGES_PER_REPOSITORY = 3
+TOKENS = ["token1", "token2", "token3"]
+REQUEST_LATENCY = 0.05
+
+
+def run_benchmark(mode: str) -> Tuple[float, Counter]:
+    requested_pages = Counter()
+    with responses.RequestsMock() as api:
+        api.add(
+            "GET",
+            "https://api.github.com/rate_limit",
+            json={
+                "resources": {
+                    "core": {"limit": 5000, "used": 0, "remaining": 5000, "reset": 4070908800},
+                    "graphql": {"limit": 5000, "used": 0, "remaining": 5000, "reset": 4070908800},
+                }
+            },
+        )
+        for repository in REPOSITORIES:
+
+            def callback(request, repository=repository):
+                requested_pages[(repository, int(request.params.get("page", 1)))] += 1
+                time.sleep(REQUEST_LATENCY)
+                return tags_response(repository, int(request.params.get("page", 1)), last_page=PAGES_PER_REPOSITORY)
+
+            api.add_callback("GET", f"https://api.github.com/repos/{repository}/tags", callback=callback, content_type="application/json")
+
+        authenticator = MultipleTokenAuthenticatorWithRateLimiter(tokens=TOKENS)
+        stream = Tags(repositories=REPOSITORIES, page_size_for_large_streams=100, authenticator=authenticator)
+        start = time.perf_counter()
+        if mode == "previous":
+            # The previous implementation read the pages of the repositories one after the other
+            with patch.object(RepositoryPartitionReader, "_can_prefetch", return_value=False):
+                records = list(read_full_refresh(stream))
+        else:
+            records = list(read_full_refresh(stream))
+        duration = time.perf_counter() - start
+    assert len(records) == len(REPOSITORIES) * PAGES_PER_REPOSITORY
+    return duration, requested_pages
+
+
+@pytest.mark.slow
+def test_repository_partitions_throughput():
+    previous, previous_requested_pages = run_benchmark("previous")
+    concurrent, concurrent_requested_pages = run_benchmark("concurrent")
+
+    pages = len(REPOSITORIES) * PAGES_PER_REPOSITORY
+    logger.info(
+        f"Reading {pages} pages of {len(REPOSITORIES)} repositories with {len(TOKENS)} tokens and {REQUEST_LATENCY}s per request: "
+        f"previous {pages / previous:.0f} pages/s, concurrent {pages / concurrent:.0f} pages/s"
+    )
+    # The durations depend on the load of the machine, so they are only logged.
+    # Prefetching the pages of the next repositories must not request any page more than once.
+    expected_requested_pages = Counter(
+        {(repository, page): 1 for repository in REPOSITORIES for page in range(1, PAGES_PER_REPOSITORY + 1)}
+    )
+    assert previous_requested_pages == expected_requested_pages
+    assert concurrent_requested_pages == expected_requested_pages
@@ -3,10 +3,12 @@
 #
 
 import json
+import threading
 from unittest.mock import patch
 
 import pendulum
 import pytest
+import requests
 import responses
 from freezegun import freeze_time
 from source_github import SourceGithub
@@ -30,6 +32,7 @@ def test_authenticator_counter(rate_limit_mock_response):
     This test ensures that the rate limiter:
      1. correctly handles the available limits from GitHub API and saves it.
      2. correctly counts the number of requests made.
+     3. assigns each request to the token with the most remaining requests.
     """
     authenticator = MultipleTokenAuthenticatorWithRateLimiter(tokens=["token1", "token2", "token3"])
 
@@ -39,14 +42,14 @@ def test_authenticator_counter(rate_limit_mock_response):
     responses.add("GET", "https://api.github.com/orgs/org1", json={"id": 1})
     responses.add("GET", "https://api.github.com/orgs/org2", json={"id": 2})
     list(read_full_refresh(stream))
-    assert authenticator._tokens["token1"].count_rest == 4998
+    assert [x.count_rest for x in authenticator._tokens.values()] == [4999, 4999, 5000]
 
 
 @responses.activate
 def test_multiple_token_authenticator_with_rate_limiter():
     """
     This test ensures that:
-     1. The rate limiter iterates over all tokens one-by-one after the previous is fully drained.
+     1. The rate limiter spreads the requests over all tokens until all of them are drained.
      2. Counter is set to zero after 1500 requests were made. (500 available requests per key were set as default)
      3. Exception is handled and log warning message could be found in output. Connector does not raise AirbyteTracedException because there might be GraphQL streams with remaining request we still can read.
     """
@@ -102,7 +105,7 @@ def test_multiple_token_authenticator_with_rate_limiter_and_sleep(sleep_mock, ca
     """
     This test ensures that:
      1. The rate limiter will only wait (sleep) for token availability if the nearest available token appears within 600 seconds (see max_time).
-     2. Token Counter is reset to new values after 1500 requests were made and last token is still in use.
+     2. Token Counter is reset to new values after 1500 requests were made and the requests are spread over the tokens again.
     """
 
     counter_rate_limits = 0
@@ -145,4 +148,62 @@ def test_multiple_token_authenticator_with_rate_limiter_and_sleep(sleep_mock, ca
 
     list(read_full_refresh(stream))
     sleep_mock.assert_called_once_with(ACCEPTED_WAITING_TIME_IN_SECONDS)
-    assert [(x.count_rest, x.count_graphql) for x in authenticator._tokens.values()] == [(500, 500), (500, 500), (498, 500)]
+    assert [(x.count_rest, x.count_graphql) for x in authenticator._tokens.values()] == [(499, 500), (499, 500), (500, 500)]
+
+
+@responses.activate
+def test_authenticator_updates_token_budget_from_response_headers(rate_limit_mock_response):
+    authenticator = MultipleTokenAuthenticatorWithRateLimiter(tokens=["token1", "token2"])
+    stream = Organizations(organizations=["org1", "org2", "org3"], authenticator=authenticator)
+    responses.add(
+        "GET",
+        "https://api.github.com/orgs/org1",
+        json={"id": 1},
+        headers={"X-RateLimit-Resource": "core", "X-RateLimit-Remaining": "10", "X-RateLimit-Reset": "4070908800"},
+    )
+    # a response of the next rate limit window replaces the budget of the token
+    responses.add(
+        "GET",
+        "https://api.github.com/orgs/org2",
+        json={"id": 2},
+        headers={"X-RateLimit-Resource": "core", "X-RateLimit-Remaining": "4990", "X-RateLimit-Reset": "4070912400"},
+    )
+    responses.add("GET", "https://api.github.com/orgs/org3", json={"id": 3})
+
+    list(read_full_refresh(stream))
+
+    assert [call.request.headers["Authorization"] for call in responses.calls[-3:]] == ["token token1", "token token2", "token token2"]
+    assert [(x.count_rest, x.reset_at_rest.int_timestamp) for x in authenticator._tokens.values()] == [
+        (10, 4070908800),
+        (4989, 4070912400),
+    ]
+
+
+@responses.activate
+def test_authenticator_spreads_concurrent_requests_over_tokens(rate_limit_mock_response):
+    authenticator = MultipleTokenAuthenticatorWithRateLimiter(tokens=["token1", "token2", "token3"])
+
+    def send_requests():
+        for _ in range(100):
+            authenticator(requests.Request("GET", "https://api.github.com/orgs/org1").prepare())
+
+    threads = [threading.Thread(target=send_requests) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert [x.count_rest for x in authenticator._tokens.values()] == [4800, 4800, 4800]
+
+
+@responses.activate
+def test_update_token_skips_the_token_of_the_current_thread(rate_limit_mock_response):
+    authenticator = MultipleTokenAuthenticatorWithRateLimiter(tokens=["token1", "token2"])
+    authenticator(requests.Request("GET", "https://api.github.com/orgs/org1").prepare())
+    authenticator.update_token()
+
+    request = authenticator(requests.Request("GET", "https://api.github.com/orgs/org1").prepare())
+    other_request = authenticator(requests.Request("GET", "https://api.github.com/orgs/org1").prepare())
+
+    assert authenticator._tokens["token1"].count_rest == 0
+    assert request.headers["Authorization"] == other_request.headers["Authorization"] == "token token2"
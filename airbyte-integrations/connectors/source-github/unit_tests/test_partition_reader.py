@@ -0,0 +1,124 @@
+#
+# Copyright (c) 2024 Airbyte, Inc., all rights reserved.
+#
+
+import json
+import threading
+from unittest.mock import patch
+
+import responses
+from source_github.streams import IssueMilestones, Tags
+from source_github.utils import MultipleTokenAuthenticatorWithRateLimiter, read_full_refresh
+
+from .utils import read_incremental
+
+
+REPOSITORIES = ["org/repo1", "org/repo2", "org/repo3"]
+
+
+def tags_response(repository: str, page: int, last_page: int):
+    headers = {}
+    if page < last_page:
+        headers["Link"] = f'<https://api.github.com/repos/{repository}/tags?per_page=100&page={page + 1}>; rel="next"'
+    return 200, headers, json.dumps([{"name": f"{repository}-{page}", "commit": {"sha": "sha"}}])
+
+
+def add_tags_callback(repository: str, last_page: int, on_request=None):
+    def callback(request):
+        page = int(request.params.get("page", 1))
+        if on_request:
+            on_request(request, page)
+        return tags_response(repository, page, last_page)
+
+    responses.add_callback("GET", f"https://api.github.com/repos/{repository}/tags", callback=callback, content_type="application/json")
+
+
+@responses.activate
+def test_repositories_are_fetched_concurrently(rate_limit_mock_response):
+    authenticator = MultipleTokenAuthenticatorWithRateLimiter(tokens=["token1", "token2", "token3"])
+    stream = Tags(repositories=REPOSITORIES, page_size_for_large_streams=100, authenticator=authenticator)
+    # The first pages of all the repositories can only be returned once they are all requested at the same time
+    barrier = threading.Barrier(len(REPOSITORIES), timeout=10)
+    for repository in REPOSITORIES:
+        add_tags_callback(repository, last_page=2, on_request=lambda request, page: page == 1 and barrier.wait())
+
+    records = list(read_full_refresh(stream))
+
+    assert stream.max_concurrent_partitions == 3
+    assert [record["name"] for record in records] == [f"{repository}-{page}" for repository in REPOSITORIES for page in (1, 2)]
+    assert len([call for call in responses.calls if "/tags" in call.request.url]) == 6
+
+
+@responses.activate
+@patch("time.sleep")
+def test_exhausted_token_does_not_hold_back_the_others(sleep_mock, rate_limit_mock_response):
+    authenticator = MultipleTokenAuthenticatorWithRateLimiter(tokens=["token1", "token2", "token3"])
+    stream = Tags(repositories=REPOSITORIES, page_size_for_large_streams=100, authenticator=authenticator)
+    remaining = {"token token1": 0, "token token2": 100, "token token3": 100}
+    lock = threading.Lock()
+
+    def rate_limit_headers(request):
+        # every token reports its own budget, the first one is exhausted for the rest of the hour
+        with lock:
+            token = request.headers["Authorization"]
+            remaining[token] = max(remaining[token] - 1, 0)
+            return {"X-RateLimit-Resource": "core", "X-RateLimit-Remaining": str(remaining[token]), "X-RateLimit-Reset": "4070908800"}
+
+    for repository in REPOSITORIES:
+
+        def callback(request, repository=repository):
+            status, headers, body = tags_response(repository, int(request.params.get("page", 1)), last_page=3)
+            return status, {**headers, **rate_limit_headers(request)}, body
+
+        responses.add_callback("GET", f"https://api.github.com/repos/{repository}/tags", callback=callback, content_type="application/json")
+
+    records = list(read_full_refresh(stream))
+
+    assert [record["name"] for record in records] == [f"{repository}-{page}" for repository in REPOSITORIES for page in (1, 2, 3)]
+    tokens = [call.request.headers["Authorization"] for call in responses.calls if "/tags" in call.request.url]
+    # only the requests sent before the first response of the exhausted token are assigned to it
+    assert tokens.count("token token1") <= 3
+    assert len(tokens) == 9
+    assert authenticator._tokens["token1"].count_rest == 0
+    sleep_mock.assert_not_called()
+
+
+@responses.activate
+def test_prefetched_pages_are_only_used_for_the_same_request():
+    class MainThreadTags(Tags):
+        def request_params(self, **kwargs):
+            return {**super().request_params(**kwargs), "main": threading.current_thread() is threading.main_thread()}
+
+    stream = MainThreadTags(repositories=REPOSITORIES[:2], page_size_for_large_streams=100, authenticator=None)
+    for repository in REPOSITORIES[:2]:
+        add_tags_callback(repository, last_page=2)
+
+    records = list(read_full_refresh(stream))
+
+    assert [record["name"] for record in records] == [f"{repository}-{page}" for repository in REPOSITORIES[:2] for page in (1, 2)]
+    # the records are read from the pages requested by the reading thread
+    main_thread_requests = [call.request.url for call in responses.calls if "main=True" in call.request.url]
+    assert len(main_thread_requests) == 4
+
+
+@responses.activate
+def test_only_first_pages_are_prefetched_for_streams_sorted_in_descending_order():
+    stream = IssueMilestones(
+        repositories=REPOSITORIES[:2], page_size_for_large_streams=100, authenticator=None, start_date="2022-01-01T00:00:00Z"
+    )
+    for repository in REPOSITORIES[:2]:
+        responses.add(
+            "GET",
+            f"https://api.github.com/repos/{repository}/milestones",
+            json=[{"id": 1, "updated_at": "2022-02-01T00:00:00Z"}, {"id": 2, "updated_at": "2022-01-01T00:00:00Z"}],
+            headers={"Link": f'<https://api.github.com/repos/{repository}/milestones?page=2>; rel="next"'},
+        )
+
+    state = {repository: {"updated_at": "2022-01-15T00:00:00Z"} for repository in REPOSITORIES[:2]}
+    records = read_incremental(stream, state)
+
+    assert [(record["repository"], record["id"]) for record in records] == [("org/repo1", 1), ("org/repo2", 1)]
+    assert [call.request.url for call in responses.calls] == [
+        f"https://api.github.com/repos/{repository}/milestones?per_page=100&state=all&sort=updated&direction=desc"
+        for repository in REPOSITORIES[:2]
+    ]
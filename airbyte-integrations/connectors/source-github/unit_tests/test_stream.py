@@ -1509,10 +1509,69 @@ def test_issues_timeline_events():
     expected_records = json.load(open(expected_file))
 
     stream = IssueTimelineEvents(**repository_args)
-    records = list(stream.read_records(sync_mode=SyncMode.full_refresh, stream_slice={"repository": "airbytehq/airbyte", "number": 1}))
+    stream_slice = {"repository": "airbytehq/airbyte", "number": 1, "updated_at": "2022-02-01T00:00:00Z"}
+    records = list(stream.read_records(sync_mode=SyncMode.full_refresh, stream_slice=stream_slice))
     assert expected_records == records
 
 
+@responses.activate
+def test_issues_timeline_events_incremental():
+    repository_args = {
+        "repositories": ["airbytehq/airbyte"],
+        "page_size_for_large_streams": 20,
+        "start_date": "2022-01-01T00:00:00Z",
+    }
+    issues = json.load(open(Path(__file__).parent / "responses/issue_timeline_events_issues.json"))
+    timeline = json.load(open(Path(__file__).parent / "responses/issue_timeline_events.json"))
+    for issue in issues:
+        responses.add(
+            responses.GET, f"https://api.github.com/repos/airbytehq/airbyte/issues/{issue['number']}/timeline?per_page=100", json=timeline
+        )
+
+    stream = IssueTimelineEvents(**repository_args)
+    stream.parent._http_client._session.cache.clear()
+
+    responses.add(
+        responses.GET,
+        "https://api.github.com/repos/airbytehq/airbyte/issues",
+        json=issues,
+        match=[
+            matchers.query_param_matcher(
+                {"state": "all", "sort": "updated", "direction": "asc", "since": "2022-01-01T00:00:00Z", "per_page": "20"}
+            )
+        ],
+    )
+    stream_state = {}
+    records = read_incremental(stream, stream_state)
+    assert [(record["issue_number"], record["issue_updated_at"]) for record in records] == [
+        (1, "2022-01-10T00:00:00Z"),
+        (2, "2022-02-01T00:00:00Z"),
+        (3, "2022-03-01T00:00:00Z"),
+    ]
+    assert stream_state == {"airbytehq/airbyte": {"issue_updated_at": "2022-03-01T00:00:00Z"}}
+    assert len(responses.calls) == 4
+
+    # Only the timelines of the issues updated since the previous sync are read again
+    responses.calls.reset()
+    responses.replace(
+        responses.GET,
+        "https://api.github.com/repos/airbytehq/airbyte/issues",
+        json=issues[2:] + [{**issues[0], "updated_at": "2022-03-05T00:00:00Z"}],
+        match=[
+            matchers.query_param_matcher(
+                {"state": "all", "sort": "updated", "direction": "asc", "since": "2022-03-01T00:00:00Z", "per_page": "20"}
+            )
+        ],
+    )
+    records = read_incremental(stream, stream_state)
+    assert [(record["issue_number"], record["issue_updated_at"]) for record in records] == [(1, "2022-03-05T00:00:00Z")]
+    assert stream_state == {"airbytehq/airbyte": {"issue_updated_at": "2022-03-05T00:00:00Z"}}
+    assert [call.request.url for call in responses.calls] == [
+        "https://api.github.com/repos/airbytehq/airbyte/issues?per_page=20&state=all&sort=updated&direction=asc&since=2022-03-01T00%3A00%3A00Z",
+        "https://api.github.com/repos/airbytehq/airbyte/issues/1/timeline?per_page=100",
+    ]
+
+
 @responses.activate
 def test_pull_request_stats():
     repository_args = {
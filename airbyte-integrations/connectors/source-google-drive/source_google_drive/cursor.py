@@ -0,0 +1,61 @@
+# Copyright (c) 2024 Airbyte, Inc., all rights reserved.
+
+
+import logging
+from typing import Any, Iterable, List, Optional, Set
+
+from airbyte_cdk.sources.file_based.config.file_based_stream_config import FileBasedStreamConfig
+from airbyte_cdk.sources.file_based.remote_file import RemoteFile
+from airbyte_cdk.sources.file_based.stream.cursor.default_file_based_cursor import DefaultFileBasedCursor
+from airbyte_cdk.sources.file_based.types import StreamState
+
+
+class GoogleDriveFileBasedCursor(DefaultFileBasedCursor):
+    """
+    Keeps a page token of the Drive Changes API in the state along with the history of synced files,
+    so incremental syncs only list the files that changed since the previous sync.
+
+    The page token taken when the files are listed is only saved in the state once all the files to sync were synced,
+    so the changes of an interrupted sync are listed again by the next one.
+    """
+
+    CHANGES_PAGE_TOKEN_KEY = "changes_page_token"
+
+    def __init__(self, stream_config: FileBasedStreamConfig, **kwargs: Any):
+        super().__init__(stream_config, **kwargs)
+        self._changes_page_token: Optional[str] = None
+        self._pending_changes_page_token: Optional[str] = None
+        self._uris_to_sync: Set[str] = set()
+
+    @property
+    def changes_page_token(self) -> Optional[str]:
+        return self._changes_page_token
+
+    def set_pending_changes_page_token(self, page_token: str) -> None:
+        self._pending_changes_page_token = page_token
+
+    def _save_pending_changes_page_token(self) -> None:
+        if self._pending_changes_page_token is not None and not self._uris_to_sync:
+            self._changes_page_token = self._pending_changes_page_token
+            self._pending_changes_page_token = None
+
+    def set_initial_state(self, value: StreamState) -> None:
+        super().set_initial_state(value)
+        self._changes_page_token = value.get(self.CHANGES_PAGE_TOKEN_KEY)
+
+    def add_file(self, file: RemoteFile) -> None:
+        super().add_file(file)
+        self._uris_to_sync.discard(file.uri)
+        self._save_pending_changes_page_token()
+
+    def get_files_to_sync(self, all_files: Iterable[RemoteFile], logger: logging.Logger) -> List[RemoteFile]:
+        files_to_sync = list(super().get_files_to_sync(all_files, logger))
+        self._uris_to_sync = {file.uri for file in files_to_sync}
+        self._save_pending_changes_page_token()
+        return files_to_sync
+
+    def get_state(self) -> StreamState:
+        state = super().get_state()
+        if self._changes_page_token is not None:
+            state[self.CHANGES_PAGE_TOKEN_KEY] = self._changes_page_token
+        return state
@@ -0,0 +1,43 @@
+# Copyright (c) 2024 Airbyte, Inc., all rights reserved.
+
+
+from functools import cache
+from typing import Any, Iterable
+
+from airbyte_cdk.sources.file_based.remote_file import RemoteFile
+from airbyte_cdk.sources.file_based.stream import DefaultFileBasedStream
+from airbyte_cdk.sources.streams.core import JsonSchema
+from source_google_drive.cursor import GoogleDriveFileBasedCursor
+
+
+class GoogleDriveFileBasedStream(DefaultFileBasedStream):
+    """
+    On incremental syncs, only lists the files that changed since the previous sync with the Drive Changes API,
+    starting from the page token kept in the state by the cursor.
+    """
+
+    def __init__(self, incremental_sync: bool = False, **kwargs: Any):
+        super().__init__(**kwargs)
+        self._incremental_sync = incremental_sync
+
+    @cache
+    def get_json_schema(self) -> JsonSchema:
+        # Syncs use the schema of the configured catalog rather than inferring it again, which would list and parse all the files
+        if self.catalog_schema:
+            return self.catalog_schema
+        return super().get_json_schema()
+
+    def get_files(self) -> Iterable[RemoteFile]:
+        cursor = self.cursor
+        if not self._incremental_sync or not isinstance(cursor, GoogleDriveFileBasedCursor):
+            return super().get_files()
+
+        # The token is taken before listing the files, so the changes made during the sync are listed again by the next one
+        changes_page_token = self.stream_reader.get_changes_start_page_token()
+        files = None
+        if cursor.changes_page_token is not None:
+            files = self.stream_reader.get_changed_files(self.config.globs or [], cursor.changes_page_token, self.logger)
+        if files is None:
+            files = super().get_files()
+        cursor.set_pending_changes_page_token(changes_page_token)
+        return files
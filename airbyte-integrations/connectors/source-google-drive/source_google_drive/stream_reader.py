@@ -6,7 +6,9 @@
 import io
 import json
 import logging
+import threading
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from io import IOBase
 from os.path import getsize
@@ -15,6 +17,7 @@ from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 import pytz
 from google.oauth2 import credentials, service_account
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 from googleapiclient.http import MediaIoBaseDownload
 
 from airbyte_cdk import AirbyteTracedException, FailureType
@@ -45,6 +48,12 @@ EXPORT_MEDIA_MIME_TYPE_PDF = "application/pdf"
 EXPORT_MEDIA_MIME_TYPE_KEY = "exportable_mime_type"
 DOCUMENT_FILE_EXTENSION_KEY = "document_file_extension"
 
+# Folders of the same level of the tree are listed concurrently, within the per-user quota of the Drive API
+MAX_CONCURRENT_FOLDER_LISTINGS = 8
+# Requests failing with rate limit errors are retried with exponential backoff
+MAX_REQUEST_RETRIES = 5
+LISTED_FILE_FIELDS = "id, name, modifiedTime, mimeType"
+
 DOWNLOADABLE_DOCUMENTS_MIME_TYPES = {
     GOOGLE_DOC_MIME_TYPE: {EXPORT_MEDIA_MIME_TYPE_KEY: EXPORT_MEDIA_MIME_TYPE_DOC, DOCUMENT_FILE_EXTENSION_KEY: ".docx"},
     GOOGLE_SPREADSHEET_MIME_TYPE: {
@@ -71,7 +80,9 @@ class SourceGoogleDriveStreamReader(AbstractFileBasedStreamReader):
 
     def __init__(self):
         super().__init__()
-        self._drive_service = None
+        # The Drive service is not thread safe, so each thread builds its own
+        self._thread_local = threading.local()
+        self._root_folder: Optional[Dict[str, str]] = None
 
     @property
     def config(self) -> SourceGoogleDriveSpec:
@@ -116,69 +127,183 @@ class SourceGoogleDriveStreamReader(AbstractFileBasedStreamReader):
 
     @property
     def google_drive_service(self):
-        if self._drive_service is None:
-            self._drive_service = self._build_google_service("drive", "v3")
-        return self._drive_service
+        drive_service = getattr(self._thread_local, "drive_service", None)
+        if drive_service is None:
+            drive_service = self._thread_local.drive_service = self._build_google_service("drive", "v3")
+        return drive_service
+
+    def _list_folder(self, folder_id: str) -> List[Dict[str, Any]]:
+        """
+        List the files and folders directly inside the folder, across all pages.
+        """
+        service = self.google_drive_service
+        # fetch all files in this folder (1000 is the max page size)
+        # supportsAllDrives and includeItemsFromAllDrives are required to access files in shared drives
+        request = service.files().list(
+            q=f"'{folder_id}' in parents",
+            pageSize=1000,
+            fields=f"nextPageToken, files({LISTED_FILE_FIELDS})",
+            supportsAllDrives=True,
+            includeItemsFromAllDrives=True,
+        )
+        files = []
+        while request is not None:
+            results = request.execute(num_retries=MAX_REQUEST_RETRIES)
+            files.extend(results.get("files", []))
+            request = service.files().list_next(request, results)
+        return files
+
+    def _create_remote_file(self, new_file: Dict[str, Any], file_name: str) -> GoogleDriveRemoteFile:
+        last_modified = datetime.strptime(new_file["modifiedTime"], "%Y-%m-%dT%H:%M:%S.%fZ")
+        original_mime_type = new_file["mimeType"]
+        mime_type = (
+            self._get_export_mime_type(original_mime_type) if self._is_exportable_document(original_mime_type) else original_mime_type
+        )
+        return GoogleDriveRemoteFile(
+            uri=file_name,
+            last_modified=last_modified,
+            id=new_file["id"],
+            original_mime_type=original_mime_type,
+            mime_type=mime_type,
+        )
 
     def get_matching_files(self, globs: List[str], prefix: Optional[str], logger: logging.Logger) -> Iterable[RemoteFile]:
         """
         Get all files matching the specified glob patterns.
+
+        The folder tree is walked level by level, listing the folders of a level concurrently.
         """
-        service = self.google_drive_service
         root_folder_id = get_folder_id(self.config.folder_url)
         # ignore prefix argument as it's legacy only and this is a new connector
         prefixes = self.get_prefixes_from_globs(globs)
 
-        folder_id_queue = [("", root_folder_id)]
+        folders = [("", root_folder_id)]
         seen: Set[str] = set()
-        while len(folder_id_queue) > 0:
-            (path, folder_id) = folder_id_queue.pop()
-            # fetch all files in this folder (1000 is the max page size)
-            # supportsAllDrives and includeItemsFromAllDrives are required to access files in shared drives
-            request = service.files().list(
-                q=f"'{folder_id}' in parents",
-                pageSize=1000,
-                fields="nextPageToken, files(id, name, modifiedTime, mimeType)",
-                supportsAllDrives=True,
-                includeItemsFromAllDrives=True,
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_FOLDER_LISTINGS) as executor:
+            while len(folders) > 0:
+                next_level_folders = []
+                for (path, _), new_files in zip(folders, executor.map(lambda folder: self._list_folder(folder[1]), folders)):
+                    for new_file in new_files:
+                        # It's possible files and folders are linked up multiple times, this prevents us from getting stuck in a loop
+                        if new_file["id"] in seen:
+                            continue
+                        seen.add(new_file["id"])
+                        file_name = path + new_file["name"]
+                        if new_file["mimeType"] == FOLDER_MIME_TYPE:
+                            folder_name = f"{file_name}/"
+                            # check prefix matching in both directions to handle
+                            prefix_matches_folder_name = any(prefix.startswith(folder_name) for prefix in prefixes)
+                            folder_name_matches_prefix = any(folder_name.startswith(prefix) for prefix in prefixes)
+                            if prefix_matches_folder_name or folder_name_matches_prefix or len(prefixes) == 0:
+                                next_level_folders.append((folder_name, new_file["id"]))
+                        else:
+                            remote_file = self._create_remote_file(new_file, file_name)
+                            if self.file_matches_globs(remote_file, globs):
+                                yield remote_file
+                folders = next_level_folders
+
+    def _get_root_folder(self) -> Dict[str, str]:
+        """
+        Id of the root folder, resolving aliases like "root" for My Drive, and id of its shared drive if any.
+        """
+        if self._root_folder is None:
+            self._root_folder = (
+                self.google_drive_service.files()
+                .get(fileId=get_folder_id(self.config.folder_url), fields="id, driveId", supportsAllDrives=True)
+                .execute(num_retries=MAX_REQUEST_RETRIES)
+            )
+        return self._root_folder
+
+    def _get_drive_parameters(self) -> Dict[str, Any]:
+        drive_id = self._get_root_folder().get("driveId")
+        return {"driveId": drive_id, "includeItemsFromAllDrives": True} if drive_id else {}
+
+    def get_changes_start_page_token(self) -> str:
+        """
+        Token to list the changes made to the drive of the root folder from now on.
+        """
+        return (
+            self.google_drive_service.changes()
+            .getStartPageToken(supportsAllDrives=True, **self._get_drive_parameters())
+            .execute(num_retries=MAX_REQUEST_RETRIES)["startPageToken"]
+        )
+
+    def _get_folder_path(self, folder_id: str, folder_paths: Dict[str, Optional[str]]) -> Optional[str]:
+        """
+        Path of the folder relative to the root folder, or None if the folder is not below the root folder.
+
+        Paths of the folders visited along the way are added to folder_paths, so each folder is only fetched once.
+        """
+        visited_folders = []
+        while folder_id not in folder_paths:
+            try:
+                folder = (
+                    self.google_drive_service.files()
+                    .get(fileId=folder_id, fields="id, name, parents", supportsAllDrives=True)
+                    .execute(num_retries=MAX_REQUEST_RETRIES)
+                )
+            except HttpError as e:
+                if e.resp.status != 404:
+                    raise
+                # the folder is not accessible, e.g. the parent of a file shared with the user, so it can't be below the root folder
+                folder_paths[folder_id] = None
+                break
+            visited_folders.append((folder_id, folder["name"]))
+            parents = folder.get("parents")
+            if not parents:
+                # reached the top of a drive without going through the root folder
+                folder_paths[folder_id] = None
+                break
+            folder_id = parents[0]
+
+        path = folder_paths[folder_id]
+        for visited_folder_id, name in reversed(visited_folders):
+            path = f"{path}{name}/" if path is not None else None
+            folder_paths[visited_folder_id] = path
+        return path
+
+    def get_changed_files(self, globs: List[str], page_token: str, logger: logging.Logger) -> Optional[List[GoogleDriveRemoteFile]]:
+        """
+        Get the files matching the specified glob patterns that changed since the page token was taken, using the Changes API.
+
+        Returns None if a folder changed, as the paths of all the files below it may have changed with it: the whole tree has to be listed.
+        Removed files are not returned.
+        """
+        service = self.google_drive_service
+        folder_paths: Dict[str, Optional[str]] = {self._get_root_folder()["id"]: ""}
+        changed_files: Dict[str, GoogleDriveRemoteFile] = {}
+        while page_token is not None:
+            results = (
+                service.changes()
+                .list(
+                    pageToken=page_token,
+                    pageSize=1000,
+                    spaces="drive",
+                    fields=f"nextPageToken, newStartPageToken, changes(removed, file({LISTED_FILE_FIELDS}, parents))",
+                    supportsAllDrives=True,
+                    **self._get_drive_parameters(),
+                )
+                .execute(num_retries=MAX_REQUEST_RETRIES)
             )
-            while True:
-                results = request.execute()
-                new_files = results.get("files", [])
-                for new_file in new_files:
-                    # It's possible files and folders are linked up multiple times, this prevents us from getting stuck in a loop
-                    if new_file["id"] in seen:
-                        continue
-                    seen.add(new_file["id"])
-                    file_name = path + new_file["name"]
-                    if new_file["mimeType"] == FOLDER_MIME_TYPE:
-                        folder_name = f"{file_name}/"
-                        # check prefix matching in both directions to handle
-                        prefix_matches_folder_name = any(prefix.startswith(folder_name) for prefix in prefixes)
-                        folder_name_matches_prefix = any(folder_name.startswith(prefix) for prefix in prefixes)
-                        if prefix_matches_folder_name or folder_name_matches_prefix or len(prefixes) == 0:
-                            folder_id_queue.append((folder_name, new_file["id"]))
-                        continue
-                    else:
-                        last_modified = datetime.strptime(new_file["modifiedTime"], "%Y-%m-%dT%H:%M:%S.%fZ")
-                        original_mime_type = new_file["mimeType"]
-                        mime_type = (
-                            self._get_export_mime_type(original_mime_type)
-                            if self._is_exportable_document(original_mime_type)
-                            else original_mime_type
-                        )
-                        remote_file = GoogleDriveRemoteFile(
-                            uri=file_name,
-                            last_modified=last_modified,
-                            id=new_file["id"],
-                            original_mime_type=original_mime_type,
-                            mime_type=mime_type,
-                        )
-                        if self.file_matches_globs(remote_file, globs):
-                            yield remote_file
-                request = service.files().list_next(request, results)
-                if request is None:
-                    break
+            for change in results.get("changes", []):
+                new_file = change.get("file")
+                if change.get("removed") or new_file is None:
+                    continue
+                if new_file["mimeType"] == FOLDER_MIME_TYPE:
+                    logger.info(f"Folder {new_file['name']} changed, listing all the files of the folder {self.config.folder_url}.")
+                    return None
+                parents = new_file.get("parents") or []
+                path = self._get_folder_path(parents[0], folder_paths) if parents else None
+                if path is None:
+                    continue
+                remote_file = self._create_remote_file(new_file, path + new_file["name"])
+                if self.file_matches_globs(remote_file, globs):
+                    # a file changed several times is listed once, with its latest version
+                    changed_files[remote_file.id] = remote_file
+            page_token = results.get("nextPageToken")
+
+        logger.info(f"Found {len(changed_files)} changed files matching the globs with the Changes API.")
+        return list(changed_files.values())
 
     def _is_exportable_document(self, mime_type: str):
         """
@@ -0,0 +1,291 @@
+#
+# Copyright (c) 2024 Airbyte, Inc., all rights reserved.
+#
+
+
+import json
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from unittest.mock import MagicMock, patch
+from urllib.parse import parse_qs, urlparse
+
+import httplib2
+import pytest
+from googleapiclient.discovery import build
+from source_google_drive.cursor import GoogleDriveFileBasedCursor
+from source_google_drive.source import SourceGoogleDrive
+from source_google_drive.stream_reader import FOLDER_MIME_TYPE, GoogleDriveRemoteFile
+
+from airbyte_cdk.models import SyncMode
+from airbyte_cdk.sources.file_based.config.file_based_stream_config import FileBasedStreamConfig
+from airbyte_cdk.test.catalog_builder import CatalogBuilder, ConfiguredAirbyteStreamBuilder
+from airbyte_cdk.test.entrypoint_wrapper import read
+from airbyte_cdk.test.state_builder import StateBuilder
+
+
+ROOT_FOLDER_ID = "root_folder"
+CONFIG = {
+    "folder_url": f"https://drive.google.com/drive/folders/{ROOT_FOLDER_ID}",
+    "credentials": {"auth_type": "Service", "service_account_info": '{"test": "abc"}'},
+    "streams": [{"name": "test", "globs": ["**/*.jsonl"], "format": {"filetype": "jsonl"}}],
+}
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "id": {"type": "integer"},
+        "_ab_source_file_last_modified": {"type": "string"},
+        "_ab_source_file_url": {"type": "string"},
+    },
+}
+
+
+class MockDrive:
+    """
+    In memory Drive, served over HTTP with the Drive v3 endpoints used by the connector:
+    files.list, files.get, files.get_media, changes.getStartPageToken and changes.list.
+    """
+
+    # small pages, so listings go through several pages
+    PAGE_SIZE = 2
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.contents: Dict[str, bytes] = {}
+        self.changes: List[Dict[str, Any]] = []
+        self.requests: List[str] = []
+        self.max_concurrent_requests = 0
+        self._concurrent_requests = 0
+        self._lock = threading.Lock()
+        self._modified_at = 0
+        self.add(ROOT_FOLDER_ID, "root", FOLDER_MIME_TYPE, parent=None)
+        self.add("other_folder", "other", FOLDER_MIME_TYPE, parent=None)
+
+        drive = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                with drive._lock:
+                    drive.requests.append(url.path)
+                    drive._concurrent_requests += 1
+                    drive.max_concurrent_requests = max(drive.max_concurrent_requests, drive._concurrent_requests)
+                try:
+                    time.sleep(drive.latency)
+                    status, body = drive.handle(url.path, {key: values[0] for key, values in parse_qs(url.query).items()})
+                finally:
+                    with drive._lock:
+                        drive._concurrent_requests -= 1
+                self.send_response(status)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}/"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def add(self, file_id: str, name: str, mime_type: str = "application/jsonl", parent: Optional[str] = ROOT_FOLDER_ID, content=b""):
+        self._modified_at += 1
+        self.files[file_id] = {
+            "id": file_id,
+            "name": name,
+            "mimeType": mime_type,
+            "modifiedTime": datetime.fromtimestamp(1700000000 + self._modified_at).strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+            "parents": [parent] if parent else [],
+        }
+        self.contents[file_id] = content
+        self.changes.append({"fileId": file_id, "removed": False})
+
+    def remove(self, file_id: str):
+        del self.files[file_id]
+        self.changes.append({"fileId": file_id, "removed": True})
+
+    def handle(self, path: str, query: Dict[str, str]):
+        if path == "/drive/v3/files":
+            parent = query["q"].split("'")[1]
+            children = [file for file in self.files.values() if parent in file["parents"]]
+            return self._page(children, query, "files")
+        if path.startswith("/drive/v3/files/"):
+            file_id = path.rsplit("/", 1)[1]
+            if file_id not in self.files:
+                return 404, json.dumps({"error": {"code": 404, "message": "File not found"}}).encode()
+            if query.get("alt") == "media":
+                return 200, self.contents[file_id]
+            return 200, json.dumps(self.files[file_id]).encode()
+        if path == "/drive/v3/changes/startPageToken":
+            return 200, json.dumps({"startPageToken": str(len(self.changes))}).encode()
+        if path == "/drive/v3/changes":
+            changes = [
+                {"fileId": change["fileId"], "removed": True}
+                if change["removed"] or change["fileId"] not in self.files
+                else {"fileId": change["fileId"], "removed": False, "file": self.files[change["fileId"]]}
+                for change in self.changes[int(query["pageToken"]) :]
+            ]
+            status, body = self._page(changes, {**query, "pageToken": "0"}, "changes")
+            page = json.loads(body)
+            page.pop("nextPageToken", None)
+            start = int(query["pageToken"])
+            if start + self.PAGE_SIZE < len(self.changes):
+                page["nextPageToken"] = str(start + self.PAGE_SIZE)
+            else:
+                page["newStartPageToken"] = str(len(self.changes))
+            return status, json.dumps(page).encode()
+        return 404, b"{}"
+
+    def _page(self, items: List[Dict[str, Any]], query: Dict[str, str], key: str):
+        start = int(query.get("pageToken", "0"))
+        page = {key: items[start : start + self.PAGE_SIZE]}
+        if start + self.PAGE_SIZE < len(items):
+            page["nextPageToken"] = str(start + self.PAGE_SIZE)
+        return 200, json.dumps(page).encode()
+
+
+@pytest.fixture(name="drive")
+def drive_fixture():
+    drive = MockDrive()
+    with (
+        patch("source_google_drive.stream_reader.service_account"),
+        patch(
+            "source_google_drive.stream_reader.build",
+            side_effect=lambda service_name, version, credentials: build(
+                service_name, version, http=httplib2.Http(), client_options={"api_endpoint": f"{drive.url}drive/v3/"}, static_discovery=True
+            ),
+        ),
+    ):
+        yield drive
+    drive.close()
+
+
+def _read(state=None):
+    catalog = (
+        CatalogBuilder()
+        .with_stream(ConfiguredAirbyteStreamBuilder().with_name("test").with_sync_mode(SyncMode.incremental).with_json_schema(SCHEMA))
+        .build()
+    )
+    source = SourceGoogleDrive(catalog=catalog, config=CONFIG, state=state)
+    return read(source, config=CONFIG, catalog=catalog, state=state)
+
+
+def _create_reader():
+    source = SourceGoogleDrive(catalog=None, config=CONFIG, state=None)
+    source.stream_reader.config = source.spec_class(**CONFIG)
+    return source.stream_reader
+
+
+def test_sibling_folders_are_listed_concurrently(drive):
+    drive.latency = 0.05
+    for i in range(8):
+        drive.add(f"folder_{i}", f"folder_{i}", FOLDER_MIME_TYPE)
+        for j in range(3):
+            drive.add(f"file_{i}_{j}", f"file_{j}.jsonl", parent=f"folder_{i}")
+
+    files = list(_create_reader().get_matching_files(["**/*.jsonl"], None, MagicMock()))
+
+    assert sorted(file.uri for file in files) == sorted(f"folder_{i}/file_{j}.jsonl" for i in range(8) for j in range(3))
+    assert drive.max_concurrent_requests > 1
+
+
+def test_get_changed_files(drive):
+    drive.add("folder", "folder", FOLDER_MIME_TYPE)
+    drive.add("subfolder", "subfolder", FOLDER_MIME_TYPE, parent="folder")
+    drive.add("unchanged", "unchanged.jsonl", parent="subfolder")
+    drive.add("modified", "modified.jsonl", parent="subfolder")
+    drive.add("removed", "removed.jsonl")
+    reader = _create_reader()
+    page_token = reader.get_changes_start_page_token()
+
+    drive.add("modified", "modified.jsonl", parent="subfolder")
+    drive.add("modified", "modified.jsonl", parent="subfolder")
+    drive.add("added", "added.jsonl", parent="folder")
+    drive.add("not_matching", "not_matching.csv")
+    drive.add("outside_root", "outside_root.jsonl", parent="other_folder")
+    drive.remove("removed")
+
+    changed_files = reader.get_changed_files(["**/*.jsonl"], page_token, MagicMock())
+
+    assert sorted(file.uri for file in changed_files) == ["folder/added.jsonl", "folder/subfolder/modified.jsonl"]
+    # the path of each folder is only resolved once
+    assert drive.requests.count("/drive/v3/files/subfolder") == 1
+
+
+def test_get_changed_files_skips_files_with_an_inaccessible_parent(drive):
+    drive.add("folder", "folder", FOLDER_MIME_TYPE)
+    reader = _create_reader()
+    page_token = reader.get_changes_start_page_token()
+
+    # a file shared with the user, whose parent folder is not shared with the user
+    drive.add("shared", "shared.jsonl", parent="inaccessible_folder")
+    drive.add("added", "added.jsonl", parent="folder")
+
+    changed_files = reader.get_changed_files(["**/*.jsonl"], page_token, MagicMock())
+
+    assert [file.uri for file in changed_files] == ["folder/added.jsonl"]
+
+
+def test_get_changed_files_returns_none_when_a_folder_changed(drive):
+    drive.add("folder", "folder", FOLDER_MIME_TYPE)
+    reader = _create_reader()
+    page_token = reader.get_changes_start_page_token()
+
+    drive.add("folder", "renamed_folder", FOLDER_MIME_TYPE)
+
+    assert reader.get_changed_files(["**/*.jsonl"], page_token, MagicMock()) is None
+
+
+def test_incremental_sync_only_lists_changed_files(drive):
+    drive.add("folder", "folder", FOLDER_MIME_TYPE)
+    drive.add("first", "first.jsonl", parent="folder", content=b'{"id": 1}\n')
+    drive.add("second", "second.jsonl", content=b'{"id": 2}\n')
+
+    first_sync = _read()
+    assert sorted(record.record.data["id"] for record in first_sync.records) == [1, 2]
+    state = first_sync.most_recent_state.stream_state.__dict__
+    assert state[GoogleDriveFileBasedCursor.CHANGES_PAGE_TOKEN_KEY] == str(len(drive.changes))
+
+    drive.add("second", "second.jsonl", content=b'{"id": 3}\n')
+    drive.requests.clear()
+    second_sync = _read(StateBuilder().with_stream_state("test", state).build())
+
+    assert [record.record.data["id"] for record in second_sync.records] == [3]
+    assert "/drive/v3/files" not in drive.requests
+    assert second_sync.most_recent_state.stream_state.__dict__[GoogleDriveFileBasedCursor.CHANGES_PAGE_TOKEN_KEY] == str(len(drive.changes))
+
+
+def test_incremental_sync_lists_all_files_when_a_folder_changed(drive):
+    drive.add("folder", "folder", FOLDER_MIME_TYPE)
+    drive.add("first", "first.jsonl", parent="folder", content=b'{"id": 1}\n')
+    state = _read().most_recent_state.stream_state.__dict__
+
+    drive.add("folder", "renamed_folder", FOLDER_MIME_TYPE)
+    second_sync = _read(StateBuilder().with_stream_state("test", state).build())
+
+    # the file has a new path, so it is synced again
+    assert [record.record.data["id"] for record in second_sync.records] == [1]
+    assert "/drive/v3/files" in drive.requests
+
+
+def test_cursor_saves_page_token_once_all_files_are_synced():
+    cursor = GoogleDriveFileBasedCursor(FileBasedStreamConfig(name="test", format={"filetype": "jsonl"}))
+    cursor.set_initial_state({"history": {}, GoogleDriveFileBasedCursor.CHANGES_PAGE_TOKEN_KEY: "1"})
+    files = [
+        GoogleDriveRemoteFile(uri=f"file_{i}.jsonl", id=str(i), last_modified=datetime(2024, 1, 1), original_mime_type="application/jsonl")
+        for i in range(2)
+    ]
+
+    cursor.set_pending_changes_page_token("2")
+    assert cursor.get_files_to_sync(files, MagicMock()) == files
+    cursor.add_file(files[0])
+    assert cursor.get_state()[GoogleDriveFileBasedCursor.CHANGES_PAGE_TOKEN_KEY] == "1"
+    cursor.add_file(files[1])
+    assert cursor.get_state()[GoogleDriveFileBasedCursor.CHANGES_PAGE_TOKEN_KEY] == "2"
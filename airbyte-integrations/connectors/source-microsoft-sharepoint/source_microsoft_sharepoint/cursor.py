@@ -0,0 +1,63 @@
+#
+# Copyright (c) 2025 Airbyte, Inc., all rights reserved.
+#
+
+
+import logging
+from typing import Any, Iterable, List, Mapping, Optional, Set
+
+from airbyte_cdk.sources.file_based.config.file_based_stream_config import FileBasedStreamConfig
+from airbyte_cdk.sources.file_based.remote_file import RemoteFile
+from airbyte_cdk.sources.file_based.stream.cursor.default_file_based_cursor import DefaultFileBasedCursor
+from airbyte_cdk.sources.file_based.types import StreamState
+
+
+class SourceMicrosoftSharePointCursor(DefaultFileBasedCursor):
+    """
+    Keeps the delta links of the drives in the state along with the history of synced files,
+    so incremental syncs only enumerate the items that changed since the previous sync.
+
+    The delta state of an enumeration is only saved in the state once all the files to sync were synced,
+    so the changes of an interrupted sync are enumerated again by the next one.
+    """
+
+    DELTA_STATE_KEY = "delta"
+
+    def __init__(self, stream_config: FileBasedStreamConfig, **kwargs: Any):
+        super().__init__(stream_config, **kwargs)
+        self._delta_state: Optional[Mapping[str, Any]] = None
+        self._pending_delta_state: Optional[Mapping[str, Any]] = None
+        self._uris_to_sync: Set[str] = set()
+
+    @property
+    def delta_state(self) -> Optional[Mapping[str, Any]]:
+        return self._delta_state
+
+    def set_pending_delta_state(self, delta_state: Mapping[str, Any]) -> None:
+        self._pending_delta_state = delta_state
+
+    def _save_pending_delta_state(self) -> None:
+        if self._pending_delta_state is not None and not self._uris_to_sync:
+            self._delta_state = self._pending_delta_state
+            self._pending_delta_state = None
+
+    def set_initial_state(self, value: StreamState) -> None:
+        super().set_initial_state(value)
+        self._delta_state = value.get(self.DELTA_STATE_KEY)
+
+    def add_file(self, file: RemoteFile) -> None:
+        super().add_file(file)
+        self._uris_to_sync.discard(file.uri)
+        self._save_pending_delta_state()
+
+    def get_files_to_sync(self, all_files: Iterable[RemoteFile], logger: logging.Logger) -> List[RemoteFile]:
+        files_to_sync = list(super().get_files_to_sync(all_files, logger))
+        self._uris_to_sync = {file.uri for file in files_to_sync}
+        self._save_pending_delta_state()
+        return files_to_sync
+
+    def get_state(self) -> StreamState:
+        state = super().get_state()
+        if self._delta_state is not None:
+            state[self.DELTA_STATE_KEY] = self._delta_state
+        return state
@@ -0,0 +1,245 @@
+# Copyright (c) 2025 Airbyte, Inc., all rights reserved.
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from http import HTTPStatus
+from typing import Any, Callable, Dict, Iterable, List, Mapping, MutableMapping, Optional, Tuple
+
+import requests
+
+from airbyte_cdk import AirbyteTracedException, FailureType
+
+
+LOGGER = logging.getLogger("airbyte")
+
+GRAPH_API_URL = "https://graph.microsoft.com/v1.0"
+# Maximum number of requests of a JSON batch
+MAX_BATCH_SIZE = 20
+MAX_RETRIES = 5
+INITIAL_RETRY_AFTER = 5
+MAX_RETRY_AFTER = 300
+
+DELTA_LINK_KEY = "delta_link"
+ENUMERATED_AT_KEY = "enumerated_at"
+DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+# Allowed difference between the local clock and the clock of the Graph API
+MAX_CLOCK_SKEW = timedelta(minutes=5)
+
+DriveFile = Tuple[str, str, datetime]
+
+
+def parse_last_modified(drive_item: Mapping[str, Any]) -> datetime:
+    return datetime.strptime(drive_item["lastModifiedDateTime"], DATETIME_FORMAT)
+
+
+class ResyncRequiredError(Exception):
+    """
+    Raised when a delta link expired, in which case the drive has to be enumerated again from the start.
+    """
+
+
+class GraphDriveItemsClient:
+    """
+    Enumerates the items of drives with the Microsoft Graph API.
+
+    Whole drives are enumerated with delta queries, which page through all the items of a drive and end with a delta link
+    listing the items changed since then. The delta link and the time of the enumeration are kept in a drive state,
+    so the next enumeration only requests the changed items. The paths of the folders of the changed items are resolved again
+    on each enumeration. Folders are enumerated with JSON batches of requests.
+    """
+
+    def __init__(self, get_headers: Callable[[], Dict[str, str]], api_url: str = GRAPH_API_URL):
+        self._get_headers = get_headers
+        self._api_url = api_url
+        self._session = requests.Session()
+
+    def _request(self, method: str, url: str, **kwargs: Any) -> Mapping[str, Any]:
+        """
+        Sends a request to the Graph API, retrying on throttling and unavailability with the delay of the Retry-After header.
+        """
+        retry_after = INITIAL_RETRY_AFTER
+        for _ in range(MAX_RETRIES):
+            response = self._session.request(method, url, headers=self._get_headers(), **kwargs)
+            if response.status_code not in (HTTPStatus.TOO_MANY_REQUESTS, HTTPStatus.SERVICE_UNAVAILABLE):
+                break
+            time.sleep(int(response.headers.get("Retry-After", retry_after)))
+            retry_after = min(retry_after * 2, MAX_RETRY_AFTER)
+        else:
+            message = f"Maximum number of retries of {MAX_RETRIES} exceeded for the request to {url}."
+            raise AirbyteTracedException(message, message, failure_type=FailureType.system_error)
+
+        if response.status_code == HTTPStatus.GONE:
+            raise ResyncRequiredError(f"The delta link '{url}' expired.")
+        if response.status_code != HTTPStatus.OK:
+            error_info = response.json().get("error", {}).get("message", "No additional error information provided.")
+            raise RuntimeError(f"Failed to retrieve URL '{url}'. HTTP status: {response.status_code}. Error: {error_info}")
+        return response.json()
+
+    def _relative_url(self, url: str) -> str:
+        return url[len(self._api_url) :] if url.startswith(self._api_url) else url
+
+    def batch_get(self, urls: List[str], skip_not_found: bool = False) -> Iterable[Tuple[str, Mapping[str, Any]]]:
+        """
+        Gets the URLs, relative to the API URL, with JSON batches of requests, and yields each URL with its response body.
+
+        Throttled requests of a batch are sent again in the next batch.
+        """
+        pending_urls = list(urls)
+        retry_after = INITIAL_RETRY_AFTER
+        while pending_urls:
+            batch_urls, pending_urls = pending_urls[:MAX_BATCH_SIZE], pending_urls[MAX_BATCH_SIZE:]
+            requests_ = [{"id": str(index), "method": "GET", "url": url} for index, url in enumerate(batch_urls)]
+            responses = self._request("POST", f"{self._api_url}/$batch", json={"requests": requests_})["responses"]
+
+            throttled = False
+            for response in sorted(responses, key=lambda response: int(response["id"])):
+                url = batch_urls[int(response["id"])]
+                if response["status"] in (HTTPStatus.TOO_MANY_REQUESTS, HTTPStatus.SERVICE_UNAVAILABLE):
+                    throttled = True
+                    retry_after = max(retry_after, int(response.get("headers", {}).get("Retry-After", 0)))
+                    pending_urls.append(url)
+                    continue
+                if response["status"] == HTTPStatus.NOT_FOUND and skip_not_found:
+                    LOGGER.warning(f"Requested item could not be found: url: {url}")
+                    continue
+                if response["status"] != HTTPStatus.OK:
+                    error_info = response.get("body", {}).get("error", {}).get("message", "No additional error information provided.")
+                    raise RuntimeError(f"Failed to retrieve URL '{url}'. HTTP status: {response['status']}. Error: {error_info}")
+                yield url, response["body"]
+
+            if throttled:
+                time.sleep(retry_after)
+                retry_after = min(retry_after * 2, MAX_RETRY_AFTER)
+            else:
+                retry_after = INITIAL_RETRY_AFTER
+
+    def get_folder_files(self, drive_id: str, folder_id: str, path: str) -> Iterable[DriveFile]:
+        """
+        Yields all the files below the folder, listing the children of the folders of each level of the tree with JSON batches.
+        """
+        folders = [(f"/drives/{drive_id}/items/{folder_id}/children", path)]
+        while folders:
+            folder_paths = dict(folders)
+            next_folders = []
+            for url, page in self.batch_get([url for url, _ in folders]):
+                folder_path = folder_paths[url]
+                for child in page.get("value", []):
+                    child_path = folder_path + "/" + child["name"]
+                    if child.get("file"):
+                        yield child_path, child["@microsoft.graph.downloadUrl"], parse_last_modified(child)
+                    elif child.get("folder"):
+                        next_folders.append((f"/drives/{drive_id}/items/{child['id']}/children", child_path))
+                next_link = page.get("@odata.nextLink")
+                if next_link:
+                    next_page_url = self._relative_url(next_link)
+                    folder_paths[next_page_url] = folder_path
+                    next_folders.append((next_page_url, folder_path))
+            folders = next_folders
+
+    def _resolve_folders(self, drive_id: str, folder_ids: Iterable[str], folders: MutableMapping[str, List[Optional[str]]]) -> None:
+        """
+        Adds the folders, and their ancestors missing from the folders, to the folders with JSON batches.
+        """
+        missing_folder_ids = set()
+        for folder_id in folder_ids:
+            # the closest missing ancestor of the folder, if any
+            while folder_id is not None and folder_id in folders:
+                folder_id = folders[folder_id][0]
+            if folder_id is not None:
+                missing_folder_ids.add(folder_id)
+        while missing_folder_ids:
+            urls = [f"/drives/{drive_id}/items/{folder_id}?$select=id,name,root,parentReference" for folder_id in missing_folder_ids]
+            missing_folder_ids = set()
+            # folders deleted since then are skipped, along with their files
+            for _, folder in self.batch_get(urls, skip_not_found=True):
+                parent_id = None if "root" in folder else folder.get("parentReference", {}).get("id")
+                folders[folder["id"]] = [parent_id, "" if "root" in folder else folder["name"]]
+                if parent_id and parent_id not in folders:
+                    missing_folder_ids.add(parent_id)
+
+    @staticmethod
+    def _get_path(folder_id: str, folders: Mapping[str, List[Optional[str]]]) -> Optional[str]:
+        """
+        Path of the folder relative to the root of the drive, or None if one of its ancestors is unknown.
+        """
+        names = []
+        while folder_id is not None:
+            if folder_id not in folders:
+                return None
+            folder_id, name = folders[folder_id]
+            names.append(name)
+        return "/".join(name for name in reversed(names) if name)
+
+    @staticmethod
+    def _may_have_been_renamed_or_moved(folder: Mapping[str, Any], enumerated_at: datetime) -> bool:
+        """
+        Whether the folder may have been renamed or moved since the previous enumeration, as it was modified after it was created.
+        """
+        last_modified = parse_last_modified(folder)
+        created = datetime.strptime(folder["createdDateTime"], DATETIME_FORMAT) if "createdDateTime" in folder else None
+        return last_modified >= enumerated_at - MAX_CLOCK_SKEW and last_modified != created
+
+    def get_drive_files(
+        self, drive_id: str, folder_path: str, drive_state: Optional[Mapping[str, Any]], new_drive_state: MutableMapping[str, Any]
+    ) -> List[DriveFile]:
+        """
+        Returns the files of the drive below the folder path, relative to the root of the drive.
+
+        With the state of a previous enumeration, only the files changed since then are returned. If a folder was renamed or moved,
+        the paths of all the files below it changed, so the whole drive is enumerated again, as it is when the delta link expired.
+        The state to enumerate the changes made from now on is set in new_drive_state.
+        """
+        enumerated_at = datetime.now(timezone.utc).replace(tzinfo=None)
+        if drive_state:
+            url = drive_state[DELTA_LINK_KEY]
+            previous_enumerated_at = datetime.strptime(drive_state[ENUMERATED_AT_KEY], DATETIME_FORMAT)
+        else:
+            url = f"{self._api_url}/drives/{drive_id}/root/delta"
+            previous_enumerated_at = None
+
+        # The delta feed has the latest version of each changed item, possibly over several pages
+        folders: Dict[str, List[Optional[str]]] = {}
+        changed_files: Dict[str, Mapping[str, Any]] = {}
+        while True:
+            try:
+                page = self._request("GET", url)
+            except ResyncRequiredError:
+                if not drive_state:
+                    raise
+                LOGGER.info(f"The delta link of drive {drive_id} expired, enumerating all the files of the drive.")
+                return self.get_drive_files(drive_id, folder_path, None, new_drive_state)
+            for item in page.get("value", []):
+                if item.get("deleted"):
+                    folders.pop(item["id"], None)
+                    changed_files.pop(item["id"], None)
+                elif "root" in item:
+                    folders[item["id"]] = [None, ""]
+                elif item.get("folder"):
+                    if previous_enumerated_at and self._may_have_been_renamed_or_moved(item, previous_enumerated_at):
+                        LOGGER.info(f"Folder {item['name']} may have been renamed or moved, enumerating all the files of drive {drive_id}.")
+                        return self.get_drive_files(drive_id, folder_path, None, new_drive_state)
+                    folders[item["id"]] = [item["parentReference"]["id"], item["name"]]
+                elif item.get("file"):
+                    changed_files[item["id"]] = item
+            if "@odata.nextLink" in page:
+                url = page["@odata.nextLink"]
+            else:
+                delta_link = page["@odata.deltaLink"]
+                break
+
+        # Folders unchanged since the previous enumeration are missing from the delta feed
+        self._resolve_folders(drive_id, {item["parentReference"]["id"] for item in changed_files.values()}, folders)
+
+        folder_prefix = f"{folder_path}/" if folder_path else ""
+        files = []
+        for item in changed_files.values():
+            parent_path = self._get_path(item["parentReference"]["id"], folders)
+            if parent_path is None:
+                continue
+            file_path = f"{parent_path}/{item['name']}" if parent_path else item["name"]
+            if file_path.startswith(folder_prefix):
+                files.append((file_path, item["@microsoft.graph.downloadUrl"], parse_last_modified(item)))
+
+        new_drive_state[DELTA_LINK_KEY] = delta_link
+        new_drive_state[ENUMERATED_AT_KEY] = enumerated_at.strftime(DATETIME_FORMAT)
+        return files
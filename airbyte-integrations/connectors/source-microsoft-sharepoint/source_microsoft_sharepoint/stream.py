@@ -0,0 +1,40 @@
+#
+# Copyright (c) 2025 Airbyte, Inc., all rights reserved.
+#
+
+
+from functools import cache
+from typing import Any, Dict, Iterable
+
+from airbyte_cdk.sources.file_based.remote_file import RemoteFile
+from airbyte_cdk.sources.file_based.stream import DefaultFileBasedStream
+from airbyte_cdk.sources.streams.core import JsonSchema
+from source_microsoft_sharepoint.cursor import SourceMicrosoftSharePointCursor
+
+
+class SourceMicrosoftSharePointStream(DefaultFileBasedStream):
+    """
+    On incremental syncs, only enumerates the items of the drives that changed since the previous sync with delta queries,
+    starting from the delta links kept in the state by the cursor.
+    """
+
+    def __init__(self, incremental_sync: bool = False, **kwargs: Any):
+        super().__init__(**kwargs)
+        self._incremental_sync = incremental_sync
+
+    @cache
+    def get_json_schema(self) -> JsonSchema:
+        # Syncs use the schema of the configured catalog rather than inferring it again, which would enumerate and parse all the files
+        if self.catalog_schema:
+            return self.catalog_schema
+        return super().get_json_schema()
+
+    def get_files(self) -> Iterable[RemoteFile]:
+        cursor = self.cursor
+        if not self._incremental_sync or not isinstance(cursor, SourceMicrosoftSharePointCursor):
+            return super().get_files()
+
+        # Filled in as the drives are enumerated, which is done by the time the cursor selects the files to sync
+        new_delta_state: Dict[str, Any] = {}
+        cursor.set_pending_delta_state(new_delta_state)
+        return self.stream_reader.get_changed_files(self.config.globs or [], cursor.delta_state, new_delta_state, self.logger)
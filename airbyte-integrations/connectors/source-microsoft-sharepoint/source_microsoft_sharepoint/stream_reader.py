@@ -10,7 +10,7 @@ from functools import lru_cache
 from io import IOBase
 from os import makedirs, path
 from os.path import getsize
-from typing import Any, Callable, Dict, Iterable, List, MutableMapping, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Mapping, MutableMapping, Optional, Tuple
 
 import requests
 import smart_open
@@ -29,8 +29,8 @@ from airbyte_cdk.sources.file_based.remote_file import RemoteFile
 from source_microsoft_sharepoint.spec import SourceMicrosoftSharePointSpec
 
 from .exceptions import ErrorDownloadingFile, ErrorFetchingMetadata
+from .graph import GraphDriveItemsClient, parse_last_modified
 from .utils import (
-    FolderNotFoundException,
     MicrosoftSharePointRemoteFile,
     execute_query_with_retry,
     filter_http_urls,
@@ -113,6 +113,7 @@ class SourceMicrosoftSharePointStreamReader(AbstractFileBasedStreamReader):
         super().__init__()
         self._auth_client = None
         self._one_drive_client = None
+        self._graph_client = None
 
     @property
     def config(self) -> SourceMicrosoftSharePointSpec:
@@ -132,6 +133,12 @@ class SourceMicrosoftSharePointStreamReader(AbstractFileBasedStreamReader):
             self._one_drive_client = self.auth_client.client
         return self._one_drive_client
 
+    @property
+    def graph_client(self) -> GraphDriveItemsClient:
+        if self._graph_client is None:
+            self._graph_client = GraphDriveItemsClient(self._get_headers)
+        return self._graph_client
+
     def get_access_token(self):
         # Directly fetch a new access token from the auth_client each time it's called
         return self.auth_client._get_access_token()["access_token"]
@@ -184,23 +191,6 @@ class SourceMicrosoftSharePointStreamReader(AbstractFileBasedStreamReader):
         headers = {"Authorization": f"Bearer {access_token}"}
         base_url = f"https://graph.microsoft.com/v1.0/drives/{drive_id}"
 
-        def get_files(url: str, path: str) -> List[Tuple[str, str, datetime]]:
-            response = requests.get(url, headers=headers)
-            if response.status_code != 200:
-                error_info = response.json().get("error", {}).get("message", "No additional error information provided.")
-                raise RuntimeError(f"Failed to retrieve files from URL '{url}'. HTTP status: {response.status_code}. Error: {error_info}")
-
-            data = response.json()
-            for child in data.get("value", []):
-                new_path = path + "/" + child["name"]
-                if child.get("file"):  # Object is a file
-                    last_modified = datetime.strptime(child["lastModifiedDateTime"], "%Y-%m-%dT%H:%M:%SZ")
-                    yield (new_path, child["@microsoft.graph.downloadUrl"], last_modified)
-                else:  # Object is a folder, retrieve children
-                    child_url = f"{base_url}/items/{child['id']}/children"  # Use item endpoint for nested objects
-                    yield from get_files(child_url, new_path)
-            yield from []
-
         # Initial request to item endpoint
         item_url = f"{base_url}/items/{object_id}"
         item_response = requests.get(item_url, headers=headers)
@@ -215,43 +205,39 @@ class SourceMicrosoftSharePointStreamReader(AbstractFileBasedStreamReader):
         item_data = item_response.json()
         if item_data.get("file"):  # Initial object is a file
             new_path = path + "/" + item_data["name"]
-            last_modified = datetime.strptime(item_data["lastModifiedDateTime"], "%Y-%m-%dT%H:%M:%SZ")
-            yield (new_path, item_data["@microsoft.graph.downloadUrl"], last_modified)
+            yield (new_path, item_data["@microsoft.graph.downloadUrl"], parse_last_modified(item_data))
         else:
             # Initial object is a folder, start file retrieval
-            yield from get_files(f"{item_url}/children", path)
-
-    def _list_directories_and_files(self, root_folder, path):
-        """Enumerates folders and files starting from a root folder."""
-        drive_items = execute_query_with_retry(root_folder.children.get())
-        for item in drive_items:
-            item_path = path + "/" + item.name if path else item.name
-            if item.is_file:
-                yield (item_path, item.properties["@microsoft.graph.downloadUrl"], item.properties["lastModifiedDateTime"])
-            else:
-                yield from self._list_directories_and_files(item, item_path)
-        yield from []
+            yield from self.graph_client.get_folder_files(drive_id, object_id, path)
+
+    def _get_files_by_drive_name(
+        self,
+        drives,
+        folder_path,
+        delta_state: Optional[Mapping[str, Any]] = None,
+        new_delta_state: Optional[MutableMapping[str, Any]] = None,
+    ):
+        """
+        Yields files from the specified drive.
 
-    def _get_files_by_drive_name(self, drives, folder_path):
-        """Yields files from the specified drive."""
+        Drives are enumerated with delta queries. With the delta state of a previous enumeration, only the files changed since then
+        are yielded. The delta state to enumerate the changes made from now on is set in new_delta_state.
+        """
+        delta_state = delta_state or {}
+        new_delta_state = new_delta_state if new_delta_state is not None else {}
         path_levels = [level for level in folder_path.split("/") if level]
         folder_path = "/".join(path_levels)
+        if folder_path in self.ROOT_PATH:
+            folder_path = ""
 
         for drive in drives:
             is_sharepoint = drive.drive_type == "documentLibrary"
             if is_sharepoint:
-                # Define base path for drive files to differentiate files between drives
-                if folder_path in self.ROOT_PATH:
-                    folder = drive.root
-                    folder_path_url = drive.web_url
-                else:
-                    try:
-                        folder = execute_query_with_retry(drive.root.get_by_path(folder_path).get())
-                    except FolderNotFoundException:
-                        continue
-                    folder_path_url = drive.web_url + "/" + folder_path
-
-                yield from self._list_directories_and_files(folder, folder_path_url)
+                new_delta_state[drive.id] = {}
+                files = self.graph_client.get_drive_files(drive.id, folder_path, delta_state.get(drive.id), new_delta_state[drive.id])
+                for file_path, download_url, last_modified in files:
+                    # Define base path for drive files to differentiate files between drives
+                    yield (f"{drive.web_url}/{file_path}", download_url, last_modified)
 
     def get_all_sites(self) -> List[MutableMapping[str, Any]]:
         """
@@ -359,10 +345,10 @@ class SourceMicrosoftSharePointStreamReader(AbstractFileBasedStreamReader):
             if parent_reference and parent_reference["driveId"] not in drive_ids:
                 yield from self._get_shared_drive_object(parent_reference["driveId"], drive_item.id, drive_item.web_url)
 
-    def get_all_files(self):
+    def get_all_files(self, delta_state: Optional[Mapping[str, Any]] = None, new_delta_state: Optional[MutableMapping[str, Any]] = None):
         if self.config.search_scope in ("ACCESSIBLE_DRIVES", "ALL"):
             # Get files from accessible drives
-            yield from self._get_files_by_drive_name(self.drives, self.config.folder_path)
+            yield from self._get_files_by_drive_name(self.drives, self.config.folder_path, delta_state, new_delta_state)
 
         # skip this step for application authentication flow
         if self.config.credentials.auth_type != "Client" or (
@@ -378,7 +364,18 @@ class SourceMicrosoftSharePointStreamReader(AbstractFileBasedStreamReader):
         """
         Retrieve all files matching the specified glob patterns in SharePoint.
         """
-        files = self.get_all_files()
+        yield from self.get_changed_files(globs, None, {}, logger)
+
+    def get_changed_files(
+        self, globs: List[str], delta_state: Optional[Mapping[str, Any]], new_delta_state: MutableMapping[str, Any], logger: logging.Logger
+    ) -> Iterable[RemoteFile]:
+        """
+        Retrieve the files matching the specified glob patterns in SharePoint that changed since the delta state was set.
+
+        Without a delta state, all the files are retrieved. Shared items are always retrieved, as delta queries are only available
+        for whole drives. The delta state to retrieve the changes made from now on is set in new_delta_state.
+        """
+        files = self.get_all_files(delta_state, new_delta_state)
 
         files_generator = filter_http_urls(
             self.filter_files_by_globs_and_start_date(
@@ -400,7 +397,8 @@ class SourceMicrosoftSharePointStreamReader(AbstractFileBasedStreamReader):
             items_processed = True
             yield file
 
-        if not items_processed:
+        # an incremental enumeration finds no files when none changed
+        if not items_processed and not delta_state:
             raise AirbyteTracedException(
                 message=f"Drive is empty or does not exist.",
                 failure_type=FailureType.config_error,
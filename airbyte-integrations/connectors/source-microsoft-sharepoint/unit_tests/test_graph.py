@@ -0,0 +1,345 @@
+#
+# Copyright (c) 2025 Airbyte, Inc., all rights reserved.
+#
+import json
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from unittest.mock import Mock, PropertyMock, patch
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from source_microsoft_sharepoint.cursor import SourceMicrosoftSharePointCursor
+from source_microsoft_sharepoint.graph import DELTA_LINK_KEY, ENUMERATED_AT_KEY, GraphDriveItemsClient
+from source_microsoft_sharepoint.source import SourceMicrosoftSharePoint
+from source_microsoft_sharepoint.stream_reader import SourceMicrosoftSharePointStreamReader
+
+from airbyte_cdk.models import SyncMode
+from airbyte_cdk.test.catalog_builder import CatalogBuilder, ConfiguredAirbyteStreamBuilder
+from airbyte_cdk.test.entrypoint_wrapper import read
+from airbyte_cdk.test.state_builder import StateBuilder
+
+
+DRIVE_ID = "drive"
+DRIVE_URL = "https://example.sharepoint.com/sites/test/Shared%20Documents"
+
+
+class GraphStub:
+    """
+    Local stub of the Microsoft Graph drive endpoints used by the connector: delta queries, children and items of a drive,
+    and JSON batches of those requests.
+    """
+
+    # small pages, so enumerations go through several pages
+    PAGE_SIZE = 2
+
+    def __init__(self):
+        self.items: Dict[str, Dict[str, Any]] = {}
+        self.changes: List[str] = []
+        self.requests: List[str] = []
+        self.throttled_urls: List[str] = []
+        # delta links with an older token expired
+        self.oldest_delta_token = 0
+        self._started_at = int(time.time())
+        self._modified_at = 0
+        self.add("root", "root", folder=True, parent=None)
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _respond(self, status: int, body: Any):
+                content = body if isinstance(body, bytes) else json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def do_GET(self):
+                stub.requests.append(f"GET {urlparse(self.path).path}")
+                self._respond(*stub.handle(self.path))
+
+            def do_POST(self):
+                stub.requests.append(f"POST {self.path}")
+                batch = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                responses = []
+                for request in batch["requests"]:
+                    if request["url"] in stub.throttled_urls:
+                        stub.throttled_urls.remove(request["url"])
+                        responses.append({"id": request["id"], "status": 429, "headers": {"Retry-After": "1"}, "body": {}})
+                        continue
+                    status, body = stub.handle(f"/v1.0{request['url']}")
+                    responses.append({"id": request["id"], "status": status, "body": body})
+                self._respond(200, {"responses": responses})
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}/v1.0"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def add(self, item_id: str, name: str, folder: bool = False, parent: Optional[str] = "root", content: bytes = b""):
+        self._modified_at += 1
+        modified_at = datetime.fromtimestamp(self._started_at + self._modified_at, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        self.items[item_id] = {
+            "id": item_id,
+            "name": name,
+            "parent": parent,
+            "folder": folder,
+            "content": content,
+            "createdDateTime": self.items[item_id]["createdDateTime"] if item_id in self.items else modified_at,
+            "lastModifiedDateTime": modified_at,
+        }
+        self.changes.append(item_id)
+
+    def remove(self, item_id: str):
+        self.items[item_id]["deleted"] = True
+        self.changes.append(item_id)
+
+    def drive_item(self, item_id: str) -> Dict[str, Any]:
+        item = self.items[item_id]
+        if item.get("deleted"):
+            return {"id": item_id, "deleted": {"state": "deleted"}, "parentReference": {"id": item["parent"]}}
+        drive_item = {
+            "id": item_id,
+            "name": item["name"],
+            "createdDateTime": item["createdDateTime"],
+            "lastModifiedDateTime": item["lastModifiedDateTime"],
+        }
+        if item["parent"] is None:
+            drive_item["root"] = {}
+        else:
+            drive_item["parentReference"] = {"driveId": DRIVE_ID, "id": item["parent"]}
+        if item["folder"]:
+            drive_item["folder"] = {"childCount": 0}
+        else:
+            drive_item["file"] = {"mimeType": "text/csv"}
+            drive_item["@microsoft.graph.downloadUrl"] = f"{self.url}/download/{item_id}"
+        return drive_item
+
+    def _page(self, items: List[Dict[str, Any]], url: str, skip: int) -> Dict[str, Any]:
+        page = {"value": items[skip : skip + self.PAGE_SIZE]}
+        if skip + self.PAGE_SIZE < len(items):
+            separator = "&" if "?" in url else "?"
+            page["@odata.nextLink"] = f"{self.url}{url}{separator}$skiptoken={skip + self.PAGE_SIZE}"
+        return page
+
+    def handle(self, path: str):
+        url = urlparse(path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        skip = int(query.pop("$skiptoken", 0))
+        parts = url.path.split("/")[2:]
+
+        if parts[0] == "download":
+            return 200, self.items[parts[1]]["content"]
+        if parts[2:] == ["root", "delta"]:
+            # the latest version of each item changed since the token
+            token = int(query.get("token", 0))
+            if token and token < self.oldest_delta_token:
+                return 410, {"error": {"code": "resyncRequired", "message": "Resync required."}}
+            changed_ids = list(dict.fromkeys(reversed(self.changes[token:])))[::-1]
+            page = self._page(
+                [self.drive_item(item_id) for item_id in changed_ids],
+                f"/drives/{DRIVE_ID}/root/delta" + (f"?token={token}" if token else ""),
+                skip,
+            )
+            if "@odata.nextLink" not in page:
+                page["@odata.deltaLink"] = f"{self.url}/drives/{DRIVE_ID}/root/delta?token={len(self.changes)}"
+            return 200, page
+        item_id = parts[3]
+        if item_id not in self.items or self.items[item_id].get("deleted"):
+            return 404, {"error": {"code": "itemNotFound", "message": "The resource could not be found."}}
+        if parts[4:] == ["children"]:
+            children = [
+                self.drive_item(child["id"]) for child in self.items.values() if child["parent"] == item_id and not child.get("deleted")
+            ]
+            return 200, self._page(children, f"/drives/{DRIVE_ID}/items/{item_id}/children", skip)
+        return 200, self.drive_item(item_id)
+
+
+@pytest.fixture(name="graph")
+def graph_fixture():
+    graph = GraphStub()
+    yield graph
+    graph.close()
+
+
+def _create_client(graph: GraphStub) -> GraphDriveItemsClient:
+    return GraphDriveItemsClient(lambda: {"Authorization": "Bearer token"}, api_url=graph.url)
+
+
+def test_get_drive_files_returns_changes_since_previous_enumeration(graph):
+    graph.add("folder", "folder", folder=True)
+    graph.add("other_folder", "other_folder", folder=True)
+    for i in range(3):
+        graph.add(f"file_{i}", f"file_{i}.csv", parent="folder")
+    graph.add("outside", "outside.csv", parent="other_folder")
+    client = _create_client(graph)
+
+    drive_state = {}
+    files = client.get_drive_files(DRIVE_ID, "folder", None, drive_state)
+    assert sorted(path for path, _, _ in files) == ["folder/file_0.csv", "folder/file_1.csv", "folder/file_2.csv"]
+    assert drive_state[DELTA_LINK_KEY] == f"{graph.url}/drives/{DRIVE_ID}/root/delta?token={len(graph.changes)}"
+
+    graph.add("file_0", "file_0.csv", parent="folder")
+    graph.add("file_0", "file_0.csv", parent="folder")
+    graph.add("new", "new.csv", parent="folder")
+    graph.remove("file_1")
+    graph.add("outside", "outside.csv", parent="other_folder")
+    graph.requests.clear()
+
+    new_drive_state = {}
+    files = client.get_drive_files(DRIVE_ID, "folder", drive_state, new_drive_state)
+
+    assert sorted(path for path, _, _ in files) == ["folder/file_0.csv", "folder/new.csv"]
+    # the folders of the changed files and their parent folder are resolved with a batch for each level
+    assert graph.requests == [f"GET /v1.0/drives/{DRIVE_ID}/root/delta"] * 2 + ["POST /v1.0/$batch"] * 2
+    # only the delta link and the time of the enumeration are kept, whatever the number of folders
+    assert sorted(new_drive_state) == [DELTA_LINK_KEY, ENUMERATED_AT_KEY]
+
+
+def test_get_drive_files_enumerates_drive_again_when_a_folder_is_renamed(graph):
+    graph.add("folder", "folder", folder=True)
+    graph.add("file", "file.csv", parent="folder")
+    client = _create_client(graph)
+    drive_state = {}
+    client.get_drive_files(DRIVE_ID, "", None, drive_state)
+
+    graph.add("folder", "renamed_folder", folder=True)
+    files = client.get_drive_files(DRIVE_ID, "", drive_state, {})
+
+    assert [path for path, _, _ in files] == ["renamed_folder/file.csv"]
+
+
+def test_get_drive_files_does_not_enumerate_drive_again_for_new_folders(graph):
+    graph.add("folder", "folder", folder=True)
+    graph.add("file", "file.csv", parent="folder")
+    client = _create_client(graph)
+    drive_state = {}
+    client.get_drive_files(DRIVE_ID, "", None, drive_state)
+
+    graph.add("new_folder", "new_folder", folder=True)
+    graph.add("new_file", "new_file.csv", parent="new_folder")
+    files = client.get_drive_files(DRIVE_ID, "", drive_state, {})
+
+    assert [path for path, _, _ in files] == ["new_folder/new_file.csv"]
+
+
+def test_get_drive_files_enumerates_drive_again_when_the_delta_link_expired(graph):
+    graph.add("folder", "folder", folder=True)
+    graph.add("file", "file.csv", parent="folder")
+    client = _create_client(graph)
+    drive_state = {}
+    client.get_drive_files(DRIVE_ID, "", None, drive_state)
+
+    graph.add("new_file", "new_file.csv", parent="folder")
+    graph.oldest_delta_token = len(graph.changes)
+    graph.requests.clear()
+    new_drive_state = {}
+    files = client.get_drive_files(DRIVE_ID, "", drive_state, new_drive_state)
+
+    assert sorted(path for path, _, _ in files) == ["folder/file.csv", "folder/new_file.csv"]
+    assert graph.requests[:2] == [f"GET /v1.0/drives/{DRIVE_ID}/root/delta"] * 2
+    assert new_drive_state[DELTA_LINK_KEY] == f"{graph.url}/drives/{DRIVE_ID}/root/delta?token={len(graph.changes)}"
+
+
+def test_get_drive_files_resolves_unknown_folders_with_batches(graph):
+    graph.add("folder", "folder", folder=True)
+    graph.add("subfolder", "subfolder", folder=True, parent="folder")
+    graph.add("file", "file.csv", parent="subfolder")
+    drive_state = {
+        DELTA_LINK_KEY: f"{graph.url}/drives/{DRIVE_ID}/root/delta?token={len(graph.changes) - 1}",
+        ENUMERATED_AT_KEY: datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+    }
+
+    files = _create_client(graph).get_drive_files(DRIVE_ID, "", drive_state, {})
+
+    assert [path for path, _, _ in files] == ["folder/subfolder/file.csv"]
+    assert graph.requests.count("POST /v1.0/$batch") == 3
+
+
+@patch("source_microsoft_sharepoint.graph.time.sleep")
+def test_get_folder_files_lists_folders_of_a_level_in_batches(mock_sleep, graph):
+    for i in range(30):
+        graph.add(f"folder_{i}", f"folder_{i}", folder=True)
+        for j in range(3):
+            graph.add(f"file_{i}_{j}", f"file_{j}.csv", parent=f"folder_{i}")
+    graph.throttled_urls.append(f"/drives/{DRIVE_ID}/items/folder_0/children")
+
+    files = list(_create_client(graph).get_folder_files(DRIVE_ID, "root", "https://example.com"))
+
+    assert sorted(path for path, _, _ in files) == sorted(
+        f"https://example.com/folder_{i}/file_{j}.csv" for i in range(30) for j in range(3)
+    )
+    # 15 pages of the root folder, 2 pages for each of the 30 folders and the throttled request are sent in 18 batches
+    assert graph.requests.count("POST /v1.0/$batch") == 18
+    mock_sleep.assert_called_once_with(5)
+
+
+def test_incremental_sync_only_enumerates_changed_items(graph):
+    graph.add("folder", "folder", folder=True)
+    graph.add("first", "first.csv", parent="folder", content=b"id\n1\n")
+    graph.add("second", "second.csv", content=b"id\n2\n")
+    config = {
+        "credentials": {"auth_type": "Client", "client_id": "client_id", "client_secret": "client_secret", "tenant_id": "tenant_id"},
+        "search_scope": "ACCESSIBLE_DRIVES",
+        "folder_path": ".",
+        "streams": [{"name": "test", "globs": ["**/*.csv"], "validation_policy": "Emit Record", "format": {"filetype": "csv"}}],
+    }
+    schema = {
+        "type": "object",
+        "properties": {
+            "id": {"type": "string"},
+            "_ab_source_file_last_modified": {"type": "string"},
+            "_ab_source_file_url": {"type": "string"},
+        },
+    }
+    catalog = (
+        CatalogBuilder()
+        .with_stream(ConfiguredAirbyteStreamBuilder().with_name("test").with_sync_mode(SyncMode.incremental).with_json_schema(schema))
+        .build()
+    )
+
+    def _read(state=None):
+        source = SourceMicrosoftSharePoint(catalog=catalog, config=config, state=state)
+        source.stream_reader._graph_client = _create_client(graph)
+        return read(source, config=config, catalog=catalog, state=state)
+
+    drive = Mock(id=DRIVE_ID, web_url=DRIVE_URL, drive_type="documentLibrary")
+    with (
+        patch.object(SourceMicrosoftSharePointStreamReader, "drives", new_callable=PropertyMock, return_value=[drive]),
+        patch("source_microsoft_sharepoint.stream_reader.filter_http_urls", side_effect=lambda files, logger: files),
+    ):
+        first_sync = _read()
+        assert sorted(record.record.data["id"] for record in first_sync.records) == ["1", "2"]
+        state = first_sync.most_recent_state.stream_state.__dict__
+        assert state[SourceMicrosoftSharePointCursor.DELTA_STATE_KEY][DRIVE_ID][DELTA_LINK_KEY].endswith(f"token={len(graph.changes)}")
+
+        graph.add("second", "second.csv", content=b"id\n3\n")
+        graph.requests.clear()
+        second_sync = _read(StateBuilder().with_stream_state("test", state).build())
+
+    assert [record.record.data["id"] for record in second_sync.records] == ["3"]
+    assert [request for request in graph.requests if "/download/" not in request] == [
+        f"GET /v1.0/drives/{DRIVE_ID}/root/delta",
+        "POST /v1.0/$batch",
+    ]
+
+
+def test_cursor_saves_delta_state_once_all_files_are_synced():
+    cursor = SourceMicrosoftSharePointCursor(Mock(days_to_sync_if_history_is_full=3))
+    cursor.set_initial_state({"history": {}, SourceMicrosoftSharePointCursor.DELTA_STATE_KEY: {DRIVE_ID: {DELTA_LINK_KEY: "1"}}})
+    files = [Mock(uri=f"file_{i}.csv", last_modified=datetime(2024, 1, 1)) for i in range(2)]
+
+    cursor.set_pending_delta_state({DRIVE_ID: {DELTA_LINK_KEY: "2"}})
+    assert cursor.get_files_to_sync(files, Mock()) == files
+    cursor.add_file(files[0])
+    assert cursor.get_state()[SourceMicrosoftSharePointCursor.DELTA_STATE_KEY] == {DRIVE_ID: {DELTA_LINK_KEY: "1"}}
+    cursor.add_file(files[1])
+    assert cursor.get_state()[SourceMicrosoftSharePointCursor.DELTA_STATE_KEY] == {DRIVE_ID: {DELTA_LINK_KEY: "2"}}
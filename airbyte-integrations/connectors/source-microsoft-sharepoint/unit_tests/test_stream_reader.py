@@ -28,15 +28,6 @@ from airbyte_cdk import AirbyteTracedException
 TEST_LOCAL_DIRECTORY = "/tmp/airbyte-file-transfer"
 
 
-def create_mock_drive_item(is_file, name, children=None):
-    """Helper function to create a mock drive item."""
-    mock_item = MagicMock(properties={"@microsoft.graph.downloadUrl": "test_url", "lastModifiedDateTime": "1991-08-24"})
-    mock_item.is_file = is_file
-    mock_item.name = name
-    mock_item.children.get.return_value.execute_query = Mock(return_value=children or [])
-    return mock_item
-
-
 @pytest.fixture
 def setup_reader_class():
     reader = SourceMicrosoftSharePointStreamReader()  # Instantiate your class here
@@ -352,25 +343,6 @@ def test_microsoft_sharepoint_client_initialization(requests_mock):
     assert client._msal_app is not None
 
 
-def test_list_directories_and_files():
-    """Test the list_directories_and_files method in SourceMicrosoftSharePointStreamReader."""
-    # Create a mock structure of folders and files
-    mock_child_file1 = create_mock_drive_item(True, "file1.txt")
-    mock_child_file2 = create_mock_drive_item(True, "file2.txt")
-    mock_child_folder = create_mock_drive_item(False, "folder1", children=[mock_child_file1])
-    mock_root_folder = create_mock_drive_item(False, "root", children=[mock_child_folder, mock_child_file2])
-
-    stream_reader = SourceMicrosoftSharePointStreamReader()
-
-    result = list(stream_reader._list_directories_and_files(mock_root_folder, "https://example.com/root"))
-
-    assert len(result) == 2
-    assert result == [
-        ("https://example.com/root/folder1/file1.txt", "test_url", "1991-08-24"),
-        ("https://example.com/root/file2.txt", "test_url", "1991-08-24"),
-    ]
-
-
 @pytest.mark.parametrize(
     "drive_type, files_number",
     [
@@ -378,32 +350,28 @@ def test_list_directories_and_files():
         ("business", 0),
     ],
 )
-@patch("source_microsoft_sharepoint.stream_reader.SourceMicrosoftSharePointStreamReader._list_directories_and_files")
-def test_get_files_by_drive_name(mock_list_directories_and_files, drive_type, files_number):
-    # Helper function usage
-    mock_drive = Mock()
+def test_get_files_by_drive_name(drive_type, files_number):
+    mock_drive = Mock(id="testDriveId", web_url="https://example.com/testDrive", drive_type=drive_type)
     mock_drive.name = "testDrive"
-    mock_drive.web_url = "https://example.com/testDrive"
-    mock_drive.drive_type = drive_type
-    mock_drive.root.get_by_path.return_value.get().execute_query_with_incremental_retry.return_value = create_mock_drive_item(
-        is_file=False, name="root"
-    )
-
-    # Mock files
-    mock_file = create_mock_drive_item(is_file=True, name="testFile.txt")
-    mock_list_directories_and_files.return_value = [mock_file]
 
     # Create stream reader instance
     stream_reader = SourceMicrosoftSharePointStreamReader()
     stream_reader._config = Mock()
+    stream_reader._graph_client = Mock()
+    stream_reader._graph_client.get_drive_files.return_value = [("test/path/testFile.txt", "test_url", datetime(1991, 8, 24))]
 
     # Call the method
-    files = list(stream_reader._get_files_by_drive_name([mock_drive], "/test/path"))
+    delta_state = {"testDriveId": {"delta_link": "https://example.com/delta"}}
+    new_delta_state = {}
+    files = list(stream_reader._get_files_by_drive_name([mock_drive], "/test/path/", delta_state, new_delta_state))
 
     # Assertions
     assert len(files) == files_number
     if files_number:
-        assert files[0].name == "testFile.txt"
+        assert files[0] == ("https://example.com/testDrive/test/path/testFile.txt", "test_url", datetime(1991, 8, 24))
+        stream_reader._graph_client.get_drive_files.assert_called_once_with(
+            "testDriveId", "test/path", delta_state["testDriveId"], new_delta_state["testDriveId"]
+        )
 
 
 @pytest.mark.parametrize(
@@ -467,33 +435,6 @@ file_response = {
     "lastModifiedDateTime": "2021-01-01T00:00:00Z",
 }
 
-empty_folder_response = {"folder": True, "value": []}
-
-# Adjusting the folder_with_nested_files to represent the initial folder response
-folder_with_nested_files_initial = {
-    "folder": True,
-    "value": [
-        {"id": "subfolder1", "folder": True, "name": "subfolder1"},
-        {"id": "subfolder2", "folder": True, "name": "subfolder2"},
-    ],  # Empty subfolder  # Subfolder with a file
-}
-
-# Response for the empty subfolder (subfolder1)
-empty_subfolder_response = {"value": [], "name": "subfolder1"}  # No files or folders inside subfolder1
-
-# Response for the subfolder with a file (subfolder2)
-not_empty_subfolder_response = {
-    "value": [
-        {
-            "file": True,
-            "name": "NestedFile.txt",
-            "@microsoft.graph.downloadUrl": "http://example.com/nested",
-            "lastModifiedDateTime": "2021-01-02T00:00:00Z",
-        }
-    ],
-    "name": "subfolder2",
-}
-
 
 @pytest.mark.parametrize(
     "initial_response, subsequent_responses, expected_result, raises_error, expected_error_message, initial_path",
@@ -513,27 +454,6 @@ not_empty_subfolder_response = {
             None,
             "http://example.com",
         ),
-        # Object ID is an empty folder
-        (empty_folder_response, [empty_subfolder_response], [], False, None, "http://example.com"),
-        # Object ID is a folder with empty subfolders and files
-        (
-            {"folder": True, "name": "root"},  # Initial folder response
-            [
-                folder_with_nested_files_initial,
-                empty_subfolder_response,
-                not_empty_subfolder_response,
-            ],
-            [
-                (
-                    "http://example.com/subfolder2/NestedFile.txt",
-                    "http://example.com/nested",
-                    datetime.strptime("2021-01-02T00:00:00Z", "%Y-%m-%dT%H:%M:%SZ"),
-                )
-            ],
-            False,
-            None,
-            "http://example.com",
-        ),
         # Error response on initial request
         (
             MagicMock(status_code=400, json=MagicMock(return_value={"error": {"message": "Bad Request"}})),
@@ -543,19 +463,6 @@ not_empty_subfolder_response = {
             "Failed to retrieve the initial shared object with ID 'dummy_object_id' from drive 'dummy_drive_id'. HTTP status: 400. Error: Bad Request",
             "http://example.com",
         ),
-        # Error response while iterating over nested
-        (
-            {"folder": True, "name": "root"},
-            [MagicMock(status_code=400, json=MagicMock(return_value={"error": {"message": "Bad Request"}}))],
-            [],
-            True,
-            (
-                "Failed to retrieve files from URL "
-                "'https://graph.microsoft.com/v1.0/drives/dummy_drive_id/items/dummy_object_id/children'. "
-                "HTTP status: 400. Error: Bad Request"
-            ),
-            "http://example.com",
-        ),
     ],
 )
 @patch("source_microsoft_sharepoint.stream_reader.requests.get")
@@ -593,6 +500,23 @@ def test_get_shared_drive_object(
         assert result == expected_result
 
 
+@patch("source_microsoft_sharepoint.stream_reader.requests.get")
+@patch("source_microsoft_sharepoint.stream_reader.SourceMicrosoftSharePointStreamReader.get_access_token")
+def test_get_shared_drive_object_folder(mock_get_access_token, mock_requests_get):
+    mock_get_access_token.return_value = "dummy_access_token"
+    mock_requests_get.return_value = MagicMock(status_code=200, json=MagicMock(return_value={"folder": True, "name": "root"}))
+    nested_file = ("http://example.com/subfolder/NestedFile.txt", "http://example.com/nested", datetime(2021, 1, 2))
+
+    reader = SourceMicrosoftSharePointStreamReader()
+    reader._graph_client = Mock()
+    reader._graph_client.get_folder_files.return_value = [nested_file]
+
+    result = list(reader._get_shared_drive_object("dummy_drive_id", "dummy_object_id", "http://example.com"))
+
+    assert result == [nested_file]
+    reader._graph_client.get_folder_files.assert_called_once_with("dummy_drive_id", "dummy_object_id", "http://example.com")
+
+
 @pytest.mark.parametrize(
     "auth_type, user_principal_name, has_refresh_token",
     [
@@ -0,0 +1,138 @@
+# Copyright (c) 2024 Airbyte, Inc., all rights reserved.
+
+
+import logging
+import os
+import queue
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Mapping
+
+import pytest
+from source_sftp_bulk.client import SFTPClient
+from source_sftp_bulk.spec import SourceSFTPBulkSpec
+from source_sftp_bulk.stream_reader import SourceSFTPBulkStreamReader
+
+from airbyte_cdk.sources.file_based.file_based_stream_reader import FileReadMode
+from airbyte_cdk.sources.file_based.remote_file import RemoteFile
+
+from .conftest import TMP_FOLDER
+
+
+logger = logging.getLogger("airbyte")
+
+BENCHMARK_FOLDER = "benchmark"
+FILE_COUNT = 8
+FILE_SIZE = 8 * 1024 * 1024
+UNPIPELINED_SAMPLE_SIZE = 1024 * 1024
+# one way latency added to every packet, which makes a round trip of 50ms
+INJECTED_LATENCY = 0.025
+
+
+class LatencyProxy:
+    """TCP proxy delaying the packets in both directions, without limiting the bandwidth."""
+
+    def __init__(self, upstream_host: str, upstream_port: int, latency: float):
+        self.upstream = (upstream_host, upstream_port)
+        self.latency = latency
+        self._server = socket.create_server(("127.0.0.1", 0))
+        self.port = self._server.getsockname()[1]
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self):
+        while True:
+            downstream, _ = self._server.accept()
+            upstream = socket.create_connection(self.upstream)
+            threading.Thread(target=self._forward, args=(downstream, upstream), daemon=True).start()
+            threading.Thread(target=self._forward, args=(upstream, downstream), daemon=True).start()
+
+    def _forward(self, source: socket.socket, destination: socket.socket):
+        packets = queue.Queue()
+
+        def receive():
+            while True:
+                try:
+                    data = source.recv(64 * 1024)
+                except OSError:
+                    data = b""
+                packets.put((time.monotonic(), data))
+                if not data:
+                    return
+
+        threading.Thread(target=receive, daemon=True).start()
+        while True:
+            received_at, data = packets.get()
+            time.sleep(max(0.0, received_at + self.latency - time.monotonic()))
+            if not data:
+                destination.close()
+                return
+            destination.sendall(data)
+
+
+@pytest.fixture(name="benchmark_files", scope="module")
+def benchmark_files_fixture():
+    os.makedirs(f"{TMP_FOLDER}/{BENCHMARK_FOLDER}", exist_ok=True)
+    files = []
+    for i in range(FILE_COUNT):
+        file_name = f"{BENCHMARK_FOLDER}/file_{i}.csv"
+        content = "".join(f"{row},{'x' * 50}\n" for row in range(FILE_SIZE // 60)).encode("utf-8")
+        with open(f"{TMP_FOLDER}/{file_name}", "wb") as f:
+            f.write(content)
+        files.append((RemoteFile(uri=f"/files/{file_name}", last_modified=datetime.now()), content))
+    return files
+
+
+def test_transfer_throughput_with_latency(config: Mapping[str, Any], benchmark_files, tmp_path):
+    proxy = LatencyProxy(config["host"], config["port"], INJECTED_LATENCY)
+    proxied_config = {**config, "host": "127.0.0.1", "port": proxy.port}
+    reader = SourceSFTPBulkStreamReader()
+    reader.config = SourceSFTPBulkSpec(**proxied_config)
+
+    # Previous implementation: one session, files opened without prefetching and read one at a time.
+    # It is slow enough to only read the start of one file and extrapolate.
+    client = SFTPClient(host="127.0.0.1", username=config["username"], password=config["credentials"]["password"], port=proxy.port)
+    start = time.perf_counter()
+    remote_file, content = benchmark_files[0]
+    with client.sftp_connection.open(remote_file.uri, mode="rb") as f:
+        assert f.read(UNPIPELINED_SAMPLE_SIZE) == content[:UNPIPELINED_SAMPLE_SIZE]
+    unpipelined_duration = (time.perf_counter() - start) * FILE_COUNT * FILE_SIZE / UNPIPELINED_SAMPLE_SIZE
+
+    def read(benchmark_file):
+        remote_file, content = benchmark_file
+        with reader.open_file(remote_file, FileReadMode.READ_BINARY, None, logger) as f:
+            assert f.read() == content
+
+    start = time.perf_counter()
+    for benchmark_file in benchmark_files:
+        read(benchmark_file)
+    pipelined_duration = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(read, benchmark_files))
+    pooled_duration = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for remote_file, _ in benchmark_files:
+        client.sftp_connection.get(remote_file.uri, str(tmp_path / "single_session.csv"))
+    single_session_download_duration = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(lambda benchmark_file: reader.get_file(benchmark_file[0], str(tmp_path), logger), benchmark_files))
+    pooled_download_duration = time.perf_counter() - start
+
+    megabytes = FILE_COUNT * FILE_SIZE / (1024 * 1024)
+    logger.info(
+        f"Reading {megabytes:.0f} MB with a {INJECTED_LATENCY * 2 * 1000:.0f}ms round trip: "
+        f"unpipelined {megabytes / unpipelined_duration:.2f} MB/s (extrapolated), "
+        f"pipelined {megabytes / pipelined_duration:.2f} MB/s, pipelined over a pool of sessions {megabytes / pooled_duration:.2f} MB/s. "
+        f"Downloading: one session {megabytes / single_session_download_duration:.2f} MB/s, "
+        f"pool of sessions {megabytes / pooled_download_duration:.2f} MB/s."
+    )
+    assert pipelined_duration < unpipelined_duration
+    assert pooled_duration < pipelined_duration
+    assert pooled_download_duration < single_session_download_duration
@@ -4,8 +4,11 @@
 
 
 import io
+import itertools
 import logging
-from typing import Optional
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Optional, Tuple
 
 import backoff
 import paramiko
@@ -16,6 +19,8 @@ from airbyte_cdk import AirbyteTracedException, FailureType
 
 # set default timeout to 300 seconds
 REQUEST_TIMEOUT = 300
+# maximum number of read requests in flight for a single file
+MAX_CONCURRENT_PREFETCH_REQUESTS = 128
 
 logger = logging.getLogger("airbyte")
 
@@ -85,3 +90,153 @@ class SFTPClient:
     @property
     def sftp_connection(self) -> paramiko.SFTPClient:
         return self._connection
+
+
+class SFTPConnectionPool:
+    """
+    Small pool of SFTP sessions, each on its own SSH connection, so several files can be transferred in parallel.
+
+    A paramiko SFTP session cannot serve requests from several threads at once, so a session is only used by one caller at a time.
+    Sessions are opened when every open session is in use, and callers wait for a session to be released once the pool is full.
+    """
+
+    MAX_CONNECTIONS_DEFAULT = 4
+
+    def __init__(self, client_factory: Callable[[], SFTPClient], max_connections: int = MAX_CONNECTIONS_DEFAULT):
+        self._client_factory = client_factory
+        self._max_connections = max_connections
+        self._open_connections = 0
+        self._idle_clients: List[SFTPClient] = []
+        self._condition = threading.Condition()
+
+    def acquire(self) -> SFTPClient:
+        with self._condition:
+            while not self._idle_clients and self._open_connections >= self._max_connections:
+                self._condition.wait()
+            if self._idle_clients:
+                return self._idle_clients.pop()
+            self._open_connections += 1
+
+        try:
+            return self._client_factory()
+        except Exception as e:
+            with self._condition:
+                self._open_connections -= 1
+                if self._open_connections == 0:
+                    raise
+                # Servers can limit the number of connections per user, keep using the sessions that are already open
+                logger.warning(f"Failed to open an additional SFTP session, using the {self._open_connections} open session(s): {e}")
+                self._max_connections = self._open_connections
+            return self.acquire()
+
+    def release(self, client: SFTPClient) -> None:
+        with self._condition:
+            self._idle_clients.append(client)
+            self._condition.notify()
+
+    @contextmanager
+    def connection(self) -> Iterator[SFTPClient]:
+        client = self.acquire()
+        try:
+            yield client
+        finally:
+            self.release(client)
+
+
+class SFTPFileReader(io.RawIOBase):
+    """
+    Read-only and seekable file object over a remote SFTP file, backed by pipelined reads.
+
+    The file is read in windows, each fetched with many concurrent SFTP read requests instead of one request per round trip.
+    While the file is read sequentially, the next window is requested ahead so it is transferred while the current one is consumed.
+    """
+
+    WINDOW_SIZE_DEFAULT = 4 * 1024 * 1024
+
+    def __init__(
+        self,
+        remote_file: paramiko.SFTPFile,
+        size: int,
+        window_size: int = WINDOW_SIZE_DEFAULT,
+        on_close: Optional[Callable[[], None]] = None,
+    ):
+        super().__init__()
+        self._remote_file = remote_file
+        self._size = size
+        self._window_size = window_size
+        self._on_close = on_close
+        self._window = b""
+        self._window_start = 0
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = self._size + offset
+        else:
+            raise ValueError(f"Invalid whence value: {whence}")
+        if position < 0:
+            raise ValueError(f"Negative seek position {position}")
+        self._position = position
+        return self._position
+
+    def _get_requests(self, start: int) -> List[Tuple[int, int]]:
+        end = min(start + self._window_size, self._size)
+        return [
+            (offset, min(paramiko.SFTPFile.MAX_REQUEST_SIZE, end - offset))
+            for offset in range(start, end, paramiko.SFTPFile.MAX_REQUEST_SIZE)
+        ]
+
+    def _fetch_window(self, start: int) -> None:
+        requests = self._get_requests(start)
+        # Only read ahead while the file is read sequentially, so random access (e.g. parquet) does not buffer unused data.
+        # Requests of the window that was read ahead are already in flight and are not sent again.
+        read_ahead_requests = self._get_requests(start + self._window_size) if start == self._window_start + len(self._window) else []
+        blocks = self._remote_file.readv(requests + read_ahead_requests, max_concurrent_prefetch_requests=MAX_CONCURRENT_PREFETCH_REQUESTS)
+        self._window = b"".join(itertools.islice(blocks, len(requests)))
+        self._window_start = start
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        if size is None or size < 0:
+            size = self._size - self._position
+        chunks = []
+        while size > 0 and self._position < self._size:
+            if not self._window_start <= self._position < self._window_start + len(self._window):
+                self._fetch_window(self._position)
+            offset = self._position - self._window_start
+            chunk = self._window[offset : offset + size]
+            if not chunk:
+                break
+            chunks.append(chunk)
+            self._position += len(chunk)
+            size -= len(chunk)
+        return b"".join(chunks)
+
+    def readall(self) -> bytes:
+        return self.read(-1)
+
+    def readinto(self, buffer) -> int:
+        data = self.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+    def close(self) -> None:
+        if not self.closed:
+            try:
+                self._remote_file.close()
+            finally:
+                if self._on_close is not None:
+                    self._on_close()
+        super().close()
@@ -0,0 +1,111 @@
+# Copyright (c) 2024 Airbyte, Inc., all rights reserved.
+
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from wcmatch import fnmatch
+
+
+logger = logging.getLogger("airbyte")
+
+LISTING_CACHE_DIR = os.path.join(tempfile.gettempdir(), "source_sftp_bulk", "listing_cache")
+# directories modified this recently may still be written to, so their listing is not cached
+MIN_CACHED_DIRECTORY_AGE_SECONDS = 60
+
+
+def directory_may_contain_matches(directory: str, globs: List[str]) -> bool:
+    """
+    Whether files below the directory can match any of the globs.
+
+    The directory path is compared with the globs segment by segment, so the walk does not descend into directories
+    that no glob can match, e.g. `/files/2023` for `/files/2024-*/*.csv`. `**` is assumed to match anything below it.
+    """
+    directory_segments = collapse_slashes(directory).split("/")
+    return any(_segments_may_contain_matches(directory_segments, collapse_slashes(glob).split("/")) for glob in globs)
+
+
+def collapse_slashes(path: str) -> str:
+    """
+    Collapse repeated slashes, e.g. `//files` when walking from the `/` folder path, which the SFTP server resolves as `/files`.
+    """
+    return re.sub(r"/{2,}", "/", path)
+
+
+def _segments_may_contain_matches(directory_segments: List[str], glob_segments: List[str]) -> bool:
+    for index, directory_segment in enumerate(directory_segments):
+        if index < len(glob_segments) and glob_segments[index] == "**":
+            return True
+        # the last segment of the glob matches file names, so files below the directory would have too many segments
+        if index >= len(glob_segments) - 1:
+            return False
+        if not fnmatch.fnmatch(directory_segment, glob_segments[index], flags=fnmatch.DOTMATCH):
+            return False
+    return True
+
+
+@dataclass
+class DirectoryEntry:
+    filename: str
+    is_directory: bool
+    # unknown for the directories of a cached listing, as it changes when their own entries change
+    mtime: Optional[int]
+
+
+class DirectoryListingCache:
+    """
+    Listings of the directories of an SFTP server, persisted on local disk between syncs.
+
+    A listing is reused as long as the modification time of its directory did not change, which happens whenever an entry of
+    the directory is added, removed or renamed. Files overwritten in place do not change the modification time of their directory,
+    so their new modification time is only seen once the directory changes.
+    """
+
+    def __init__(self, server: str, cache_dir: Optional[str] = None):
+        cache_dir = cache_dir or LISTING_CACHE_DIR
+        self._path = os.path.join(cache_dir, f"{hashlib.sha256(server.encode('utf-8')).hexdigest()}.json")
+        self._lock = threading.Lock()
+        self._listings: Dict[str, dict] = {}
+        try:
+            with open(self._path, "r") as cache_file:
+                self._listings = json.load(cache_file)
+        except FileNotFoundError:
+            pass
+        except ValueError as e:
+            logger.warning(f"Ignoring the invalid directory listing cache {self._path}: {e}")
+
+    def get(self, directory: str, mtime: int) -> Optional[List[DirectoryEntry]]:
+        with self._lock:
+            listing = self._listings.get(directory)
+        if listing is None or listing["mtime"] != mtime:
+            return None
+        return [DirectoryEntry(*entry) for entry in listing["entries"]]
+
+    def put(self, directory: str, mtime: int, entries: List[DirectoryEntry]) -> None:
+        if time.time() - mtime < MIN_CACHED_DIRECTORY_AGE_SECONDS:
+            return
+        with self._lock:
+            self._listings[directory] = {
+                "mtime": mtime,
+                "entries": [[entry.filename, entry.is_directory, None if entry.is_directory else entry.mtime] for entry in entries],
+            }
+
+    def save(self) -> None:
+        cache_dir = os.path.dirname(self._path)
+        os.makedirs(cache_dir, exist_ok=True)
+        with self._lock:
+            content = json.dumps(self._listings)
+
+        # Write to a temporary file first so a concurrent sync never reads a partial file
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        with os.fdopen(file_descriptor, "w") as temporary_file:
+            temporary_file.write(content)
+        os.replace(temporary_path, self._path)
@@ -60,6 +60,16 @@ class SourceSFTPBulkSpec(AbstractFileBasedSpec):
         default="use_records_transfer",
     )
 
+    cache_directory_listings: bool = Field(
+        title="Cache Directory Listings",
+        description="Reuse the listing of the directories that did not change since the previous sync instead of listing them again. "
+        "Files overwritten in place do not change their directory, so they are only picked up once a file is added, removed or renamed "
+        "in their directory.",
+        default=False,
+        order=8,
+        group="advanced",
+    )
+
     @classmethod
     def documentation_url(cls) -> str:
         return "https://docs.airbyte.com/integrations/sources/sftp-bulk"
@@ -2,9 +2,12 @@
 
 
 import datetime
+import io
 import logging
+import re
 import stat
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from io import IOBase
 from typing import Dict, Iterable, List, Optional
 
@@ -15,7 +18,8 @@ from airbyte_cdk import FailureType
 from airbyte_cdk.sources.file_based.exceptions import FileSizeLimitError
 from airbyte_cdk.sources.file_based.file_based_stream_reader import AbstractFileBasedStreamReader, FileReadMode
 from airbyte_cdk.sources.file_based.remote_file import RemoteFile
-from source_sftp_bulk.client import SFTPClient
+from source_sftp_bulk.client import MAX_CONCURRENT_PREFETCH_REQUESTS, SFTPClient, SFTPConnectionPool, SFTPFileReader
+from source_sftp_bulk.directory_listing import DirectoryEntry, DirectoryListingCache, collapse_slashes, directory_may_contain_matches
 from source_sftp_bulk.spec import SourceSFTPBulkSpec
 
 
@@ -24,7 +28,7 @@ class SourceSFTPBulkStreamReader(AbstractFileBasedStreamReader):
 
     def __init__(self):
         super().__init__()
-        self._sftp_client = None
+        self._connection_pool = None
 
     @property
     def config(self) -> SourceSFTPBulkSpec:
@@ -44,21 +48,69 @@ class SourceSFTPBulkStreamReader(AbstractFileBasedStreamReader):
         assert isinstance(value, SourceSFTPBulkSpec)
         self._config = value
 
+    def _create_sftp_client(self) -> SFTPClient:
+        authentication = (
+            {"password": self.config.credentials.password}
+            if self.config.credentials.auth_type == "password"
+            else {"private_key": self.config.credentials.private_key}
+        )
+        return SFTPClient(
+            host=self.config.host,
+            username=self.config.username,
+            **authentication,
+            port=self.config.port,
+        )
+
     @property
-    def sftp_client(self) -> SFTPClient:
-        if self._sftp_client is None:
-            authentication = (
-                {"password": self.config.credentials.password}
-                if self.config.credentials.auth_type == "password"
-                else {"private_key": self.config.credentials.private_key}
-            )
-            self._sftp_client = SFTPClient(
-                host=self.config.host,
-                username=self.config.username,
-                **authentication,
-                port=self.config.port,
-            )
-        return self._sftp_client
+    def connection_pool(self) -> SFTPConnectionPool:
+        if self._connection_pool is None:
+            self._connection_pool = SFTPConnectionPool(self._create_sftp_client)
+        return self._connection_pool
+
+    def _get_start_directories(self, globs: List[str]) -> List[str]:
+        """
+        Start the walk at the deepest directories the glob prefixes point to, instead of listing their parent directories.
+        """
+        root = self._config.folder_path or "/"
+        if any(not glob.split("*")[0] for glob in globs):
+            # the glob starts with a wildcard and can match anything below the folder path
+            return [root]
+
+        # The walk joins the folder path and the entry names with "/", e.g. `//files` for the `/` folder path,
+        # so the start directories are joined the same way to keep the file URIs the walk yields
+        root_directory = collapse_slashes(f"{root}/")
+        directories = set()
+        for prefix in self.get_prefixes_from_globs(globs):
+            # the prefixes only end at the first "*", the other wildcards can't be part of a directory to list
+            prefix = collapse_slashes(re.split(r"[?\[]", prefix)[0])
+            directory = prefix[: prefix.rfind("/")]
+            directories.add(f"{root}/{directory[len(root_directory):]}" if directory.startswith(root_directory) else root)
+        return sorted(
+            directory
+            for directory in directories
+            if not any(directory.startswith(f"{other_directory}/") for other_directory in directories if other_directory != directory)
+        )
+
+    def _list_directory(
+        self, directory: str, mtime: Optional[int], listing_cache: Optional[DirectoryListingCache], logger: logging.Logger
+    ) -> List[DirectoryEntry]:
+        with self.connection_pool.connection() as client:
+            try:
+                if listing_cache is not None:
+                    if mtime is None:
+                        mtime = client.sftp_connection.stat(directory).st_mtime
+                    entries = listing_cache.get(directory, mtime)
+                    if entries is not None:
+                        return entries
+                items = client.sftp_connection.listdir_attr(directory)
+            except Exception as e:
+                logger.warning(f"Failed to list files in directory: {e}")
+                return []
+
+        entries = [DirectoryEntry(item.filename, bool(item.st_mode and stat.S_ISDIR(item.st_mode)), item.st_mtime) for item in items]
+        if listing_cache is not None:
+            listing_cache.put(directory, mtime, entries)
+        return entries
 
     def get_matching_files(
         self,
@@ -66,29 +118,48 @@ class SourceSFTPBulkStreamReader(AbstractFileBasedStreamReader):
         prefix: Optional[str],
         logger: logging.Logger,
     ) -> Iterable[RemoteFile]:
-        directories = [self._config.folder_path or "/"]
-
-        # Iterate through directories and subdirectories
-        while directories:
-            current_dir = directories.pop()
-            try:
-                items = self.sftp_client.sftp_connection.listdir_attr(current_dir)
-            except Exception as e:
-                logger.warning(f"Failed to list files in directory: {e}")
-                continue
+        listing_cache = (
+            DirectoryListingCache(f"{self.config.username}@{self.config.host}:{self.config.port}")
+            if self.config.cache_directory_listings
+            else None
+        )
 
-            for item in items:
-                if item.st_mode and stat.S_ISDIR(item.st_mode):
-                    directories.append(f"{current_dir}/{item.filename}")
-                else:
-                    yield from self.filter_files_by_globs_and_start_date(
-                        [RemoteFile(uri=f"{current_dir}/{item.filename}", last_modified=datetime.datetime.fromtimestamp(item.st_mtime))],
-                        globs,
-                    )
+        # Walk the directories concurrently over the sessions of the connection pool,
+        # skipping the directories no glob can match
+        with ThreadPoolExecutor(max_workers=SFTPConnectionPool.MAX_CONNECTIONS_DEFAULT) as executor:
+            pending_listings = {
+                executor.submit(self._list_directory, directory, None, listing_cache, logger): directory
+                for directory in self._get_start_directories(globs)
+            }
+            while pending_listings:
+                done, _ = wait(pending_listings, return_when=FIRST_COMPLETED)
+                for future in done:
+                    current_dir = pending_listings.pop(future)
+                    files = []
+                    for entry in future.result():
+                        path = f"{current_dir}/{entry.filename}"
+                        if not entry.is_directory:
+                            files.append(RemoteFile(uri=path, last_modified=datetime.datetime.fromtimestamp(entry.mtime)))
+                        elif directory_may_contain_matches(path, globs):
+                            pending_listings[executor.submit(self._list_directory, path, entry.mtime, listing_cache, logger)] = path
+                    yield from self.filter_files_by_globs_and_start_date(files, globs)
+
+        if listing_cache is not None:
+            listing_cache.save()
 
     def open_file(self, file: RemoteFile, mode: FileReadMode, encoding: Optional[str], logger: logging.Logger) -> IOBase:
-        remote_file = self.sftp_client.sftp_connection.open(file.uri, mode=mode.value)
-        return remote_file
+        client = self.connection_pool.acquire()
+        try:
+            remote_file = client.sftp_connection.open(file.uri, mode="rb")
+            file_reader = SFTPFileReader(remote_file, remote_file.stat().st_size, on_close=lambda: self.connection_pool.release(client))
+        except Exception:
+            self.connection_pool.release(client)
+            raise
+
+        buffered_reader = io.BufferedReader(file_reader)
+        if mode == FileReadMode.READ:
+            return io.TextIOWrapper(buffered_reader, encoding=encoding)
+        return buffered_reader
 
     @staticmethod
     def create_progress_handler(local_file_path: str, logger: logging.Logger):
@@ -165,7 +236,14 @@ class SourceSFTPBulkStreamReader(AbstractFileBasedStreamReader):
         progress_handler = self.create_progress_handler(local_file_path, logger)
         start_download_time = time.time()
         # Copy a remote file in remote path from the SFTP server to the local host as local path.
-        self.sftp_client.sftp_connection.get(file.uri, local_file_path, callback=progress_handler)
+        # Concurrent downloads are spread over the sessions of the connection pool.
+        with self.connection_pool.connection() as client:
+            client.sftp_connection.get(
+                file.uri,
+                local_file_path,
+                callback=progress_handler,
+                max_concurrent_prefetch_requests=MAX_CONCURRENT_PREFETCH_REQUESTS,
+            )
 
         download_duration = time.time() - start_download_time
         logger.info(f"Time taken to download the file {file.uri}: {download_duration:,.2f} seconds.")
@@ -174,5 +252,6 @@ class SourceSFTPBulkStreamReader(AbstractFileBasedStreamReader):
         return {"file_url": absolute_file_path, "bytes": file_size, "file_relative_path": file_relative_path}
 
     def file_size(self, file: RemoteFile):
-        file_size = self.sftp_client.sftp_connection.stat(file.uri).st_size
+        with self.connection_pool.connection() as client:
+            file_size = client.sftp_connection.stat(file.uri).st_size
         return file_size
@@ -1,12 +1,15 @@
 # Copyright (c) 2023 Airbyte, Inc., all rights reserved.
 
 
+import io
+import os
+import threading
 from unittest.mock import MagicMock, patch
 
 import paramiko
 import pytest
 from paramiko.ssh_exception import SSHException
-from source_sftp_bulk.client import SFTPClient
+from source_sftp_bulk.client import SFTPClient, SFTPConnectionPool, SFTPFileReader
 
 
 def test_client_exception():
@@ -28,3 +31,90 @@ def test_client_connection():
             port=123,
         )
         assert SFTPClient
+
+
+def test_connection_pool_opens_sessions_only_when_all_are_in_use():
+    pool = SFTPConnectionPool(MagicMock, max_connections=2)
+
+    with pool.connection() as first_client:
+        pass
+    with pool.connection() as client:
+        assert client is first_client
+        with pool.connection() as second_client:
+            assert second_client is not first_client
+
+    acquired = []
+    first_client, second_client = pool.acquire(), pool.acquire()
+    waiting_thread = threading.Thread(target=lambda: acquired.append(pool.acquire()))
+    waiting_thread.start()
+    waiting_thread.join(timeout=0.2)
+    # The pool is full, so the thread waits until a session is released
+    assert acquired == []
+    pool.release(second_client)
+    waiting_thread.join(timeout=1)
+    assert acquired == [second_client]
+
+
+def test_connection_pool_keeps_using_open_sessions_when_the_server_refuses_more():
+    client_factory = MagicMock(side_effect=[MagicMock(), SSHException("too many connections")])
+    pool = SFTPConnectionPool(client_factory, max_connections=4)
+
+    first_client = pool.acquire()
+    threading.Timer(0.1, pool.release, args=(first_client,)).start()
+    assert pool.acquire() is first_client
+    assert client_factory.call_count == 2
+
+
+class FakeSFTPFile:
+    def __init__(self, content: bytes):
+        self.content = content
+        self.requests = []
+        self.closed = False
+
+    def readv(self, chunks, max_concurrent_prefetch_requests=None):
+        new_requests = [chunk for chunk in chunks if chunk not in self.requests]
+        assert all(size <= paramiko.SFTPFile.MAX_REQUEST_SIZE for _, size in new_requests)
+        self.requests.extend(new_requests)
+        for offset, size in chunks:
+            yield self.content[offset : offset + size]
+
+    def close(self):
+        self.closed = True
+
+
+def test_file_reader_reads_windows_with_pipelined_requests():
+    content = os.urandom(10 * paramiko.SFTPFile.MAX_REQUEST_SIZE + 100)
+    window_size = 4 * paramiko.SFTPFile.MAX_REQUEST_SIZE
+    remote_file = FakeSFTPFile(content)
+    on_close = MagicMock()
+
+    with io.BufferedReader(SFTPFileReader(remote_file, len(content), window_size=window_size, on_close=on_close)) as file_reader:
+        assert file_reader.read(100) == content[:100]
+        # The first window is requested along with the next one, as the file is read from its start
+        assert len(remote_file.requests) == 8
+        assert file_reader.read() == content[100:]
+        assert len(remote_file.requests) == 11
+
+        file_reader.seek(-50, io.SEEK_END)
+        assert file_reader.read() == content[-50:]
+        file_reader.seek(window_size + 10)
+        assert file_reader.read(20) == content[window_size + 10 : window_size + 30]
+
+    assert remote_file.closed
+    on_close.assert_called_once()
+
+
+def test_file_reader_does_not_read_ahead_on_random_access():
+    content = os.urandom(10 * paramiko.SFTPFile.MAX_REQUEST_SIZE)
+    remote_file = FakeSFTPFile(content)
+    file_reader = SFTPFileReader(remote_file, len(content), window_size=2 * paramiko.SFTPFile.MAX_REQUEST_SIZE)
+
+    file_reader.seek(-8, io.SEEK_END)
+    assert file_reader.read(8) == content[-8:]
+    file_reader.seek(3 * paramiko.SFTPFile.MAX_REQUEST_SIZE)
+    assert file_reader.read(10) == content[3 * paramiko.SFTPFile.MAX_REQUEST_SIZE : 3 * paramiko.SFTPFile.MAX_REQUEST_SIZE + 10]
+    assert remote_file.requests == [
+        (len(content) - 8, 8),
+        (3 * paramiko.SFTPFile.MAX_REQUEST_SIZE, paramiko.SFTPFile.MAX_REQUEST_SIZE),
+        (4 * paramiko.SFTPFile.MAX_REQUEST_SIZE, paramiko.SFTPFile.MAX_REQUEST_SIZE),
+    ]
@@ -3,13 +3,19 @@
 
 import datetime
 import logging
+import stat
+import threading
 from unittest.mock import MagicMock, patch
 
 import freezegun
 import paramiko
+from source_sftp_bulk import directory_listing
 from source_sftp_bulk.spec import SourceSFTPBulkSpec
 from source_sftp_bulk.stream_reader import SourceSFTPBulkStreamReader
 
+from airbyte_cdk.sources.file_based.file_based_stream_reader import FileReadMode
+from airbyte_cdk.sources.file_based.remote_file import RemoteFile
+
 
 logger = logging.Logger("")
 
@@ -40,3 +46,158 @@ def test_stream_reader_files_read_and_filter_by_date():
         assert len(files) == 1
         assert files[0].uri == "//sample_file_1.csv"
         assert files[0].last_modified == datetime.datetime(2024, 1, 1, 0, 0)
+
+
+def test_stream_reader_open_file_decodes_pipelined_reads_and_releases_session():
+    content = "id,name\n1,café\n"
+    fake_client = MagicMock()
+    fake_client.from_transport = MagicMock(return_value=fake_client)
+    remote_file = MagicMock()
+    remote_file.stat.return_value = MagicMock(st_size=len(content.encode("utf-8")))
+    remote_file.readv = lambda chunks, **kwargs: (content.encode("utf-8")[offset : offset + size] for offset, size in chunks)
+    fake_client.open = MagicMock(return_value=remote_file)
+    with patch.object(paramiko, "Transport", MagicMock()), patch.object(paramiko, "SFTPClient", fake_client):
+        reader = SourceSFTPBulkStreamReader()
+        reader.config = SourceSFTPBulkSpec(
+            host="localhost",
+            username="username",
+            credentials={"auth_type": "password", "password": "password"},
+            port=123,
+            streams=[],
+            start_date="2024-01-01T00:00:00.000000Z",
+        )
+        file = RemoteFile(uri="/files/sample_file.csv", last_modified=datetime.datetime(2024, 1, 1))
+        with reader.open_file(file, FileReadMode.READ, "utf-8", logger) as f:
+            assert f.readlines() == ["id,name\n", "1,café\n"]
+
+        fake_client.open.assert_called_once_with("/files/sample_file.csv", mode="rb")
+        remote_file.close.assert_called_once()
+        # The session is back in the pool and is reused for the next file
+        with reader.connection_pool.connection():
+            assert fake_client.from_transport.call_count == 1
+
+
+class FakeSFTPServer:
+    """Directories of the server by path, each mapping its entries to their modification time."""
+
+    def __init__(self, directories):
+        self.directories = directories
+        self.listed_directories = []
+        self._lock = threading.Lock()
+
+    def listdir_attr(self, directory):
+        with self._lock:
+            self.listed_directories.append(directory)
+        return [
+            MagicMock(filename=name, st_mode=stat.S_IFDIR if f"{directory}/{name}" in self.directories else stat.S_IFREG, st_mtime=mtime)
+            for name, mtime in self.directories[directory].items()
+        ]
+
+    def stat(self, path):
+        parent, name = path.rsplit("/", 1)
+        return MagicMock(st_mtime=self.directories[parent][name])
+
+    def get_channel(self):
+        return MagicMock()
+
+    def close(self):
+        pass
+
+
+def get_matching_files_from_server(server, globs, cache_directory_listings=False, folder_path="/files"):
+    fake_client = MagicMock()
+    fake_client.from_transport = MagicMock(return_value=server)
+    with patch.object(paramiko, "Transport", MagicMock()), patch.object(paramiko, "SFTPClient", fake_client):
+        reader = SourceSFTPBulkStreamReader()
+        reader.config = SourceSFTPBulkSpec(
+            host="localhost",
+            username="username",
+            credentials={"auth_type": "password", "password": "password"},
+            port=123,
+            folder_path=folder_path,
+            streams=[],
+            start_date="2024-01-01T00:00:00.000000Z",
+            cache_directory_listings=cache_directory_listings,
+        )
+        return sorted(file.uri for file in reader.get_matching_files(globs=globs, prefix=None, logger=logger))
+
+
+def test_get_matching_files_only_lists_directories_the_globs_can_match():
+    server = FakeSFTPServer(
+        {
+            "/files": {"2023-12": 1704067200, "2024-01": 1704067200, "archive": 1704067200, "root.csv": 1704067200},
+            "/files/2023-12": {"a.csv": 1704067200},
+            "/files/2024-01": {"a.csv": 1704067200, "b.json": 1704067200, "nested": 1704067200},
+            "/files/2024-01/nested": {"a.csv": 1704067200},
+            "/files/archive": {"2024-01": 1704067200},
+            "/files/archive/2024-01": {"a.csv": 1704067200},
+        }
+    )
+
+    assert get_matching_files_from_server(server, ["/files/2024-*/*.csv"]) == ["/files/2024-01/a.csv"]
+    assert sorted(server.listed_directories) == ["/files", "/files/2024-01"]
+
+    server.listed_directories.clear()
+    assert get_matching_files_from_server(server, ["/files/archive/**/*.csv", "/files/2024-01/nested/*.csv"]) == [
+        "/files/2024-01/nested/a.csv",
+        "/files/archive/2024-01/a.csv",
+    ]
+    # The walk starts at the directories of the glob prefixes
+    assert sorted(server.listed_directories) == ["/files/2024-01/nested", "/files/archive", "/files/archive/2024-01"]
+
+    server.listed_directories.clear()
+    assert len(get_matching_files_from_server(server, ["**/*.csv"])) == 5
+    assert len(server.listed_directories) == 6
+
+
+def test_get_matching_files_from_the_root_folder_path():
+    # Walking from the "/" folder path joins the entry names to it, as in `//files`
+    server = FakeSFTPServer(
+        {
+            "/": {"files": 1704067200, "root.csv": 1704067200},
+            "//files": {"2024-01": 1704067200, "archive": 1704067200, "a.csv": 1704067200},
+            "//files/2024-01": {"a.csv": 1704067200},
+            "//files/archive": {"a.csv": 1704067200},
+        }
+    )
+
+    assert get_matching_files_from_server(server, ["/files/*.csv"], folder_path="/") == ["//files/a.csv"]
+    assert server.listed_directories == ["//files"]
+
+    server.listed_directories.clear()
+    assert get_matching_files_from_server(server, ["/files/2024-*/*.csv", "/*.csv"], folder_path="/") == [
+        "//files/2024-01/a.csv",
+        "//root.csv",
+    ]
+    assert sorted(server.listed_directories) == ["/", "//files", "//files/2024-01"]
+
+    server.listed_directories.clear()
+    assert len(get_matching_files_from_server(server, ["**/*.csv"], folder_path="/")) == 4
+    assert len(server.listed_directories) == 4
+
+
+def test_get_matching_files_reuses_listings_of_unchanged_directories(tmp_path, monkeypatch):
+    monkeypatch.setattr(directory_listing, "LISTING_CACHE_DIR", str(tmp_path))
+    server = FakeSFTPServer(
+        {
+            "": {"files": 1704067200},
+            "/files": {"2024-01": 1704067200, "2024-02": 1704067200},
+            "/files/2024-01": {"a.csv": 1704067200},
+            "/files/2024-02": {"a.csv": 1704067200},
+        }
+    )
+    assert get_matching_files_from_server(server, ["**/*.csv"], cache_directory_listings=True) == [
+        "/files/2024-01/a.csv",
+        "/files/2024-02/a.csv",
+    ]
+    assert len(server.listed_directories) == 3
+
+    server.listed_directories.clear()
+    server.directories["/files/2024-02"]["b.csv"] = 1704153600
+    server.directories["/files"]["2024-02"] = 1704153600
+    assert get_matching_files_from_server(server, ["**/*.csv"], cache_directory_listings=True) == [
+        "/files/2024-01/a.csv",
+        "/files/2024-02/a.csv",
+        "/files/2024-02/b.csv",
+    ]
+    assert server.listed_directories == ["/files/2024-02"]